@@ -2,9 +2,9 @@
 import os
 import tkinter as tk
 from tkinter import messagebox
-from openpyxl import load_workbook
 
 import db_search.db_search_modul as t
+from db_search.db_search_snapshot import JournalSnapshot, get_cell
 import paths_home  # импортируем файл с путями до базы данных, отчетов и др.
 
 
@@ -18,6 +18,9 @@ class AppSearch(tk.Toplevel):
         # импортируем путь до файла отчета по результатам поиска
         self.file_report = paths_home.db_search_report
 
+        # локальный снимок базы рекламаций ОТК (SQLite) - поиск без открытия файла Excel
+        self.snapshot = JournalSnapshot(self.file_database, paths_home.db_search_snapshot)
+
         self.title('ПОИСК ПО БАЗЕ РЕКЛАМАЦИЙ ОТК')
         # меняем логотип Tkinter (перышко) на логотип БЗА
         self.iconbitmap('IconBZA.ico')
@@ -161,20 +164,32 @@ class AppSearch(tk.Toplevel):
         """функция подготовки выборки из базы и вывода на экран"""
         self.god, self.num1, self.num2 = self.get_value()
 
-        # открываем файл базы рекламаций ОТК
-        self.wb = load_workbook(self.file_database)
-        # открываем лист по номеру года
-        self.sheet = self.wb[self.god]
+        if not self.god:
+            return
+
+        # проверяем снимок базы рекламаций ОТК - если файл базы изменился, снимок пересобирается
+        self.snapshot.ensure_actual()
+
+        if not self.snapshot.has_year(self.god):
+            messagebox.showinfo('ОШИБКА', f'В базе нет листа {self.god} года', parent=self)
+            return
+
+        # найденные строки с двигателями и актами рекламаций: {номер: [(строка, значение ячейки), ...]}
+        # колонка 20 - номера двигателей, колонка 13 - номера актов рекламаций ПРИОБРЕТАТЕЛЯ изделия
+        self.found_dvigs = self.snapshot.find_engines(self.god, self.num1)
+        self.found_acts = self.snapshot.find_acts(self.god, self.num2)
 
-        # список двигателей и актов рекламаций из всей базы
-        # колонка 20 - номера двигателей
-        self.cells_dvigs = tuple(self.sheet.cell(row=i, column=20) for i in range(3, self.sheet.max_row+1))
-        # колонка 13 - номера актов рекламаций ПРИОБРЕТАТЕЛЯ изделия
-        self.cells_acts = tuple(self.sheet.cell(row=i, column=13) for i in range(3, self.sheet.max_row+1))
+        # номера двигателей и актов рекламаций, которые есть в базе полностью
+        self.dvigs = self.snapshot.exists_engines(self.god, self.num1)
+        self.acts = self.snapshot.exists_acts(self.god, self.num2)
 
-        # вспомогательные списки двигателей и актов рекламаций
-        self.dvigs = tuple(str(cell.value) for cell in self.cells_dvigs if cell.value)
-        self.acts = tuple(cell.value for cell in self.cells_acts)
+        # значения всех колонок найденных строк (для отчета)
+        found_rows = [
+            row
+            for found in (*self.found_dvigs.values(), *self.found_acts.values())
+            for row, value in found
+        ]
+        self.rows = self.snapshot.get_rows(self.god, found_rows)
 
         self.text_1.delete('1.0', tk.END)  # очищаем поле вывода перед выводом новых результатов
 
@@ -183,23 +198,22 @@ class AppSearch(tk.Toplevel):
                 # вывод текста
                 self.text_1.insert(1.0, f'Двигателя {n} в базе нет\n')
 
-            for i, cell in enumerate(self.cells_dvigs):
-                # если в списке cells_dvigs двигатель есть - печатаем номер строки таблицы Excel
-                if n in str(cell.value):
-                    row = i + 3
-                    self.text_1.insert(1.0, f'Двигатель {str(cell.value)}: строка - {row}\n')
+            for row, value in self.found_dvigs[n]:
+                # если двигатель есть - печатаем номер строки таблицы Excel
+                self.text_1.insert(1.0, f'Двигатель {value}: строка - {row}\n')
 
         for n in self.num2:  # перебираем входящий список актов и ищем акт во вспомогательном списке acts
             if n not in self.acts:  # если во вспомогательном списке нет - печатаем результат
                 # вывод текста
                 self.text_1.insert(1.0, f'Акта {n} в базе нет\n')
 
-            for i, cell in enumerate(self.cells_acts):
-                # если в списке cells_acts акт есть - печатаем номер строки таблицы Excel
-                if n in str(cell.value):
-                    row = i + 3
-                    # вывод текста
-                    self.text_1.insert(1.0, f'Акт {cell.value}: строка - {row}\n')
+            for row, value in self.found_acts[n]:
+                # если акт есть - печатаем номер строки таблицы Excel
+                self.text_1.insert(1.0, f'Акт {value}: строка - {row}\n')
+
+    def _cell(self, row, name):
+        """значение ячейки найденной строки журнала по названию колонки"""
+        return get_cell(self.rows[row], t.ind(name))
 
 
     def clear_strok(self):  # функция очистки строк ввода номеров двигателей и актов
@@ -234,74 +248,71 @@ class AppSearch(tk.Toplevel):
                     print('Двигателя', n, 'в базе нет', file=res_file)
                     print(file=res_file)
 
-                for i, cell in enumerate(self.cells_dvigs):
-                    # если в списке cells_dvigs двигатель есть - печатаем информацию из ячеек Excel
-                    if n in str(cell.value):
-                        row = i + 3
-
-                        print('Двигатель', str(cell.value), '| строка -', row, '|', file=res_file)
-                        print('-' * 80, file=res_file)
-
+                for row, value in self.found_dvigs.get(n, []):
+                    # если двигатель есть - печатаем информацию из ячеек Excel
+                    print('Двигатель', value, '| строка -', row, '|', file=res_file)
+                    print('-' * 80, file=res_file)
+
+                    print(
+                        self._cell(row, 'Наименование изделия'), '|',
+                        self._cell(row, 'Обозначение изделия'), '|',
+                        'зав.№:', self._cell(row, 'Заводской номер изделия'),
+                        self._cell(row, 'Дата изготовления изделия'), '|',
+                        file=res_file
+                    )
+
+                    print(
+                        'Где выявлен дефект:',
+                        self._cell(row, 'Период выявления дефекта'), '|', end=' ',
+                        file=res_file
+                    )
+
+                    if self._cell(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'):
                         print(
-                            self.sheet.cell(row, t.ind('Наименование изделия')).value, '|',
-                            self.sheet.cell(row, t.ind('Обозначение изделия')).value, '|',
-                            'зав.№:', self.sheet.cell(row, t.ind('Заводской номер изделия')).value,
-                            self.sheet.cell(row, t.ind('Дата изготовления изделия')).value, '|',
-                            file=res_file
+                            'Р/А №:',
+                            self._cell(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'),
+                            '|', end=' ', file=res_file
                         )
+                    else:
+                        print('Р/А №: акта нет', '|', end=' ', file=res_file)
+
+                    print(
+                        'Дефект:',
+                        self._cell(row, 'Заявленный дефект изделия'),
+                        file=res_file
+                    )
 
+                    if self._cell(row, 'Номер акта исследования'):
                         print(
-                            'Где выявлен дефект:',
-                            self.sheet.cell(row, t.ind('Период выявления дефекта')).value, '|', end=' ',
+                            'Акт БЗА:',
+                            self._cell(row, 'Номер акта исследования'), 'от',
+                            self._cell(row, 'Дата акта исследования').strftime('%d.%m.%Y'),
                             file=res_file
                         )
+                    else:
+                        print('Акт БЗА: акта нет', file=res_file)
 
-                        if self.sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value:
-                            print(
-                                'Р/А №:',
-                                self.sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value,
-                                '|', end=' ', file=res_file
-                            )
-                        else:
-                            print('Р/А №: акта нет', '|', end=' ', file=res_file)
+                    print(
+                        'Решение БЗА:',
+                        self._cell(row, 'Причины возникновения дефектов'), end=' ',
+                        file=res_file
+                    )
 
+                    if self._cell(row, 'Месяц отражения в статистике БЗА'):
                         print(
-                            'Дефект:',
-                            self.sheet.cell(row, t.ind('Заявленный дефект изделия')).value,
+                            '| отчетность БЗА -',
+                            self._cell(row, 'Месяц отражения в статистике БЗА'),
                             file=res_file
                         )
-
-                        if self.sheet.cell(row, t.ind('Номер акта исследования')).value:
-                            print(
-                                'Акт БЗА:',
-                                self.sheet.cell(row, t.ind('Номер акта исследования')).value, 'от',
-                                self.sheet.cell(row, t.ind('Дата акта исследования')).value.strftime('%d.%m.%Y'),
-                                file=res_file
-                            )
-                        else:
-                            print('Акт БЗА: акта нет', file=res_file)
-
+                    else:
                         print(
-                            'Решение БЗА:',
-                            self.sheet.cell(row, t.ind('Причины возникновения дефектов')).value, end=' ',
+                            '|',
+                            self._cell(row, 'Пояснения к причинам возникновения дефектов'),
                             file=res_file
                         )
 
-                        if self.sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value:
-                            print(
-                                '| отчетность БЗА -',
-                                self.sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value,
-                                file=res_file
-                            )
-                        else:
-                            print(
-                                '|',
-                                self.sheet.cell(row, t.ind('Пояснения к причинам возникновения дефектов')).value,
-                                file=res_file
-                            )
-
-                        print('-' * 80, file=res_file)
-                        print(file=res_file)
+                    print('-' * 80, file=res_file)
+                    print(file=res_file)
 
             if num2:   # если есть список актов из строки ввода
                 print('Номер акта:', ', '.join(n for n in num2),
@@ -313,73 +324,70 @@ class AppSearch(tk.Toplevel):
                     print('Акта', n, 'в базе нет', file=res_file)
                     print(file=res_file)
 
-                for i, cell in enumerate(self.cells_acts):
-                    # если в списке cells_acts есть акт - печатаем информацию из ячеек Excel
-                    if n in str(cell.value):
-                        row = i + 3
-
-                        print('Акт', cell.value, '| строка -', row, '|', file=res_file)
-                        print('-' * 80, file=res_file)
-
+                for row, value in self.found_acts.get(n, []):
+                    # если акт есть - печатаем информацию из ячеек Excel
+                    print('Акт', value, '| строка -', row, '|', file=res_file)
+                    print('-' * 80, file=res_file)
+
+                    print(
+                        self._cell(row, 'Наименование изделия'), '|',
+                        self._cell(row, 'Обозначение изделия'), '|',
+                        'зав.№:', self._cell(row, 'Заводской номер изделия'),
+                        self._cell(row, 'Дата изготовления изделия'), '|',
+                        file=res_file
+                    )
+
+                    print(
+                        'Где выявлен дефект:',
+                        self._cell(row, 'Период выявления дефекта'), '|', end=' ',
+                        file=res_file
+                    )
+
+                    if self._cell(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'):
                         print(
-                            self.sheet.cell(row, t.ind('Наименование изделия')).value, '|',
-                            self.sheet.cell(row, t.ind('Обозначение изделия')).value, '|',
-                            'зав.№:', self.sheet.cell(row, t.ind('Заводской номер изделия')).value,
-                            self.sheet.cell(row, t.ind('Дата изготовления изделия')).value, '|',
-                            file=res_file
+                            'Р/А №:',
+                            self._cell(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'),
+                            '|', end=' ', file=res_file
                         )
+                    else:
+                        print('Р/А №: акта нет', '|', end=' ', file=res_file)
+
+                    print(
+                        'Дефект:',
+                        self._cell(row, 'Заявленный дефект изделия'),
+                        file=res_file
+                    )
 
+                    if self._cell(row, 'Номер акта исследования'):
                         print(
-                            'Где выявлен дефект:',
-                            self.sheet.cell(row, t.ind('Период выявления дефекта')).value, '|', end=' ',
+                            'Акт БЗА:',
+                            self._cell(row, 'Номер акта исследования'),
+                            'от', self._cell(row, 'Дата акта исследования').strftime('%d.%m.%Y'),
                             file=res_file
                         )
+                    else:
+                        print('Акт БЗА: акта нет', file=res_file)
 
-                        if self.sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value:
-                            print(
-                                'Р/А №:',
-                                self.sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value,
-                                '|', end=' ', file=res_file
-                            )
-                        else:
-                            print('Р/А №: акта нет', '|', end=' ', file=res_file)
+                    print(
+                        'Решение БЗА:', self._cell(row, 'Причины возникновения дефектов'), end=' ',
+                        file=res_file
+                    )
 
+                    if self._cell(row, 'Месяц отражения в статистике БЗА'):
                         print(
-                            'Дефект:',
-                            self.sheet.cell(row, t.ind('Заявленный дефект изделия')).value,
+                            '| отчетность БЗА -',
+                            self._cell(row, 'Месяц отражения в статистике БЗА'),
                             file=res_file
                         )
-
-                        if self.sheet.cell(row, t.ind('Номер акта исследования')).value:
-                            print(
-                                'Акт БЗА:',
-                                self.sheet.cell(row, t.ind('Номер акта исследования')).value,
-                                'от', self.sheet.cell(row, t.ind('Дата акта исследования')).value.strftime('%d.%m.%Y'),
-                                file=res_file
-                            )
-                        else:
-                            print('Акт БЗА: акта нет', file=res_file)
-
+                    else:
                         print(
-                            'Решение БЗА:', self.sheet.cell(row, t.ind('Причины возникновения дефектов')).value, end=' ',
+                            '|',
+                            self._cell(row, 'Пояснения к причинам возникновения дефектов'),
                             file=res_file
                         )
 
-                        if self.sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value:
-                            print(
-                                '| отчетность БЗА -',
-                                self.sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value,
-                                file=res_file
-                            )
-                        else:
-                            print(
-                                '|',
-                                self.sheet.cell(row, t.ind('Пояснения к причинам возникновения дефектов')).value,
-                                file=res_file
-                            )
-
-                        print('-' * 80, file=res_file)
-                        print(file=res_file)
+                    print('-' * 80, file=res_file)
+                    print(file=res_file)
 
         try:
             # Показываем сообщение о создании и сохранении файла и вопросом об его открытии
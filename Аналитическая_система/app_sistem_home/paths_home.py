@@ -1,5 +1,7 @@
 # Модуль для переменных с путями до файлов ОТК (базы данных, логи, таблицы и отчеты)
 
+import os
+import tempfile
 from datetime import datetime
 
 
@@ -15,6 +17,11 @@ folder_reports = "D:/АНАЛИТИЧЕСКАЯ_СИСТЕМА_УК/"
 # ----------------------------------- приложение Поиск по базе ОТК -----------------------------------
 # файл отчета по результатам поиска
 db_search_report = f"{folder_reports}Отчет по результатам поиска по базе ОТК.txt"
+# локальный снимок базы рекламаций ОТК (SQLite) для быстрого поиска - на компьютере пользователя,
+# пересобирается автоматически при изменении файла базы
+db_search_snapshot = os.path.join(
+    os.environ.get("LOCALAPPDATA", tempfile.gettempdir()), "АНАЛИТИЧЕСКАЯ_СИСТЕМА_УК", "Снимок_базы_ОТК.sqlite3"
+)
 
 # ----------------------------------- приложение Резервное копирование -------------------------------
 # файл базы данных резервного копирования - перечень файлов и каталогов
@@ -0,0 +1,161 @@
+# Вспомогательный модуль приложения <Копирование отгрузки>
+# для расчета простых формул Excel (суммы по строкам и столбцам таблицы отгрузки) без запуска Excel
+
+import re
+
+from openpyxl.utils import column_index_from_string, range_boundaries
+
+# токены формулы: диапазон или ячейка (со знаками $), функция, число, операторы и скобки
+TOKEN_PATTERN = re.compile(
+    r"\s*(?:(\$?[A-Z]{1,3}\$?\d+(?::\$?[A-Z]{1,3}\$?\d+)?)|([A-Z]+)\(|(\d+(?:\.\d+)?)|([-+*/(),;]))",
+    re.IGNORECASE,
+)
+
+
+class FormulaError(Exception):
+    """Формула не поддерживается (требуется расчет в Excel)"""
+
+
+class FormulaEvaluator:
+    """
+    Расчет значений ячеек листа openpyxl, в том числе формул вида =SUM(C4:C22), =C23+D23-E5, =(A1+B1)*2.
+    Формулы, ссылающиеся на другие ячейки с формулами, рассчитываются рекурсивно,
+    результаты запоминаются. Пустые и текстовые ячейки считаются равными 0 (как в SUM Excel).
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.values = {}  # рассчитанные значения ячеек: {(строка, столбец): значение}
+
+    def value(self, row, column):
+        """Значение ячейки (для формулы - рассчитанное значение)"""
+        key = (row, column)
+        if key not in self.values:
+            self.values[key] = None  # защита от циклических ссылок
+            raw = self.ws.cell(row=row, column=column).value
+            if isinstance(raw, str) and raw.startswith("="):
+                self.values[key] = self.evaluate(raw[1:])
+            else:
+                self.values[key] = raw
+        return self.values[key]
+
+    def number(self, row, column):
+        """Значение ячейки как число для арифметики"""
+        value = self.value(row, column)
+        return (
+            value
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+            else 0
+        )
+
+    def evaluate(self, formula):
+        """Расчет выражения формулы (без знака =)"""
+        # состояние разбора сохраняется: формула может рассчитываться внутри другой формулы
+        state = getattr(self, "tokens", None), getattr(self, "position", 0)
+        self.tokens = self._tokenize(formula)
+        self.position = 0
+        try:
+            result = self._expression()
+            if self.position != len(self.tokens):
+                raise FormulaError(f"Формула не поддерживается: ={formula}")
+            return result
+        finally:
+            self.tokens, self.position = state
+
+    @staticmethod
+    def _tokenize(formula):
+        tokens = []
+        position = 0
+        formula = formula.strip()
+        while position < len(formula):
+            match = TOKEN_PATTERN.match(formula, position)
+            if not match:
+                raise FormulaError(f"Формула не поддерживается: ={formula}")
+            reference, function, number, operator = match.groups()
+            if reference:
+                tokens.append(("ref", reference.replace("$", "").upper()))
+            elif function:
+                tokens.append(("func", function.upper()))
+            elif number:
+                tokens.append(("num", float(number) if "." in number else int(number)))
+            else:
+                tokens.append(("op", operator))
+            position = match.end()
+        return tokens
+
+    def _peek(self):
+        return (
+            self.tokens[self.position]
+            if self.position < len(self.tokens)
+            else (None, None)
+        )
+
+    def _take(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _expression(self):
+        result = self._term()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            _, operator = self._take()
+            result = result + self._term() if operator == "+" else result - self._term()
+        return result
+
+    def _term(self):
+        result = self._factor()
+        while self._peek() in (("op", "*"), ("op", "/")):
+            _, operator = self._take()
+            result = (
+                result * self._factor() if operator == "*" else result / self._factor()
+            )
+        return result
+
+    def _factor(self):
+        kind, value = self._take()
+        if kind == "num":
+            return value
+        if kind == "ref":
+            if ":" in value:
+                raise FormulaError(f"Диапазон {value} допустим только внутри SUM")
+            return self._cell_number(value)
+        if kind == "func":
+            if value != "SUM":
+                raise FormulaError(f"Функция {value} не поддерживается")
+            return self._sum_arguments()
+        if (kind, value) == ("op", "-"):
+            return -self._factor()
+        if (kind, value) == ("op", "("):
+            result = self._expression()
+            if self._take() != ("op", ")"):
+                raise FormulaError("Нет закрывающей скобки")
+            return result
+        raise FormulaError(f"Неожиданный элемент формулы: {value}")
+
+    def _sum_arguments(self):
+        """Аргументы SUM(...) через запятую или точку с запятой: диапазоны, ячейки, выражения"""
+        total = 0
+        while True:
+            kind, value = self._peek()
+            if kind == "ref" and ":" in value:
+                self._take()
+                min_col, min_row, max_col, max_row = range_boundaries(value)
+                total += sum(
+                    self.number(row, column)
+                    for row in range(min_row, max_row + 1)
+                    for column in range(min_col, max_col + 1)
+                )
+            else:
+                total += self._expression()
+
+            kind, value = self._take()
+            if (kind, value) == ("op", ")"):
+                return total
+            if (kind, value) not in (("op", ","), ("op", ";")):
+                raise FormulaError("Ошибка в аргументах SUM")
+
+    def _cell_number(self, reference):
+        letters = reference.rstrip("0123456789")
+        return self.number(
+            int(reference[len(letters) :]), column_index_from_string(letters)
+        )
@@ -113,15 +113,24 @@ class SearchEngine(tk.Toplevel):
         # создаем экземпляр класса из импортированного модуля
         pr = dvg.Search(god)
 
+        numbers = []  # номера изделий в порядке ввода (None - некорректный номер)
         for prod in prods.split():
             try:
                 # переводим в int и обратно в str для удаления незначащих нулей в вводимых номерах изделий
-                prod = str(int(prod))
+                numbers.append((prod, str(int(prod))))
             except ValueError:
+                numbers.append((prod, None))
+
+        # ищем все номера изделий одним пакетным запросом по индексу
+        answers = pr.get_answers([number for prod, number in numbers if number])
+
+        for prod, number in numbers:
+            if number is None:
                 self.text_1.insert(1.0, f'Некорректный номер изделия: {prod}\n')
                 continue
-            if pr.get_answer(prod):
-                res, vid, dvig, act = pr.get_answer(prod)
+            prod = number
+            if answers[prod]:
+                res, vid, dvig, act = answers[prod]
                 self.text_1.insert(1.0, f'Двигатель № {dvig}, акт рекламации № {act}\n')
                 self.text_1.insert(1.0, f'Изделие № {prod} - {vid} - cтрока {res+3}\n')
                 self.text_1.insert(1.0, f"{'-'*50}\n")  # декоративная строка
@@ -19,7 +19,7 @@ from io import BytesIO
 from datetime import date
 from django.db.models import Q
 
-from reclamations.models import Reclamation
+from core.modules.data_access import get_reclamations_df
 from reports.config.paths import (
     BASE_REPORTS_DIR,
     get_defect_chart_product_path,
@@ -71,22 +71,6 @@ class DefectDateDataProcessor:
         except (ValueError, AttributeError):
             return None
 
-    def format_message_date(self, date_obj):
-        """
-        Преобразование DateField → "2024-03"
-        """
-        if pd.isna(date_obj) or not date_obj:
-            return None
-
-        try:
-            # Если это строка - конвертируем
-            if isinstance(date_obj, str):
-                date_obj = pd.to_datetime(date_obj)
-
-            return date_obj.strftime("%Y-%m")
-        except (ValueError, AttributeError):
-            return None
-
     def _get_filter_names(self):
         """Возвращает названия фильтров для отчета"""
         filter_parts = []
@@ -144,30 +128,16 @@ class DefectDateDataProcessor:
                 consumer_q |= Q(defect_period__name=consumer)
             queryset_filter &= consumer_q
 
-        # Получаем данные
-        queryset = (
-            Reclamation.objects.filter(queryset_filter)
-            .select_related("defect_period", "product_name", "product")
-            .values(
+        # Получаем данные (дата сообщения - datetime64, потребитель и изделия - category)
+        df = get_reclamations_df(
+            queryset_filter,
+            fields=[
                 "defect_period__name",
                 "product_name__name",
                 "product__nomenclature",
                 "message_received_date",
                 "manufacture_date",
-            )
-        )
-
-        # Если нет данных
-        if not queryset.exists():
-            filter_text = self._get_filter_names()
-            year_text = (
-                f"за {self.year} год" if str(self.year) != "all" else "за все годы"
-            )
-            return None, f"Нет данных для {filter_text} {year_text}"
-
-        # Преобразуем в DataFrame
-        df = pd.DataFrame(list(queryset))
-        df.rename(
+            ],
             columns={
                 "defect_period__name": "Потребитель",
                 "product_name__name": "Вид_изделия",
@@ -175,9 +145,9 @@ class DefectDateDataProcessor:
                 "message_received_date": "Дата_сообщения",
                 "manufacture_date": "Дата_изготовления_raw",
             },
-            inplace=True,
         )
 
+        # Если нет данных
         if df.empty:
             filter_text = self._get_filter_names()
             year_text = (
@@ -195,9 +165,9 @@ class DefectDateDataProcessor:
             return False, "Нет данных для обработки"
 
         try:
-            # Преобразуем дату сообщения
-            self.df["Дата_сообщения_formatted"] = self.df["Дата_сообщения"].apply(
-                self.format_message_date
+            # Преобразуем дату сообщения (колонка уже datetime64, NaT -> NaN)
+            self.df["Дата_сообщения_formatted"] = self.df["Дата_сообщения"].dt.strftime(
+                "%Y-%m"
             )
 
             # Преобразуем дату изготовления
@@ -19,6 +19,7 @@ from io import BytesIO
 from datetime import date
 from django.db.models import Q
 
+from core.modules.stage_metrics import files_size, timed_stage
 from reclamations.models import Reclamation
 from reports.config.paths import (
     BASE_REPORTS_DIR,
@@ -71,6 +72,7 @@ class MileageChartProcessor:
 
         return ", ".join(filter_parts)
 
+    @timed_stage("db", rows=lambda self, result: len(self.df))
     def get_data_from_db(self):
         """Получение и обработка данных из Django ORM"""
         # Проверяем, что изделие выбрано
@@ -146,6 +148,7 @@ class MileageChartProcessor:
         except Exception as e:
             return None, f"Ошибка обработки данных: {str(e)}"
 
+    @timed_stage("pandas", rows=lambda self, result: len(self.df))
     def create_analysis(self):
         """Создание анализа по бинам с настраиваемым шагом"""
         if self.df.empty:
@@ -166,6 +169,7 @@ class MileageChartProcessor:
 
         return True
 
+    @timed_stage("chart", size=lambda self, result: len(result or ""))
     def create_chart_base64(self):
         """Создание графика в base64"""
         if self.bins_data.empty:
@@ -266,6 +270,7 @@ class MileageChartProcessor:
 
         return base64.b64encode(plot_data).decode("utf-8")
 
+    @timed_stage("file", size=lambda self, result: files_size(*result))
     def save_files(self):
         """Сохранение файлов на диск"""
 
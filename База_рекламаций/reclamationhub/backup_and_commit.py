@@ -61,15 +61,11 @@ def main():
                 PYTHON_PATH,
                 "-Xutf8",  # флаг для Windows, чтобы было на русском (UTF-8)
                 "manage.py",
-                "dumpdata",
-                "--indent=2",
-                "--output=fixtures/db.json",
-                "--exclude=auth.permission",
-                "--exclude=contenttypes",
-                "--exclude=admin.logentry",
-                "--exclude=sessions.session",
+                # снимок по моделям (JSONL.gz), перезаписываются только измененные модели
+                "snapshot_db",
+                "--output=fixtures/snapshot",
             ],
-            "Создание фикстуры базы данных",
+            "Создание снимка базы данных",
         ):
             return  # Прерываем выполнение в случае ошибки
 
@@ -81,7 +77,7 @@ def main():
 
         # Добавление изменений
         if not run_command(
-            ["git", "add", "fixtures/db.json"],
+            ["git", "add", "fixtures/snapshot"],
             f"Добавление фикстуры БД в Git",
         ):
             return
@@ -3,9 +3,10 @@ from django.db import migrations
 def transfer_reclamation_data(apps, schema_editor):
     """Переносим данные из reclamation (ForeignKey) в reclamations (ManyToMany)"""
     Claim = apps.get_model('claims', 'Claim')
+    db_alias = schema_editor.connection.alias
 
     # Считаем количество претензий с привязанными рекламациями
-    claims_with_reclamation = Claim.objects.filter(reclamation__isnull=False)
+    claims_with_reclamation = Claim.objects.using(db_alias).filter(reclamation__isnull=False)
     count = claims_with_reclamation.count()
 
     print(f"Найдено {count} претензий с привязанными рекламациями")
@@ -19,8 +20,9 @@ def transfer_reclamation_data(apps, schema_editor):
 def reverse_transfer_reclamation_data(apps, schema_editor):
     """Обратная операция - переносим обратно в ForeignKey"""
     Claim = apps.get_model('claims', 'Claim')
+    db_alias = schema_editor.connection.alias
 
-    for claim in Claim.objects.all():
+    for claim in Claim.objects.using(db_alias).all():
         first_reclamation = claim.reclamations.first()
         if first_reclamation:
             claim.reclamation = first_reclamation
@@ -13,11 +13,12 @@ def extract_consumer_prefix(period_name):
 def fill_consumer_names(apps, schema_editor):
     """Заполняет consumer_name для существующих претензий"""
     Claim = apps.get_model("claims", "Claim")
+    db_alias = schema_editor.connection.alias
 
     updated = 0
     skipped = 0
 
-    for claim in Claim.objects.all():
+    for claim in Claim.objects.using(db_alias).all():
         # Если уже заполнено - пропускаем
         if claim.consumer_name:
             continue
@@ -44,7 +45,7 @@ def fill_consumer_names(apps, schema_editor):
 def reverse_func(apps, schema_editor):
     """Откат миграции - очищаем consumer_name"""
     Claim = apps.get_model("claims", "Claim")
-    Claim.objects.update(consumer_name=None)
+    Claim.objects.using(schema_editor.connection.alias).update(consumer_name=None)
 
 
 class Migration(migrations.Migration):
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 from django.utils import timezone
 
@@ -187,3 +189,27 @@ class Claim(models.Model):
             return period_name.split(" - ")[0].strip()
 
         return period_name.strip()
+
+
+@receiver(post_save, sender=Claim)
+@receiver(post_delete, sender=Claim)
+@receiver(post_save, sender=Reclamation)
+@receiver(post_delete, sender=Reclamation)
+@receiver(m2m_changed, sender=Claim.reclamations.through)
+def clear_time_analysis_cache(sender, **kwargs):
+    """Сброс кэша помесячных рядов временного анализа при изменении данных"""
+    from claims.modules.time_analysis_processor import TimeAnalysisProcessor
+
+    TimeAnalysisProcessor.clear_cache()
+
+
+@receiver(post_save, sender=Claim)
+@receiver(post_delete, sender=Claim)
+@receiver(post_save, sender=Reclamation)
+@receiver(post_delete, sender=Reclamation)
+@receiver(m2m_changed, sender=Claim.reclamations.through)
+def outdate_prebuilt_reports(sender, **kwargs):
+    """Готовые отчеты ночной подготовки перестают считаться актуальными"""
+    from core.modules.report_scheduler import bump_data_generation
+
+    bump_data_generation()
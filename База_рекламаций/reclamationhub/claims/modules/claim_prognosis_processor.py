@@ -30,6 +30,8 @@ from claims.modules.forecast import (
     TimeSeriesCorrelation,
 )
 
+from core.db_router import analytics_db
+from core.modules.stage_metrics import files_size, timed_stage
 from reports.config.paths import (
     get_claim_prognosis_chart_path,
     BASE_REPORTS_DIR,
@@ -184,6 +186,7 @@ class ClaimPrognosisProcessor:
 
     # ========== ПОЛУЧЕНИЕ ИСТОРИЧЕСКИХ ДАННЫХ ==========
 
+    @timed_stage("db", rows=lambda self, result: len(result["labels"]))
     def _get_historical_data(self):
         """
         Получение исторических данных из БД через TimeAnalysisProcessor
@@ -729,6 +732,8 @@ class ClaimPrognosisProcessor:
 
     # ========== ГЛАВНЫЙ МЕТОД ==========
 
+    @timed_stage("forecast")
+    @analytics_db()
     def generate_analysis(self):
         """
         Главный метод прогноза: собирает всё и возвращает готовый результат.
@@ -891,6 +896,10 @@ class ClaimPrognosisProcessor:
 
     # ========== СОХРАНЕНИЕ ==========
 
+    @timed_stage(
+        "chart", size=lambda self, result: files_size(result.get("chart_path"))
+    )
+    @analytics_db()
     def save_to_files(self):
         """Сохранение графика в PNG"""
         try:
@@ -21,7 +21,11 @@ from reports.config.paths import (
     BASE_REPORTS_DIR,
 )
 
+from django.db.models import Q
+
 from claims.models import Claim
+from core.db_router import analytics_db
+from core.modules.data_access import get_claims_df
 
 
 class ConsumerAnalysisProcessor:
@@ -74,37 +78,35 @@ class ConsumerAnalysisProcessor:
     def _get_claims_df(self, specific_consumer=None):
         """Получение DataFrame с претензиями"""
 
-        # Базовый фильтр по году
-        queryset_filter = {"claim_date__year": self.year}
+        # Все претензии за год загружаются одним запросом (в рамках HTTP-запроса
+        # DataFrame берется из кэша), потребители отбираются уже в pandas
+        df = get_claims_df(
+            Q(claim_date__year=self.year),
+            fields=[
+                "claim_number",
+                "claim_date",
+                "claim_amount_all",
+                "claim_amount_act",
+                "costs_act",
+                "costs_all",
+                "type_money",
+                "consumer_name",
+            ],
+        )
 
         # Фильтр по потребителям
         if specific_consumer:
             # Для конкретного потребителя
-            queryset_filter["consumer_name"] = specific_consumer
+            df = df[df["consumer_name"] == specific_consumer]
         elif not self.all_consumers_mode:
             # Для выбранных потребителей
-            queryset_filter["consumer_name__in"] = self.consumers
+            df = df[df["consumer_name"].isin(self.consumers)]
         # Если all_consumers_mode=True, то фильтр по потребителям не добавляем
 
-        # Получаем все записи
-        claims = Claim.objects.filter(**queryset_filter).values(
-            "claim_number",
-            "claim_date",
-            "claim_amount_all",
-            "claim_amount_act",
-            "costs_act",
-            "costs_all",
-            "type_money",
-            "consumer_name",
-        )
-
-        if not claims.exists():
+        if df.empty:
             return pd.DataFrame()
 
-        # Создаем общий DataFrame из полученных записей
-        df = pd.DataFrame(list(claims))
-
-        return df
+        return df.reset_index(drop=True)
 
     def get_summary_data(self):
         """Сводная информация по потребителю/потребителям"""
@@ -259,9 +261,6 @@ class ConsumerAnalysisProcessor:
         monthly_costs = [Decimal("0.00")] * 12
 
         if not df.empty:
-            # Преобразуем формат claim_date в datetime
-            df["claim_date"] = pd.to_datetime(df["claim_date"])
-
             # Обрабатываем каждую претензию
             for _, row in df.iterrows():
                 month_idx = row["claim_date"].month - 1  # 0-11 для индексации массива
@@ -291,6 +290,7 @@ class ConsumerAnalysisProcessor:
             ],
         }
 
+    @analytics_db()
     def generate_analysis(self):
         """Главный метод генерации анализа"""
         try:
@@ -367,9 +367,6 @@ class ConsumerAnalysisProcessor:
         if df.empty:
             return {"labels": [], "amounts": [], "costs": []}
 
-        # Преобразуем формат claim_date в datetime
-        df["claim_date"] = pd.to_datetime(df["claim_date"])
-
         monthly_data = {}
 
         for _, row in df.iterrows():
@@ -404,6 +401,7 @@ class ConsumerAnalysisProcessor:
 
         return {"labels": labels, "amounts": amounts, "costs": costs}
 
+    @analytics_db()
     def save_to_files(self, analysis_data=None):
         """Сохранение графика и таблицы анализа потребителя в файлы"""
         try:
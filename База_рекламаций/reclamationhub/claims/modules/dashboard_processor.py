@@ -19,7 +19,11 @@ import pandas as pd
 from datetime import date
 from decimal import Decimal
 
+from django.db.models import Q
+
 from claims.models import Claim
+from core.db_router import analytics_db
+from core.modules.data_access import get_claims_df
 
 
 class DashboardProcessor:
@@ -62,22 +66,22 @@ class DashboardProcessor:
 
     def _get_unique_claims_df(self):
         """Получение DataFrame с УНИКАЛЬНЫМИ претензиями (группировка по claim_number)"""
-        # Получаем все записи за год
-        claims = Claim.objects.filter(claim_date__year=self.year).values(
-            "claim_number",
-            "claim_date",
-            "claim_amount_all",
-            "costs_all",
-            "type_money",
-            "consumer_name",
+        # Получаем все записи за год (в рамках HTTP-запроса DataFrame берется из кэша)
+        df = get_claims_df(
+            Q(claim_date__year=self.year),
+            fields=[
+                "claim_number",
+                "claim_date",
+                "claim_amount_all",
+                "costs_all",
+                "type_money",
+                "consumer_name",
+            ],
         )
 
-        if not claims.exists():
+        if df.empty:
             return pd.DataFrame()
 
-        # Создаем DataFrame
-        df = pd.DataFrame(list(claims))
-
         # Группируем по claim_number и берем первую запись
         # (т.к. все строки одной претензии имеют одинаковые суммы)
         df_unique = df.groupby("claim_number").first().reset_index()
@@ -158,9 +162,6 @@ class DashboardProcessor:
         if df.empty:
             return {"labels": [], "amounts": [], "costs": []}
 
-        # Преобразуем claim_date в datetime
-        df["claim_date"] = pd.to_datetime(df["claim_date"])
-
         # Группируем по месяцам
         monthly_data = {}
 
@@ -277,6 +278,7 @@ class DashboardProcessor:
 
         return result
 
+    @analytics_db()
     def generate_dashboard(self):
         """Главный метод генерации Dashboard"""
         try:
@@ -300,6 +302,7 @@ class DashboardProcessor:
                 "error": f"Ошибка при генерации Dashboard: {str(e)}",
             }
 
+    @analytics_db()
     def save_to_files(self, dashboard_data=None):
         """Сохранение графика и таблицы Dashboard в файлы"""
         try:
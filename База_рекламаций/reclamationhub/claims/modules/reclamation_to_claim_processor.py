@@ -8,9 +8,10 @@
 
 from datetime import date
 from decimal import Decimal
-from django.db.models import Prefetch
 from django.db.models import Q
 
+import numpy as np
+import pandas as pd
 import matplotlib
 
 matplotlib.use("Agg")
@@ -23,6 +24,7 @@ from reports.config.paths import (
 )
 
 from claims.models import Claim
+from core.db_router import analytics_db
 from reclamations.models import Reclamation
 
 
@@ -44,6 +46,34 @@ class ReclamationToClaimProcessor:
         12: "Декабрь",
     }
 
+    # Интервалы распределения по срокам эскалации (границы включительно)
+    INTERVALS_LABELS = [
+        "0-90 дней",
+        "91-180 дней",
+        "181-270 дней",
+        "271-360 дней",
+        ">360 дней",
+    ]
+    INTERVALS_BINS = [-1, 90, 180, 270, 360, np.inf]
+
+    # Колонки плоских таблиц, загружаемых из БД через values_list
+    CLAIM_COLUMNS = [
+        "claim_id",
+        "consumer_name",
+        "claim_date",
+        "type_money",
+        "costs_act",
+        "reclamation_act_date",
+    ]
+    LINK_COLUMNS = ["claim_id", "reclamation_id"]
+    RECLAMATION_COLUMNS = [
+        "reclamation_id",
+        "message_received_date",
+        "consumer_act_date",
+        "end_consumer_act_date",
+        "period_name",
+    ]
+
     def __init__(self, year=None, consumers=None, exchange_rate=None):
         self.today = date.today()
         self.year = year or self.today.year
@@ -51,10 +81,16 @@ class ReclamationToClaimProcessor:
         self.all_consumers_mode = len(self.consumers) == 0
         self.exchange_rate = exchange_rate or Decimal("0.03")
 
-        # Кэш для выборок
+        # Кэш для плоских таблиц (загружаются из БД один раз)
+        self._claims_df = None
+        self._links_df = None
+        self._reclamations_df = None
+
+        # Кэш для производных таблиц
         self._group_a_claims_cache = None
         self._group_b_claims_cache = None
-        self._reclamations_cache = None
+        self._linked_reclamations_cache = None
+        self._escalation_days_cache = None
 
     def _convert_to_byn(self, amount, currency):
         """Конвертация суммы в BYN"""
@@ -70,14 +106,31 @@ class ReclamationToClaimProcessor:
         else:
             return Decimal("0.00")
 
-    def _get_reclamation_date(self, consumer_act_date, end_consumer_act_date):
-        """Получение даты рекламации с приоритетом"""
-        return consumer_act_date or end_consumer_act_date
+    def _sum_claims_byn(self, claims_df):
+        """Сумма признанного по акту (costs_act) в BYN: группировка по валюте + конвертация"""
+        totals = (
+            claims_df.dropna(subset=["costs_act"])
+            .groupby("type_money")["costs_act"]
+            .sum()
+        )
+
+        total_amount = Decimal("0.00")
+        for currency, amount in totals.items():
+            total_amount += self._convert_to_byn(amount, currency)
+
+        return total_amount
 
     def _extract_consumer_prefix(self, consumer_name):
         """Извлечение префикса потребителя ("ПАЗ - АСП" → "ПАЗ")"""
         return Claim.extract_consumer_prefix(consumer_name)
 
+    def _map_consumer_prefix(self, names):
+        """Префиксы потребителей для колонки (вычисляются один раз на уникальное имя)"""
+        prefixes = {
+            name: self._extract_consumer_prefix(name) for name in names.unique()
+        }
+        return names.map(prefixes)
+
     def _consumer_matches_filter(self, consumer_name):
         """Проверка, соответствует ли потребитель фильтру
         Учитывает префиксы:
@@ -103,125 +156,191 @@ class ReclamationToClaimProcessor:
 
         return False
 
-    def _get_base_claims_data(self):
-        """Фильтрация на SQL уровне"""
-        if (
-            self._group_a_claims_cache is not None
-            and self._group_b_claims_cache is not None
-        ):
-            return self._group_a_claims_cache, self._group_b_claims_cache
+    def _load_base_data(self):
+        """
+        Загрузка трех плоских таблиц одним проходом (фильтрация на SQL уровне):
+        - претензии: признанные + фильтр потребителей
+        - связи претензия ↔ рекламация (промежуточная таблица M2M)
+        - рекламации за выбранный год
+        Все метрики групп A и B считаются далее через merge / groupby.
+        """
+        if self._claims_df is not None:
+            return self._claims_df, self._links_df, self._reclamations_df
 
         # Формируем SQL фильтр по потребителям
-        consumer_filter = Q()
+        claims_filter = Q(result_claim="ACCEPTED")
         if not self.all_consumers_mode:
+            consumer_filter = Q()
             for consumer in self.consumers:
                 consumer_filter |= Q(consumer_name__istartswith=consumer)
+            claims_filter &= consumer_filter
+
+        claims_qs = Claim.objects.filter(claims_filter)
 
-        reclamations_prefetch = Prefetch(
-            "reclamations",
-            queryset=Reclamation.objects.filter(year=self.year).only(  # Фильтр по году!
-                "id",
-                "year",
-                "consumer_act_date",
-                "end_consumer_act_date",
-                "message_received_date",
+        # Претензии (порядок сортировки модели сохраняется для TOP потребителей)
+        claims_df = pd.DataFrame(
+            list(
+                claims_qs.values_list(
+                    "id",
+                    "consumer_name",
+                    "claim_date",
+                    "type_money",
+                    "costs_act",
+                    "reclamation_act_date",
+                )
             ),
+            columns=self.CLAIM_COLUMNS,
         )
-
-        # Группа А: претензии со связанными рекламациями + фильтр потребителей
-        group_a_filter = Q(result_claim="ACCEPTED", reclamations__isnull=False)
-        if not self.all_consumers_mode:
-            group_a_filter &= consumer_filter
-
-        self._group_a_claims_cache = (
-            Claim.objects.filter(group_a_filter)
-            .prefetch_related(reclamations_prefetch)
-            .distinct()
+        claims_df["claim_date"] = pd.to_datetime(claims_df["claim_date"])
+        claims_df["reclamation_act_date"] = pd.to_datetime(
+            claims_df["reclamation_act_date"]
         )
-
-        # Группа Б: претензии без связей за выбранный год + фильтр потребителей
-        group_b_filter = Q(
-            result_claim="ACCEPTED",
-            claim_date__year=self.year,
-            reclamations__isnull=True,
+        claims_df["consumer"] = self._map_consumer_prefix(claims_df["consumer_name"])
+
+        # Связи претензия ↔ рекламация (только для отобранных претензий, рекламации любого года)
+        links_df = pd.DataFrame(
+            list(
+                Claim.reclamations.through.objects.filter(
+                    claim_id__in=claims_qs.values("id")
+                ).values_list("claim_id", "reclamation_id")
+            ),
+            columns=self.LINK_COLUMNS,
         )
-        if not self.all_consumers_mode:
-            group_b_filter &= consumer_filter
-
-        self._group_b_claims_cache = Claim.objects.filter(group_b_filter)
-
-        return self._group_a_claims_cache, self._group_b_claims_cache
 
-    # Убираем методы фильтрации Python!
-    def _get_filtered_group_a_claims(self):
-        """Теперь данные уже отфильтрованы на SQL уровне"""
-        group_a_claims, _ = self._get_base_claims_data()
-        return list(group_a_claims)  # Просто возвращаем как есть
-
-    def _get_filtered_group_b_claims(self):
-        """Теперь данные уже отфильтрованы на SQL уровне"""
-        _, group_b_claims = self._get_base_claims_data()
-        return list(group_b_claims)
-
-    def _get_filtered_reclamations(self):
-        """Единый метод получения рекламаций с кэшированием"""
-        if self._reclamations_cache is not None:
-            return self._reclamations_cache
-
-        if not self.all_consumers_mode:
-            q_filters = Q()
-            for consumer in self.consumers:
-                q_filters |= Q(defect_period__name__istartswith=consumer)
-
-            self._reclamations_cache = (
-                Reclamation.objects.filter(q_filters)
-                .filter(year=self.year)
-                .only(
+        # Рекламации за выбранный год
+        reclamations_df = pd.DataFrame(
+            list(
+                Reclamation.objects.filter(year=self.year).values_list(
                     "id",
-                    "year",
                     "message_received_date",
                     "consumer_act_date",
                     "end_consumer_act_date",
                     "defect_period__name",
                 )
-                .select_related("defect_period")
-            )
+            ),
+            columns=self.RECLAMATION_COLUMNS,
+        )
+        for column in (
+            "message_received_date",
+            "consumer_act_date",
+            "end_consumer_act_date",
+        ):
+            reclamations_df[column] = pd.to_datetime(reclamations_df[column])
+
+        # Дата рекламации с приоритетом: акт приобретателя → акт конечного потребителя
+        reclamations_df["reclamation_date"] = reclamations_df[
+            "consumer_act_date"
+        ].fillna(reclamations_df["end_consumer_act_date"])
+        reclamations_df["consumer"] = self._map_consumer_prefix(
+            reclamations_df["period_name"]
+        )
+
+        # Признак попадания рекламации в фильтр потребителей (аналог istartswith)
+        if self.all_consumers_mode:
+            reclamations_df["in_filter"] = True
         else:
-            self._reclamations_cache = (
-                Reclamation.objects.filter(year=self.year)
-                .only(
-                    "id",
-                    "year",
-                    "message_received_date",
-                    "consumer_act_date",
-                    "end_consumer_act_date",
-                    "defect_period__name",
-                )
-                .select_related("defect_period")
+            prefixes = tuple(consumer.lower() for consumer in self.consumers)
+            reclamations_df["in_filter"] = (
+                reclamations_df["period_name"]
+                .fillna("")
+                .str.lower()
+                .str.startswith(prefixes)
             )
 
-        return self._reclamations_cache
+        self._claims_df = claims_df
+        self._links_df = links_df
+        self._reclamations_df = reclamations_df
 
-    def _count_reclamations_by_consumer(self):
-        """Подсчет рекламаций по потребителям (фильтрация на уровне БД)"""
+        return self._claims_df, self._links_df, self._reclamations_df
 
-        reclamations_all = self._get_filtered_reclamations()  # используем кэш
+    def _get_filtered_group_a_claims(self):
+        """Группа А: претензии со связанными рекламациями"""
+        if self._group_a_claims_cache is None:
+            claims_df, links_df, _ = self._load_base_data()
+            self._group_a_claims_cache = claims_df[
+                claims_df["claim_id"].isin(links_df["claim_id"])
+            ]
+        return self._group_a_claims_cache
 
-        consumer_reclamation_count = {}
+    def _get_filtered_group_b_claims(self):
+        """Группа Б: претензии без связей за выбранный год"""
+        if self._group_b_claims_cache is None:
+            claims_df, links_df, _ = self._load_base_data()
+            self._group_b_claims_cache = claims_df[
+                ~claims_df["claim_id"].isin(links_df["claim_id"])
+                & (claims_df["claim_date"].dt.year == self.year)
+            ]
+        return self._group_b_claims_cache
+
+    def _get_linked_reclamations(self):
+        """Связи претензий Группы А с рекламациями выбранного года (с атрибутами рекламаций)"""
+        if self._linked_reclamations_cache is None:
+            _, links_df, reclamations_df = self._load_base_data()
+            self._linked_reclamations_cache = links_df.merge(
+                reclamations_df, on="reclamation_id", how="inner"
+            )
+        return self._linked_reclamations_cache
 
-        for reclamation in reclamations_all:
-            # Получаем имя потребителя из defect_period
-            if not reclamation.defect_period or not reclamation.defect_period.name:
-                continue
+    def _get_filtered_reclamations(self):
+        """Рекламации выбранного года с учетом фильтра по потребителям"""
+        _, _, reclamations_df = self._load_base_data()
+        return reclamations_df[reclamations_df["in_filter"]]
 
-            period_name = reclamation.defect_period.name
-            consumer_prefix = self._extract_consumer_prefix(period_name)
+    def _get_escalation_days(self):
+        """
+        Срок эскалации по каждой претензии Группы А (в днях).
+        Берется первая связанная рекламация (с наибольшим id, как в сортировке модели),
+        отрицательные сроки и отсутствующие даты исключаются.
+        """
+        if self._escalation_days_cache is not None:
+            return self._escalation_days_cache
 
-            consumer_reclamation_count[consumer_prefix] = (
-                consumer_reclamation_count.get(consumer_prefix, 0) + 1
-            )
+        first_reclamations = (
+            self._get_linked_reclamations()
+            .sort_values("reclamation_id", ascending=False)
+            .drop_duplicates(subset="claim_id")
+        )
+        claims_days = self._get_filtered_group_a_claims()[
+            ["claim_id", "consumer", "claim_date"]
+        ].merge(
+            first_reclamations[["claim_id", "reclamation_date"]],
+            on="claim_id",
+            how="inner",
+        )
+        claims_days["days"] = (
+            claims_days["claim_date"] - claims_days["reclamation_date"]
+        ).dt.days
+
+        claims_days = claims_days.dropna(subset=["days"])
+        claims_days = claims_days[claims_days["days"] >= 0].astype({"days": "int64"})
+
+        self._escalation_days_cache = claims_days[["claim_id", "consumer", "days"]]
+        return self._escalation_days_cache
+
+    def _distribute_by_intervals(self, days):
+        """Распределение сроков (в днях) по интервалам INTERVALS_LABELS"""
+        counts = (
+            pd.cut(days, bins=self.INTERVALS_BINS, labels=self.INTERVALS_LABELS)
+            .value_counts(sort=False)
+            .reindex(self.INTERVALS_LABELS, fill_value=0)
+        )
+        return {
+            "labels": list(self.INTERVALS_LABELS),
+            "counts": [int(count) for count in counts],
+        }
 
-        return consumer_reclamation_count
+    def _count_reclamations_by_consumer(self):
+        """Подсчет рекламаций по потребителям (фильтрация на уровне БД)"""
+        reclamations_df = self._get_filtered_reclamations()
+
+        # Пропускаем рекламации без периода выявления дефекта
+        consumers = reclamations_df["consumer"]
+        consumers = consumers[consumers.notna() & (consumers != "")]
+
+        return {
+            consumer: int(count)
+            for consumer, count in consumers.value_counts(sort=False).items()
+        }
 
         # ========== ГРУППА A: Претензии со связанными рекламациями ==========
 
@@ -245,7 +364,7 @@ class ReclamationToClaimProcessor:
         # Получаем отфильтрованные претензии Группы А
         filtered_claims = self._get_filtered_group_a_claims()
 
-        if not filtered_claims:
+        if filtered_claims.empty:
             # Есть рекламации, но нет претензий
             return {
                 "total_reclamations": total_reclamations,
@@ -255,37 +374,15 @@ class ReclamationToClaimProcessor:
                 "claim_amount_byn": "0.00",
             }
 
-        # Считаем уникальные рекламации и прочую статистику
-        unique_reclamations = set()
-        total_claim_amount = Decimal("0.00")
-        days_list = []
-
-        for claim in filtered_claims:
-            # Собираем уникальные рекламации
-            for reclamation in claim.reclamations.all():
-                unique_reclamations.add(reclamation.id)
-
-            # Сумма претензии
-            if claim.costs_act:
-                total_claim_amount += self._convert_to_byn(
-                    claim.costs_act, claim.type_money
-                )
-
-            # Срок эскалации (берем первую связанную рекламацию)
-            first_rec = claim.reclamations.first()
-            if first_rec:
-                rec_date = self._get_reclamation_date(
-                    first_rec.consumer_act_date, first_rec.end_consumer_act_date
-                )
-                if rec_date and claim.claim_date:
-                    days = (claim.claim_date - rec_date).days
-                    if days >= 0:
-                        days_list.append(days)
-
-        escalated_count = len(unique_reclamations)
+        # Уникальные рекламации, сумма претензий и сроки эскалации
+        escalated_count = int(
+            self._get_linked_reclamations()["reclamation_id"].nunique()
+        )
+        total_claim_amount = self._sum_claims_byn(filtered_claims)
+        days = self._get_escalation_days()["days"]
 
         # Средний срок и конверсия
-        average_days = round(sum(days_list) / len(days_list)) if days_list else 0
+        average_days = round(int(days.sum()) / len(days)) if len(days) else 0
         escalation_rate = round((escalated_count / total_reclamations) * 100, 1)
 
         return {
@@ -304,46 +401,29 @@ class ReclamationToClaimProcessor:
         if not consumer_reclamation_count:
             return {"labels": [], "conversion_rates": []}
 
-        # Получаем рекламации для месячного анализа
-        reclamations_all = self._get_filtered_reclamations()  # используем кэш
-
-        # Получаем отфильтрованные претензии Группы А
-        filtered_claims = self._get_filtered_group_a_claims()
-
         # Считаем количество рекламаций по месяцам
-        monthly_total = {}
-        for reclamation in reclamations_all:
-            if reclamation.message_received_date:
-                month = reclamation.message_received_date.month
-                monthly_total[month] = monthly_total.get(month, 0) + 1
+        months = self._get_filtered_reclamations()["message_received_date"].dt.month
+        monthly_total = months.dropna().astype("int64").value_counts().sort_index()
 
-        if not monthly_total:
+        if monthly_total.empty:
             return {"labels": [], "conversion_rates": []}
 
-        # Считаем эскалации по месяцам
-        monthly_escalated = {}
-        for claim in filtered_claims:
-            for reclamation in claim.reclamations.all():
-                if reclamation.message_received_date:
-                    month = reclamation.message_received_date.month
-                    if month not in monthly_escalated:
-                        monthly_escalated[month] = set()
-                    monthly_escalated[month].add(reclamation.id)
-
-        # Преобразуем sets в counts
-        monthly_escalated_counts = {
-            month: len(rec_set) for month, rec_set in monthly_escalated.items()
-        }
+        # Считаем эскалации (уникальные рекламации) по месяцам
+        linked = self._get_linked_reclamations().dropna(
+            subset=["message_received_date"]
+        )
+        monthly_escalated = linked.groupby(linked["message_received_date"].dt.month)[
+            "reclamation_id"
+        ].nunique()
 
         # Формируем данные для графика
         labels = []
         conversion_rates = []
 
-        for month in sorted(monthly_total.keys()):
+        for month, total in monthly_total.items():
             labels.append(self.MONTH_NAMES[month])
 
-            total = monthly_total[month]
-            escalated = monthly_escalated_counts.get(month, 0)
+            escalated = int(monthly_escalated.get(month, 0))
 
             conversion = round((escalated / total) * 100, 1) if total > 0 else 0
             conversion_rates.append(conversion)
@@ -352,93 +432,36 @@ class ReclamationToClaimProcessor:
 
     def get_group_a_time_distribution(self):
         """График: Распределение по срокам эскалации"""
-        filtered_claims = self._get_filtered_group_a_claims()
-
-        intervals_labels = [
-            "0-90 дней",
-            "91-180 дней",
-            "181-270 дней",
-            "271-360 дней",
-            ">360 дней",
-        ]
-        intervals_counts = [0, 0, 0, 0, 0]
-
-        for claim in filtered_claims:
-            # Берем первую связанную рекламацию
-            first_rec = claim.reclamations.first()
-            if first_rec:
-                rec_date = self._get_reclamation_date(
-                    first_rec.consumer_act_date, first_rec.end_consumer_act_date
-                )
-
-                if rec_date and claim.claim_date:
-                    days = (claim.claim_date - rec_date).days
-
-                    if days < 0:
-                        continue
-                    elif days <= 90:
-                        intervals_counts[0] += 1
-                    elif days <= 180:
-                        intervals_counts[1] += 1
-                    elif days <= 270:
-                        intervals_counts[2] += 1
-                    elif days <= 360:
-                        intervals_counts[3] += 1
-                    else:
-                        intervals_counts[4] += 1
-
-        return {"labels": intervals_labels, "counts": intervals_counts}
+        return self._distribute_by_intervals(self._get_escalation_days()["days"])
 
     def get_group_a_top_consumers(self):
         """Таблица TOP потребителей"""
         filtered_claims = self._get_filtered_group_a_claims()
 
-        if not filtered_claims:
+        if filtered_claims.empty:
             return []
 
-        # Сбор статистики по потребителям
-        consumer_stats = {}
-
-        for claim in filtered_claims:
-            consumer = claim.consumer_name
-            consumer_prefix = self._extract_consumer_prefix(consumer)
-
-            if consumer_prefix not in consumer_stats:
-                consumer_stats[consumer_prefix] = {
-                    "escalated_reclamations": set(),
-                    "days_list": [],
-                }
+        # Уникальные рекламации по потребителю претензии
+        linked = self._get_linked_reclamations()[["claim_id", "reclamation_id"]].merge(
+            filtered_claims[["claim_id", "consumer"]], on="claim_id"
+        )
+        escalated_by_consumer = linked.groupby("consumer")["reclamation_id"].nunique()
 
-            # Добавляем уникальные рекламации
-            for reclamation in claim.reclamations.all():
-                consumer_stats[consumer_prefix]["escalated_reclamations"].add(
-                    reclamation.id
-                )
-
-            # Добавляем дни (берем первую рекламацию)
-            first_rec = claim.reclamations.first()
-            if first_rec:
-                rec_date = self._get_reclamation_date(
-                    first_rec.consumer_act_date, first_rec.end_consumer_act_date
-                )
-                if rec_date and claim.claim_date:
-                    days = (claim.claim_date - rec_date).days
-                    if days >= 0:
-                        consumer_stats[consumer_prefix]["days_list"].append(days)
+        # Сроки эскалации по потребителю
+        days_by_consumer = self._get_escalation_days().groupby("consumer")["days"]
+        days_sum = days_by_consumer.sum()
+        days_count = days_by_consumer.count()
 
         # Используем общий метод для подсчета ВСЕХ рекламаций
         consumer_reclamation_count = self._count_reclamations_by_consumer()
 
-        # Формируем итоговую таблицу
+        # Формируем итоговую таблицу (в порядке появления потребителей в претензиях)
         result = []
-        for consumer, stats in consumer_stats.items():
-            escalated = len(stats["escalated_reclamations"])
+        for consumer in filtered_claims["consumer"].unique():
+            escalated = int(escalated_by_consumer.get(consumer, 0))
             total = consumer_reclamation_count.get(consumer, 0)
-            average_days = (
-                round(sum(stats["days_list"]) / len(stats["days_list"]))
-                if stats["days_list"]
-                else 0
-            )
+            count = int(days_count.get(consumer, 0))
+            average_days = round(int(days_sum[consumer]) / count) if count else 0
             conversion_rate = round((escalated / total) * 100, 1) if total > 0 else 0
 
             result.append(
@@ -466,17 +489,10 @@ class ReclamationToClaimProcessor:
         total_claims = len(filtered_claims)
 
         # Количество претензий без даты рекламации
-        claims_without_date = sum(
-            1 for claim in filtered_claims if not claim.reclamation_act_date
-        )
+        claims_without_date = int(filtered_claims["reclamation_act_date"].isna().sum())
 
         # Общая сумма в BYN по претензиям Группы В
-        total_amount_byn = Decimal("0.00")
-        for claim in filtered_claims:
-            if claim.costs_act:
-                total_amount_byn += self._convert_to_byn(
-                    claim.costs_act, claim.type_money
-                )
+        total_amount_byn = self._sum_claims_byn(filtered_claims)
 
         return {
             "claims_without_link": total_claims,
@@ -488,36 +504,15 @@ class ReclamationToClaimProcessor:
         """График: Распределение по срокам (претензии без связи)"""
         filtered_claims = self._get_filtered_group_b_claims()
 
-        intervals_labels = [
-            "0-90 дней",
-            "91-180 дней",
-            "181-270 дней",
-            "271-360 дней",
-            ">360 дней",
-        ]
-        intervals_counts = [0, 0, 0, 0, 0]
-
-        for claim in filtered_claims:
-            if claim.reclamation_act_date and claim.claim_date:
-                days = (claim.claim_date - claim.reclamation_act_date).days
-
-                if days < 0:
-                    continue
-                elif days <= 90:
-                    intervals_counts[0] += 1
-                elif days <= 180:
-                    intervals_counts[1] += 1
-                elif days <= 270:
-                    intervals_counts[2] += 1
-                elif days <= 360:
-                    intervals_counts[3] += 1
-                else:
-                    intervals_counts[4] += 1
-
-        return {"labels": intervals_labels, "counts": intervals_counts}
+        days = (
+            filtered_claims["claim_date"] - filtered_claims["reclamation_act_date"]
+        ).dt.days.dropna()
+
+        return self._distribute_by_intervals(days[days >= 0])
 
     # ========== Главный метод генерации анализа ==========
 
+    @analytics_db()
     def generate_analysis(self):
         """Главный метод генерации анализа"""
         try:
@@ -566,6 +561,7 @@ class ReclamationToClaimProcessor:
 
     # ============ Метод сохранения файлов  ====================
 
+    @analytics_db()
     def save_to_files(self, analysis_data=None):
         """Сохранение графиков и таблиц в файлы"""
         try:
@@ -6,6 +6,9 @@
 - `TimeAnalysisProcessor` - Анализ конверсии количество рекламаций → сумма претензий
 """
 
+import threading
+import time
+import numpy as np
 import pandas as pd
 import matplotlib
 from datetime import date
@@ -13,9 +16,10 @@ from datetime import date
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-from django.db.models import Q, Prefetch
+from django.db.models import Q
 
 from claims.models import Claim
+from core.db_router import analytics_db
 from reclamations.models import Reclamation
 from reports.config.paths import (
     get_time_analysis_chart_path,
@@ -41,6 +45,12 @@ class TimeAnalysisProcessor:
         12: "Дек",
     }
 
+    # Кэш помесячных рядов (общий для всех экземпляров, в т.ч. для ClaimPrognosisProcessor).
+    # Сбрасывается сигналами при изменении рекламаций/претензий и по таймауту (сек.)
+    CACHE_TIMEOUT = 600
+    _monthly_cache = {}
+    _monthly_cache_lock = threading.Lock()
+
     def __init__(self, year=None, consumers=None, exchange_rate=None):
         """
         year: год анализа
@@ -54,49 +64,43 @@ class TimeAnalysisProcessor:
         self.all_consumers_mode = len(self.consumers) == 0
         self.exchange_rate = exchange_rate or 0.03
 
-    def _convert_to_byn(self, amount, currency):
-        """Конвертация суммы в BYN"""
-        if not amount:
-            return 0.00
-
-        amount_decimal = float(str(amount))
-
-        if currency == "BYN":
-            return amount_decimal
-        elif currency == "RUR":
-            return amount_decimal * self.exchange_rate
-        else:
-            return 0.00
-
-    def _format_date_to_month(self, date_obj):
-        """Преобразование DateField → "2024-03" """
-        if pd.isna(date_obj) or not date_obj:
-            return None
-
-        try:
-            if isinstance(date_obj, str):
-                date_obj = pd.to_datetime(date_obj)
-            return date_obj.strftime("%Y-%m")
-        except (ValueError, AttributeError):
-            return None
+    def _convert_to_byn(self, amounts, currencies):
+        """Конвертация колонки сумм в BYN (векторно, пустые суммы → 0)"""
+        amounts = pd.to_numeric(amounts, errors="coerce").fillna(0.0).astype(float)
+        rates = np.select(
+            [currencies == "BYN", currencies == "RUR"], [1.0, self.exchange_rate], 0.0
+        )
+        return amounts * rates
 
     def _extract_consumer_prefix(self, consumer_name):
         """Извлекает префикс потребителя (как в reclamation_to_claim)"""
         return Claim.extract_consumer_prefix(consumer_name)
 
+    def _get_cache_key(self):
+        """Ключ кэша помесячных рядов по параметрам анализа"""
+        return (self.year, tuple(self.consumers), float(self.exchange_rate))
+
+    @classmethod
+    def clear_cache(cls):
+        """Сброс кэша помесячных рядов (вызывается сигналами при изменении данных)"""
+        with cls._monthly_cache_lock:
+            cls._monthly_cache.clear()
+
     def _get_data_from_db(self):
         """
-        Получение данных из БД:
+        Получение данных из БД (колоночная загрузка через values_list):
         - Рекламации с фильтром по потребителям и году
-        - Признанные претензии с фильтром по потребителям
+        - Связи рекламация ↔ претензия (промежуточная таблица M2M)
+        - Признанные претензии текущего года
 
         Возвращает DataFrame с колонками:
         - reclamation_id
-        - message_date_formatted
+        - message_date (месяц сообщения, Period)
         - claim_number
-        - claim_date_formatted
+        - claim_date (месяц претензии, Period)
         - claim_cost (признанная сумма по претензии claim.costs_all)
         - type_money
+        - claim_cost_byn (признанная сумма в BYN)
         """
         # Фильтруем рекламации на уровне БД
         q_filters = Q(year=self.year)
@@ -109,84 +113,109 @@ class TimeAnalysisProcessor:
                 consumer_q |= Q(defect_period__name__istartswith=f"{consumer_prefix} -")
             q_filters &= consumer_q
 
-        # Queryset для признанных претензий
-        recognized_claims = Claim.objects.filter(
-            result_claim="ACCEPTED",
-            reclamations__isnull=False,
-            claim_date__year=self.year,  # Только претензии текущего года
-        ).distinct()
-
-        # Предзагружаем претензии
-        reclamations = (
-            Reclamation.objects.filter(q_filters)
-            .select_related("defect_period")
-            .prefetch_related(
-                Prefetch(
-                    "claims",
-                    queryset=recognized_claims,
-                    to_attr="recognized_claims_cache",
+        reclamations = pd.DataFrame(
+            list(
+                Reclamation.objects.filter(q_filters).values_list(
+                    "id", "message_received_date"
                 )
-            )
+            ),
+            columns=["reclamation_id", "message_date"],
         )
 
-        if not reclamations.exists():
+        if reclamations.empty:
             return None
 
-        # Формируем данные
-        data = []
+        # Связи с признанными претензиями текущего года
+        links = pd.DataFrame(
+            list(
+                Claim.reclamations.through.objects.filter(
+                    claim__result_claim="ACCEPTED",
+                    claim__claim_date__year=self.year,  # Только претензии текущего года
+                    reclamation__year=self.year,
+                ).values_list("claim_id", "reclamation_id")
+            ),
+            columns=["claim_id", "reclamation_id"],
+        )
+        links = links[links["reclamation_id"].isin(reclamations["reclamation_id"])]
+
+        # Признанные претензии (порядок сортировки модели сохраняется в claim_order)
+        claims = pd.DataFrame(
+            list(
+                Claim.objects.filter(
+                    id__in=links["claim_id"].unique().tolist()
+                ).values_list(
+                    "id",
+                    "consumer_name",
+                    "claim_number",
+                    "claim_date",
+                    "costs_all",
+                    "type_money",
+                )
+            ),
+            columns=[
+                "claim_id",
+                "consumer_name",
+                "claim_number",
+                "claim_date",
+                "claim_cost",
+                "type_money",
+            ],
+        )
+        claims["claim_order"] = np.arange(len(claims))
 
-        for reclamation in reclamations:
-            # Дата получения сообщения
-            message_date_formatted = self._format_date_to_month(
-                reclamation.message_received_date
-            )
+        # Фильтр по потребителям в претензиях
+        if not self.all_consumers_mode:
+            consumer_prefixes = [
+                self._extract_consumer_prefix(c) for c in self.consumers
+            ]
+            prefixes = {
+                name: self._extract_consumer_prefix(name)
+                for name in claims["consumer_name"].unique()
+            }
+            claims = claims[
+                claims["consumer_name"].map(prefixes).isin(consumer_prefixes)
+            ]
 
-            # Проверяем наличие признанных претензий
-            for claim in reclamation.recognized_claims_cache:
-                # Фильтр по потребителям в претензиях
-                if not self.all_consumers_mode:
-                    claim_prefix = self._extract_consumer_prefix(claim.consumer_name)
-                    consumer_prefixes = [
-                        self._extract_consumer_prefix(c) for c in self.consumers
-                    ]
-                    if claim_prefix not in consumer_prefixes:
-                        continue
-
-                claim_date_formatted = self._format_date_to_month(claim.claim_date)
-
-                data.append(
-                    {
-                        "reclamation_id": reclamation.id,
-                        "message_date": message_date_formatted,
-                        "claim_number": claim.claim_number,
-                        "claim_date": claim_date_formatted,
-                        "claim_cost": claim.costs_all,
-                        "type_money": claim.type_money,
-                    }
-                )
+        # Рекламации с признанными претензиями (строка на каждую пару)
+        with_claims = links.merge(claims, on="claim_id", how="inner").merge(
+            reclamations, on="reclamation_id", how="inner"
+        )
 
-            # Добавляем рекламации БЕЗ претензий (для подсчета сообщений)
-            if not reclamation.recognized_claims_cache:
-                data.append(
-                    {
-                        "reclamation_id": reclamation.id,
-                        "message_date": message_date_formatted,
-                        "claim_number": None,
-                        "claim_date": None,
-                        "claim_cost": None,
-                        "type_money": None,
-                    }
-                )
+        # Добавляем рекламации БЕЗ претензий (для подсчета сообщений)
+        without_claims = reclamations[
+            ~reclamations["reclamation_id"].isin(links["reclamation_id"])
+        ]
+
+        df = pd.concat([with_claims, without_claims], ignore_index=True)
 
-        if not data:
+        if df.empty:
             return None
 
-        df = pd.DataFrame(data)
-        return df
+        # Порядок строк как в выборке: рекламации по убыванию id, внутри - претензии
+        df = df.sort_values(
+            ["reclamation_id", "claim_order"], ascending=[False, True], kind="stable"
+        ).reset_index(drop=True)
+
+        # Месяцы сообщения и претензии, суммы в BYN - векторно
+        df["message_date"] = pd.to_datetime(df["message_date"]).dt.to_period("M")
+        df["claim_date"] = pd.to_datetime(df["claim_date"]).dt.to_period("M")
+        df["claim_cost_byn"] = self._convert_to_byn(df["claim_cost"], df["type_money"])
+
+        return df[
+            [
+                "reclamation_id",
+                "message_date",
+                "claim_number",
+                "claim_date",
+                "claim_cost",
+                "type_money",
+                "claim_cost_byn",
+            ]
+        ]
 
     def get_monthly_distribution(self):
         """
-        Группировка данных по месяцам
+        Группировка данных по месяцам (результат кэшируется по параметрам анализа)
 
         Возвращает:
         {
@@ -197,6 +226,23 @@ class TimeAnalysisProcessor:
             "claims_costs": [254.23, 105745.14, 45500.98, ...]
         }
         """
+        cache_key = self._get_cache_key()
+
+        with self._monthly_cache_lock:
+            cached = self._monthly_cache.get(cache_key)
+
+        if cached and time.monotonic() - cached[0] < self.CACHE_TIMEOUT:
+            return {key: list(values) for key, values in cached[1].items()}
+
+        monthly_data = self._calculate_monthly_distribution()
+
+        with self._monthly_cache_lock:
+            self._monthly_cache[cache_key] = (time.monotonic(), monthly_data)
+
+        return {key: list(values) for key, values in monthly_data.items()}
+
+    def _calculate_monthly_distribution(self):
+        """Расчет помесячных рядов (без кэша)"""
         df = self._get_data_from_db()
 
         if df is None or df.empty:
@@ -215,7 +261,7 @@ class TimeAnalysisProcessor:
         # Правая граница: самая поздняя дата сообщения
         max_date = df["message_date"].max()
 
-        if min_date is None or max_date is None:
+        if pd.isna(min_date) or pd.isna(max_date):
             return {
                 "labels": [],
                 "labels_formatted": [],
@@ -225,62 +271,42 @@ class TimeAnalysisProcessor:
             }
 
         # Генерируем все месяцы между min и max
-        all_months = (
-            pd.date_range(start=min_date, end=max_date, freq="MS")  # Month Start
-            .strftime("%Y-%m")
-            .tolist()
-        )
+        all_months = pd.period_range(start=min_date, end=max_date, freq="M")
 
         # ----------------- Группируем по месяцам -------------------
-        # Считаем количество рекламаций по месяцам и записываем в словарь ("2025-01": 12, "2025-02": 47, ...)
-        message_counts = df["message_date"].value_counts().to_dict()
-        # Считаем количество претензий по месяцам и записываем в словарь
-        claim_counts = df["claim_date"].value_counts().to_dict()
-
-        # Считаем признанные суммы и записываем в словарь
-        # Создаем временный столбец с конвертированными признанными суммами
-        df["claim_cost_byn"] = df.apply(
-            lambda row: self._convert_to_byn(row["claim_cost"], row["type_money"]),
-            axis=1,
+        # Считаем количество рекламаций по месяцам
+        message_counts = (
+            df["message_date"].value_counts().reindex(all_months, fill_value=0)
         )
+        # Считаем количество претензий по месяцам
+        claim_counts = df["claim_date"].value_counts().reindex(all_months, fill_value=0)
 
-        # Фильтруем только строки с claim_date
+        # Фильтруем только строки с claim_date (уникальные претензии)
         claims_only = df.dropna(subset=["claim_date"]).drop_duplicates(
             subset="claim_number"
         )
-        # print("=== ГРУППЫ С ПРЕТЕНЗИЯМИ ===")
-        # for date, group in claims_only.groupby("claim_date"):
-        #     print(f"\n{date}:")
-        #     print(group[["claim_number", "claim_cost", "claim_cost_byn"]])
 
-        # Группируем по дате претензии, суммируем признанные суммы и записываем в словарь
+        # Группируем по дате претензии и суммируем признанные суммы в BYN
         claim_costs = (
-            claims_only.groupby("claim_date")["claim_cost_byn"].sum().to_dict()
+            claims_only.groupby("claim_date")["claim_cost_byn"]
+            .sum()
+            .reindex(all_months, fill_value=0)
         )
 
-        # # Удаляем временный столбец
-        # df = df.drop("claim_cost_byn", axis=1)
-
-        # Заполняем данные для всех месяцев (даже если 0)
-        reclamation_data = [message_counts.get(month, 0) for month in all_months]
-        claim_data_counts = [claim_counts.get(month, 0) for month in all_months]
-        claim_data_costs = [claim_costs.get(month, 0) for month in all_months]
-
         # Форматируем метки для отображения
-        labels_formatted = []
-        for month_str in all_months:
-            year, month = month_str.split("-")
-            month_name = self.MONTH_NAMES[int(month)]
-            labels_formatted.append(f"{month_name} {year}")
+        labels_formatted = [
+            f"{self.MONTH_NAMES[month.month]} {month.year}" for month in all_months
+        ]
 
         return {
-            "labels": all_months,
+            "labels": all_months.strftime("%Y-%m").tolist(),
             "labels_formatted": labels_formatted,
-            "reclamations": reclamation_data,
-            "claims_counts": claim_data_counts,
-            "claims_costs": claim_data_costs,
+            "reclamations": message_counts.tolist(),
+            "claims_counts": claim_counts.tolist(),
+            "claims_costs": claim_costs.tolist(),
         }
 
+    @analytics_db()
     def generate_analysis(self):
         """Главный метод генерации анализа"""
         try:
@@ -324,6 +350,7 @@ class TimeAnalysisProcessor:
                 "error": f"Ошибка при генерации временного анализа: {str(e)}",
             }
 
+    @analytics_db()
     def save_to_files(self):
         """Сохранение графика в PNG с двумя осями Y"""
         try:
@@ -8,6 +8,9 @@ from django.contrib import messages
 
 from claims.modules.dashboard_processor import DashboardProcessor
 from claims.models import Claim
+from core.modules.report_jobs import claims_dashboard_params
+from core.modules.report_scheduler import get_prebuilt, restore_prebuilt_artifacts
+from reports.config.paths import BASE_REPORTS_DIR
 
 
 def dashboard_view(request):
@@ -47,7 +50,11 @@ def dashboard_view(request):
         # Создаем процессор и ОДИН РАЗ генерируем данные
         processor = DashboardProcessor(year=year, exchange_rate=exchange_rate_decimal)
 
-        dashboard_result = processor.generate_dashboard()
+        # Готовый результат ночной подготовки (если данные с тех пор не менялись)
+        prebuilt_params = claims_dashboard_params(year, exchange_rate_decimal)
+        dashboard_result = get_prebuilt("claims_dashboard", prebuilt_params)
+        if dashboard_result is None:
+            dashboard_result = processor.generate_dashboard()
 
         # Обрабатываем результат
         context, error_message, warning_message = handle_dashboard_result(
@@ -65,8 +72,12 @@ def dashboard_view(request):
 
         # Если нужно сохранить файлы
         if action == "save_files":
-            # Используем УЖЕ сгенерированные данные для сохранения
-            result = processor.save_to_files(dashboard_result)
+            # Файлы ночной подготовки или сохранение УЖЕ сгенерированных данных
+            files = restore_prebuilt_artifacts("claims_dashboard", prebuilt_params)
+            if files:
+                result = {"success": True, "base_dir": BASE_REPORTS_DIR, **files}
+            else:
+                result = processor.save_to_files(dashboard_result)
 
             if result["success"]:
                 messages.success(
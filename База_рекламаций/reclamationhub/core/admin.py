@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.db.models import Avg, Count, Max
+from django.shortcuts import render
+from django.urls import path
+from django.utils import timezone
+
+from reclamationhub.admin import admin_site
+from core.models import RequestProfile
+from core.modules.request_profiler import recent_requests, slowest_endpoints
+
+
+@admin.register(RequestProfile, site=admin_site)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Замеры запросов (только просмотр) и страница самых медленных представлений"""
+
+    change_list_template = "admin/request_profile_changelist.html"
+
+    list_display = [
+        "created_at",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "sql_count",
+        "sql_time_ms",
+        "username",
+    ]
+    list_filter = ["method", "status_code"]
+    search_fields = ["path", "view_name", "username"]
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "slowest/",
+                self.admin_site.admin_view(self.slowest_view),
+                name="core_requestprofile_slowest",
+            ),
+        ]
+        return custom_urls + urls
+
+    def slowest_view(self, request):
+        """Сводка по самым медленным представлениям: из БД за период и из буфера процесса"""
+        try:
+            days = max(int(request.GET.get("days", 7)), 1)
+        except ValueError:
+            days = 7
+
+        stored = (
+            RequestProfile.objects.filter(
+                created_at__gte=timezone.now() - timedelta(days=days)
+            )
+            .values("view_name")
+            .annotate(
+                count=Count("id"),
+                avg_ms=Avg("duration_ms"),
+                max_ms=Max("duration_ms"),
+                avg_sql_count=Avg("sql_count"),
+                avg_sql_ms=Avg("sql_time_ms"),
+            )
+            .order_by("-avg_ms")[:20]
+        )
+
+        return render(
+            request,
+            "admin/request_profile_slowest.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": "Самые медленные страницы",
+                "opts": self.model._meta,
+                "days": days,
+                "stored": stored,
+                "recent": slowest_endpoints(recent_requests()),
+            },
+        )
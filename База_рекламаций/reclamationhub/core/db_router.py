@@ -0,0 +1,98 @@
+# core\db_router.py
+
+"""
+Маршрутизация чтения аналитики и справок в отдельную БД только для чтения.
+
+Тяжелые агрегирующие выборки страниц аналитики, справок и процессоров претензий
+выполняются на отдельном алиасе (реплика MySQL или периодически обновляемый снимок,
+см. команду `refresh_analytics_db`), чтобы не конкурировать с вводом рекламаций
+в админ-панели на `default`.
+
+Чтение переключается только внутри контекста `analytics_db()` и только для моделей
+приложений с данными (ANALYTICS_DB["APPS"]): сессии, пользователи, сообщения
+и метаданные справок всегда читаются из `default`. Запись в контексте всегда идет
+в `default`. Если алиас не описан в DATABASES, все запросы идут в `default`.
+
+Настройки (settings.ANALYTICS_DB, все ключи необязательны):
+    ALIAS - алиас БД для аналитики в DATABASES (по умолчанию "analytics")
+    APPS  - приложения, чтение которых переносится на алиас
+    PATHS - префиксы URL, запросы к которым выполняются в контексте analytics_db()
+            (AnalyticsDbMiddleware)
+    REFRESH - обновлять снимок БД аналитики перед ночной подготовкой отчетов
+              (задание `analytics_db` команды `prebuild_reports`; для реплики - False)
+
+Использование:
+    with analytics_db():
+        result = DashboardProcessor(year=2025).generate_dashboard()
+
+    class DashboardProcessor:
+        @analytics_db()
+        def generate_dashboard(self): ...
+
+Включает:
+- `analytics_db` - контекстный менеджер (и декоратор) чтения из БД аналитики
+- `AnalyticsRouter` - маршрутизатор БД (settings.DATABASE_ROUTERS)
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+DEFAULTS = {
+    "ALIAS": "analytics",
+    "APPS": ("reclamations", "investigations", "claims", "sourcebook"),
+    "PATHS": ("/analytics/", "/reports/", "/claims/"),
+    "REFRESH": False,
+}
+
+# Включено ли чтение из БД аналитики (свое для каждого потока и запроса)
+_pinned = contextvars.ContextVar("analytics_db_pinned", default=False)
+
+
+def get_config():
+    """Настройки БД аналитики с учетом значений по умолчанию"""
+    return {**DEFAULTS, **getattr(settings, "ANALYTICS_DB", {})}
+
+
+def get_analytics_alias():
+    """Алиас БД аналитики или None, если он не описан в DATABASES"""
+    alias = get_config()["ALIAS"]
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def analytics_db():
+    """Чтение моделей данных из БД аналитики внутри блока with (или декорированной функции)"""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class AnalyticsRouter:
+    """В контексте analytics_db(): чтение - из БД аналитики, запись - в default"""
+
+    def _is_data_model(self, model):
+        return model._meta.app_label in get_config()["APPS"]
+
+    def db_for_read(self, model, **hints):
+        if _pinned.get() and self._is_data_model(model):
+            return get_analytics_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Явно: иначе объект, прочитанный из БД аналитики, сохранялся бы в нее же.
+        # Вне контекста - обычное правило Django (БД, из которой прочитан объект):
+        # migrate --database analytics и refresh_analytics_db пишут в БД аналитики
+        if _pinned.get() and self._is_data_model(model) and get_analytics_alias():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        alias = get_analytics_alias()
+        if alias and {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, alias}:
+            return True  # одни и те же данные в двух копиях
+        return None
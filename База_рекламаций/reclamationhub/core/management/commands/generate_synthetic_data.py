@@ -0,0 +1,97 @@
+# core/management/commands/generate_synthetic_data.py
+"""
+Management command для заполнения БД синтетическими данными (для замеров производительности).
+
+Использование:
+    python manage.py generate_synthetic_data --scale 10k
+    python manage.py generate_synthetic_data --scale 100k --years 2023 2024 2025 --seed 7
+    python manage.py generate_synthetic_data --clear
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.modules.synthetic_data import SyntheticDataGenerator, parse_scale
+
+
+class Command(BaseCommand):
+    help = (
+        "Создает синтетические рекламации, акты исследования и претензии (10k/100k/1m)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=str,
+            default="10k",
+            help="Количество рекламаций: 10k, 100k, 1m или число (по умолчанию: 10k)",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Годы рекламаций (по умолчанию: текущий и два предыдущих)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Начальное значение генератора случайных чисел (по умолчанию: 42)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Количество рекламаций в одной транзакции (по умолчанию: 2000)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Удалить ранее созданные синтетические данные",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        if options["clear"]:
+            deleted, deleted_claims = SyntheticDataGenerator(0, [0]).clear()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Удалено синтетических рекламаций - {deleted}, "
+                    f"претензий - {deleted_claims}"
+                )
+            )
+            return
+
+        try:
+            count = parse_scale(options["scale"])
+        except ValueError:
+            raise CommandError(f"Неверный масштаб: {options['scale']}")
+
+        current_year = date.today().year
+        years = options["years"] or [current_year - 2, current_year - 1, current_year]
+
+        generator = SyntheticDataGenerator(
+            count,
+            years,
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+        )
+
+        def progress(created, total):
+            self.stdout.write(f"  рекламаций: {created} из {total}")
+
+        generator.generate(progress=progress)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Синтетические данные созданы за {elapsed:.1f} сек: "
+                f"рекламаций - {generator.reclamations}, "
+                f"актов исследования - {generator.investigations}, "
+                f"претензий - {generator.claims}"
+            )
+        )
@@ -0,0 +1,99 @@
+# core/management/commands/import_otk_journal.py
+"""
+Management command для импорта истории из журнала учета ОТК в базу данных.
+
+Использование:
+    python manage.py import_otk_journal "D:/РАБОТА/2025-2019_ЖУРНАЛ УЧЁТА.xlsm"
+    python manage.py import_otk_journal journal.xlsm --years 2023 2024
+    python manage.py import_otk_journal journal.xlsm --dry-run --rejected rejected.csv
+"""
+
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.modules.otk_journal_import import OtkJournalImporter
+
+
+class Command(BaseCommand):
+    help = "Импортирует рекламации, акты исследования и претензии из журнала ОТК (xlsm)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", type=str, help="Путь к файлу журнала ОТК")
+        parser.add_argument(
+            "--years",
+            nargs="+",
+            type=int,
+            default=None,
+            help="Листы-годы для импорта (по умолчанию: все листы журнала)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Количество строк в одной транзакции (по умолчанию: 500)",
+        )
+        parser.add_argument(
+            "--create-refs",
+            action="store_true",
+            help="Создавать отсутствующие периоды выявления и изделия в справочниках",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только проверить строки журнала, без записи в базу данных",
+        )
+        parser.add_argument(
+            "--rejected",
+            type=str,
+            default=None,
+            help="CSV-файл для списка отклоненных строк",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        importer = OtkJournalImporter(
+            options["file"],
+            batch_size=options["batch_size"],
+            create_refs=options["create_refs"],
+            dry_run=options["dry_run"],
+        )
+
+        try:
+            importer.import_years(options["years"])
+        except FileNotFoundError:
+            raise CommandError(f"Файл журнала не найден: {options['file']}")
+
+        elapsed = time.perf_counter() - start
+        mode = " (проверка, без записи)" if options["dry_run"] else ""
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Импорт завершен за {elapsed:.1f} сек{mode}: "
+                f"рекламаций - {importer.imported}, "
+                f"актов исследования - {importer.investigations}, "
+                f"претензий - {importer.claims}"
+            )
+        )
+        if importer.duplicates:
+            self.stdout.write(f"Пропущено (уже есть в базе): {importer.duplicates}")
+
+        if not importer.rejected:
+            return
+
+        self.stdout.write(
+            self.style.WARNING(f"⚠️ Отклонено строк: {len(importer.rejected)}")
+        )
+        for year, row_number, reason in importer.rejected[:20]:
+            self.stdout.write(f"  лист {year}, строка {row_number}: {reason}")
+        if len(importer.rejected) > 20:
+            self.stdout.write("  ...")
+
+        if options["rejected"]:
+            with open(options["rejected"], "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(["Лист", "Строка", "Причина"])
+                writer.writerows(importer.rejected)
+            self.stdout.write(f"Список отклоненных строк: {options['rejected']}")
@@ -0,0 +1,55 @@
+# core/management/commands/load_snapshot.py
+"""
+Management command для быстрой загрузки снимка базы данных (созданного snapshot_db).
+
+Использование:
+    python manage.py load_snapshot
+    python manage.py load_snapshot fixtures/snapshot --replace
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.modules.db_snapshot import DbSnapshot
+
+
+class Command(BaseCommand):
+    help = "Загружает снимок БД (JSONL.gz по моделям) через bulk_create"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "folder",
+            type=str,
+            nargs="?",
+            default="fixtures/snapshot",
+            help="Каталог снимка (по умолчанию: fixtures/snapshot)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество объектов в одном INSERT (по умолчанию: 1000)",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Удалить существующие строки моделей снимка перед загрузкой",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        snapshot = DbSnapshot(options["folder"], batch_size=options["batch_size"])
+        try:
+            result = snapshot.load(replace=options["replace"])
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Снимок БД загружен за {elapsed:.1f} сек: "
+                f"моделей - {len(result)}, строк - {sum(result.values())}"
+            )
+        )
@@ -0,0 +1,198 @@
+# core/management/commands/load_test.py
+"""
+Management command для нагрузочной проверки запущенного экземпляра системы.
+
+Значения параметров запросов (годы, номера двигателей, типы изделий) берутся из БД,
+с которой работает проверяемый сервер. Несколько значений --users дают прогоны
+с возрастающей нагрузкой: пропускная способность перестает расти, а задержки
+резко увеличиваются при упоре в рабочие процессы WSGI-сервера или в MySQL.
+
+Использование:
+    python manage.py load_test --username admin --password secret
+    python manage.py load_test --url http://127.0.0.1:8000 --users 1 5 10 20 --duration 60
+    python manage.py load_test --users 10 --think-time 0 --output loadtest/month_end.json
+"""
+
+import json
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from claims.models import Claim
+from core.modules.load_test import SCENARIOS, LoadTest
+from reclamations.models import Reclamation
+from sourcebook.models import ProductType
+
+
+class Command(BaseCommand):
+    help = "Нагрузочный прогон: N одновременных сотрудников, RPS, p50/p95/p99 и доля ошибок"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            type=str,
+            default="http://127.0.0.1:8000",
+            help="Адрес сервера (по умолчанию: http://127.0.0.1:8000)",
+        )
+        parser.add_argument(
+            "--username", type=str, required=True, help="Пользователь админ-панели"
+        )
+        parser.add_argument(
+            "--password",
+            type=str,
+            default=os.environ.get("LOAD_TEST_PASSWORD", ""),
+            help="Пароль (по умолчанию: переменная окружения LOAD_TEST_PASSWORD)",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            default=[10],
+            help="Число одновременных пользователей, несколько значений - ступени нагрузки",
+        )
+        parser.add_argument(
+            "--duration",
+            type=int,
+            default=60,
+            help="Длительность ступени после ввода пользователей, сек (по умолчанию: 60)",
+        )
+        parser.add_argument(
+            "--ramp-up",
+            type=float,
+            default=5,
+            help="Время ввода пользователей, сек (по умолчанию: 5)",
+        )
+        parser.add_argument(
+            "--think-time",
+            type=float,
+            default=0.5,
+            help="Средняя пауза пользователя между запросами, сек (по умолчанию: 0.5)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30,
+            help="Таймаут запроса, сек (по умолчанию: 30)",
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=None,
+            help="Выполнять только указанные сценарии",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Файл JSON для сохранения результатов",
+        )
+
+    def get_sample(self):
+        """Значения параметров запросов из БД"""
+        reclamations = Reclamation.objects.order_by("-pk")
+        sample = {
+            "years": list(
+                Reclamation.objects.values_list("year", flat=True).distinct()
+            ),
+            "claim_years": list(
+                Claim.objects.values_list("claim_date__year", flat=True).distinct()
+            ),
+            "engine_numbers": list(
+                reclamations.exclude(engine_number__isnull=True)
+                .exclude(engine_number="")
+                .values_list("engine_number", flat=True)[:500]
+            ),
+            "product_numbers": list(
+                reclamations.exclude(product_number__isnull=True)
+                .exclude(product_number="")
+                .values_list("product_number", flat=True)[:500]
+            ),
+            "product_type_ids": [
+                str(pk) for pk in ProductType.objects.values_list("pk", flat=True)
+            ],
+        }
+        # Пустая БД: запросы с заведомо отсутствующими значениями
+        sample["years"] = sample["years"] or [date.today().year]
+        sample["claim_years"] = [year for year in sample["claim_years"] if year] or [
+            date.today().year
+        ]
+        sample["engine_numbers"] = sample["engine_numbers"] or ["0000000"]
+        sample["product_numbers"] = sample["product_numbers"] or ["000000"]
+        sample["product_type_ids"] = sample["product_type_ids"] or ["0"]
+        return sample
+
+    def handle(self, *args, **options):
+        if not options["password"]:
+            raise CommandError("Не указан пароль (--password или LOAD_TEST_PASSWORD)")
+
+        scenarios = None
+        if options["scenarios"]:
+            scenarios = {name: SCENARIOS[name] for name in options["scenarios"]}
+
+        load_test = LoadTest(
+            options["url"],
+            options["username"],
+            options["password"],
+            self.get_sample(),
+            duration=options["duration"],
+            ramp_up=options["ramp_up"],
+            think_time=options["think_time"],
+            timeout=options["timeout"],
+            scenarios=scenarios,
+            seed=options["seed"],
+        )
+
+        results = []
+        for users in options["users"]:
+            self.stdout.write(f"\nПользователей: {users} ...")
+            result = load_test.run(users)
+            if result["login_errors"]:
+                raise CommandError(result["login_errors"][0])
+            results.append(result)
+            self.print_result(result)
+
+        if len(results) > 1:
+            self.stdout.write("\nСтупени нагрузки (всего):")
+            self.print_header("пользователей")
+            for result in results:
+                self.print_row(str(result["users"]), result["total"])
+
+        if options["output"]:
+            folder = os.path.dirname(options["output"])
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(
+                    {"url": options["url"], "runs": results},
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Результаты сохранены в {options['output']}")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ Нагрузочный прогон завершен"))
+
+    def print_header(self, title):
+        self.stdout.write(
+            f"  {title:<24}{'запросов':>9}{'RPS':>9}{'p50 мс':>9}"
+            f"{'p95 мс':>9}{'p99 мс':>9}{'ошибок %':>10}"
+        )
+
+    def print_row(self, name, summary):
+        line = (
+            f"  {name:<24}{summary['requests']:>9}{summary['rps']:>9}"
+            f"{summary['p50_ms']:>9}{summary['p95_ms']:>9}{summary['p99_ms']:>9}"
+            f"{summary['error_rate']:>10}"
+        )
+        self.stdout.write(self.style.ERROR(line) if summary["error_rate"] else line)
+
+    def print_result(self, result):
+        self.print_header("сценарий")
+        for name, summary in result["scenarios"].items():
+            self.print_row(name, summary)
+        self.print_row("ВСЕГО", result["total"])
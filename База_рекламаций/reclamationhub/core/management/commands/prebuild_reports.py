@@ -0,0 +1,105 @@
+# core/management/commands/prebuild_reports.py
+"""
+Management command для ночной подготовки стандартных отчетов (core.modules.report_scheduler).
+
+Задания выполняются в порядке зависимостей, готовые результаты сохраняются в кэш
+"prebuilt_reports" и отдаются страницами, пока данные не изменились. Задание,
+результат которого в кэше еще актуален, повторно не считается (кроме --force).
+
+Использование:
+    python manage.py prebuild_reports
+    python manage.py prebuild_reports --jobs claims_dashboard length_study
+    python manage.py prebuild_reports --list
+    python manage.py prebuild_reports --force
+    python manage.py prebuild_reports --clear
+
+Запуск по расписанию (каждую ночь в 03:00):
+    cron:
+        0 3 * * * cd /path/to/reclamationhub && python manage.py prebuild_reports
+    Планировщик заданий Windows:
+        schtasks /Create /SC DAILY /ST 03:00 /TN "ReclamationHub prebuild_reports"
+            /TR "C:\\path\\to\\python.exe C:\\path\\to\\reclamationhub\\manage.py prebuild_reports"
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.modules import report_scheduler
+
+
+class Command(BaseCommand):
+    help = "Ночная подготовка стандартных отчетов в кэш готовых результатов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs",
+            nargs="+",
+            default=None,
+            help="Задания для выполнения (по умолчанию: все; зависимости добавляются)",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="Показать список заданий и выйти",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересчитать, даже если в кэше есть актуальный результат",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Удалить все готовые результаты из кэша и выйти",
+        )
+
+    def handle(self, *args, **options):
+        jobs = report_scheduler.load_jobs()
+
+        if options["list"]:
+            for job in jobs.values():
+                depends = f" (после: {', '.join(job.depends)})" if job.depends else ""
+                self.stdout.write(f"  {job.name:<20} {job.title}{depends}")
+            return
+
+        if options["clear"]:
+            report_scheduler.clear()
+            self.stdout.write(self.style.SUCCESS("✅ Кэш готовых отчетов очищен"))
+            return
+
+        start = time.perf_counter()
+        try:
+            results = report_scheduler.run_jobs(
+                names=options["jobs"],
+                force=options["force"],
+                progress=self._print_result,
+            )
+        except (RuntimeError, ValueError) as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        errors = sum(1 for result in results if result["status"] == "ошибка")
+        built = sum(1 for result in results if result["status"] == "готово")
+        summary = (
+            f"Подготовка отчетов завершена за {elapsed:.1f} сек: "
+            f"рассчитано - {built}, заданий - {len(results)}, ошибок - {errors}"
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
+
+    def _print_result(self, result):
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        line = f"  {result['title']}"
+        if params:
+            line += f" [{params}]"
+        line += f": {result['status']} ({result['seconds']} сек)"
+        if result["error"]:
+            line += f" - {result['error']}"
+
+        if result["status"] == "ошибка":
+            self.stdout.write(self.style.ERROR(line))
+        else:
+            self.stdout.write(line)
@@ -0,0 +1,84 @@
+# core/management/commands/refresh_analytics_db.py
+"""
+Management command для обновления снимка БД аналитики (алиас ANALYTICS_DB["ALIAS"]).
+
+Данные приложений ANALYTICS_DB["APPS"] выгружаются из default (DbSnapshot) и
+загружаются в БД аналитики с заменой прежних строк. Используется, когда БД аналитики -
+не реплика MySQL, а отдельная копия (SQLite или MySQL). Перед первым обновлением
+нужно создать таблицы: python manage.py migrate --database analytics
+
+Использование:
+    python manage.py refresh_analytics_db
+    python manage.py refresh_analytics_db --snapshot fixtures/snapshot
+"""
+
+import tempfile
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.db_router import get_analytics_alias, get_config
+from core.modules.db_snapshot import DbSnapshot
+
+
+class Command(BaseCommand):
+    help = "Копирует данные рекламаций, исследований, претензий и справочников в БД аналитики"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--snapshot",
+            type=str,
+            default=None,
+            help="Загрузить готовый снимок (snapshot_db) вместо выгрузки из default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество объектов в одном INSERT (по умолчанию: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        alias = get_analytics_alias()
+        if alias is None:
+            raise CommandError(
+                f"БД аналитики '{get_config()['ALIAS']}' не описана в DATABASES"
+            )
+
+        start = time.perf_counter()
+        data_apps = set(get_config()["APPS"])
+        exclude = [
+            config.label
+            for config in apps.get_app_configs()
+            if config.label not in data_apps
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            folder = options["snapshot"] or tmp_dir
+            if not options["snapshot"]:
+                DbSnapshot(
+                    folder,
+                    exclude=exclude,
+                    batch_size=options["batch_size"],
+                    using=DEFAULT_DB_ALIAS,
+                ).dump(force=True)
+
+            try:
+                result = DbSnapshot(
+                    folder,
+                    exclude=exclude,
+                    batch_size=options["batch_size"],
+                    using=alias,
+                ).load(replace=True)
+            except FileNotFoundError as e:
+                raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ БД аналитики '{alias}' обновлена за {elapsed:.1f} сек: "
+                f"моделей - {len(result)}, строк - {sum(result.values())}"
+            )
+        )
@@ -0,0 +1,101 @@
+# core/management/commands/run_benchmarks.py
+"""
+Management command для замеров времени, памяти и числа SQL-запросов
+процессоров аналитики и страниц админ-панели.
+
+Использование:
+    python manage.py run_benchmarks --output benchmarks/before.json
+    python manage.py run_benchmarks --output benchmarks/after.json --compare benchmarks/before.json
+    python manage.py run_benchmarks --only processors --year 2024 --repeat 5
+"""
+
+import json
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.modules.benchmarks import compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Замеряет процессоры и страницы админ-панели, сохраняет результат в JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year",
+            type=int,
+            default=date.today().year,
+            help="Год данных для процессоров (по умолчанию: текущий)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Количество повторов замера времени (по умолчанию: 3)",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=["processors", "admin"],
+            default=["processors", "admin"],
+            help="Группы сценариев (по умолчанию: все)",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Файл JSON для сохранения результатов",
+        )
+        parser.add_argument(
+            "--compare",
+            type=str,
+            default=None,
+            help="Файл JSON предыдущих замеров для сравнения",
+        )
+
+    def handle(self, *args, **options):
+        previous = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as f:
+                    previous = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Не удалось прочитать {options['compare']}: {e}")
+
+        def progress(name, result):
+            if not result["ok"]:
+                self.stdout.write(self.style.ERROR(f"  {name}: {result['error']}"))
+                return
+            self.stdout.write(
+                f"  {name}: {result['wall_median_ms']} мс, "
+                f"{result['peak_mb']} МБ, SQL - {result['queries']} "
+                f"({result['sql_ms']} мс)"
+            )
+
+        data = run_benchmarks(
+            options["year"],
+            repeat=options["repeat"],
+            only=options["only"],
+            progress=progress,
+        )
+
+        if previous is not None:
+            self.stdout.write("\nСравнение с предыдущими замерами:")
+            for row in compare_results(previous, data):
+                self.stdout.write(
+                    f"  {row['name']} {row['metric']}: "
+                    f"{row['before']} -> {row['after']} ({row['change_pct']:+.1f}%)"
+                )
+
+        if options["output"]:
+            folder = os.path.dirname(options["output"])
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Результаты сохранены в {options['output']}")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ Замеры выполнены"))
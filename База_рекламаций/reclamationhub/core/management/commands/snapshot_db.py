@@ -0,0 +1,67 @@
+# core/management/commands/snapshot_db.py
+"""
+Management command для создания инкрементального сжатого снимка базы данных.
+
+Использование:
+    python manage.py snapshot_db
+    python manage.py snapshot_db --output fixtures/snapshot --force
+    python manage.py snapshot_db --exclude auth.permission contenttypes admin.logentry sessions.session core.requestprofile users.user
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.modules.db_snapshot import DEFAULT_EXCLUDE, DbSnapshot
+
+
+class Command(BaseCommand):
+    help = "Создает снимок БД: по файлу JSONL.gz на модель, записываются только измененные модели"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            type=str,
+            default="fixtures/snapshot",
+            help="Каталог снимка (по умолчанию: fixtures/snapshot)",
+        )
+        parser.add_argument(
+            "--exclude",
+            nargs="+",
+            default=list(DEFAULT_EXCLUDE),
+            help="Исключаемые приложения или модели (app_label или app_label.model)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество строк, читаемых из БД за один запрос (по умолчанию: 1000)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перезаписать файлы всех моделей, даже без изменений",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        snapshot = DbSnapshot(
+            options["output"],
+            exclude=options["exclude"],
+            batch_size=options["batch_size"],
+        )
+        result = snapshot.dump(force=options["force"])
+
+        written = [label for label, status in result.items() if status == "записана"]
+        for label in written:
+            self.stdout.write(f"  {label}")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Снимок БД обновлен за {elapsed:.1f} сек: "
+                f"записано моделей - {len(written)}, "
+                f"без изменений - {len(result) - len(written)}"
+            )
+        )
@@ -0,0 +1,125 @@
+# core\middleware.py
+
+"""
+Middleware проекта.
+
+Включает классы:
+- `DataFrameCacheMiddleware` - кэш DataFrame слоя доступа к данным в рамках одного запроса
+- `RequestProfilerMiddleware` - замеры времени запросов и SQL, профилирование по ?profile=1
+- `AnalyticsDbMiddleware` - чтение данных страниц аналитики и справок из БД аналитики
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+
+from core.db_router import analytics_db, get_config as get_analytics_config
+from core.modules.data_access import enable_cache, disable_cache
+from core.modules import request_profiler
+
+logger = logging.getLogger(__name__)
+
+
+class DataFrameCacheMiddleware:
+    """Включает кэш DataFrame (core.modules.data_access) на время обработки запроса"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        enable_cache()
+        try:
+            return self.get_response(request)
+        finally:
+            disable_cache()
+
+
+class RequestProfilerMiddleware:
+    """
+    Замеряет время обработки запроса, число и время SQL-запросов.
+    Замеры попадают в кольцевой буфер и (выборочно) в таблицу core.RequestProfile.
+    Сотрудник (is_staff) может добавить к URL ?profile=1 и получить вместо страницы
+    отчет профилировщика. Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = request_profiler.get_config()
+
+    def __call__(self, request):
+        if not self.config["ENABLED"] or request.path.startswith(
+            tuple(self.config["EXCLUDE_PATHS"])
+        ):
+            return self.get_response(request)
+
+        profile = request.GET.get("profile") == "1" and getattr(request, "user", None)
+        profile = bool(profile and request.user.is_staff)
+
+        stats = request_profiler.QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            if profile:
+                response, report = request_profiler.profile_request(
+                    self.get_response, request
+                )
+            else:
+                response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        self.save(request, response, duration_ms, stats)
+
+        if profile:
+            return HttpResponse(report)
+        return response
+
+    def save(self, request, response, duration_ms, stats):
+        """Запись замера в кольцевой буфер и (выборочно) в БД"""
+        match = getattr(request, "resolver_match", None)
+        entry = {
+            "method": request.method,
+            "path": request.path[:500],
+            "view_name": (match.view_name if match else "")[:200] or "-",
+            "status_code": response.status_code,
+            "duration_ms": duration_ms,
+            "sql_count": stats.count,
+            "sql_time_ms": stats.time * 1000,
+        }
+        request_profiler.record(entry)
+
+        if not request_profiler.should_store(duration_ms, self.config):
+            return
+
+        from core.models import RequestProfile
+
+        user = getattr(request, "user", None)
+        try:
+            RequestProfile.objects.create(
+                username=user.get_username() if user and user.is_authenticated else "",
+                **entry,
+            )
+        except DatabaseError:
+            # замеры не должны ломать обработку запроса
+            logger.exception("Не удалось сохранить замер запроса %s", request.path)
+
+
+class AnalyticsDbMiddleware:
+    """
+    Выполняет запросы к страницам с префиксами ANALYTICS_DB["PATHS"] (аналитика,
+    справки, аналитика претензий) в контексте analytics_db() - чтение моделей данных
+    идет из БД аналитики, если она описана в DATABASES (см. core.db_router).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(get_analytics_config()["PATHS"])
+
+    def __call__(self, request):
+        if not request.path.startswith(self.paths):
+            return self.get_response(request)
+        with analytics_db():
+            return self.get_response(request)
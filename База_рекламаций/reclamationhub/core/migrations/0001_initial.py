@@ -0,0 +1,59 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Дата запроса"
+                    ),
+                ),
+                ("method", models.CharField(max_length=10, verbose_name="Метод")),
+                ("path", models.CharField(max_length=500, verbose_name="URL")),
+                (
+                    "view_name",
+                    models.CharField(
+                        db_index=True, max_length=200, verbose_name="Представление"
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(verbose_name="Код ответа"),
+                ),
+                ("duration_ms", models.FloatField(verbose_name="Время, мс")),
+                ("sql_count", models.PositiveIntegerField(verbose_name="SQL-запросов")),
+                ("sql_time_ms", models.FloatField(verbose_name="Время SQL, мс")),
+                (
+                    "username",
+                    models.CharField(
+                        blank=True, max_length=150, verbose_name="Пользователь"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Замер запроса",
+                "verbose_name_plural": "Замеры запросов",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    Модель для выборочных замеров обработки запросов (RequestProfilerMiddleware).
+    Сохраняется доля запросов REQUEST_PROFILER["SAMPLE_RATE"] и все медленные запросы.
+    """
+
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Дата запроса"
+    )
+    method = models.CharField(max_length=10, verbose_name="Метод")
+    path = models.CharField(max_length=500, verbose_name="URL")
+    view_name = models.CharField(
+        max_length=200, db_index=True, verbose_name="Представление"
+    )
+    status_code = models.PositiveSmallIntegerField(verbose_name="Код ответа")
+    duration_ms = models.FloatField(verbose_name="Время, мс")
+    sql_count = models.PositiveIntegerField(verbose_name="SQL-запросов")
+    sql_time_ms = models.FloatField(verbose_name="Время SQL, мс")
+    username = models.CharField(max_length=150, blank=True, verbose_name="Пользователь")
+
+    class Meta:
+        verbose_name = "Замер запроса"
+        verbose_name_plural = "Замеры запросов"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.duration_ms:.0f} мс"
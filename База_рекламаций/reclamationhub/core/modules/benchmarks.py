@@ -0,0 +1,237 @@
+# core\modules\benchmarks.py
+
+"""
+Замеры производительности процессоров аналитики и страниц админ-панели.
+
+Для каждого сценария фиксируются:
+- время выполнения (минимум и медиана из нескольких повторов);
+- пиковая память Python (tracemalloc, отдельным прогоном - трассировка замедляет код);
+- число и время SQL-запросов (через `connection.execute_wrapper`, как в профилировщике запросов).
+
+Результаты сохраняются в JSON вместе с описанием окружения (СУБД, число записей,
+версии Python/Django/pandas), чтобы сравнивать замеры до и после оптимизации
+на одном наборе данных (см. `generate_synthetic_data`).
+
+Включает:
+- `measure` - замер одного сценария
+- `processor_cases`, `admin_cases` - сценарии процессоров и страниц админ-панели
+- `run_benchmarks` - выполнение сценариев и сборка результата
+- `compare_results` - сравнение с предыдущим файлом результатов
+"""
+
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime
+
+import django
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from core.modules.request_profiler import QueryStats
+
+
+def measure(func, repeat=3):
+    """
+    Замер сценария func
+    Returns: словарь wall_min_ms, wall_median_ms, peak_mb, queries, sql_ms, ok, error
+    """
+    result = {"ok": True, "error": ""}
+    timings = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        # Память и SQL - отдельным прогоном
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(stats))
+            tracemalloc.start()
+            try:
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        return {**result, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        **result,
+        "wall_min_ms": round(min(timings), 1),
+        "wall_median_ms": round(statistics.median(timings), 1),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+        "queries": stats.count,
+        "sql_ms": round(stats.time * 1000, 1),
+    }
+
+
+# ---------------------------- Сценарии процессоров ------------------------------------
+
+
+def processor_cases(year, output_dir):
+    """Сценарии процессоров: {название: функция без аргументов}"""
+    from claims.modules.dashboard_processor import DashboardProcessor
+    from claims.modules.reclamation_to_claim_processor import (
+        ReclamationToClaimProcessor,
+    )
+    from claims.modules.time_analysis_processor import TimeAnalysisProcessor
+    from reports.modules.culprits_defect_module import CulpritsDefectProcessor
+    from utils.modules.excel_exporter_processor import UniversalExcelExporter
+
+    def time_analysis():
+        # без кэша - замеряется полный расчет, а не чтение из кэша
+        TimeAnalysisProcessor.clear_cache()
+        TimeAnalysisProcessor(year=year).generate_analysis()
+
+    def excel_export():
+        exporter = UniversalExcelExporter(year=year)
+        exporter.selected_fields = list(exporter.field_config)
+        exporter.save_path = os.path.join(output_dir, "benchmark_export.xlsx")
+        exporter.export_to_excel()
+
+    return {
+        "DashboardProcessor": lambda: DashboardProcessor(
+            year=year
+        ).generate_dashboard(),
+        "ReclamationToClaimProcessor": lambda: ReclamationToClaimProcessor(
+            year=year
+        ).generate_analysis(),
+        "TimeAnalysisProcessor": time_analysis,
+        "CulpritsDefectProcessor": lambda: CulpritsDefectProcessor(
+            user_number=0
+        ).generate_analysis(),
+        "UniversalExcelExporter": excel_export,
+    }
+
+
+# ---------------------------- Сценарии админ-панели ------------------------------------
+
+
+def admin_cases(client):
+    """Сценарии страниц админ-панели: {название: функция без аргументов}"""
+    from reclamations.models import Reclamation
+
+    def get(url):
+        def request():
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: код ответа {response.status_code}")
+
+        return request
+
+    changelist = reverse("admin:reclamations_reclamation_changelist")
+    cases = {
+        "admin:reclamation_changelist": get(changelist),
+        "admin:reclamation_changelist_search": get(f"{changelist}?q=течь"),
+        "admin:investigation_changelist": get(
+            reverse("admin:investigations_investigation_changelist")
+        ),
+        "admin:claim_changelist": get(reverse("admin:claims_claim_changelist")),
+    }
+
+    last = Reclamation.objects.order_by("-pk").values_list("pk", flat=True).first()
+    if last is not None:
+        cases["admin:reclamation_change"] = get(
+            reverse("admin:reclamations_reclamation_change", args=[last])
+        )
+    return cases
+
+
+def _run_admin(repeat, progress):
+    """Страницы админ-панели от имени временного суперпользователя (удаляется откатом)"""
+    from django.contrib.auth import get_user_model
+
+    results = {}
+    with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+        user = get_user_model().objects.create_superuser(
+            username="benchmark_admin", password=None, email=""
+        )
+        client = Client()
+        client.force_login(user)
+        for name, func in admin_cases(client).items():
+            results[name] = measure(func, repeat)
+            if progress:
+                progress(name, results[name])
+        transaction.set_rollback(True)
+    return results
+
+
+# ---------------------------- Запуск ------------------------------------
+
+
+def environment_info():
+    """Описание окружения замера: СУБД, объем данных, версии"""
+    import pandas as pd
+
+    from claims.models import Claim
+    from investigations.models import Investigation
+    from reclamations.models import Reclamation
+
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "vendor": connection.vendor,
+        "reclamations": Reclamation.objects.count(),
+        "investigations": Investigation.objects.count(),
+        "claims": Claim.objects.count(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "pandas": pd.__version__,
+    }
+
+
+def run_benchmarks(year, repeat=3, only=("processors", "admin"), progress=None):
+    """
+    Выполнение сценариев
+    progress: функция (название, результат) для вывода хода замеров
+    Returns: словарь {"meta": окружение, "results": {название: результат measure}}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        if "processors" in only:
+            for name, func in processor_cases(year, output_dir).items():
+                results[name] = measure(func, repeat)
+                if progress:
+                    progress(name, results[name])
+
+    if "admin" in only:
+        results.update(_run_admin(repeat, progress))
+
+    meta = environment_info()
+    meta.update({"year": year, "repeat": repeat})
+    return {"meta": meta, "results": results}
+
+
+def compare_results(previous, current):
+    """
+    Сравнение с предыдущими замерами (изменение в процентах, минус - быстрее/меньше)
+    Returns: список словарей name, metric, before, after, change_pct
+    """
+    rows = []
+    for name, after in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before or not before.get("ok") or not after.get("ok"):
+            continue
+        for metric in ("wall_median_ms", "peak_mb", "queries"):
+            old, new = before.get(metric), after.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            rows.append(
+                {
+                    "name": name,
+                    "metric": metric,
+                    "before": old,
+                    "after": new,
+                    "change_pct": round(change, 1),
+                }
+            )
+    return rows
@@ -0,0 +1,235 @@
+# core\modules\data_access.py
+
+"""
+Общий слой доступа к данным для pandas-процессоров (отчеты, аналитика, претензии).
+
+DataFrame строится напрямую из кортежей values_list (без промежуточных словарей)
+с явными типами колонок:
+- `category` - справочные и повторяющиеся строки (потребитель, изделие, виновник, валюта)
+- `int16` / `int32` - счетчики, годы и ID (`Int16` / `Int32`, если в колонке есть NULL)
+- `datetime64[ns]` - даты
+- денежные суммы (DecimalField) остаются объектами Decimal для точных расчетов
+
+В рамках одного HTTP-запроса готовые DataFrame кэшируются (см. `DataFrameCacheMiddleware`),
+поэтому повторные обращения процессоров к одной и той же выборке не идут в БД.
+
+Включает функции:
+- `get_reclamations_df` - DataFrame рекламаций
+- `get_investigations_df` - DataFrame актов исследования
+- `get_claims_df` - DataFrame претензий
+- `get_claim_links_df` - DataFrame связей претензия ↔ рекламация (таблица M2M)
+- `get_queryset_df` - DataFrame по произвольному QuerySet
+- `enable_cache` / `disable_cache` - управление кэшем в рамках запроса
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.db.models import Q
+
+from claims.models import Claim
+from core.modules.stage_metrics import stage
+from investigations.models import Investigation
+from reclamations.models import Reclamation
+
+
+# Явные типы колонок по полям моделей ("app_label.Model.field")
+FIELD_DTYPES = {
+    # Справочники и повторяющиеся значения
+    "sourcebook.PeriodDefect.name": "category",
+    "sourcebook.ProductType.name": "category",
+    "sourcebook.Product.nomenclature": "category",
+    "reclamations.Reclamation.status": "category",
+    "reclamations.Reclamation.away_type": "category",
+    "reclamations.Reclamation.sender": "category",
+    "investigations.Investigation.solution": "category",
+    "investigations.Investigation.fault_type": "category",
+    "investigations.Investigation.guilty_department": "category",
+    "investigations.Investigation.return_condition": "category",
+    "claims.Claim.consumer_name": "category",
+    "claims.Claim.type_money": "category",
+    "claims.Claim.result_claim": "category",
+    # Короткие целые
+    "reclamations.Reclamation.year": "int16",
+    "reclamations.Reclamation.yearly_number": "int16",
+    "reclamations.Reclamation.products_count": "int16",
+    "claims.Claim.year": "int16",
+}
+
+# Типы колонок по классу поля (если поле не указано в FIELD_DTYPES)
+FIELD_CLASS_DTYPES = [
+    (models.DateTimeField, "datetime64[ns, UTC]"),
+    (models.DateField, "datetime64[ns]"),
+    (models.AutoField, "int32"),
+    (models.BigAutoField, "int32"),
+    (models.ForeignKey, "int32"),
+    (models.OneToOneField, "int32"),
+    (models.IntegerField, "int32"),
+    (models.FloatField, "float64"),
+]
+
+# Nullable-аналоги целых типов для колонок с NULL
+NULLABLE_INT_DTYPES = {"int16": "Int16", "int32": "Int32", "int64": "Int64"}
+
+
+# ==================== КЭШ В РАМКАХ ЗАПРОСА ====================
+
+_state = threading.local()
+
+
+def enable_cache():
+    """Включает кэш DataFrame для текущего потока (начало HTTP-запроса)"""
+    _state.cache = {}
+
+
+def disable_cache():
+    """Выключает и очищает кэш DataFrame для текущего потока (конец HTTP-запроса)"""
+    _state.cache = None
+
+
+def _get_cache():
+    """Кэш текущего запроса или None (вне запроса данные не кэшируются)"""
+    return getattr(_state, "cache", None)
+
+
+# ==================== ОПРЕДЕЛЕНИЕ ТИПОВ ====================
+
+
+def _resolve_field(model, lookup):
+    """Находит поле модели по пути lookup ("reclamation__defect_period__name")"""
+    field = None
+    for part in lookup.split("__"):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return field
+
+
+def get_field_dtype(model, lookup):
+    """Тип колонки pandas для поля модели (None - оставить object)"""
+    field = _resolve_field(model, lookup)
+
+    # Для "claim_id" / "reclamation_id" и т.п. get_field возвращает связь (ForeignKey)
+    key = f"{field.model._meta.label}.{field.name}"
+    if key in FIELD_DTYPES:
+        return FIELD_DTYPES[key]
+
+    for field_class, dtype in FIELD_CLASS_DTYPES:
+        if isinstance(field, field_class):
+            return dtype
+
+    # Поле "id" связанной модели в конце пути (related_model для обратных связей)
+    if field.is_relation:
+        return "int32"
+
+    return None
+
+
+def _build_column(values, dtype):
+    """Колонка нужного типа из кортежа значений"""
+    if dtype is None:
+        return pd.Series(values, dtype=object)
+
+    if dtype == "category":
+        return pd.Series(pd.Categorical(values))
+
+    if dtype == "datetime64[ns]":
+        return pd.Series(np.array(values, dtype="datetime64[D]").astype(dtype))
+
+    if dtype == "datetime64[ns, UTC]":
+        return pd.Series(pd.to_datetime(values, utc=True))
+
+    if dtype in NULLABLE_INT_DTYPES:
+        if any(value is None for value in values):
+            return pd.Series(values, dtype=NULLABLE_INT_DTYPES[dtype])
+        return pd.Series(np.array(values, dtype=dtype))
+
+    return pd.Series(values, dtype=dtype)
+
+
+# ==================== ПОСТРОЕНИЕ DATAFRAME ====================
+
+
+def get_queryset_df(queryset, fields, columns=None):
+    """
+    DataFrame по QuerySet с явными типами колонок.
+
+    Аргументы:
+    - queryset: QuerySet модели (фильтры, сортировка, annotate)
+    - fields: список полей/lookup для values_list ("id", "defect_period__name", ...)
+    - columns: словарь переименования колонок {lookup: "Название"} (необязательно)
+
+    Возвращает:
+    - DataFrame (пустой DataFrame с нужными колонками, если записей нет)
+    """
+    fields = list(fields)
+    columns = columns or {}
+
+    cache = _get_cache()
+    try:
+        cache_key = (queryset.model._meta.label, tuple(fields), str(queryset.query))
+    except EmptyResultSet:  # заведомо пустая выборка (например, id__in=[])
+        cache, cache_key = None, None
+
+    if cache is not None and cache_key in cache:
+        df = cache[cache_key].copy()
+    else:
+        with stage("db") as timer:
+            rows = list(queryset.values_list(*fields))
+            timer.add_rows(len(rows))
+        values_by_column = list(zip(*rows)) if rows else [()] * len(fields)
+
+        df = pd.DataFrame(
+            {
+                field: _build_column(values, _get_dtype(queryset, field))
+                for field, values in zip(fields, values_by_column)
+            }
+        )
+
+        if cache is not None:
+            cache[cache_key] = df.copy()
+
+    if columns:
+        df = df.rename(columns=columns)
+
+    return df
+
+
+def _get_dtype(queryset, lookup):
+    """Тип колонки: поле модели или аннотация QuerySet"""
+    annotation = queryset.query.annotations.get(lookup)
+    if annotation is not None:
+        output_field = annotation.output_field
+        for field_class, dtype in FIELD_CLASS_DTYPES:
+            if isinstance(output_field, field_class):
+                return dtype
+        return None
+
+    return get_field_dtype(queryset.model, lookup)
+
+
+def get_reclamations_df(filters=None, fields=(), columns=None):
+    """DataFrame рекламаций (filters - объект Q или None для всех записей)"""
+    queryset = Reclamation.objects.filter(filters or Q())
+    return get_queryset_df(queryset, fields, columns)
+
+
+def get_investigations_df(filters=None, fields=(), columns=None):
+    """DataFrame актов исследования (filters - объект Q или None для всех записей)"""
+    queryset = Investigation.objects.filter(filters or Q())
+    return get_queryset_df(queryset, fields, columns)
+
+
+def get_claims_df(filters=None, fields=(), columns=None):
+    """DataFrame претензий (filters - объект Q или None для всех записей)"""
+    queryset = Claim.objects.filter(filters or Q())
+    return get_queryset_df(queryset, fields, columns)
+
+
+def get_claim_links_df(filters=None, columns=None):
+    """DataFrame связей претензия ↔ рекламация: колонки claim_id, reclamation_id"""
+    queryset = Claim.reclamations.through.objects.filter(filters or Q())
+    return get_queryset_df(queryset, ["claim_id", "reclamation_id"], columns)
@@ -0,0 +1,282 @@
+# core\modules\db_snapshot.py
+
+"""
+Инкрементальный сжатый снимок базы данных (замена полного `dumpdata` в backup_and_commit.py).
+
+Каждая модель записывается в отдельный файл `<app_label>.<model>.jsonl.gz`:
+одна строка - один объект в формате фикстур Django (`{"model", "pk", "fields"}`),
+строки упорядочены по первичному ключу, объекты читаются потоком через `.iterator()`.
+Файлы gzip пишутся без даты в заголовке, поэтому неизменные данные дают тот же файл
+байт в байт и не создают изменений в git.
+
+В `manifest.json` каталога снимка для каждой модели хранятся число строк и SHA-256
+содержимого. Повторный снимок читает все модели потоком и не перезаписывает файлы
+моделей, у которых совпал хэш строк. Число строк и max(updated_at) для пропуска
+чтения не используются: `QuerySet.update()` не меняет поля auto_now, и такие
+изменения были бы потеряны.
+
+Загрузка снимка идет через `bulk_create` пакетами в одной транзакции
+с отключенной проверкой внешних ключей (как в `loaddata`), без save() и сигналов
+на каждый объект. Связи многие-ко-многим создаются пакетами через промежуточные модели.
+
+Включает класс:
+- `DbSnapshot` - создание и загрузка снимка базы данных
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# Модели, которые не входят в снимок (как --exclude в прежнем вызове dumpdata)
+DEFAULT_EXCLUDE = (
+    "auth.permission",
+    "contenttypes",
+    "admin.logentry",
+    "sessions.session",
+    "core.requestprofile",  # замеры запросов профилировщика - не данные, меняются постоянно
+)
+
+MANIFEST_FILE = "manifest.json"
+
+
+class DbSnapshot:
+    """Создание и загрузка снимка базы данных в каталоге `folder`"""
+
+    def __init__(
+        self,
+        folder,
+        exclude=DEFAULT_EXCLUDE,
+        batch_size=1000,
+        using=DEFAULT_DB_ALIAS,
+    ):
+        self.folder = folder
+        self.exclude = set(exclude)
+        self.batch_size = batch_size
+        self.using = using
+
+    # ---------------------------- Общие методы ------------------------------------
+
+    @staticmethod
+    def model_label(model):
+        return model._meta.label_lower
+
+    def model_file(self, model):
+        return os.path.join(self.folder, f"{self.model_label(model)}.jsonl.gz")
+
+    def get_models(self):
+        """Модели снимка в порядке зависимостей (сначала те, на которые ссылаются)"""
+        app_list = {}
+        for model in apps.get_models():
+            label = self.model_label(model)
+            if (
+                label in self.exclude
+                or model._meta.app_label in self.exclude
+                or model._meta.proxy
+                or not model._meta.managed
+            ):
+                continue
+            app_list.setdefault(apps.get_app_config(model._meta.app_label), []).append(
+                model
+            )
+        return serializers.sort_dependencies(app_list.items())
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.folder, MANIFEST_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        """Запись манифеста через временный файл (при сбое прежний манифест не портится)"""
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.folder)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.folder, MANIFEST_FILE))
+
+    # ---------------------------- Создание снимка ------------------------------------
+
+    def iter_lines(self, model):
+        """Строки JSONL объектов модели в порядке первичного ключа (объекты читаются потоком)"""
+        queryset = model._default_manager.using(self.using).order_by("pk")
+        # Для связей многие-ко-многим сериализатор читает только первичные ключи
+        for obj in serializers.serialize(
+            "python",
+            queryset.iterator(chunk_size=self.batch_size),
+            use_natural_foreign_keys=False,
+            use_natural_primary_keys=False,
+        ):
+            yield json.dumps(
+                obj, cls=DjangoJSONEncoder, ensure_ascii=False, sort_keys=True
+            )
+
+    def write_model(self, model):
+        """
+        Запись модели во временный файл с одновременным расчетом хэша
+        Returns: (путь до временного файла, число строк, хэш)
+        """
+        digest = hashlib.sha256()
+        rows = 0
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.folder)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                filename="", mode="wb", fileobj=raw, mtime=0
+            ) as f:
+                for line in self.iter_lines(model):
+                    data = (line + "\n").encode("utf-8")
+                    digest.update(data)
+                    f.write(data)
+                    rows += 1
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, rows, digest.hexdigest()
+
+    def dump(self, force=False):
+        """
+        Создание (обновление) снимка базы данных
+        Returns: словарь {метка модели: "записана" / "без изменений"}
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        manifest = self.load_manifest()
+        new_manifest = {}
+        result = {}
+
+        for model in self.get_models():
+            label = self.model_label(model)
+            previous = manifest.get(label)
+            file_exists = os.path.exists(self.model_file(model))
+
+            tmp_path, rows, sha256 = self.write_model(model)
+            new_manifest[label] = {"rows": rows, "sha256": sha256}
+
+            if not force and previous and file_exists and previous["sha256"] == sha256:
+                os.remove(tmp_path)
+                result[label] = "без изменений"
+            else:
+                os.replace(tmp_path, self.model_file(model))
+                result[label] = "записана"
+
+        # Файлы удаленных (исключенных) моделей больше не нужны
+        for label in set(manifest) - set(new_manifest):
+            path = os.path.join(self.folder, f"{label}.jsonl.gz")
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.save_manifest(new_manifest)
+        return result
+
+    # ---------------------------- Загрузка снимка ------------------------------------
+
+    def iter_objects(self, model):
+        """Объекты модели из файла снимка (DeserializedObject: object + m2m_data)"""
+        with gzip.open(self.model_file(model), "rt", encoding="utf-8") as f:
+            records = (json.loads(line) for line in f if line.strip())
+            yield from serializers.deserialize("python", records, using=self.using)
+
+    def load(self, replace=False):
+        """
+        Загрузка снимка в базу данных через bulk_create
+        replace: удалить существующие строки моделей снимка перед загрузкой
+        Returns: словарь {метка модели: число загруженных строк}
+        """
+        manifest = self.load_manifest()
+        if not manifest:
+            raise FileNotFoundError(f"В каталоге {self.folder} нет снимка базы данных")
+
+        models = [
+            model for model in self.get_models() if self.model_label(model) in manifest
+        ]
+        connection = connections[self.using]
+        result = {}
+
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                if replace:
+                    self.delete_rows(connection, models)
+
+                for model in models:
+                    result[self.model_label(model)] = self.load_model(model)
+
+            # Проверка внешних ключей после загрузки всех моделей (как в loaddata)
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+
+        # Сброс последовательностей автоинкремента после вставки явных pk
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        return result
+
+    def delete_rows(self, connection, models):
+        """
+        Удаление всех строк моделей снимка SQL-запросами DELETE через курсор
+        (как в synthetic_data.clear()): в обратном порядке зависимостей, сначала
+        ссылающиеся модели, у каждой - сначала ее автоматические таблицы связей m2m
+        """
+        tables = []
+        for model in reversed(models):
+            for field in model._meta.local_many_to_many:
+                through = field.remote_field.through
+                if through._meta.auto_created:
+                    tables.append(through._meta.db_table)
+            tables.append(model._meta.db_table)
+
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(table)}")
+
+    def load_model(self, model):
+        """Загрузка одной модели пакетами по batch_size объектов"""
+        manager = model._base_manager.using(self.using)
+        objects = []
+        m2m_links = []  # (поле, pk объекта, список pk связанных объектов)
+        rows = 0
+
+        for deserialized in self.iter_objects(model):
+            objects.append(deserialized.object)
+            for field_name, values in (deserialized.m2m_data or {}).items():
+                m2m_links.append((field_name, deserialized.object.pk, values))
+
+            if len(objects) >= self.batch_size:
+                manager.bulk_create(objects, batch_size=self.batch_size)
+                rows += len(objects)
+                objects = []
+
+        if objects:
+            manager.bulk_create(objects, batch_size=self.batch_size)
+            rows += len(objects)
+
+        self.load_m2m(model, m2m_links)
+        return rows
+
+    def load_m2m(self, model, m2m_links):
+        """Связи многие-ко-многим - пакетной вставкой строк промежуточных моделей"""
+        through_rows = {}
+        for field_name, pk, values in m2m_links:
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue  # явная промежуточная модель загружается как отдельная модель
+            source = field.m2m_field_name() + "_id"
+            target = field.m2m_reverse_field_name() + "_id"
+            through_rows.setdefault(through, []).extend(
+                through(**{source: pk, target: value}) for value in values
+            )
+
+        for through, objects in through_rows.items():
+            through._base_manager.using(self.using).bulk_create(
+                objects, batch_size=self.batch_size
+            )
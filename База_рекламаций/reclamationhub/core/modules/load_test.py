@@ -0,0 +1,269 @@
+# core\modules\load_test.py
+
+"""
+Нагрузочная проверка запущенного экземпляра системы (HTTP, только стандартная библиотека).
+
+Виртуальные пользователи (потоки) входят в админ-панель под учетной записью сотрудника
+и в цикле выполняют сценарии, выбираемые случайно с учетом веса:
+главная страница и `ajax_year_data`, списки рекламаций, актов исследования и претензий,
+AJAX-запросы формы рекламации и претензии (`get_products`,
+`check_duplicate_reclamations_ajax`, `search_related_data`) и расчет Dashboard претензий.
+
+Для каждого сценария и в целом считаются пропускная способность (запросов в секунду),
+задержки p50/p95/p99 и доля ошибок (код ответа 4xx/5xx, таймаут, обрыв соединения).
+Прогон по нескольким уровням нагрузки (`levels`) показывает, при каком числе
+пользователей пропускная способность перестает расти - упор в рабочие процессы
+WSGI-сервера или в MySQL.
+
+Включает класс:
+- `LoadTest` - прогон нагрузки и сводка результатов
+"""
+
+import random
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+# Сценарии: название -> вес (доля запросов)
+SCENARIOS = {
+    "home": 10,
+    "ajax_year_data": 10,
+    "admin_reclamations": 15,
+    "admin_investigations": 10,
+    "admin_claims": 10,
+    "search_related_data": 10,
+    "check_duplicates": 15,
+    "get_products": 15,
+    "claims_dashboard": 5,
+}
+
+LOGIN_PATH = "/admin/login/"
+
+
+def percentile(values, percent):
+    """Перцентиль отсортированного списка (метод ближайшего ранга)"""
+    if not values:
+        return 0.0
+    index = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class LoginError(Exception):
+    """Не удалось войти в админ-панель"""
+
+
+class Session:
+    """HTTP-сессия одного виртуального пользователя (куки сессии и CSRF)"""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+
+    def cookie(self, name):
+        for cookie in self.cookies:
+            if cookie.name == name:
+                return cookie.value
+        return None
+
+    def request(self, method, path, data=None):
+        """
+        Запрос к серверу
+        Returns: (код ответа, тело ответа)
+        """
+        body = urlencode(data).encode("utf-8") if data is not None else None
+        request = Request(self.base_url + path, data=body, method=method)
+        if method == "POST":
+            request.add_header("X-CSRFToken", self.cookie("csrftoken") or "")
+            request.add_header("Referer", self.base_url + path)
+            request.add_header("X-Requested-With", "XMLHttpRequest")
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except HTTPError as e:
+            return e.code, e.read()
+
+    def login(self, username, password):
+        self.request("GET", LOGIN_PATH)  # получение куки csrftoken
+        self.request(
+            "POST",
+            LOGIN_PATH,
+            {
+                "username": username,
+                "password": password,
+                "csrfmiddlewaretoken": self.cookie("csrftoken") or "",
+                "next": "/admin/",
+            },
+        )
+        if not self.cookie("sessionid"):
+            raise LoginError(f"Не удалось войти под пользователем {username}")
+
+
+class LoadTest:
+    """
+    Нагрузочный прогон
+    sample: значения для параметров запросов, полученные из БД (годы, номера двигателей и т.п.)
+    """
+
+    def __init__(
+        self,
+        base_url,
+        username,
+        password,
+        sample,
+        duration=60,
+        ramp_up=5,
+        think_time=0.5,
+        timeout=30,
+        scenarios=None,
+        seed=None,
+    ):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.sample = sample
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_time = think_time
+        self.timeout = timeout
+        self.scenarios = scenarios or SCENARIOS
+        self.seed = seed
+
+    # ---------------------------- Сценарии ------------------------------------
+
+    def build_request(self, name, rng):
+        """Метод, путь и данные запроса сценария name"""
+        sample = self.sample
+        year = rng.choice(sample["years"])
+
+        if name == "home":
+            return "GET", "/", None
+        if name == "ajax_year_data":
+            return "GET", "/ajax/year-data/?" + urlencode({"year": year}), None
+        if name == "admin_reclamations":
+            query = (
+                {"q": rng.choice(sample["engine_numbers"])}
+                if rng.random() < 0.3
+                else {}
+            )
+            return "GET", "/admin/reclamations/reclamation/?" + urlencode(query), None
+        if name == "admin_investigations":
+            return "GET", "/admin/investigations/investigation/", None
+        if name == "admin_claims":
+            return "GET", "/admin/claims/claim/", None
+        if name == "search_related_data":
+            query = {"engine_number": rng.choice(sample["engine_numbers"])}
+            return "GET", "/admin/search-related-data/?" + urlencode(query), None
+        if name == "check_duplicates":
+            data = {
+                "engine_number": rng.choice(sample["engine_numbers"]),
+                "product_number": rng.choice(sample["product_numbers"]),
+                "current_reclamation_id": "",
+            }
+            return "POST", "/admin/ajax/check-reclamation-duplicates/", data
+        if name == "get_products":
+            query = {"product_type_id": rng.choice(sample["product_type_ids"])}
+            return "GET", "/admin/get_products/?" + urlencode(query), None
+        if name == "claims_dashboard":
+            data = {
+                "year": rng.choice(sample["claim_years"]),
+                "exchange_rate": "0.03",
+            }
+            return "POST", "/claims/dashboard/", data
+        raise ValueError(f"Неизвестный сценарий: {name}")
+
+    # ---------------------------- Прогон ------------------------------------
+
+    def _user(self, index, users, stop_at, records, errors, lock):
+        """Цикл одного виртуального пользователя"""
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        names = list(self.scenarios)
+        weights = list(self.scenarios.values())
+
+        # Равномерный ввод пользователей в течение ramp_up секунд
+        time.sleep(self.ramp_up * index / max(users, 1))
+
+        session = Session(self.base_url, self.timeout)
+        try:
+            session.login(self.username, self.password)
+        except (LoginError, URLError, OSError) as e:
+            with lock:
+                errors.append(str(e))
+            return
+
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights=weights)[0]
+            method, path, data = self.build_request(name, rng)
+
+            start = time.perf_counter()
+            try:
+                status, _ = session.request(method, path, data)
+                ok = status < 400
+            except (URLError, OSError):
+                ok = False  # таймаут или обрыв соединения
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with lock:
+                records.append((name, elapsed_ms, ok))
+
+            if self.think_time:
+                time.sleep(rng.uniform(0, self.think_time * 2))
+
+    def run(self, users):
+        """
+        Прогон с users одновременными пользователями
+        Returns: словарь users, duration, total и scenarios (сводки по сценариям), login_errors
+        """
+        records = []
+        errors = []
+        lock = threading.Lock()
+        start = time.monotonic()
+        stop_at = start + self.ramp_up + self.duration
+
+        threads = [
+            threading.Thread(
+                target=self._user,
+                args=(index, users, stop_at, records, errors, lock),
+                daemon=True,
+            )
+            for index in range(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.monotonic() - start
+        scenarios = {}
+        for name in self.scenarios:
+            items = [record for record in records if record[0] == name]
+            if items:
+                scenarios[name] = self.summarize(items, elapsed)
+
+        return {
+            "users": users,
+            "duration": round(elapsed, 1),
+            "total": self.summarize(records, elapsed),
+            "scenarios": scenarios,
+            "login_errors": errors,
+        }
+
+    @staticmethod
+    def summarize(records, elapsed):
+        """Сводка по замерам (название, время мс, успех)"""
+        latencies = sorted(record[1] for record in records)
+        failed = sum(1 for record in records if not record[2])
+        count = len(records)
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "error_rate": round(failed / count * 100, 2) if count else 0.0,
+        }
@@ -0,0 +1,701 @@
+# core\modules\otk_journal_import.py
+
+"""
+Массовый импорт истории из журнала учета ОТК (`{год}-2019_ЖУРНАЛ УЧЁТА.xlsm`)
+в модели Reclamation / Investigation / Claim.
+
+Журнал читается потоково (openpyxl в режиме read_only), каждый лист - отдельный год.
+Столбцы журнала сопоставляются с полями моделей по таблице `JOURNAL_COLUMNS`
+(та же нумерация, что и в `ind()` приложения "Поиск по базе ОТК":
+Аналитическая_система/app_sistem_home/db_search/db_search_modul.py).
+
+Строки сохраняются пакетами через bulk_create внутри транзакции (без save(),
+full_clean с запросами и сигналов на каждую строку). Справочники (период выявления,
+наименование и обозначение изделия) разрешаются по словарям в памяти.
+Строки с ошибками не прерывают импорт, а попадают в отчет `rejected`.
+
+Включает класс:
+- `OtkJournalImporter` - импорт листов журнала ОТК в базу данных
+"""
+
+import re
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection, transaction
+from openpyxl import load_workbook
+
+from claims.models import Claim
+from core.modules.report_scheduler import bump_data_generation
+from investigations.models import Investigation
+from reclamations.models import Reclamation
+from sourcebook.models import PeriodDefect, Product, ProductType
+
+# Номера столбцов журнала ОТК (нумерация с 1, как в ind() db_search_modul.py)
+JOURNAL_COLUMNS = {
+    "Месяц регистрации": 1,
+    "Входящий № по ОТК": 2,
+    "Дата поступления сообщения в ОТК": 3,
+    "Кто отправил сообщение": 4,
+    "Исходящий № отправителя": 5,
+    "Дата отправления сообщения": 6,
+    "Период выявления дефекта": 7,
+    "Обозначение изделия": 8,
+    "Наименование изделия": 9,
+    "Заводской номер изделия": 10,
+    "Дата изготовления изделия": 11,
+    "Организация - ПРИОБРЕТАТЕЛЬ изделия": 12,
+    "Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия": 13,
+    "Дата рекламационного акта ПРИОБРЕТАТЕЛЯ изделия": 14,
+    "Государство, где забраковано изделие": 15,
+    "КОНЕЧНЫЙ ПОТРЕБИТЕЛЬ составивший рекламационный акт": 16,
+    "Номер рекламационного акта КОНЕЧНОГО ПОТРЕБИТЕЛЯ": 17,
+    "Дата рекламационного акта КОНЕЧНОГО ПОТРЕБИТЕЛЯ": 18,
+    "Марка двигателя": 19,
+    "Номер двигателя": 20,
+    "Транспортное средство": 21,
+    "Номер транспортного средства (шасси)": 22,
+    "Дата выявления дефекта изделия": 23,
+    "Пробег, наработка": 24,
+    "Заявленный дефект изделия": 25,
+    "Требование потребителя": 26,
+    "Принятые меры по сообщению": 27,
+    "Исходящий № документа": 28,
+    "Дата исходящего документа": 29,
+    "Способ отправления письма по принятым мерам": 30,
+    "Ответ потребителя на сообщение": 31,
+    "Исходящий № ответа потребителя": 32,
+    "Дата ответа потребителя": 33,
+    "Дата поступления изделия": 34,
+    "Организация - ОТПРАВИТЕЛЬ изделия": 35,
+    "Номер накладной прихода изделия": 36,
+    "Дата накладной прихода изделия": 37,
+    "Количество предъявленных изделий": 38,
+    "Документы по рекламационному изделию": 39,
+    "Номер акта исследования": 40,
+    "Дата акта исследования": 41,
+    "Виновник дефекта - БЗА": 42,
+    "Виновное подразделение": 43,
+    "Месяц отражения в статистике БЗА": 44,
+    "Виновник дефекта - потребитель": 45,
+    "Изделие соответствует  ТУ": 46,
+    "Виновник не установлен": 47,
+    "Причины возникновения дефектов": 48,
+    "Пояснения к причинам возникновения дефектов": 49,
+    "Поставщик дефектного комплектующего": 50,
+    "Номер ПКД": 51,
+    "Отметка о выполнении ПКД": 52,
+    "Номер акта утилизации": 53,
+    "Дата акта утилизации": 54,
+    "Номер и месяц справки снятия с объёмов": 55,
+    "Получатель": 56,
+    "Дата отправки": 57,
+    "Номер накладной отгрузки изделия потребителю": 58,
+    "Дата накладной отгрузки изделия потребителю": 59,
+    "Состояние возвращаемого потребителю изделия": 60,
+    "Пояснения по состоянию возвращаемого изделия": 61,
+    "№ претензии": 62,
+    "Дата претензии": 63,
+    "Сумма по претензии": 64,
+    "№ ответа БЗА": 65,
+    "Дата ответа БЗА": 66,
+    "Результат рассмотрения претензии": 67,
+    "Сумма затрат БЗА": 68,
+}
+
+JOURNAL_WIDTH = max(JOURNAL_COLUMNS.values())  # 68 столбцов
+FIRST_DATA_ROW = 3  # строка 2 - заголовки, данные с 3 строки
+
+# Столбцы журнала → поля модели Reclamation: (столбец, поле, тип значения)
+RECLAMATION_FIELDS = [
+    ("Входящий № по ОТК", "incoming_number", "str"),
+    ("Дата поступления сообщения в ОТК", "message_received_date", "date"),
+    ("Кто отправил сообщение", "sender", "str"),
+    ("Исходящий № отправителя", "sender_outgoing_number", "str"),
+    ("Дата отправления сообщения", "message_sent_date", "date"),
+    ("Заводской номер изделия", "product_number", "str"),
+    ("Дата изготовления изделия", "manufacture_date", "month"),
+    ("Организация - ПРИОБРЕТАТЕЛЬ изделия", "purchaser", "str"),
+    ("Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия", "consumer_act_number", "str"),
+    ("Дата рекламационного акта ПРИОБРЕТАТЕЛЯ изделия", "consumer_act_date", "date"),
+    ("Государство, где забраковано изделие", "country_rejected", "str"),
+    ("КОНЕЧНЫЙ ПОТРЕБИТЕЛЬ составивший рекламационный акт", "end_consumer", "str"),
+    (
+        "Номер рекламационного акта КОНЕЧНОГО ПОТРЕБИТЕЛЯ",
+        "end_consumer_act_number",
+        "str",
+    ),
+    (
+        "Дата рекламационного акта КОНЕЧНОГО ПОТРЕБИТЕЛЯ",
+        "end_consumer_act_date",
+        "date",
+    ),
+    ("Марка двигателя", "engine_brand", "str"),
+    ("Номер двигателя", "engine_number", "str"),
+    ("Транспортное средство", "transport_name", "str"),
+    ("Номер транспортного средства (шасси)", "transport_number", "str"),
+    ("Дата выявления дефекта изделия", "defect_detection_date", "date"),
+    ("Пробег, наработка", "mileage_operating_time", "str"),
+    ("Заявленный дефект изделия", "claimed_defect", "str"),
+    ("Требование потребителя", "consumer_requirement", "str"),
+    ("Принятые меры по сообщению", "measures_taken", "str"),
+    ("Исходящий № документа", "outgoing_document_number", "str"),
+    ("Дата исходящего документа", "outgoing_document_date", "date"),
+    ("Способ отправления письма по принятым мерам", "letter_sending_method", "str"),
+    ("Ответ потребителя на сообщение", "consumer_response", "str"),
+    ("Исходящий № ответа потребителя", "consumer_response_number", "str"),
+    ("Дата ответа потребителя", "consumer_response_date", "date"),
+    ("Дата поступления изделия", "product_received_date", "date"),
+    ("Организация - ОТПРАВИТЕЛЬ изделия", "product_sender", "str"),
+    ("Номер накладной прихода изделия", "receipt_invoice_number", "str"),
+    ("Дата накладной прихода изделия", "receipt_invoice_date", "date"),
+    ("Количество предъявленных изделий", "products_count", "int"),
+    ("Документы по рекламационному изделию", "reclamation_documents", "str"),
+    ("Номер ПКД", "pkd_number", "str"),
+    ("Номер и месяц справки снятия с объёмов", "volume_removal_reference", "str"),
+]
+
+# Столбцы журнала → поля модели Investigation
+INVESTIGATION_FIELDS = [
+    ("Дата акта исследования", "act_date", "date"),
+    ("Виновное подразделение", "guilty_department", "str"),
+    ("Причины возникновения дефектов", "defect_causes", "str"),
+    ("Пояснения к причинам возникновения дефектов", "defect_causes_explanation", "str"),
+    ("Поставщик дефектного комплектующего", "defective_supplier", "str"),
+    ("Номер акта утилизации", "disposal_act_number", "str"),
+    ("Дата акта утилизации", "disposal_act_date", "date"),
+    ("Получатель", "recipient", "str"),
+    ("Дата отправки", "shipment_date", "date"),
+    (
+        "Номер накладной отгрузки изделия потребителю",
+        "shipment_invoice_number",
+        "str",
+    ),
+    ("Дата накладной отгрузки изделия потребителю", "shipment_invoice_date", "date"),
+    (
+        "Пояснения по состоянию возвращаемого изделия",
+        "return_condition_explanation",
+        "str",
+    ),
+]
+
+# Столбцы журнала → поля модели Claim
+CLAIM_FIELDS = [
+    ("№ претензии", "claim_number", "str"),
+    ("Дата претензии", "claim_date", "date"),
+    ("Сумма по претензии", "claim_amount_act", "money"),
+    ("№ ответа БЗА", "response_number", "str"),
+    ("Дата ответа БЗА", "response_date", "date"),
+    ("Сумма затрат БЗА", "costs_act", "money"),
+]
+
+# Отметки виновника ("+") → тип виновника (порядок - приоритет)
+FAULT_COLUMNS = [
+    ("Виновник дефекта - БЗА", Investigation.FaultType.BZA),
+    ("Виновник не установлен", Investigation.FaultType.UNKNOWN),
+    ("Виновник дефекта - потребитель", Investigation.FaultType.CONSUMER),
+    ("Изделие соответствует  ТУ", Investigation.FaultType.COMPLIANT),
+]
+
+# Признаются рекламации с виновником БЗА или с неустановленным виновником
+ACCEPTED_FAULTS = {Investigation.FaultType.BZA, Investigation.FaultType.UNKNOWN}
+
+# Значения-заглушки, которые в журнале означают пустую ячейку
+EMPTY_VALUES = {"", "-", "--", "н/д", "нет", "нет данных"}
+
+DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d")
+
+
+class RowError(Exception):
+    """Ошибка разбора строки журнала (строка попадает в отчет отклоненных)"""
+
+
+class OtkJournalImporter:
+    """Импорт листов журнала ОТК в базу данных пакетами bulk_create"""
+
+    def __init__(self, file_path, batch_size=500, create_refs=False, dry_run=False):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.create_refs = create_refs  # создавать отсутствующие записи справочников
+        self.dry_run = dry_run  # только разбор и проверка, без записи в БД
+
+        self.imported = 0  # сохранено рекламаций
+        self.investigations = 0  # сохранено актов исследования
+        self.claims = 0  # сохранено претензий
+        self.duplicates = 0  # пропущено строк, которые уже есть в базе
+        self.rejected = []  # [(лист, строка, причина)]
+
+        # Справочники в памяти: наименование → id
+        self.periods = dict(PeriodDefect.objects.values_list("name", "id"))
+        self.product_types = dict(ProductType.objects.values_list("name", "id"))
+        self.products = {
+            nomenclature: (product_id, product_type_id)
+            for product_id, nomenclature, product_type_id in Product.objects.values_list(
+                "id", "nomenclature", "product_type_id"
+            )
+        }
+
+        # Суммы по претензиям за год: (год, номер претензии) → [сумма, признано, [id]]
+        self.claim_totals = defaultdict(lambda: [Decimal("0.00"), Decimal("0.00"), []])
+
+    # ==================== ЧТЕНИЕ ЖУРНАЛА ====================
+
+    def get_year_sheets(self):
+        """Названия листов-годов журнала ("2019", "2020", ...)"""
+        workbook = load_workbook(self.file_path, read_only=True)
+        try:
+            return [
+                name for name in workbook.sheetnames if re.fullmatch(r"\d{4}", name)
+            ]
+        finally:
+            workbook.close()
+
+    def import_years(self, years=None):
+        """Импорт указанных листов-годов (по умолчанию - всех листов журнала)"""
+        years = [str(year) for year in years] if years else self.get_year_sheets()
+
+        workbook = load_workbook(
+            self.file_path, read_only=True, data_only=True, keep_links=False
+        )
+        try:
+            for year in years:
+                if year not in workbook.sheetnames:
+                    self.rejected.append((year, None, "Лист отсутствует в журнале"))
+                    continue
+                self._import_sheet(workbook[year], int(year))
+        finally:
+            workbook.close()
+
+        if not self.dry_run:
+            self._update_claim_totals()
+            self._clear_caches()
+
+    def _import_sheet(self, sheet, year):
+        """Потоковое чтение листа и сохранение пакетами"""
+        existing_keys = self._get_existing_keys(year)
+        batch = []
+
+        rows = sheet.iter_rows(
+            min_row=FIRST_DATA_ROW, max_col=JOURNAL_WIDTH, values_only=True
+        )
+        for row_number, values in enumerate(rows, start=FIRST_DATA_ROW):
+            if not any(value not in (None, "") for value in values):
+                continue  # пустая строка
+
+            values = tuple(values) + (None,) * (JOURNAL_WIDTH - len(values))
+
+            try:
+                parsed = self._parse_row(values, year)
+            except RowError as e:
+                self.rejected.append((year, row_number, str(e)))
+                continue
+
+            key = self._get_row_key(parsed["reclamation"])
+            if key in existing_keys:
+                self.duplicates += 1
+                continue
+            existing_keys.add(key)
+
+            parsed["row_number"] = row_number
+            batch.append(parsed)
+
+            if len(batch) >= self.batch_size:
+                self._save_batch(batch, year)
+                batch = []
+
+        if batch:
+            self._save_batch(batch, year)
+
+    # ==================== РАЗБОР СТРОКИ ====================
+
+    @staticmethod
+    def _cell(values, column):
+        """Значение ячейки по названию столбца журнала"""
+        return values[JOURNAL_COLUMNS[column] - 1]
+
+    def _convert(self, value, value_type, column):
+        """Приведение значения ячейки к типу поля модели"""
+        if isinstance(value, str):
+            value = value.strip()
+            if value.lower() in EMPTY_VALUES:
+                return None
+        if value is None:
+            return None
+
+        if value_type == "str":
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)  # номера, прочитанные Excel как число
+            if isinstance(value, datetime):
+                value = value.strftime("%d.%m.%Y")
+            return str(value)
+
+        if value_type == "date":
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, date):
+                return value
+            for date_format in DATE_FORMATS:
+                try:
+                    return datetime.strptime(str(value), date_format).date()
+                except ValueError:
+                    continue
+            raise RowError(f"{column}: неверная дата '{value}'")
+
+        if value_type == "month":  # дата изготовления в формате ММ.ГГ
+            if isinstance(value, (datetime, date)):
+                return value.strftime("%m.%y")
+            return str(value)
+
+        if value_type == "int":
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise RowError(f"{column}: ожидается число, получено '{value}'")
+
+        if value_type == "money":
+            try:
+                return Decimal(str(value).replace(" ", "").replace(",", ".")).quantize(
+                    Decimal("0.01")
+                )
+            except InvalidOperation:
+                raise RowError(f"{column}: неверная сумма '{value}'")
+
+        return value
+
+    def _get_fields(self, values, mapping):
+        """Словарь полей модели по таблице сопоставления столбцов"""
+        fields = {}
+        for column, field, value_type in mapping:
+            value = self._convert(self._cell(values, column), value_type, column)
+            if value is not None:
+                fields[field] = value
+        return fields
+
+    def _resolve_refs(self, values):
+        """ID справочников (период выявления, наименование и обозначение изделия)"""
+        period_name = self._convert(
+            self._cell(values, "Период выявления дефекта"), "str", ""
+        )
+        nomenclature = self._convert(
+            self._cell(values, "Обозначение изделия"), "str", ""
+        )
+        type_name = self._convert(self._cell(values, "Наименование изделия"), "str", "")
+
+        if not period_name:
+            raise RowError("Не указан период выявления дефекта")
+        if not nomenclature:
+            raise RowError("Не указано обозначение изделия")
+
+        period_id = self.periods.get(period_name)
+        if period_id is None:
+            if not self.create_refs:
+                raise RowError(f"Период выявления '{period_name}' нет в справочнике")
+            period_id = self._create_ref(PeriodDefect, self.periods, name=period_name)
+
+        product_type_id = self.product_types.get(type_name) if type_name else None
+        product_id, product_product_type_id = self.products.get(
+            nomenclature, (None, None)
+        )
+
+        if product_id is None:
+            # Новое изделие можно создать только с известным наименованием
+            if not self.create_refs or not type_name:
+                raise RowError(f"Изделия '{nomenclature}' нет в справочнике")
+            if product_type_id is None:
+                product_type_id = self._create_ref(
+                    ProductType, self.product_types, name=type_name
+                )
+            product_id = self._create_product(nomenclature, product_type_id)
+        elif product_type_id is None:
+            # Наименование берется из справочника изделий
+            product_type_id = product_product_type_id
+
+        return period_id, product_type_id, product_id
+
+    def _create_ref(self, model, cache, name):
+        """Создание записи справочника (только с флагом create_refs)"""
+        if self.dry_run:
+            cache[name] = 0  # в режиме проверки записи не создаются
+        else:
+            cache[name] = model.objects.create(name=name).id
+        return cache[name]
+
+    def _create_product(self, nomenclature, product_type_id):
+        """Создание обозначения изделия (только с флагом create_refs)"""
+        if self.dry_run:
+            product_id = 0
+        else:
+            product_id = Product.objects.create(
+                nomenclature=nomenclature, product_type_id=product_type_id
+            ).id
+        self.products[nomenclature] = (product_id, product_type_id)
+        return product_id
+
+    def _parse_row(self, values, year):
+        """Разбор строки журнала в несохраненные объекты моделей"""
+        period_id, product_type_id, product_id = self._resolve_refs(values)
+
+        fields = self._get_fields(values, RECLAMATION_FIELDS)
+        if "message_received_date" not in fields:
+            raise RowError("Не указана дата поступления сообщения")
+
+        reclamation = Reclamation(
+            defect_period_id=period_id,
+            product_name_id=product_type_id,
+            product_id=product_id,
+            **fields,
+        )
+        if reclamation.engine_number:
+            reclamation.engine_number = reclamation.normalize_engine_number(
+                reclamation.engine_number
+            )
+
+        investigation = self._parse_investigation(values, year)
+        claim = self._parse_claim(values, year, reclamation)
+
+        # Проверка полей без запросов к БД (справочники уже разрешены по словарям)
+        try:
+            reclamation.clean_fields(
+                exclude=[
+                    "defect_period",
+                    "product_name",
+                    "product",
+                    "year",
+                    "yearly_number",
+                ]
+            )
+            reclamation.clean()
+            if investigation:
+                investigation.clean_fields(exclude=["reclamation"])
+                investigation.clean()
+            if claim:
+                claim.clean_fields()
+        except ValidationError as e:
+            raise RowError("; ".join(e.messages))
+
+        # Статус рекламации - как при регистрации через админку
+        if investigation:
+            reclamation.status = Reclamation.Status.CLOSED
+        elif reclamation.receipt_invoice_number:
+            reclamation.status = Reclamation.Status.IN_PROGRESS
+
+        return {
+            "reclamation": reclamation,
+            "investigation": investigation,
+            "claim": claim,
+        }
+
+    def _parse_investigation(self, values, year):
+        """Акт исследования (если в строке заполнен номер акта)"""
+        act_number = self._convert(
+            self._cell(values, "Номер акта исследования"), "str", ""
+        )
+        if not act_number:
+            return None
+
+        # В журнале номер акта хранится без года: "1067" → "2025 № 1067"
+        if not re.match(r"\d{4}\s*(?:№|ММЗ)", act_number) and act_number not in (
+            "без исследования",
+            "не требуется",
+        ):
+            act_number = f"{year} № {act_number.lstrip('№ ')}"
+
+        fields = self._get_fields(values, INVESTIGATION_FIELDS)
+        if "act_date" not in fields:
+            raise RowError(f"Для акта исследования {act_number} не указана дата")
+
+        # Виновник по отметкам "+" в столбцах журнала
+        fault_type = Investigation.FaultType.UNKNOWN
+        for column, fault in FAULT_COLUMNS:
+            if str(self._cell(values, column) or "").strip() == "+":
+                fault_type = fault
+                break
+
+        return_condition = self._convert(
+            self._cell(values, "Состояние возвращаемого потребителю изделия"), "str", ""
+        )
+        if return_condition:
+            labels = {
+                label.lower(): value
+                for value, label in Investigation.ReturnCondition.choices
+            }
+            return_condition = labels.get(return_condition.lower())
+
+        return Investigation(
+            act_number=act_number,
+            act_number_sort=Investigation.get_act_number_sort(act_number),
+            fault_type=fault_type,
+            solution=(
+                Investigation.Solution.ACCEPT
+                if fault_type in ACCEPTED_FAULTS
+                else Investigation.Solution.DEFLECT
+            ),
+            return_condition=return_condition,
+            **fields,
+        )
+
+    def _parse_claim(self, values, year, reclamation):
+        """Претензия по акту рекламации (если в строке заполнен номер претензии)"""
+        fields = self._get_fields(values, CLAIM_FIELDS)
+        if "claim_number" not in fields:
+            return None
+        if "claim_date" not in fields:
+            raise RowError(f"Для претензии {fields['claim_number']} не указана дата")
+
+        result = self._convert(
+            self._cell(values, "Результат рассмотрения претензии"), "str", ""
+        )
+
+        # Сумма по претензии целиком (claim_amount_all) пересчитывается после импорта
+        claim_amount_act = fields.pop("claim_amount_act", Decimal("0.00"))
+
+        return Claim(
+            year=fields["claim_date"].year,
+            consumer_name=Claim.extract_consumer_prefix(
+                self._convert(self._cell(values, "Период выявления дефекта"), "str", "")
+            ),
+            claim_amount_all=claim_amount_act,
+            claim_amount_act=claim_amount_act,
+            result_claim=(
+                Claim.Result.REJECTED
+                if result and result.lower().startswith("отклон")
+                else Claim.Result.ACCEPTED
+            ),
+            reclamation_act_number=(
+                reclamation.consumer_act_number or reclamation.end_consumer_act_number
+            ),
+            reclamation_act_date=(
+                reclamation.consumer_act_date or reclamation.end_consumer_act_date
+            ),
+            engine_number=reclamation.engine_number,
+            message_received_date=reclamation.message_received_date,
+            receipt_invoice_number=reclamation.receipt_invoice_number,
+            **fields,
+        )
+
+    # ==================== ДУБЛИКАТЫ ====================
+
+    @staticmethod
+    def _get_row_key(reclamation):
+        """Ключ записи для поиска уже импортированных строк"""
+        return (
+            reclamation.message_received_date,
+            reclamation.product_id,
+            reclamation.product_number,
+            reclamation.consumer_act_number,
+            reclamation.end_consumer_act_number,
+        )
+
+    def _get_existing_keys(self, year):
+        """Ключи рекламаций года, которые уже есть в базе (одним запросом)"""
+        return set(
+            Reclamation.objects.filter(year=year).values_list(
+                "message_received_date",
+                "product_id",
+                "product_number",
+                "consumer_act_number",
+                "end_consumer_act_number",
+            )
+        )
+
+    # ==================== СОХРАНЕНИЕ ====================
+
+    def _save_batch(self, batch, year):
+        """Сохранение пакета строк одной транзакцией"""
+        if self.dry_run:
+            self.imported += len(batch)
+            return
+
+        try:
+            with transaction.atomic():
+                self._bulk_create(batch, year)
+        except DatabaseError as e:
+            # Пакет откатывается целиком (вместе с выделенными номерами рекламаций)
+            for parsed in batch:
+                self.rejected.append(
+                    (year, parsed["row_number"], f"Ошибка записи пакета: {e}")
+                )
+            return
+
+        self.imported += len(batch)
+
+    def _bulk_create(self, batch, year):
+        """bulk_create рекламаций, актов исследования, претензий и связей M2M"""
+        reclamations = [parsed["reclamation"] for parsed in batch]
+
+        # Номера в году - одним блоком из счетчика года
+        Reclamation.assign_yearly_numbers(reclamations, year=year)
+        Reclamation.objects.bulk_create(reclamations)
+
+        # MySQL не возвращает id из bulk_create - получаем их по номеру в году
+        if reclamations[0].pk is None:
+            ids = dict(
+                Reclamation.objects.filter(
+                    year=year,
+                    yearly_number__gte=reclamations[0].yearly_number,
+                    yearly_number__lte=reclamations[-1].yearly_number,
+                ).values_list("yearly_number", "id")
+            )
+            for reclamation in reclamations:
+                reclamation.pk = ids[reclamation.yearly_number]
+
+        investigations = []
+        for parsed in batch:
+            if parsed["investigation"]:
+                parsed["investigation"].reclamation = parsed["reclamation"]
+                investigations.append(parsed["investigation"])
+        Investigation.objects.bulk_create(investigations)
+
+        claims = [parsed["claim"] for parsed in batch if parsed["claim"]]
+        if claims:
+            if connection.features.can_return_rows_from_bulk_insert:
+                Claim.objects.bulk_create(claims)
+            else:
+                # Без возврата id из bulk_create претензии сохраняются по одной
+                # (их немного по сравнению с рекламациями)
+                for claim in claims:
+                    claim.save()
+
+            Through = Claim.reclamations.through
+            Through.objects.bulk_create(
+                [
+                    Through(
+                        claim_id=parsed["claim"].pk,
+                        reclamation_id=parsed["reclamation"].pk,
+                    )
+                    for parsed in batch
+                    if parsed["claim"]
+                ]
+            )
+
+            for claim in claims:
+                totals = self.claim_totals[(claim.year, claim.claim_number)]
+                totals[0] += claim.claim_amount_act
+                totals[1] += claim.costs_act or Decimal("0.00")
+                totals[2].append(claim.pk)
+
+        self.investigations += len(investigations)
+        self.claims += len(claims)
+
+    def _update_claim_totals(self):
+        """Суммы по претензии целиком (claim_amount_all, costs_all) по всем ее актам"""
+        claims = []
+        for amount_all, costs_all, claim_ids in self.claim_totals.values():
+            for claim_id in claim_ids:
+                claims.append(
+                    Claim(id=claim_id, claim_amount_all=amount_all, costs_all=costs_all)
+                )
+
+        Claim.objects.bulk_update(
+            claims, ["claim_amount_all", "costs_all"], batch_size=self.batch_size
+        )
+
+    @staticmethod
+    def _clear_caches():
+        """bulk_create не отправляет сигналы - сбрасываем кэши аналитики вручную"""
+        from claims.modules.time_analysis_processor import TimeAnalysisProcessor
+
+        TimeAnalysisProcessor.clear_cache()
+        bump_data_generation()  # готовые отчеты устарели
@@ -0,0 +1,197 @@
+# core\modules\report_jobs.py
+
+"""
+Задания ночной подготовки стандартных отчетов (реестр - core.modules.report_scheduler).
+
+Для каждого отчета - функция параметров (используется и заданием, и представлением,
+чтобы ключи кэша совпадали) и функция расчета через процессор отчета.
+Ночью считаются отчеты с параметрами, которые открывают по утрам:
+- Dashboard претензий за текущий год с курсом по умолчанию;
+- справка по виновникам за прошлый месяц с номером акта по умолчанию из формы;
+- длительность исследований и % признанных за текущий год по всем потребителям;
+- данные справки за период (новые записи с последней справки). Сама справка
+  (файлы и номер) формируется только по кнопке - ночью готовится только выборка.
+
+Перед расчетом отчетов выполняется задание `analytics_db` - обновление снимка
+БД аналитики (если ANALYTICS_DB["REFRESH"] = True, см. core.db_router).
+"""
+
+import io
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.core.management import call_command
+
+from core.db_router import get_analytics_alias, get_config as get_analytics_config
+from core.modules.report_scheduler import NothingToBuild, PrebuildError, register
+
+DEFAULT_EXCHANGE_RATE = "0.03"  # курс RUR→BYN по умолчанию (как в форме Dashboard)
+
+
+def _check_result(result, error_key="message"):
+    """Неуспешный результат процессора: нет данных или ошибка (в кэш не сохраняется)"""
+    if result["success"]:
+        return
+    message = result.get(error_key) or "Ошибка при формировании отчета"
+    if result.get("message_type") == "info":
+        raise NothingToBuild(message)
+    raise PrebuildError(message)
+
+
+# ---------------------------- БД аналитики ------------------------------------
+
+
+@register("analytics_db", "Обновление БД аналитики", cached=False)
+def refresh_analytics_db():
+    if get_analytics_alias() and get_analytics_config()["REFRESH"]:
+        call_command("refresh_analytics_db", stdout=io.StringIO())
+
+
+# ---------------------------- Dashboard претензий ------------------------------------
+
+
+def claims_dashboard_params(year, exchange_rate):
+    return {
+        "year": int(year),
+        "exchange_rate": str(Decimal(str(exchange_rate)).normalize()),
+    }
+
+
+@register(
+    "claims_dashboard",
+    "Dashboard претензий",
+    depends=["analytics_db"],
+    params=lambda: [claims_dashboard_params(date.today().year, DEFAULT_EXCHANGE_RATE)],
+)
+def build_claims_dashboard(year, exchange_rate):
+    from claims.modules.dashboard_processor import DashboardProcessor
+
+    processor = DashboardProcessor(year=year, exchange_rate=Decimal(exchange_rate))
+    result = processor.generate_dashboard()
+    _check_result(result, error_key="error")
+    if result["summary_cards"]["total_claims"] == 0:
+        raise NothingToBuild(f"Нет претензий за {year} год")
+
+    # Файлы для кнопки "Сохранить" (график PNG и таблица TXT)
+    files = processor.save_to_files(result)
+    if not files["success"]:
+        raise PrebuildError(files["error"])
+    return result, {
+        "chart_path": files["chart_path"],
+        "table_path": files["table_path"],
+    }
+
+
+# ---------------------------- Справка по виновникам ------------------------------------
+
+
+def culprits_defect_params(user_number):
+    # Отчетный месяц - прошлый (как в CulpritsDefectProcessor)
+    report_month = date.today() - relativedelta(months=1)
+    return {"user_number": int(user_number), "month": report_month.strftime("%Y-%m")}
+
+
+def _culprits_defect_nightly_params():
+    from reports.modules.culprits_defect_module import CulpritsDefectProcessor
+
+    # Номер акта по умолчанию в форме - последний акт прошлой справки
+    max_act_number = CulpritsDefectProcessor().max_act_number
+    return [culprits_defect_params(max_act_number)] if max_act_number else []
+
+
+@register(
+    "culprits_defect",
+    "Справка по виновникам дефектов",
+    depends=["analytics_db"],
+    params=_culprits_defect_nightly_params,
+)
+def build_culprits_defect(user_number, month):
+    from reports.modules.culprits_defect_module import CulpritsDefectProcessor
+
+    # Номера актов в JSON не записываются - их запишет представление при выдаче справки
+    processor = CulpritsDefectProcessor(user_number=user_number, save_act_numbers=False)
+    result = processor.generate_analysis()
+    if not result["success"]:
+        # Процессор возвращает все неудачи как warning: ошибку отличаем по тексту
+        if str(result["message"]).startswith("Ошибка"):
+            raise PrebuildError(result["message"])
+        raise NothingToBuild(result["message"])  # нет новых актов / справка уже была
+    return result, {}
+
+
+# ---------------------------- Длительность исследований ------------------------------------
+
+
+def length_study_params(year, consumers):
+    return {"year": int(year), "consumers": sorted(consumers)}
+
+
+@register(
+    "length_study",
+    "Длительность исследований",
+    depends=["analytics_db"],
+    params=lambda: [length_study_params(date.today().year, [])],
+)
+def build_length_study(year, consumers):
+    from reports.modules.length_study_module import LengthStudyProcessor
+
+    result = LengthStudyProcessor(year=year, consumers=consumers).generate_report()
+    _check_result(result)
+    return result, {"txt_path": result["txt_path"], "png_path": result["png_path"]}
+
+
+# ---------------------------- % признанных рекламаций ------------------------------------
+
+
+def accept_defect_params(year, months):
+    return {"year": int(year), "months": sorted(months)}
+
+
+@register(
+    "accept_defect",
+    "% признанных рекламаций",
+    depends=["analytics_db"],
+    params=lambda: [accept_defect_params(date.today().year, [])],
+)
+def build_accept_defect(year, months):
+    from reports.modules.accept_defect_module import AcceptDefectProcessor
+
+    result = AcceptDefectProcessor(year=year, months=months).generate_report()
+    if not result["success"] and result.get("message_type") == "info":
+        raise NothingToBuild(f"Нет данных за {year} год")
+    _check_result(result)
+    return result, {"txt_path": result["txt_path"]}
+
+
+# ---------------------------- Справка за период ------------------------------------
+
+
+def enquiry_period_params(last_processed_id):
+    return {"year": date.today().year, "last_processed_id": int(last_processed_id)}
+
+
+def _enquiry_period_nightly_params():
+    from reports.models import EnquiryPeriod
+
+    last_metadata = EnquiryPeriod.objects.order_by("-sequence_number").first()
+    return [
+        enquiry_period_params(last_metadata.last_processed_id if last_metadata else 0)
+    ]
+
+
+@register(
+    "enquiry_period",
+    "Справка за период (выборка)",
+    depends=["analytics_db"],
+    params=_enquiry_period_nightly_params,
+)
+def build_enquiry_period(year, last_processed_id):
+    from reports.modules.enquiry_period_module import DataProcessor
+
+    processor = DataProcessor()
+    if processor.last_processed_id != last_processed_id:
+        raise PrebuildError("Справка за период сформирована во время подготовки")
+    if processor.get_result() is None:
+        raise NothingToBuild("Нет новых записей для справки за период")
+    return processor.to_prebuilt(), {}
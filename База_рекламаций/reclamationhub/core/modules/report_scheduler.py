@@ -0,0 +1,345 @@
+# core\modules\report_scheduler.py
+
+"""
+Ночная подготовка стандартных отчетов и кэш готовых результатов.
+
+Задания (Dashboard претензий, справки по виновникам, длительности исследований,
+% признанных и за период) регистрируются в реестре декоратором `register`
+(см. `core.modules.report_jobs`) и выполняются командой `prebuild_reports`
+(cron / Планировщик заданий Windows) в порядке зависимостей.
+
+Результат задания - данные для страницы и файлы (PNG, TXT, Excel) - сохраняется
+в кэше Django с алиасом "prebuilt_reports" (FileBasedCache, общий для всех
+процессов сервера) по ключу "задание + параметры". Вместе с результатом хранится
+версия данных (число строк, последние id и дата изменения рекламаций, счетчик
+изменений из сигналов моделей). Представление получает готовый результат через
+`get_prebuilt`, только если параметры совпали и данные с ночи не менялись -
+иначе отчет считается как обычно.
+
+Включает:
+- `register`, `resolve_order` - реестр заданий и порядок выполнения с учетом зависимостей
+- `run_jobs` - выполнение заданий и сохранение результатов в кэш
+- `get_prebuilt`, `restore_prebuilt_artifacts` - готовый результат для представления
+- `bump_data_generation` - отметка изменения данных (вызывается сигналами моделей,
+  а групповыми операциями update() / bulk_create, которые сигналы не отправляют, - явно)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+
+from core.db_router import analytics_db
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "prebuilt_reports"
+GENERATION_KEY = "data_generation"
+LOCK_KEY = "prebuild_lock"
+LOCK_TIMEOUT = 4 * 60 * 60  # сек, защита от повторного запуска при зависшем прогоне
+
+JOBS = {}  # {название: Job}
+
+
+class PrebuildError(Exception):
+    """Ошибка расчета отчета (результат не сохраняется в кэш)"""
+
+
+class NothingToBuild(Exception):
+    """Нет данных для отчета - сохранять нечего, это не ошибка"""
+
+
+class Job:
+    """
+    Задание подготовки отчета
+    build: функция (**параметры) -> (данные для страницы, {имя файла: путь})
+    params: функция без аргументов -> список словарей параметров для ночного расчета
+    cached: False - задание только выполняет действие (например, обновление БД аналитики)
+    """
+
+    def __init__(self, name, build, title, depends=(), params=None, cached=True):
+        self.name = name
+        self.build = build
+        self.title = title
+        self.depends = tuple(depends)
+        self.params = params or (lambda: [{}])
+        self.cached = cached
+
+
+def register(name, title, depends=(), params=None, cached=True):
+    """Декоратор функции расчета: регистрация задания в реестре"""
+
+    def decorator(build):
+        JOBS[name] = Job(name, build, title, depends, params, cached)
+        return build
+
+    return decorator
+
+
+def load_jobs():
+    """Реестр заданий (задания регистрируются при импорте модуля report_jobs)"""
+    import core.modules.report_jobs  # noqa: F401
+
+    return JOBS
+
+
+def resolve_order(names):
+    """
+    Задания names и их зависимости в порядке выполнения (зависимости - раньше)
+    Raises: ValueError - неизвестное задание или циклическая зависимость
+    """
+    order = []
+    state = {}  # название: "в обработке" / "готово"
+
+    def visit(name, chain):
+        if state.get(name) == "готово":
+            return
+        if state.get(name) == "в обработке":
+            raise ValueError(
+                f"Циклическая зависимость заданий: {' -> '.join(chain + [name])}"
+            )
+        if name not in JOBS:
+            raise ValueError(f"Неизвестное задание: {name}")
+        state[name] = "в обработке"
+        for dependency in JOBS[name].depends:
+            visit(dependency, chain + [name])
+        state[name] = "готово"
+        order.append(JOBS[name])
+
+    for name in names:
+        visit(name, [])
+    return order
+
+
+# ---------------------------- Кэш результатов ------------------------------------
+
+
+def get_cache():
+    """Кэш готовых отчетов или None, если он не настроен в CACHES"""
+    if CACHE_ALIAS not in settings.CACHES:
+        return None
+    return caches[CACHE_ALIAS]
+
+
+def cache_key(job_name, params):
+    """Ключ кэша: задание + хэш параметров (порядок ключей не важен)"""
+    data = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{job_name}:{hashlib.sha1(data.encode('utf-8')).hexdigest()}"
+
+
+def bump_data_generation():
+    """Отметка изменения данных: готовые результаты перестают совпадать по версии"""
+    cache = get_cache()
+    if cache is None:
+        return
+    try:
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:  # ключа еще нет
+            cache.set(GENERATION_KEY, 1, timeout=None)
+    except OSError:
+        # кэш отчетов не должен мешать сохранению данных
+        logger.exception("Не удалось отметить изменение данных в кэше отчетов")
+
+
+def data_version():
+    """Версия данных: число строк и последние id моделей, дата изменения, счетчик изменений"""
+    from claims.models import Claim
+    from investigations.models import Investigation
+    from reclamations.models import Reclamation
+
+    cache = get_cache()
+    version = [cache.get(GENERATION_KEY, 0) if cache is not None else 0]
+    with analytics_db():
+        version.append(
+            Reclamation.objects.aggregate(
+                rows=Count("pk"), last_id=Max("pk"), updated_at=Max("updated_at")
+            )
+        )
+        for model in (Investigation, Claim, Claim.reclamations.through):
+            version.append(model.objects.aggregate(rows=Count("pk"), last_id=Max("pk")))
+    return repr(version)
+
+
+def _get_entry(job_name, params):
+    """Актуальная запись кэша (параметры совпали, данные не менялись) или None"""
+    cache = get_cache()
+    if cache is None:
+        return None
+    try:
+        entry = cache.get(cache_key(job_name, params))
+    except OSError:
+        logger.exception("Не удалось прочитать кэш отчета %s", job_name)
+        return None
+    if entry is None or entry["data_version"] != data_version():
+        return None
+    return entry
+
+
+def get_prebuilt(job_name, params, restore=False):
+    """
+    Готовые данные отчета, если параметры совпали и данные не менялись
+    restore: восстановить файлы отчета (TXT, PNG, Excel) по исходным путям
+    Returns: данные для страницы или None
+    """
+    entry = _get_entry(job_name, params)
+    if entry is None:
+        return None
+    if restore and _write_artifacts(entry) is None:
+        return None
+    return entry["payload"]
+
+
+def restore_prebuilt_artifacts(job_name, params):
+    """
+    Восстановление файлов готового отчета по исходным путям
+    Returns: {имя файла: путь} или None (нет актуального результата или файлы не записаны)
+    """
+    entry = _get_entry(job_name, params)
+    if entry is None or not entry["artifacts"]:
+        return None
+    return _write_artifacts(entry)
+
+
+def _write_artifacts(entry):
+    paths = {}
+    try:
+        for name, (path, content) in entry["artifacts"].items():
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+            paths[name] = path
+    except OSError:
+        logger.exception("Не удалось восстановить файлы отчета %s", entry["job"])
+        return None
+    return paths
+
+
+def _read_artifacts(artifacts):
+    result = {}
+    for name, path in (artifacts or {}).items():
+        if path and os.path.isfile(path):
+            with open(path, "rb") as f:
+                result[name] = (path, f.read())
+    return result
+
+
+# ---------------------------- Выполнение заданий ------------------------------------
+
+
+def run_jobs(names=None, force=False, progress=None):
+    """
+    Выполнение заданий names (по умолчанию - всех) с зависимостями
+    force: пересчитать, даже если в кэше есть актуальный результат
+    progress: функция (результат задания) для вывода хода выполнения
+    Returns: список словарей job, title, params, status, seconds, error
+    Raises: RuntimeError - кэш не настроен или уже идет другой прогон
+    """
+    cache = get_cache()
+    if cache is None:
+        raise RuntimeError(f"В settings.CACHES не настроен кэш '{CACHE_ALIAS}'")
+
+    jobs = load_jobs()
+    order = resolve_order(names or list(jobs))
+
+    if not cache.add(LOCK_KEY, os.getpid(), timeout=LOCK_TIMEOUT):
+        raise RuntimeError("Подготовка отчетов уже выполняется другим процессом")
+
+    results = []
+    failed = set()
+    try:
+        for job in order:
+            if failed.intersection(job.depends):
+                failed.add(job.name)
+                result = _result(job, {}, "пропущено", 0, "ошибка в зависимостях")
+                results.append(result)
+                if progress:
+                    progress(result)
+                continue
+
+            try:
+                params_list = job.params()
+            except Exception as e:
+                params_list = []
+                failed.add(job.name)
+                result = _result(job, {}, "ошибка", 0, str(e))
+                results.append(result)
+                if progress:
+                    progress(result)
+
+            for params in params_list:
+                result = _run_job(cache, job, params, force)
+                if result["status"] == "ошибка":
+                    failed.add(job.name)
+                results.append(result)
+                if progress:
+                    progress(result)
+    finally:
+        cache.delete(LOCK_KEY)
+    return results
+
+
+def _result(job, params, status, seconds, error=""):
+    return {
+        "job": job.name,
+        "title": job.title,
+        "params": params,
+        "status": status,
+        "seconds": round(seconds, 1),
+        "error": error,
+    }
+
+
+def _run_job(cache, job, params, force):
+    """Расчет одного набора параметров задания"""
+    start = time.perf_counter()
+    key = cache_key(job.name, params)
+
+    try:
+        if not job.cached:
+            job.build(**params)
+            return _result(job, params, "выполнено", time.perf_counter() - start)
+
+        # Версия - до расчета: изменения во время расчета сделают результат неактуальным
+        version = data_version()
+        entry = cache.get(key)
+        if not force and entry is not None and entry["data_version"] == version:
+            return _result(job, params, "актуально", time.perf_counter() - start)
+
+        with analytics_db():
+            payload, artifacts = job.build(**params)
+
+        cache.set(
+            key,
+            {
+                "job": job.name,
+                "params": params,
+                "built_at": datetime.now(),
+                "data_version": version,
+                "payload": payload,
+                "artifacts": _read_artifacts(artifacts),
+            },
+        )
+        return _result(job, params, "готово", time.perf_counter() - start)
+
+    except NothingToBuild as e:
+        return _result(job, params, "нет данных", time.perf_counter() - start, str(e))
+
+    except Exception as e:
+        logger.exception("Ошибка подготовки отчета %s %s", job.name, params)
+        return _result(job, params, "ошибка", time.perf_counter() - start, str(e))
+
+
+def clear():
+    """Удаление всех готовых результатов"""
+    cache = get_cache()
+    if cache is not None:
+        cache.clear()
@@ -0,0 +1,153 @@
+# core\modules\request_profiler.py
+
+"""
+Замеры обработки запросов для RequestProfilerMiddleware (безопасно для рабочего режима).
+
+Для каждого запроса фиксируются время обработки, число SQL-запросов и время SQL
+(через `connection.execute_wrapper`, без DEBUG и без сохранения текста запросов).
+Последние замеры хранятся в кольцевом буфере в памяти процесса, в таблицу
+`core.RequestProfile` записывается выборка запросов (доля SAMPLE_RATE) и все
+запросы медленнее SLOW_MS.
+
+Настройки (settings.REQUEST_PROFILER, все ключи необязательны):
+    ENABLED       - включить замеры (по умолчанию True)
+    SAMPLE_RATE   - доля запросов, сохраняемых в БД (по умолчанию 0.05)
+    SLOW_MS       - запросы дольше этого времени сохраняются всегда (по умолчанию 1000)
+    RING_SIZE     - размер кольцевого буфера (по умолчанию 500)
+    EXCLUDE_PATHS - префиксы URL без замеров (статика, медиа, панель отладки)
+
+Включает:
+- `QueryStats` - счетчик SQL-запросов для execute_wrapper
+- `profile_request` - отчет профилировщика (pyinstrument или cProfile) для ?profile=1
+- `recent_requests`, `slowest_endpoints` - данные кольцевого буфера для админ-панели
+"""
+
+import cProfile
+import html
+import io
+import pstats
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0.05,
+    "SLOW_MS": 1000,
+    "RING_SIZE": 500,
+    "EXCLUDE_PATHS": ("/static/", "/media/", "/__debug__/", "/favicon.ico"),
+}
+
+_ring = None
+_ring_lock = threading.Lock()
+
+
+def get_config():
+    """Настройки профилирования с учетом значений по умолчанию"""
+    return {**DEFAULTS, **getattr(settings, "REQUEST_PROFILER", {})}
+
+
+class QueryStats:
+    """Счетчик числа и времени SQL-запросов (обертка для connection.execute_wrapper)"""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0  # секунды
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time += time.perf_counter() - start
+
+
+def _get_ring():
+    global _ring
+    if _ring is None:
+        _ring = deque(maxlen=get_config()["RING_SIZE"])
+    return _ring
+
+
+def record(entry):
+    """Добавление замера в кольцевой буфер"""
+    with _ring_lock:
+        _get_ring().append(entry)
+
+
+def recent_requests():
+    """Копия кольцевого буфера (последние замеры процесса)"""
+    with _ring_lock:
+        return list(_get_ring())
+
+
+def should_store(duration_ms, config):
+    """Сохранять ли замер в БД: медленный запрос или попадание в выборку"""
+    return duration_ms >= config["SLOW_MS"] or random.random() < config["SAMPLE_RATE"]
+
+
+def slowest_endpoints(entries, limit=20):
+    """
+    Сводка замеров по представлениям, отсортированная по среднему времени
+    Returns: список словарей view_name, count, avg_ms, max_ms, avg_sql_count, avg_sql_ms
+    """
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry["view_name"], []).append(entry)
+
+    summary = []
+    for view_name, items in groups.items():
+        count = len(items)
+        summary.append(
+            {
+                "view_name": view_name,
+                "count": count,
+                "avg_ms": sum(item["duration_ms"] for item in items) / count,
+                "max_ms": max(item["duration_ms"] for item in items),
+                "avg_sql_count": sum(item["sql_count"] for item in items) / count,
+                "avg_sql_ms": sum(item["sql_time_ms"] for item in items) / count,
+            }
+        )
+    summary.sort(key=lambda item: item["avg_ms"], reverse=True)
+    return summary[:limit]
+
+
+def profile_request(get_response, request):
+    """
+    Обработка запроса под профилировщиком
+    Returns: (ответ представления, HTML-отчет профилировщика)
+    """
+    try:
+        from pyinstrument import Profiler  # необязательная зависимость
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.stop()
+        return response, profiler.output_html()
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        response = get_response(request)
+    finally:
+        profiler.disable()
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(60)
+    report = html.escape(stream.getvalue())
+    return response, (
+        "<html><head><meta charset='utf-8'><title>cProfile</title></head>"
+        f"<body><h3>{request.method} {html.escape(request.path)}</h3>"
+        f"<pre>{report}</pre></body></html>"
+    )
@@ -0,0 +1,187 @@
+# core\modules\stage_metrics.py
+
+"""
+Замеры этапов работы процессоров (отчеты, аналитика, экспорт) в памяти процесса.
+
+Этап - загрузка из БД (`db`), обработка pandas (`pandas`), построение графика (`chart`),
+запись файла (`file`) и т.п. Для каждой пары (процессор, этап) копятся гистограмма
+времени, число вызовов, строк и байт. Время этапа - собственное: время вложенных
+этапов (например, загрузки из БД внутри обработки pandas) из него вычитается,
+поэтому сумма этапов процессора равна общему времени его работы.
+
+Данные выводятся в текстовом формате Prometheus представлением `core.views.metrics`.
+
+Использование:
+    class MileageChartProcessor:
+        @timed_stage("chart", size=lambda self, result: len(result or ""))
+        def create_chart_base64(self): ...
+
+    with stage("db") as timer:
+        rows = list(queryset.values_list(*fields))
+        timer.add_rows(len(rows))
+
+Включает:
+- `stage` - контекстный менеджер замера этапа
+- `timed_stage` - декоратор метода процессора (процессор - имя класса)
+- `files_size` - суммарный размер файлов для подсчета байт
+- `render_prometheus` - текст метрик в формате Prometheus
+"""
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Границы корзин гистограммы времени этапа (секунды)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_metrics = {}  # {(процессор, этап): словарь накопленных значений}
+_lock = threading.Lock()
+
+# Текущий процессор и стек открытых этапов (свои для каждого потока и запроса)
+_current_processor = contextvars.ContextVar("stage_processor", default="-")
+_open_stages = contextvars.ContextVar("open_stages", default=())
+
+
+class StageTimer:
+    """Счетчики одного выполнения этапа"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.children_time = 0.0  # время вложенных этапов
+
+    def add_rows(self, count):
+        self.rows += count or 0
+
+    def add_bytes(self, count):
+        self.bytes += count or 0
+
+
+def _observe(processor, name, seconds, rows, size):
+    with _lock:
+        metric = _metrics.get((processor, name))
+        if metric is None:
+            metric = _metrics[(processor, name)] = {
+                "buckets": [0] * len(BUCKETS),
+                "count": 0,
+                "sum": 0.0,
+                "rows": 0,
+                "bytes": 0,
+            }
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                metric["buckets"][index] += 1
+        metric["count"] += 1
+        metric["sum"] += seconds
+        metric["rows"] += rows
+        metric["bytes"] += size
+
+
+@contextmanager
+def stage(name, processor=None):
+    """Замер этапа name (процессор по умолчанию - тот, внутри метода которого идет вызов)"""
+    processor = processor or _current_processor.get()
+    timer = StageTimer()
+    parents = _open_stages.get()
+    token = _open_stages.set(parents + (timer,))
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        elapsed = time.perf_counter() - start
+        _open_stages.reset(token)
+        if parents:
+            parents[-1].children_time += elapsed
+        _observe(
+            processor,
+            name,
+            max(elapsed - timer.children_time, 0.0),
+            timer.rows,
+            timer.bytes,
+        )
+
+
+def timed_stage(name, rows=None, size=None):
+    """
+    Декоратор метода процессора: замер этапа name с процессором = имя класса.
+    rows, size - функции (self, результат) -> число строк / байт (необязательно)
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            token = _current_processor.set(type(self).__name__)
+            try:
+                with stage(name) as timer:
+                    result = method(self, *args, **kwargs)
+                    if rows is not None:
+                        timer.add_rows(rows(self, result))
+                    if size is not None:
+                        timer.add_bytes(size(self, result))
+                    return result
+            finally:
+                _current_processor.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def files_size(*paths):
+    """Суммарный размер существующих файлов (байт)"""
+    return sum(os.path.getsize(path) for path in paths if path and os.path.isfile(path))
+
+
+def reset():
+    """Очистка накопленных замеров"""
+    with _lock:
+        _metrics.clear()
+
+
+def _labels(processor, name):
+    processor = processor.replace("\\", "\\\\").replace('"', '\\"')
+    name = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'processor="{processor}",stage="{name}"'
+
+
+def render_prometheus():
+    """Текст метрик в формате Prometheus (text exposition format 0.0.4)"""
+    with _lock:
+        snapshot = {
+            key: {**metric, "buckets": list(metric["buckets"])}
+            for key, metric in _metrics.items()
+        }
+
+    lines = [
+        "# HELP reclamationhub_stage_seconds Собственное время этапа процессора",
+        "# TYPE reclamationhub_stage_seconds histogram",
+    ]
+    for (processor, name), metric in sorted(snapshot.items()):
+        labels = _labels(processor, name)
+        for bound, count in zip(BUCKETS, metric["buckets"]):
+            lines.append(
+                f'reclamationhub_stage_seconds_bucket{{{labels},le="{bound}"}} {count}'
+            )
+        lines.append(
+            f'reclamationhub_stage_seconds_bucket{{{labels},le="+Inf"}} {metric["count"]}'
+        )
+        lines.append(
+            f"reclamationhub_stage_seconds_sum{{{labels}}} {metric['sum']:.6f}"
+        )
+        lines.append(
+            f"reclamationhub_stage_seconds_count{{{labels}}} {metric['count']}"
+        )
+
+    for metric_name, key, help_text in (
+        ("reclamationhub_stage_rows_total", "rows", "Строк обработано этапом"),
+        ("reclamationhub_stage_bytes_total", "bytes", "Байт записано этапом"),
+    ):
+        lines.append(f"# HELP {metric_name} {help_text}")
+        lines.append(f"# TYPE {metric_name} counter")
+        for (processor, name), metric in sorted(snapshot.items()):
+            lines.append(f"{metric_name}{{{_labels(processor, name)}}} {metric[key]}")
+
+    return "\n".join(lines) + "\n"
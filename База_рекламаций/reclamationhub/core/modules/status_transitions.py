@@ -0,0 +1,128 @@
+# core\modules\status_transitions.py
+
+"""
+Групповая смена статусов рекламаций.
+
+Аналог методов модели `Reclamation.update_status_on_receipt` и `close_reclamation`,
+но для QuerySet: условия перехода проверяются в SQL, статус меняется
+одним `update()`, недостающие акты "без исследования" создаются одним `bulk_create`
+(вместо save() с full_clean и сигналом post_save на каждую запись).
+update() не обновляет поле auto_now, поэтому updated_at задается явно, и не отправляет
+сигналы - готовые отчеты (core.modules.report_scheduler) отмечаются устаревшими вручную.
+Количество запросов не зависит от количества выбранных рекламаций.
+
+Включает функции:
+- `close_reclamations` - закрытие рекламаций (действие админ-панели "Закрыть выбранные рекламации")
+- `update_status_on_receipt` - статус по накладной прихода (NEW ↔ IN_PROGRESS),
+  групповая накладная прихода (reclamations/views/invoice_intake.py)
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.modules.report_scheduler import bump_data_generation
+from investigations.models import Investigation
+from reclamations.models import Reclamation
+
+Status = Reclamation.Status
+
+# Есть номер накладной прихода
+HAS_RECEIPT_INVOICE = Q(receipt_invoice_number__isnull=False) & ~Q(
+    receipt_invoice_number=""
+)
+
+# Есть акт исследования с номером и датой
+HAS_COMPLETE_INVESTIGATION = (
+    Q(investigation__isnull=False)
+    & ~Q(investigation__act_number="")
+    & Q(investigation__act_date__isnull=False)
+)
+
+# Заполнено поле "Принятые меры по сообщению"
+HAS_MEASURES_TAKEN = Q(measures_taken__isnull=False) & ~Q(measures_taken="")
+
+
+def _get_base_queryset(queryset):
+    """Новый QuerySet по id выбранных записей (без select_related, сортировки и т.п.)"""
+    return Reclamation.objects.filter(pk__in=queryset.values("pk"))
+
+
+def close_reclamations(queryset, act_date=None):
+    """
+    Закрытие выбранных рекламаций.
+
+    - с актом исследования (номер и дата) - статус "Закрыта"
+    - без акта, но с заполненными "Принятыми мерами" - статус "Закрыта" и акт "без исследования"
+      (как сигнал auto_create_investigation_on_reject при сохранении рекламации)
+    - остальные пропускаются (закрыть без акта и без принятых мер нельзя, см. Reclamation.clean)
+    """
+    act_date = act_date or timezone.now().date()
+    queryset = _get_base_queryset(queryset).exclude(status=Status.CLOSED)
+
+    with transaction.atomic():
+        total = queryset.count()
+
+        # 1. Рекламации с актом исследования
+        updated = queryset.filter(HAS_COMPLETE_INVESTIGATION).update(
+            status=Status.CLOSED, updated_at=timezone.now()
+        )
+
+        # 2. Рекламации без акта исследования - создаем акты "без исследования"
+        reclamation_ids = list(
+            queryset.filter(Q(investigation__isnull=True) & HAS_MEASURES_TAKEN)
+            .select_for_update()
+            .values_list("pk", flat=True)
+        )
+
+        if reclamation_ids:
+            Investigation.objects.bulk_create(
+                [
+                    Investigation(
+                        reclamation_id=reclamation_id,
+                        act_number="без исследования",
+                        act_number_sort=Investigation.get_act_number_sort(
+                            "без исследования"
+                        ),
+                        act_date=act_date,
+                        solution=Investigation.Solution.DEFLECT,
+                        fault_type=Investigation.FaultType.CONSUMER,
+                        guilty_department="Не определено",
+                    )
+                    for reclamation_id in reclamation_ids
+                ]
+            )
+            updated += Reclamation.objects.filter(pk__in=reclamation_ids).update(
+                status=Status.CLOSED, updated_at=timezone.now()
+            )
+
+    if updated:
+        transaction.on_commit(bump_data_generation)
+
+    return {
+        "updated": updated,
+        "created_investigations": len(reclamation_ids),
+        "skipped": total - updated,
+    }
+
+
+def update_status_on_receipt(queryset):
+    """
+    Статус по накладной прихода (групповой аналог Reclamation.update_status_on_receipt):
+    NEW с накладной → IN_PROGRESS, IN_PROGRESS без накладной → NEW.
+    Возвращает количество рекламаций с измененным статусом.
+    """
+    queryset = _get_base_queryset(queryset)
+
+    with transaction.atomic():
+        updated = queryset.filter(Q(status=Status.NEW) & HAS_RECEIPT_INVOICE).update(
+            status=Status.IN_PROGRESS, updated_at=timezone.now()
+        )
+        updated += queryset.filter(
+            Q(status=Status.IN_PROGRESS) & ~HAS_RECEIPT_INVOICE
+        ).update(status=Status.NEW, updated_at=timezone.now())
+
+    if updated:
+        transaction.on_commit(bump_data_generation)
+
+    return updated
@@ -0,0 +1,426 @@
+# core\modules\synthetic_data.py
+
+"""
+Генерация синтетических данных для нагрузочной проверки процессоров и админ-панели.
+
+Создаются справочники (периоды выявления "<потребитель> - <период>", наименования
+и обозначения изделий), рекламации по годам с правдоподобными распределениями
+(потребители, изделия, пробег, статусы), акты исследования к большей части рекламаций
+и претензии к части признанных рекламаций. Часть претензий (unlinked_claim_ratio) создается
+без связи с рекламациями - группа Б анализа ReclamationToClaimProcessor.
+
+Записи сохраняются пакетами через bulk_create (как при импорте журнала ОТК).
+Первичные ключи назначаются заранее от текущего максимума, поэтому связи
+строятся без повторного чтения id (MySQL не возвращает id из bulk_create).
+Генерацию нельзя запускать одновременно с работой пользователей в той же БД.
+
+Все синтетические записи помечены (`sender` рекламации и `comment` претензии
+равны SYNTHETIC_MARK) и удаляются методом `clear()` (SQL-запросами DELETE через курсор,
+без загрузки объектов в память).
+
+Включает класс:
+- `SyntheticDataGenerator` - генерация и удаление синтетических данных
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from claims.models import Claim
+from core.modules.report_scheduler import bump_data_generation
+from investigations.models import Investigation
+from reclamations.models import Reclamation, ReclamationYearSequence
+from sourcebook.models import PeriodDefect, Product, ProductType
+
+SYNTHETIC_MARK = "SYNTHETIC"
+
+# Потребители с весами (доля рекламаций)
+CONSUMERS = {
+    "ЯМЗ": 30,
+    "ММЗ": 20,
+    "ПАЗ": 10,
+    "ГАЗ": 10,
+    "КАМАЗ": 10,
+    "МАЗ": 8,
+    "Ростсельмаш": 7,
+    "ТМЗ": 5,
+}
+PERIODS = {"эксплуатация": 70, "комплектация": 25, "ПСИ": 5}
+
+PRODUCT_TYPES = {
+    "водяной насос": 50,
+    "турбокомпрессор": 30,
+    "масляный насос": 12,
+    "гидронасос": 8,
+}
+PRODUCTS_PER_TYPE = 40
+
+CLAIMED_DEFECTS = [
+    "течь",
+    "шум",
+    "заклинивание",
+    "люфт вала",
+    "разрушение подшипника",
+    "течь масла",
+    "повышенная вибрация",
+]
+DEFECT_CAUSES = [
+    "износ уплотнения",
+    "нарушение условий эксплуатации",
+    "дефект сборки",
+    "дефект комплектующего",
+    "попадание абразива",
+]
+GUILTY_DEPARTMENTS = ["сборочный цех", "механический цех", "поставщик", "Не определено"]
+ENGINE_BRANDS = ["ЯМЗ-536", "ЯМЗ-650", "Д-245", "Д-260", "КАМАЗ-740", "ЗМЗ-409"]
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def parse_scale(value):
+    """Количество рекламаций по обозначению масштаба: "10k", "100k", "1m" или число"""
+    value = str(value).strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1_000)
+    if value.endswith("m"):
+        return int(float(value[:-1]) * 1_000_000)
+    return int(value)
+
+
+def weighted_choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class SyntheticDataGenerator:
+    """Генерация синтетических рекламаций, актов исследования и претензий"""
+
+    def __init__(
+        self,
+        count,
+        years,
+        batch_size=2000,
+        seed=42,
+        investigation_ratio=0.85,
+        claim_ratio=0.15,
+        unlinked_claim_ratio=0.3,
+    ):
+        self.count = count
+        self.years = sorted(years)
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.investigation_ratio = investigation_ratio
+        self.claim_ratio = claim_ratio
+        self.unlinked_claim_ratio = unlinked_claim_ratio
+
+        self.reclamations = 0
+        self.investigations = 0
+        self.claims = 0
+
+    # ---------------------------- Справочники ------------------------------------
+
+    def create_references(self):
+        """Справочники периодов выявления и изделий (существующие записи не дублируются)"""
+        self.periods = {}
+        for consumer in CONSUMERS:
+            for period in PERIODS:
+                name = f"{consumer} - {period}"
+                self.periods[(consumer, period)], _ = (
+                    PeriodDefect.objects.get_or_create(name=name)
+                )
+
+        self.products = {}
+        for type_index, type_name in enumerate(PRODUCT_TYPES, start=1):
+            product_type, _ = ProductType.objects.get_or_create(name=type_name)
+            existing = {
+                product.nomenclature: product
+                for product in Product.objects.filter(product_type=product_type)
+            }
+            missing = [
+                Product(product_type=product_type, nomenclature=nomenclature)
+                for nomenclature in (
+                    f"{type_index}{number:03d}.1307010"
+                    for number in range(1, PRODUCTS_PER_TYPE + 1)
+                )
+                if nomenclature not in existing
+            ]
+            Product.objects.bulk_create(missing, ignore_conflicts=True)
+            self.products[type_name] = (
+                product_type,
+                list(Product.objects.filter(product_type=product_type)),
+            )
+
+    # ---------------------------- Генерация ------------------------------------
+
+    def generate(self, progress=None):
+        """
+        Генерация count рекламаций, равномерно распределенных по годам
+        progress: функция (создано, всего) для вывода хода генерации
+        """
+        self.create_references()
+
+        per_year = self.count // len(self.years)
+        for index, year in enumerate(self.years):
+            # остаток от деления - в последний год
+            year_count = per_year + (
+                self.count % len(self.years) if index == len(self.years) - 1 else 0
+            )
+            created = 0
+            while created < year_count:
+                size = min(self.batch_size, year_count - created)
+                with transaction.atomic():
+                    self._create_batch(year, size)
+                created += size
+                if progress:
+                    progress(self.reclamations, self.count)
+
+        # bulk_create не отправляет сигналы - сбрасываем кэши аналитики вручную
+        from claims.modules.time_analysis_processor import TimeAnalysisProcessor
+
+        TimeAnalysisProcessor.clear_cache()
+        bump_data_generation()  # готовые отчеты устарели
+
+    @staticmethod
+    def _next_id(model):
+        return (model.objects.aggregate(max_id=Max("id"))["max_id"] or 0) + 1
+
+    def _random_date(self, year, start=None):
+        start = start or date(year, 1, 1)
+        end = date(year, 12, 31)
+        if start >= end:
+            return end
+        return start + timedelta(days=self.rng.randint(0, (end - start).days))
+
+    def _create_batch(self, year, size):
+        rng = self.rng
+
+        next_id = self._next_id(Reclamation)
+        reclamations = [
+            self._make_reclamation(year, next_id + offset) for offset in range(size)
+        ]
+        Reclamation.assign_yearly_numbers(reclamations, year=year)
+        Reclamation.objects.bulk_create(reclamations)
+        self.reclamations += size
+
+        next_id = self._next_id(Investigation)
+        first_act = (
+            Investigation.objects.filter(act_number__startswith=f"{year} № ").count()
+            + 1
+        )
+        investigations = []
+        for reclamation in reclamations:
+            if reclamation.status == Reclamation.Status.NEW:
+                continue
+            if rng.random() > self.investigation_ratio:
+                continue
+            investigations.append(
+                self._make_investigation(
+                    reclamation,
+                    next_id + len(investigations),
+                    first_act + len(investigations),
+                )
+            )
+        Investigation.objects.bulk_create(investigations)
+        self.investigations += len(investigations)
+
+        next_id = self._next_id(Claim)
+        reclamations_by_id = {
+            reclamation.pk: reclamation for reclamation in reclamations
+        }
+        claims = []
+        links = []
+        for investigation in investigations:
+            if investigation.solution != Investigation.Solution.ACCEPT:
+                continue
+            if rng.random() > self.claim_ratio / max(self.investigation_ratio, 0.01):
+                continue
+            # Группа Б: претензия без связи (акт потребителя не найден в базе рекламаций)
+            linked = rng.random() >= self.unlinked_claim_ratio
+            claim = self._make_claim(
+                reclamations_by_id[investigation.reclamation_id],
+                investigation,
+                next_id + len(claims),
+                linked,
+            )
+            claims.append(claim)
+            if linked:
+                links.append(
+                    Claim.reclamations.through(
+                        claim_id=claim.pk, reclamation_id=investigation.reclamation_id
+                    )
+                )
+        Claim.objects.bulk_create(claims)
+        Claim.reclamations.through.objects.bulk_create(links)
+        self.claims += len(claims)
+
+    def _make_reclamation(self, year, pk):
+        rng = self.rng
+        consumer = weighted_choice(rng, CONSUMERS)
+        period = weighted_choice(rng, PERIODS)
+        product_type, products = self.products[weighted_choice(rng, PRODUCT_TYPES)]
+        received = self._random_date(year)
+
+        away_type = rng.choices(
+            list(Reclamation.AwayType.values), weights=[15, 60, 20, 5]
+        )[0]
+        if away_type == Reclamation.AwayType.KILOMETRE:
+            mileage = str(int(rng.lognormvariate(10.5, 0.8)))
+        elif away_type == Reclamation.AwayType.MOTO:
+            mileage = str(int(rng.lognormvariate(7, 0.7)))
+        else:
+            mileage = "н/д"
+
+        # статус зависит от давности поступления (старые рекламации закрыты)
+        age_days = (date(max(self.years), 12, 31) - received).days
+        if age_days > 120:
+            status = Reclamation.Status.CLOSED
+        elif age_days > 30:
+            status = rng.choice(
+                [Reclamation.Status.IN_PROGRESS, Reclamation.Status.CLOSED]
+            )
+        else:
+            status = rng.choice(
+                [Reclamation.Status.NEW, Reclamation.Status.IN_PROGRESS]
+            )
+
+        return Reclamation(
+            pk=pk,
+            status=status,
+            year=year,
+            incoming_number=str(rng.randint(1, 9999)),
+            message_received_date=received,
+            sender=SYNTHETIC_MARK,
+            sender_outgoing_number=f"{rng.randint(1, 999)}/{year % 100}",
+            message_sent_date=received - timedelta(days=rng.randint(1, 10)),
+            defect_period=self.periods[(consumer, period)],
+            product_name=product_type,
+            product=rng.choice(products),
+            product_number=str(rng.randint(100000, 999999)),
+            manufacture_date=f"{rng.randint(1, 12):02d}.{(year - rng.randint(0, 2)) % 100:02d}",
+            purchaser=consumer,
+            consumer_act_number=f"{consumer}-{rng.randint(1, 99999)}",
+            consumer_act_date=received - timedelta(days=rng.randint(1, 30)),
+            end_consumer=f"АТП-{rng.randint(1, 300)}",
+            engine_brand=rng.choice(ENGINE_BRANDS),
+            engine_number=f"{rng.choice('ABCDEFGHKM')}{rng.randint(1000000, 9999999)}",
+            defect_detection_date=received - timedelta(days=rng.randint(5, 60)),
+            away_type=away_type,
+            mileage_operating_time=mileage,
+            claimed_defect=rng.choice(CLAIMED_DEFECTS),
+            products_count=rng.choices([1, 2, 3], weights=[90, 8, 2])[0],
+            product_received_date=(
+                received + timedelta(days=rng.randint(5, 40))
+                if status != Reclamation.Status.NEW
+                else None
+            ),
+        )
+
+    def _make_investigation(self, reclamation, pk, act_index):
+        rng = self.rng
+        act_number = f"{reclamation.year} № {act_index}"
+        fault_type = rng.choices(
+            list(Investigation.FaultType.values), weights=[35, 40, 20, 5]
+        )[0]
+        solution = (
+            Investigation.Solution.ACCEPT
+            if fault_type == Investigation.FaultType.BZA
+            else Investigation.Solution.DEFLECT
+        )
+        act_date = self._random_date(
+            reclamation.year, start=reclamation.message_received_date
+        )
+        return Investigation(
+            pk=pk,
+            reclamation_id=reclamation.pk,
+            act_number=act_number,
+            act_number_sort=Investigation.get_act_number_sort(act_number),
+            act_date=act_date,
+            solution=solution,
+            fault_type=fault_type,
+            guilty_department=(
+                rng.choice(GUILTY_DEPARTMENTS)
+                if fault_type == Investigation.FaultType.BZA
+                else "Не определено"
+            ),
+            defect_causes=rng.choice(DEFECT_CAUSES),
+            shipment_date=act_date + timedelta(days=rng.randint(1, 10)),
+        )
+
+    def _make_claim(self, reclamation, investigation, pk, linked=True):
+        rng = self.rng
+        amount = Decimal(rng.randint(5_000, 300_000)).quantize(Decimal("0.01"))
+        costs = (amount * Decimal(rng.uniform(0.3, 1.0))).quantize(Decimal("0.01"))
+        claim_date = investigation.act_date + timedelta(days=rng.randint(5, 90))
+        if linked:
+            act_number = reclamation.consumer_act_number
+            act_date = reclamation.consumer_act_date
+        else:
+            # Номер акта, которого нет в базе; у части претензий без связи нет и даты акта
+            act_number = f"{reclamation.purchaser}-Б{rng.randint(1, 99999)}"
+            act_date = reclamation.consumer_act_date if rng.random() < 0.7 else None
+        return Claim(
+            pk=pk,
+            year=claim_date.year,
+            consumer_name=rng.choice(list(CONSUMERS)),
+            claim_number=f"{rng.randint(1, 9999)}/{claim_date.year % 100}",
+            claim_date=claim_date,
+            type_money=rng.choices(list(Claim.Money.values), weights=[85, 15])[0],
+            claim_amount_all=amount,
+            claim_amount_act=amount,
+            reclamation_act_number=act_number,
+            reclamation_act_date=act_date,
+            investigation_act_number=investigation.act_number,
+            investigation_act_date=investigation.act_date,
+            comment=SYNTHETIC_MARK,
+            result_claim=rng.choices(list(Claim.Result.values), weights=[70, 30])[0],
+            costs_act=costs,
+            costs_all=costs,
+        )
+
+    # ---------------------------- Удаление ------------------------------------
+
+    def clear(self):
+        """Удаление синтетических данных (справочники остаются)"""
+        links = connection.ops.quote_name(Claim.reclamations.through._meta.db_table)
+        claims = connection.ops.quote_name(Claim._meta.db_table)
+        investigations = connection.ops.quote_name(Investigation._meta.db_table)
+        reclamations = connection.ops.quote_name(Reclamation._meta.db_table)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {links} WHERE claim_id IN "
+                f"(SELECT id FROM {claims} WHERE comment = %s) "
+                f"OR reclamation_id IN (SELECT id FROM {reclamations} WHERE sender = %s)",
+                [SYNTHETIC_MARK, SYNTHETIC_MARK],
+            )
+            cursor.execute(f"DELETE FROM {claims} WHERE comment = %s", [SYNTHETIC_MARK])
+            deleted_claims = cursor.rowcount
+            cursor.execute(
+                f"DELETE FROM {investigations} WHERE reclamation_id IN "
+                f"(SELECT id FROM {reclamations} WHERE sender = %s)",
+                [SYNTHETIC_MARK],
+            )
+            cursor.execute(
+                f"DELETE FROM {reclamations} WHERE sender = %s", [SYNTHETIC_MARK]
+            )
+            deleted = cursor.rowcount
+
+            # Счетчики номеров в году - от оставшихся записей
+            for sequence in ReclamationYearSequence.objects.all():
+                sequence.last_number = (
+                    Reclamation.objects.filter(year=sequence.year).aggregate(
+                        max_number=Max("yearly_number")
+                    )["max_number"]
+                    or 0
+                )
+                sequence.save(update_fields=["last_number"])
+
+        from claims.modules.time_analysis_processor import TimeAnalysisProcessor
+
+        TimeAnalysisProcessor.clear_cache()
+        bump_data_generation()
+        return deleted, deleted_claims
@@ -0,0 +1,87 @@
+# core\tests\test_db_router.py
+
+"""Маршрутизация запросов между default и БД аналитики (core.db_router)"""
+
+from django.contrib.auth.models import User
+from django.db import router
+from django.test import TestCase
+
+from core.db_router import AnalyticsRouter, analytics_db
+from sourcebook.models import Product, ProductType
+
+
+class AnalyticsRouterTest(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Разные строки в двух копиях, чтобы было видно, из какой БД прочитаны данные
+        cls.default_type = ProductType.objects.using("default").create(
+            name="водяной насос"
+        )
+        cls.analytics_type = ProductType.objects.using("analytics").create(
+            pk=cls.default_type.pk + 100, name="турбокомпрессор"
+        )
+
+    def test_pinned_reads_go_to_analytics(self):
+        with analytics_db():
+            self.assertEqual(router.db_for_read(ProductType), "analytics")
+            product_type = ProductType.objects.get()
+
+        self.assertEqual(product_type.name, "турбокомпрессор")
+        self.assertEqual(product_type._state.db, "analytics")
+
+    def test_unpinned_reads_stay_on_default(self):
+        self.assertIsNone(AnalyticsRouter().db_for_read(ProductType))
+        product_type = ProductType.objects.get()
+
+        self.assertEqual(product_type.name, "водяной насос")
+        self.assertEqual(product_type._state.db, "default")
+
+    def test_pinned_reads_of_other_apps_stay_on_default(self):
+        User.objects.create_user("operator")
+
+        with analytics_db():
+            self.assertEqual(router.db_for_read(User), "default")
+            self.assertTrue(User.objects.filter(username="operator").exists())
+
+    def test_writes_inside_analytics_db_go_to_default(self):
+        with analytics_db():
+            ProductType.objects.create(name="масляный насос")
+
+            # Объект, прочитанный из БД аналитики, сохраняется в default
+            product_type = ProductType.objects.get()
+            product_type.name = "гидронасос"
+            product_type.save()
+
+        self.assertEqual(
+            set(ProductType.objects.using("default").values_list("name", flat=True)),
+            {"водяной насос", "масляный насос", "гидронасос"},
+        )
+        self.assertEqual(
+            list(ProductType.objects.using("analytics").values_list("name", flat=True)),
+            ["турбокомпрессор"],
+        )
+
+    def test_allow_relation_across_copies(self):
+        self.assertTrue(
+            AnalyticsRouter().allow_relation(self.default_type, self.analytics_type)
+        )
+
+        # Справочник есть в обеих копиях: связь с объектом, прочитанным из БД аналитики,
+        # сохраняется в default
+        for alias in ("default", "analytics"):
+            ProductType.objects.using(alias).create(pk=500, name="гидронасос")
+
+        with analytics_db():
+            product_type = ProductType.objects.get(pk=500)
+            product = Product(product_type=product_type, nomenclature="240-1307010")
+            product.save()
+
+        self.assertEqual(product_type._state.db, "analytics")
+        self.assertTrue(
+            Product.objects.using("default")
+            .filter(pk=product.pk, product_type_id=500)
+            .exists()
+        )
+        self.assertFalse(Product.objects.using("analytics").exists())
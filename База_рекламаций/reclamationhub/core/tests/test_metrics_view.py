@@ -0,0 +1,44 @@
+# core\tests\test_metrics_view.py
+
+"""Доступ к метрикам этапов процессоров /metrics/ (core.views.metrics)"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+
+@override_settings(METRICS_TOKEN="", METRICS_ALLOWED_IPS=[])
+class MetricsAccessTest(TestCase):
+    url = "/metrics/"
+
+    def test_loopback_is_not_trusted_by_default(self):
+        response = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_allowed_ip_only_without_proxy_headers(self):
+        direct = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(direct.status_code, 200)
+
+        # Запрос из сети через Nginx: REMOTE_ADDR - адрес прокси
+        proxied = self.client.get(
+            self.url, REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="192.168.0.50"
+        )
+        self.assertEqual(proxied.status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_bearer_token(self):
+        ok = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(ok.status_code, 200)
+        self.assertIn("text/plain", ok["Content-Type"])
+
+        wrong = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(wrong.status_code, 403)
+
+    def test_staff_user(self):
+        user = User.objects.create_user("otk", password="pass")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
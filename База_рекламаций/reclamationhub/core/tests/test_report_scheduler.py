@@ -0,0 +1,86 @@
+# core\tests\test_report_scheduler.py
+
+"""Готовые отчеты (core.modules.report_scheduler) устаревают после групповых изменений"""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.modules import report_scheduler
+from core.modules.status_transitions import update_status_on_receipt
+from core.modules.synthetic_data import SyntheticDataGenerator
+from reclamations.models import Reclamation
+
+PARAMS = {"year": 2025}
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        report_scheduler.CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test_prebuilt_reports",
+        },
+    }
+)
+class PrebuiltOutdatedByBulkUpdateTest(TestCase):
+    databases = {"default", "analytics"}
+
+    @classmethod
+    def setUpTestData(cls):
+        generator = SyntheticDataGenerator(count=20, years=[2025], seed=1)
+        generator.create_references()
+        generator.generate()
+        cls.admin = User.objects.create_superuser("admin", password="pass")
+
+    def setUp(self):
+        report_scheduler.clear()
+        report_scheduler.load_jobs()
+        # Тестовое задание вместо ночных отчетов - в реестре только на время теста
+        jobs = mock.patch.dict(report_scheduler.JOBS)
+        jobs.start()
+        self.addCleanup(jobs.stop)
+        report_scheduler.register(
+            "test_report", "Тестовый отчет", params=lambda: [PARAMS]
+        )(lambda year: ({"year": year}, {}))
+
+        results = report_scheduler.run_jobs(names=["test_report"])
+        self.assertEqual([result["status"] for result in results], ["готово"])
+        self.assertEqual(
+            report_scheduler.get_prebuilt("test_report", PARAMS), {"year": 2025}
+        )
+
+    def test_group_invoice_intake(self):
+        reclamation = Reclamation.objects.first()
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse("admin:add_invoice_into"),
+            {
+                "sender_numbers": reclamation.sender_outgoing_number,
+                "received_date": "2025-06-02",
+                "product_sender": "ГАЗ",
+                "invoice_number": "77",
+                "invoice_date": "2025-06-01",
+                "action": "Применить",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+
+        reclamation.refresh_from_db()
+        self.assertEqual(reclamation.receipt_invoice_number, "77")
+        self.assertIsNone(report_scheduler.get_prebuilt("test_report", PARAMS))
+
+    def test_status_transition_after_commit(self):
+        Reclamation.objects.update(
+            status=Reclamation.Status.NEW, receipt_invoice_number="77"
+        )
+        # Сам по себе update() не отправляет сигналов и не меняет версию данных
+        self.assertIsNotNone(report_scheduler.get_prebuilt("test_report", PARAMS))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            updated = update_status_on_receipt(Reclamation.objects.all())
+
+        self.assertEqual(updated, Reclamation.objects.count())
+        self.assertIsNone(report_scheduler.get_prebuilt("test_report", PARAMS))
@@ -2,12 +2,14 @@ from django.urls import path
 
 from core.views.home_page import home_view, ajax_year_data
 from core.views.about_page import about
+from core.views.metrics import metrics_view
 
 
 urlpatterns = [
     path("", home_view, name="home"),
     path("ajax/year-data/", ajax_year_data, name="ajax_year_data"),
     path("about/", about, name="about"),
+    path("metrics/", metrics_view, name="metrics"),  # замеры этапов процессоров
     # path("export-excel/", export_excel, name="export_excel"),
 ]
 
@@ -0,0 +1,51 @@
+# core\views\metrics.py
+
+"""Представление для вывода замеров этапов процессоров в формате Prometheus."""
+
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from core.modules.stage_metrics import render_prometheus
+
+# Заголовки, которые добавляет обратный прокси (Nginx): у таких запросов REMOTE_ADDR -
+# адрес прокси (обычно 127.0.0.1), а не клиента, поэтому список адресов к ним не применяется
+PROXY_HEADERS = ("HTTP_X_FORWARDED_FOR", "HTTP_X_REAL_IP", "HTTP_X_FORWARDED_PROTO")
+
+
+def has_metrics_access(request):
+    """
+    Проверка доступа к метрикам:
+    - заголовок "Authorization: Bearer <settings.METRICS_TOKEN>" (сборщик метрик);
+    - адрес из settings.METRICS_ALLOWED_IPS, только для запросов в обход прокси;
+    - сотрудники (is_staff).
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        if hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return True
+
+    allowed_ips = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    if request.META.get("REMOTE_ADDR") in allowed_ips and not any(
+        name in request.META for name in PROXY_HEADERS
+    ):
+        return True
+
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Метрики этапов процессоров (text/plain, формат Prometheus).
+    Доступ: см. has_metrics_access (по умолчанию - только сотрудники).
+    """
+    if not has_metrics_access(request):
+        return HttpResponseForbidden("Нет доступа к метрикам")
+
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
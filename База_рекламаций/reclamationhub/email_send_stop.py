@@ -1,7 +1,9 @@
 """Python-скрипт для логирования и отправки письма с фикстурой БД после остановки серверов"""
 
+import io
 import smtplib
 import os
+import zipfile
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
@@ -65,22 +67,27 @@ def send_email_mailru():
     Это автоматическое письмо от АСУР БЗА.
 
     Серверы Django и Nginx успешно закрыты {today.strftime("%Y-%m-%d %H:%M")}.
-    Во вложении актуальная фикстура БД db.json.
+    Во вложении актуальный снимок БД (fixtures/snapshot).
     """
 
     message.attach(MIMEText(body, "plain", "utf-8"))
 
     # -------------- 4. ПРИКРЕПЛЕНИЕ ФАЙЛА ------------------------------
-    # Автоматически получаем имя файла из пути к файлу
-    filepath = "fixtures/db.json"
-    filename = os.path.basename(filepath)
+    # Снимок БД - каталог файлов по моделям, прикрепляем его одним zip-архивом
+    # (файлы моделей уже сжаты gzip, поэтому архив без повторного сжатия)
+    snapshot_dir = "fixtures/snapshot"
+    filename = f"snapshot_{today.strftime('%Y-%m-%d')}.zip"
 
     try:
-        # Открываем файл в режиме бинарного чтения
-        with open(filepath, "rb") as attachment:
-            # Создаем "обертку" для файла
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(attachment.read())
+        file_names = sorted(os.listdir(snapshot_dir))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for name in file_names:
+                archive.write(os.path.join(snapshot_dir, name), name)
+
+        # Создаем "обертку" для файла
+        part = MIMEBase("application", "octet-stream")
+        part.set_payload(buffer.getvalue())
 
         # Кодируем файл в Base64
         encoders.encode_base64(part)
@@ -97,8 +104,8 @@ def send_email_mailru():
         logging.info(f"Файл '{filename}' успешно прикреплен.")
 
     except FileNotFoundError:
-        print(f"ОШИБКА: Файл для вложения не найден по пути: {filepath}")
-        logging.info(f"ОШИБКА: Файл для вложения не найден по пути: {filepath}")
+        print(f"ОШИБКА: Снимок БД для вложения не найден по пути: {snapshot_dir}")
+        logging.info(f"ОШИБКА: Снимок БД для вложения не найден по пути: {snapshot_dir}")
         return  # Прерываем отправку, если файл не найден
 
     # --------------- 5. ОТПРАВКА ПИСЬМА ------------------------------
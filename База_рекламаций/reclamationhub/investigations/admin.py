@@ -15,6 +15,7 @@ from .models import Investigation
 from .forms import InvestigationAdminForm
 from .views.add_group_investigation import add_group_investigation_view
 from .views.add_invoice_out import add_invoice_out_view
+from .views.reclamation_autocomplete import reclamation_autocomplete_view
 
 
 class InvestigationYearListFilter(SimpleListFilter):
@@ -221,6 +222,11 @@ class InvestigationAdmin(ProductEngineSearchMixin, admin.ModelAdmin):
                 self.add_invoice_out_view,
                 name="add_invoice_out",
             ),
+            path(  # для AJAX-поиска рекламаций в форме акта исследования
+                "reclamation_autocomplete/",
+                self.admin_site.admin_view(self.reclamation_autocomplete_view),
+                name="investigations_investigation_reclamation_autocomplete",
+            ),
         ]
         return custom_urls + urls
 
@@ -258,6 +264,10 @@ class InvestigationAdmin(ProductEngineSearchMixin, admin.ModelAdmin):
         # Здесь используется self, а во views.py параметр admin_instance
         return add_invoice_out_view(self, request)
 
+    def reclamation_autocomplete_view(self, request):
+        """Метод AJAX-поиска рекламаций для поля "Рекламация" - делегируем вызов функции из views"""
+        return reclamation_autocomplete_view(self, request)
+
     # ========= Переопределение стандартных методов Django ==========
 
     def get_queryset(self, request):
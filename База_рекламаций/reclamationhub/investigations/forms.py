@@ -2,8 +2,9 @@
 
 from django import forms
 from django.utils.safestring import mark_safe
-from django.contrib.admin.widgets import AdminDateWidget
+from django.contrib.admin.widgets import AdminDateWidget, AutocompleteSelect
 from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 
 from reclamations.models import Reclamation
@@ -26,6 +27,29 @@ INVESTIGATION_DATE_FIELDS = [
     "shipment_invoice_date",
 ]
 
+
+# ------------------------- Виджеты форм приложения Investigation ----------------------
+
+
+class ReclamationAutocompleteWidget(AutocompleteSelect):
+    """
+    Выбор рекламации с AJAX-поиском (select2 из админки).
+    В HTML выводится только выбранная рекламация, варианты для выбора загружаются
+    постранично из представления reclamation_autocomplete_view.
+    """
+
+    def get_url(self):
+        return reverse(
+            f"{self.admin_site.name}:investigations_investigation_reclamation_autocomplete"
+        )
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs=extra_attrs)
+        attrs["data-placeholder"] = "Номер рекламации, акта или двигателя"
+        attrs["style"] = "width: 600px;"
+        return attrs
+
+
 # ------------------------- Формы приложения Investigation -----------------------------
 
 
@@ -307,12 +331,18 @@ class InvestigationAdminForm(forms.ModelForm):
                 except Reclamation.DoesNotExist:
                     pass
             else:
-                # Обычное создание новой записи
-                self.fields["reclamation"].queryset = (
-                    Reclamation.objects.select_related(
-                        "product", "product__product_type", "product_name"
-                    ).filter(investigation__isnull=True)
+                # Обычное создание новой записи: queryset используется только для проверки
+                # выбранного значения, варианты для выбора загружаются через AJAX-поиск
+                reclamation_field = self.fields["reclamation"]
+                reclamation_field.queryset = Reclamation.objects.select_related(
+                    "product", "product_name"
+                ).filter(investigation__isnull=True)
+                reclamation_field.widget.widget = ReclamationAutocompleteWidget(
+                    Investigation._meta.get_field("reclamation"),
+                    reclamation_field.widget.admin_site,
+                    choices=reclamation_field.choices,
                 )
+                reclamation_field.widget.widget.is_required = reclamation_field.required
         else:
             # При редактировании акта исследования делаем поле только для чтения (readonly)
             self.fields["reclamation"].widget.attrs['readonly'] = True
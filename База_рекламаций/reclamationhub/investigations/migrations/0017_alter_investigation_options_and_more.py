@@ -7,6 +7,7 @@ import re
 def update_sort_values(apps, schema_editor):
     """Обновляет значения сортировки для существующих записей"""
     Investigation = apps.get_model("investigations", "Investigation")
+    db_alias = schema_editor.connection.alias
 
     def calculate_sort_value(act_number):
         """Локальная функция для расчета значения сортировки"""
@@ -28,7 +29,7 @@ def update_sort_values(apps, schema_editor):
 
     # Обновляем записи батчами для лучшей производительности
     batch_size = 100
-    investigations = Investigation.objects.all()
+    investigations = Investigation.objects.using(db_alias).all()
 
     for i in range(0, investigations.count(), batch_size):
         batch = investigations[i : i + batch_size]
@@ -41,13 +42,15 @@ def update_sort_values(apps, schema_editor):
             updates.append(investigation)
 
         # Bulk update для лучшей производительности
-        Investigation.objects.bulk_update(updates, ["act_number_sort"])
+        Investigation.objects.using(db_alias).bulk_update(updates, ["act_number_sort"])
 
 
 def reverse_update_sort_values(apps, schema_editor):
     """Обратная миграция - сбрасываем значения"""
     Investigation = apps.get_model("investigations", "Investigation")
-    Investigation.objects.all().update(act_number_sort=0.0)
+    Investigation.objects.using(schema_editor.connection.alias).update(
+        act_number_sort=0.0
+    )
 
 
 class Migration(migrations.Migration):
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -232,27 +234,31 @@ class Investigation(models.Model):
             if os.path.isfile(self.act_scan.path):
                 os.remove(self.act_scan.path)
 
+    @staticmethod
+    def get_act_number_sort(act_number):
+        """
+        Число для сортировки по номеру акта: "2025 № 1043-1" → 2025,104301.
+        Используется в save() и при массовом импорте (bulk_create не вызывает save)
+        """
+        if act_number == "не требуется":
+            return -1.0  # В конце
+
+        match = re.search(r"(\d{4})\s*(?:№|ММЗ)\s*(\d+)(?:-(\d+))?", act_number)
+        if not match:
+            return 0.0
+
+        year = int(match.group(1))  # 2025 (год)
+        main_number = int(match.group(2))  # 1043
+        suffix = int(match.group(3)) if match.group(3) else 0  # 0, 1 (суффикс)
+
+        # Создаем дробное число: 2025,1043, 2025,104301
+        return year + (main_number * 0.0001) + (suffix * 0.000001)
+
     def save(self, *args, **kwargs):
         """Заполнение поля для сортировки, обработка файлов и обновление статуса рекламации"""
 
         # Автоматически заполняем поле для сортировки
-        if self.act_number == "не требуется":
-            self.act_number_sort = -1.0  # В конце
-        else:
-            match = re.search(
-                r"(\d{4})\s*(?:№|ММЗ)\s*(\d+)(?:-(\d+))?", self.act_number
-            )
-            if match:
-                year = int(match.group(1))  # 2025 (год)
-                main_number = int(match.group(2))  # 1043
-                suffix = int(match.group(3)) if match.group(3) else 0  # 0, 1 (суффикс)
-
-                # Создаем дробное число: 2025,1043, 2025,104301
-                self.act_number_sort = (
-                    year + (main_number * 0.0001) + (suffix * 0.000001)
-                )
-            else:
-                self.act_number_sort = 0.0
+        self.act_number_sort = self.get_act_number_sort(self.act_number)
 
         # Обработка файла
         if self.pk:  # если запись уже существует
@@ -283,3 +289,12 @@ class Investigation(models.Model):
         # Напрямую изменяем статус после удаления
         reclamation.status = reclamation.Status.IN_PROGRESS
         reclamation.save()
+
+
+@receiver(post_save, sender=Investigation)
+@receiver(post_delete, sender=Investigation)
+def outdate_prebuilt_reports(sender, **kwargs):
+    """Готовые отчеты ночной подготовки перестают считаться актуальными"""
+    from core.modules.report_scheduler import bump_data_generation
+
+    bump_data_generation()
@@ -7,6 +7,7 @@ from django.db.models import Q
 from django.utils import timezone
 from django.shortcuts import render
 
+from core.modules.report_scheduler import bump_data_generation
 from reclamations.models import Reclamation
 from investigations.models import Investigation
 from investigations.forms import AddInvestigationForm
@@ -133,10 +134,10 @@ def add_group_investigation_view(admin_instance, request):
                     uploaded_file = analysis_result["uploaded_file"]
 
                     # ---------- Создаем акты для найденных рекламаций -----------
-                    created_count = 0  # счетчик созданных актов исследования
+                    new_investigations = []  # новые акты - одним bulk_create
                     updated_count = 0  # счетчик обновленных актов исследования
-                    for reclamation in reclamations:
-                        try:
+                    try:
+                        for reclamation in reclamations:
                             investigation_fields = [
                                 f
                                 for f in form.Meta.fields
@@ -178,26 +179,42 @@ def add_group_investigation_view(admin_instance, request):
                                 )
                                 # Прикрепляем файл копии ко всем актам исследования
                                 investigation.act_scan = uploaded_file
-                                # Сохраняем изменения и увеличиваем счетчик обновленных актов исследования
-                                investigation.save()
-                                created_count += 1
-
-                            # Обновляем статус рекламации
-                            reclamation.status = reclamation.Status.CLOSED
-                            reclamation.save()
-
-                        except Exception as e:
-                            return render(
-                                request,
-                                "admin/add_group_investigation.html",
-                                {
-                                    "title": "Добавление группового акта исследования",
-                                    "form": form,
-                                    "search_result": f"Ошибка при сохранении: {str(e)}",
-                                    "found_records": False,
-                                    **context_vars,
-                                },
-                            )
+                                # bulk_create не вызывает save() - поле сортировки заполняем сами
+                                investigation.act_number_sort = (
+                                    Investigation.get_act_number_sort(
+                                        investigation.act_number
+                                    )
+                                )
+                                new_investigations.append(investigation)
+
+                        # Создаем новые акты одним запросом (без save() и пересохранения
+                        # рекламации на каждую запись)
+                        Investigation.objects.bulk_create(new_investigations)
+                        created_count = len(new_investigations)
+
+                    except Exception as e:
+                        return render(
+                            request,
+                            "admin/add_group_investigation.html",
+                            {
+                                "title": "Добавление группового акта исследования",
+                                "form": form,
+                                "search_result": f"Ошибка при сохранении: {str(e)}",
+                                "found_records": False,
+                                **context_vars,
+                            },
+                        )
+
+                    # Закрываем все рекламации группы одним запросом
+                    # (update() не обновляет auto_now - updated_at задаем явно)
+                    Reclamation.objects.filter(
+                        pk__in=reclamations.values("pk")
+                    ).exclude(status=Reclamation.Status.CLOSED).update(
+                        status=Reclamation.Status.CLOSED, updated_at=timezone.now()
+                    )
+
+                    # bulk_create и update() не отправляют сигналы - готовые отчеты устарели
+                    bump_data_generation()
 
                     # Формируем и отправляем сообщения в Django Admin
                     messages_data = format_investigation_messages(analysis_result)
@@ -2,11 +2,13 @@
 """Представление для группового добавления накладной отгрузки изделий."""
 
 from django.contrib import messages
+from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.db.models import Q
 from django.utils import timezone
 from django.shortcuts import render
 
+from core.modules.report_scheduler import bump_data_generation
 from reclamations.models import Reclamation
 from investigations.models import Investigation
 from investigations.forms import UpdateInvoiceOutForm
@@ -60,10 +62,17 @@ def add_invoice_out_view(admin_instance, request):
                     ]
                     shipment_invoice_date = form.cleaned_data["shipment_invoice_date"]
 
-                    updated_count = analysis_result["filtered_queryset"].update(
-                        shipment_invoice_number=shipment_invoice_number,
-                        shipment_invoice_date=shipment_invoice_date,
-                    )
+                    # Все найденные акты обновляются одним запросом в одной транзакции
+                    with transaction.atomic():
+                        updated_count = Investigation.objects.filter(
+                            id__in=analysis_result["investigation_ids"]
+                        ).update(
+                            shipment_invoice_number=shipment_invoice_number,
+                            shipment_invoice_date=shipment_invoice_date,
+                        )
+
+                    # update() не отправляет сигналы - готовые отчеты устарели
+                    bump_data_generation()
 
                     # Формируем и отправляем сообщения в Django Admin
                     messages_data = format_analysis_messages(analysis_result)
@@ -185,41 +194,66 @@ def analyze_invoice_numbers(form_data):
         # Добавляем номер накладной прихода в общий фильтр
         filter_q |= Q(reclamation__receipt_invoice_number=invoice_number)
 
-    filtered_queryset = Investigation.objects.filter(filter_q)
+    # ID актов исследования для обновления - одним запросом
+    investigation_ids = (
+        list(Investigation.objects.filter(filter_q).values_list("id", flat=True))
+        if filter_q
+        else []
+    )
 
-    # Проверяем отсутствующие номера (ваша существующая логика)
+    # Проверяем отсутствующие номера: каждый номер ищется во всех столбцах
+    # (акты исследования, ПСА, акты рекламаций, накладные прихода).
+    # Номера собираются одним запросом на набор столбцов, сравнение - в памяти.
     found_numbers = set()
-    all_investigations = Investigation.objects.all()
-    all_reclamations = Reclamation.objects.all()
-
-    for num in all_input_numbers:
-        # Проверяем есть ли номер в актах исследования
-        full_act_number = f"{current_year} № {num}"
-        if all_investigations.filter(act_number=full_act_number).exists():
-            found_numbers.add(num)
-        # Проверяем есть ли номер в ПСА
-        elif all_reclamations.filter(sender_outgoing_number=num).exists():
-            found_numbers.add(num)
-        # Проверяем есть ли номер в актах рекламаций Приобретателя изделия
-        elif all_reclamations.filter(consumer_act_number=num).exists():
-            found_numbers.add(num)
-        # Проверяем есть ли номер в актах рекламаций Конечного потребителя
-        elif all_reclamations.filter(end_consumer_act_number=num).exists():
-            found_numbers.add(num)
-        # Проверяем есть ли номер в накладных прихода
-        elif all_reclamations.filter(receipt_invoice_number=num).exists():
-            found_numbers.add(num)
+    input_numbers = set(all_input_numbers)
+
+    if input_numbers:
+        # Номера актов исследования текущего года
+        found_acts = {
+            act_number.casefold()
+            for act_number in Investigation.objects.filter(
+                act_number__in=[f"{current_year} № {num}" for num in input_numbers]
+            ).values_list("act_number", flat=True)
+        }
+
+        # Номера ПСА, актов рекламаций и накладных прихода
+        reclamation_columns = [
+            "sender_outgoing_number",
+            "consumer_act_number",
+            "end_consumer_act_number",
+            "receipt_invoice_number",
+        ]
+        reclamation_filter = Q()
+        for column in reclamation_columns:
+            reclamation_filter |= Q(**{f"{column}__in": input_numbers})
+
+        found_values = {
+            value.casefold()
+            for row in Reclamation.objects.filter(reclamation_filter).values_list(
+                *reclamation_columns
+            )
+            for value in row
+            if value
+        }
+
+        # Сравнение без учета регистра - как в БД (MySQL, collation *_ci)
+        found_numbers = {
+            num
+            for num in input_numbers
+            if f"{current_year} № {num}".casefold() in found_acts
+            or num.casefold() in found_values
+        }
 
     missing_numbers = [num for num in all_input_numbers if num not in found_numbers]
 
     return {
-        "filtered_queryset": filtered_queryset,
+        "investigation_ids": investigation_ids,
         "all_input_numbers": all_input_numbers,
         "found_numbers": found_numbers,
         "missing_numbers": missing_numbers,
         "total_input_count": len(all_input_numbers),
-        "found_records_count": filtered_queryset.count(),
-        "has_records": filtered_queryset.exists(),
+        "found_records_count": len(investigation_ids),
+        "has_records": bool(investigation_ids),
     }
 
 
@@ -0,0 +1,92 @@
+# investigations\views\reclamation_autocomplete.py
+"""
+AJAX-поиск рекламаций для поля "Рекламация" в форме акта исследования.
+
+Вместо выпадающего списка со всеми рекламациями без акта исследования форма загружает
+только выбранное значение, а варианты подгружаются постранично по введенному тексту:
+- полный номер рекламации "2025-1356" (или "2025-" - все рекламации года)
+- номер акта приобретателя / конечного потребителя (по началу номера)
+- номер двигателя (по началу номера)
+
+Все условия поиска используют индексы модели Reclamation, общее количество записей
+(COUNT) не считается - признак следующей страницы определяется по одной лишней записи.
+Ответ в формате select2 (как у стандартного автодополнения админки).
+"""
+
+import re
+
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.http import JsonResponse
+
+from reclamations.models import Reclamation
+
+PAGE_SIZE = 20  # количество рекламаций на одной странице выпадающего списка
+MIN_TERM_LENGTH = 2  # минимальная длина текста для поиска по номерам актов и двигателя
+
+# Полный номер рекламации "2025-1356" или только год "2025-"
+FULL_NUMBER_PATTERN = re.compile(r"^(\d{4})\s*-\s*(\d{0,4})$")
+
+
+def get_open_reclamations():
+    """Рекламации, для которых еще нет акта исследования"""
+    return Reclamation.objects.filter(investigation__isnull=True)
+
+
+def search_reclamations(queryset, term):
+    """Фильтрация рекламаций по введенному тексту (пустой текст - без фильтра)"""
+    term = term.strip()
+    if not term:
+        return queryset
+
+    match = FULL_NUMBER_PATTERN.match(term)
+    if match:
+        year, number = match.groups()
+        queryset = queryset.filter(year=int(year))
+        if number:
+            queryset = queryset.filter(yearly_number=int(number))
+        return queryset
+
+    if len(term) < MIN_TERM_LENGTH:
+        return queryset.none()
+
+    return queryset.filter(
+        Q(consumer_act_number__istartswith=term)
+        | Q(end_consumer_act_number__istartswith=term)
+        | Q(engine_number__istartswith=term)
+    )
+
+
+def reclamation_autocomplete_view(admin_instance, request):
+    """Постраничный поиск рекламаций без акта исследования (JSON для select2)"""
+    # Во views.py используем параметр admin_instance - через него передаем ссылку на InvestigationAdmin
+    if not (
+        admin_instance.has_add_permission(request)
+        or admin_instance.has_change_permission(request)
+    ):
+        raise PermissionDenied
+
+    term = request.GET.get("term", "")
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    offset = (page - 1) * PAGE_SIZE
+    queryset = (
+        search_reclamations(get_open_reclamations(), term)
+        .select_related("product", "product_name")
+        .order_by("-year", "-yearly_number")
+    )
+    # Берем на одну запись больше, чтобы узнать, есть ли следующая страница
+    reclamations = list(queryset[offset : offset + PAGE_SIZE + 1])
+
+    return JsonResponse(
+        {
+            "results": [
+                {"id": str(reclamation.pk), "text": str(reclamation)}
+                for reclamation in reclamations[:PAGE_SIZE]
+            ],
+            "pagination": {"more": len(reclamations) > PAGE_SIZE},
+        }
+    )
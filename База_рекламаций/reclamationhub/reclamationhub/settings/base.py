@@ -46,7 +46,6 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django_extensions",
-    "debug_toolbar",
     "sourcebook.apps.SourcebookConfig",
     "reclamations.apps.ReclamationsConfig",
     "investigations.apps.InvestigationsConfig",
@@ -67,8 +66,32 @@ ADMIN_APPS_ORDER = {
     "reports": 5,
     "analitics": 6,
     "auth": 7,
+    "core": 8,
 }
 
+# Встраивать карту "тип изделия → изделия" в страницу формы рекламации
+# (False - списки изделий загружаются AJAX-запросом при смене типа изделия)
+RECLAMATION_FORM_EMBED_PRODUCTS = True
+
+# Замеры времени обработки запросов (core.middleware.RequestProfilerMiddleware):
+# доля запросов SAMPLE_RATE и все запросы дольше SLOW_MS мс сохраняются в БД,
+# сводка - в админ-панели "Замеры запросов" → "Самые медленные страницы"
+REQUEST_PROFILER = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0.05,
+    "SLOW_MS": 1000,
+    "RING_SIZE": 500,
+}
+
+# Доступ к метрикам этапов процессоров /metrics/ (по умолчанию - только сотрудникам is_staff):
+# - METRICS_TOKEN: сборщик Prometheus передает заголовок "Authorization: Bearer <токен>"
+#   (bearer_token в scrape_config); пустая строка - доступ по токену выключен;
+# - METRICS_ALLOWED_IPS: адреса сборщика для запросов в обход Nginx (напрямую на порт 8000).
+#   За прокси все запросы приходят с 127.0.0.1, поэтому запросы с заголовками прокси
+#   (X-Forwarded-For, X-Real-IP, X-Forwarded-Proto) по адресу не пропускаются
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = []
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -76,9 +99,11 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.RequestProfilerMiddleware",  # замеры времени запросов и SQL
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "core.middleware.DataFrameCacheMiddleware",  # кэш DataFrame в рамках запроса
+    "core.middleware.AnalyticsDbMiddleware",  # чтение аналитики из БД "analytics"
 ]
 
 # Для разработки
@@ -134,6 +159,45 @@ DATABASES = {
     #     "ENGINE": "django.db.backends.sqlite3",
     #     "NAME": BASE_DIR / "db.sqlite3",
     # }
+    # БД только для чтения для аналитики и справок (core.db_router):
+    # реплика MySQL (пользователь только с правом SELECT)...
+    # "analytics": {
+    #     "ENGINE": "django.db.backends.mysql",
+    #     "NAME": "reclamation_db",
+    #     "USER": "rh_reader",
+    #     "PASSWORD": "",
+    #     "HOST": "replica-host",
+    #     "PORT": "3306",
+    #     "TEST": {"MIRROR": "default"},
+    # },
+    # ...или снимок, обновляемый командой refresh_analytics_db
+    # "analytics": {
+    #     "ENGINE": "django.db.backends.sqlite3",
+    #     "NAME": BASE_DIR / "analytics.sqlite3",
+    # },
+}
+
+# Чтение данных страниц аналитики, справок и процессоров претензий - из БД "analytics",
+# если она описана в DATABASES (иначе все запросы идут в default)
+DATABASE_ROUTERS = ["core.db_router.AnalyticsRouter"]
+ANALYTICS_DB = {
+    "ALIAS": "analytics",
+    "APPS": ("reclamations", "investigations", "claims", "sourcebook"),
+    "PATHS": ("/analytics/", "/reports/", "/claims/"),
+    "REFRESH": False,  # True - обновлять снимок перед ночной подготовкой отчетов
+}
+
+# Кэш готовых отчетов ночной подготовки (команда prebuild_reports):
+# файловый - общий для всех процессов сервера и переживает их перезапуск
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "prebuilt_reports": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "prebuilt_reports",
+        "TIMEOUT": 26 * 60 * 60,  # сутки + запас до следующего ночного прогона
+    },
 }
 
 
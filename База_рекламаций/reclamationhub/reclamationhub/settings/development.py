@@ -7,6 +7,10 @@ DEBUG = True
 ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 INTERNAL_IPS = ["127.0.0.1"]
 
+# Панель отладки подключается только в режиме разработки
+INSTALLED_APPS += ["debug_toolbar"]
+MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+
 # Для разработки
 CSRF_TRUSTED_ORIGINS = ["http://localhost:8000"]
 # Это необходимо для безопасной обработки AJAX-запросов.
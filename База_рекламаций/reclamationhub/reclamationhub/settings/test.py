@@ -0,0 +1,32 @@
+"""Настройки Django для запуска тестов (две БД SQLite: основная и аналитики)"""
+
+import tempfile
+
+from .base import *
+
+TEST_DB_DIR = Path(tempfile.gettempdir()) / "reclamationhub_tests"
+TEST_DB_DIR.mkdir(exist_ok=True)
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": TEST_DB_DIR / "default.sqlite3",
+        "TEST": {"NAME": TEST_DB_DIR / "test_default.sqlite3"},
+    },
+    "analytics": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": TEST_DB_DIR / "analytics.sqlite3",
+        "TEST": {"NAME": TEST_DB_DIR / "test_analytics.sqlite3"},
+    },
+}
+
+# Готовые отчеты ночной подготовки в тестах не используются
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+# Запуск тестов:
+# python manage.py test --settings=reclamationhub.settings.test
@@ -13,6 +13,7 @@ from reclamations.forms import ReclamationAdminForm
 from core.modules.search_mixin import ProductEngineSearchMixin
 from reclamations.views.invoice_intake import add_invoice_into_view
 from reclamations.views.disposal_act import add_disposal_act_view
+from core.modules.status_transitions import close_reclamations
 
 
 class YearListFilter(SimpleListFilter):
@@ -276,7 +277,12 @@ class ReclamationAdmin(ProductEngineSearchMixin, admin.ModelAdmin):
     # )
 
     # Добавляем методы действия в панель "Действие/Выполнить"
-    actions = ["add_measures", "add_investigation", "add_disposal_act"]
+    actions = [
+        "add_measures",
+        "add_investigation",
+        "add_disposal_act",
+        "close_reclamations",
+    ]
 
     # Добавляем URL для методов действий
     def get_urls(self):
@@ -341,6 +347,27 @@ class ReclamationAdmin(ProductEngineSearchMixin, admin.ModelAdmin):
         # через него передаем ссылку на ReclamationAdmin для вызова message_user.
         return add_disposal_act_view(self, request, queryset)
 
+    @admin.action(description="Закрыть выбранные рекламации")
+    def close_reclamations(self, request, queryset):
+        """Групповое закрытие рекламаций (без акта исследования - с актом "без исследования")"""
+        result = close_reclamations(queryset)
+
+        if result["updated"]:
+            message = f"Закрыто рекламаций: {result['updated']}"
+            if result["created_investigations"]:
+                message += (
+                    f" (актов 'без исследования': {result['created_investigations']})"
+                )
+            self.message_user(request, message, level="SUCCESS")
+
+        if result["skipped"]:
+            self.message_user(
+                request,
+                f"Пропущено {result['skipped']} рекламаций без акта исследования "
+                f'и без заполненного поля "Принятые меры по сообщению"',
+                level="WARNING",
+            )
+
     def add_invoice_into_view(self, request):
         """Метод группового добавления накладной прихода рекламационных изделий"""
         # Здесь используется self, а во views.py параметр admin_instance в функции -
@@ -1,10 +1,12 @@
 from django import forms
+from django.conf import settings
 from django.contrib.admin.widgets import AdminDateWidget
 from django.utils import timezone
 import re
 
 from sourcebook.models import Product
 from .models import Reclamation
+from .views.product_utils import get_products_map_json
 
 
 # ------------------------------ Константы для виджетов форм ----------------------------
@@ -157,6 +159,12 @@ class ReclamationAdminForm(forms.ModelForm):
             empty_label="---------",
         )
 
+        # Карта "тип изделия → изделия" в атрибуте поля - смена типа без запросов к серверу
+        if getattr(settings, "RECLAMATION_FORM_EMBED_PRODUCTS", False):
+            self.fields["product_name"].widget.attrs[
+                "data-products-map"
+            ] = get_products_map_json()
+
     def clean(self):
         """Метод проверки данных, вводимых пользователем в форму"""
         cleaned_data = super().clean()
@@ -6,8 +6,9 @@ import datetime
 
 def convert_datetime_to_date(apps, schema_editor):
     Reclamation = apps.get_model('reclamations', 'Reclamation')
+    db_alias = schema_editor.connection.alias
 
-    for obj in Reclamation.objects.all():
+    for obj in Reclamation.objects.using(db_alias).all():
         if not obj.message_received_date:
             continue
 
@@ -7,14 +7,16 @@ from datetime import datetime
 def populate_year_fields(apps, schema_editor):
     Reclamation = apps.get_model('reclamations', 'Reclamation')  # название приложения и модели
 
+    db_alias = schema_editor.connection.alias
+
     current_year = datetime.now().year  # 2025
 
-    for rec in Reclamation.objects.all():
+    for rec in Reclamation.objects.using(db_alias).all():
         rec.year = current_year
         rec.yearly_number = rec.id
         rec.save()
 
-    print(f"Обновлено {Reclamation.objects.count()} записей")
+    print(f"Обновлено {Reclamation.objects.using(db_alias).count()} записей")
 
 class Migration(migrations.Migration):
     dependencies = [
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.20 on 2026-10-19 10:51
+
+from django.db import migrations, models
+
+
+def populate_year_sequences(apps, schema_editor):
+    """Счетчики номеров по существующим рекламациям: последний номер = максимальный в году"""
+    Reclamation = apps.get_model('reclamations', 'Reclamation')
+    ReclamationYearSequence = apps.get_model('reclamations', 'ReclamationYearSequence')
+    db_alias = schema_editor.connection.alias
+
+    max_numbers = Reclamation.objects.using(db_alias).values('year').annotate(
+        last_number=models.Max('yearly_number')
+    )
+
+    ReclamationYearSequence.objects.using(db_alias).bulk_create(
+        [
+            ReclamationYearSequence(year=row['year'], last_number=row['last_number'])
+            for row in max_numbers
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamations', '0022_alter_reclamation_consumer_response'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReclamationYearSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(unique=True, verbose_name='Год')),
+                ('last_number', models.IntegerField(default=0, verbose_name='Последний номер')),
+            ],
+            options={
+                'verbose_name': 'Счетчик номеров рекламаций',
+                'verbose_name_plural': 'Счетчики номеров рекламаций',
+                'db_table': 'reclamation_year_sequence',
+                'ordering': ['-year'],
+            },
+        ),
+        migrations.RunPython(populate_year_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamations', '0023_reclamationyearsequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['engine_number'], name='reclamation_engine_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['consumer_act_number'], name='reclamation_consumer_act_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['end_consumer_act_number'], name='reclamation_end_cons_act_idx'),
+        ),
+    ]
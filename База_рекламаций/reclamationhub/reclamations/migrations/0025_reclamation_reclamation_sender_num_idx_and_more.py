@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamations', '0024_reclamation_reclamation_engine_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['sender_outgoing_number'], name='reclamation_sender_num_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['product_number'], name='reclamation_product_num_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from django.urls import reverse
@@ -6,7 +6,7 @@ from django.utils import timezone
 from django.utils.html import mark_safe
 from datetime import datetime
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 import re
 
@@ -325,6 +325,20 @@ class Reclamation(models.Model):
             models.Index(
                 fields=["-year", "-yearly_number"], name="reclamation_order_idx"
             ),
+            # Для поиска рекламаций по префиксу номера (автодополнение в форме акта исследования)
+            models.Index(fields=["engine_number"], name="reclamation_engine_idx"),
+            models.Index(
+                fields=["consumer_act_number"], name="reclamation_consumer_act_idx"
+            ),
+            models.Index(
+                fields=["end_consumer_act_number"],
+                name="reclamation_end_cons_act_idx",
+            ),
+            # Для проверки дубликатов в форме рекламации
+            models.Index(
+                fields=["sender_outgoing_number"], name="reclamation_sender_num_idx"
+            ),
+            models.Index(fields=["product_number"], name="reclamation_product_num_idx"),
         ]
 
     # Дополнительные свойства экземпляра класса Reclamation
@@ -474,25 +488,49 @@ class Reclamation(models.Model):
         Переопределяем метод сохранения записи. При создании новой рекламации через админку поля
         year и yearly_number заполнятся автоматически, потом пройдет валидация, потом сохранение
         """
-        if not self.pk:  # если это новая запись
-            current_year = datetime.now().year
-            self.year = current_year
+        # Нормализация номера двигателя - преобразование кирилицы в латиницу
+        if self.engine_number:
+            self.engine_number = self.normalize_engine_number(self.engine_number)
+
+        if self.pk:  # редактирование существующей записи
+            self.full_clean()  # обязательно нужен для запуска валидации
+            super().save(*args, **kwargs)
+            return
+
+        # Новая запись: номер берется из счетчика года под блокировкой строки,
+        # блокировка держится до конца транзакции (до сохранения рекламации)
+        with transaction.atomic():
+            self.year = datetime.now().year
+            self.yearly_number = ReclamationYearSequence.allocate(self.year)
+
+            # Уникальность пары (year, yearly_number) гарантирует счетчик,
+            # поэтому повторный запрос проверки unique_together не нужен
+            self.full_clean(validate_unique=False)
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def assign_yearly_numbers(cls, reclamations, year=None):
+        """
+        Присваивает номера в году списку новых рекламаций (для bulk_create при импорте).
+        Номера выделяются одним блоком из счетчика года.
 
-            # Получаем следующий номер рекламации с учетом года
-            max_number = Reclamation.objects.filter(year=current_year).aggregate(
-                max_number=models.Max("yearly_number")
-            )["max_number"]
+        Вызывать внутри transaction.atomic() вместе с bulk_create, чтобы при ошибке
+        сохранения блок номеров вернулся в счетчик.
+        """
+        if not reclamations:
+            return reclamations
 
-            self.yearly_number = (max_number or 0) + 1
+        year = year or datetime.now().year
+        first_number = ReclamationYearSequence.allocate(year, count=len(reclamations))
 
-        # Нормализация номера двигателя - преобразование кирилицы в латиницу
-        if self.engine_number:
-            self.engine_number = self._normalize_engine_number(self.engine_number)
+        for number, reclamation in enumerate(reclamations, start=first_number):
+            reclamation.year = year
+            reclamation.yearly_number = number
 
-        self.full_clean()  # обязательно нужен для запуска валидации
-        super().save(*args, **kwargs)
+        return reclamations
 
-    def _normalize_engine_number(self, engine_number):
+    @staticmethod
+    def normalize_engine_number(engine_number):
         """
         Преобразует похожие кирилические символы в латинские в номере двигателя
         """
@@ -555,6 +593,57 @@ class Reclamation(models.Model):
             self.save()
 
 
+class ReclamationYearSequence(models.Model):
+    """
+    Счетчик номеров рекламаций в году (yearly_number).
+
+    Одна строка на год. Номер выделяется под select_for_update, поэтому
+    одновременная регистрация рекламаций несколькими пользователями не дает
+    одинаковых номеров. Для массового импорта выделяется блок из N номеров.
+    """
+
+    year = models.IntegerField(unique=True, verbose_name="Год")
+    last_number = models.IntegerField(default=0, verbose_name="Последний номер")
+
+    class Meta:
+        db_table = "reclamation_year_sequence"
+        verbose_name = "Счетчик номеров рекламаций"
+        verbose_name_plural = "Счетчики номеров рекламаций"
+        ordering = ["-year"]
+
+    def __str__(self):
+        return f"{self.year}: {self.last_number}"
+
+    @classmethod
+    def allocate(cls, year, count=1):
+        """
+        Выделяет count номеров подряд для года year и возвращает первый из них.
+        Блокировка строки счетчика держится до конца внешней транзакции.
+        """
+        if count < 1:
+            raise ValueError("Количество номеров должно быть больше нуля")
+
+        with transaction.atomic():
+            try:
+                sequence = cls.objects.select_for_update().get(year=year)
+            except cls.DoesNotExist:
+                # Для нового года счетчик создается от максимального номера в таблице
+                # (на случай записей, внесенных до появления счетчика)
+                max_number = Reclamation.objects.filter(year=year).aggregate(
+                    max_number=models.Max("yearly_number")
+                )["max_number"]
+                cls.objects.get_or_create(
+                    year=year, defaults={"last_number": max_number or 0}
+                )
+                sequence = cls.objects.select_for_update().get(year=year)
+
+            first_number = sequence.last_number + 1
+            sequence.last_number += count
+            sequence.save(update_fields=["last_number"])
+
+        return first_number
+
+
 @receiver(post_save, sender=Reclamation)
 def auto_create_investigation_on_reject(sender, instance, **kwargs):
     """
@@ -581,6 +670,19 @@ def auto_create_investigation_on_reject(sender, instance, **kwargs):
             fault_type=Investigation.FaultType.CONSUMER,
             guilty_department="Не определено",
         )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductType)
+@receiver(post_delete, sender=ProductType)
+def clear_products_cache(sender, **kwargs):
+    """Сброс кэша списков изделий для формы рекламации при изменении справочника"""
+    from reclamations.views.product_utils import clear_products_cache
+
+    clear_products_cache()
+
+
 """
 Полезные сигналы Django:
 
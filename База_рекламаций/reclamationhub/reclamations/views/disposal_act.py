@@ -2,10 +2,15 @@
 """Представление для формы группового добавления акта утилизации."""
 
 from django.contrib import admin  # Импорт для admin.helpers
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import DateField
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 
+from core.modules.report_scheduler import bump_data_generation
 from reclamations.models import Reclamation
+from investigations.models import Investigation
 
 
 def add_disposal_act_view(admin_instance, request, queryset):
@@ -24,28 +29,38 @@ def add_disposal_act_view(admin_instance, request, queryset):
             )
             return HttpResponseRedirect(".")
 
-        success_count = 0
-        error_count = 0
-        no_investigation_count = 0
-
-        for reclamation in queryset:
-            if not hasattr(reclamation, "investigation"):
-                no_investigation_count += 1
-                continue
+        try:
+            disposal_act_date = DateField().to_python(disposal_act_date)
+        except ValidationError:
+            admin_instance.message_user(
+                request,
+                f"Неверная дата акта утилизации: {disposal_act_date}",
+                level="ERROR",
+            )
+            return HttpResponseRedirect(".")
 
-            try:
-                investigation = reclamation.investigation
-                investigation.disposal_act_number = disposal_act_number
-                investigation.disposal_act_date = disposal_act_date
-                investigation.save()
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                admin_instance.message_user(
-                    request,
-                    f"Ошибка при обновлении акта утилизации для рекламации {reclamation.id}: {str(e)}",
-                    level="ERROR",
+        # Все акты исследования выбранных рекламаций обновляются одним запросом
+        # (акт утилизации не влияет на статус рекламации, поэтому save() не нужен)
+        try:
+            with transaction.atomic():
+                success_count = Investigation.objects.filter(
+                    reclamation__in=queryset
+                ).update(
+                    disposal_act_number=disposal_act_number,
+                    disposal_act_date=disposal_act_date,
                 )
+        except DatabaseError as e:
+            admin_instance.message_user(
+                request,
+                f"Ошибка при обновлении акта утилизации: {str(e)}",
+                level="ERROR",
+            )
+            return HttpResponseRedirect(".")
+
+        # update() не отправляет сигналы - готовые отчеты устарели
+        bump_data_generation()
+
+        no_investigation_count = queryset.count() - success_count
 
         if success_count:
             admin_instance.message_user(
@@ -3,9 +3,13 @@
 
 from django.contrib import messages
 from django.http import HttpResponseRedirect
+from django.db import transaction
 from django.db.models import Q
 from django.shortcuts import render
+from django.utils import timezone
 
+from core.modules.report_scheduler import bump_data_generation
+from core.modules.status_transitions import update_status_on_receipt
 from reclamations.models import Reclamation
 from reclamations.forms import UpdateInvoiceNumberForm
 
@@ -159,28 +163,23 @@ def add_invoice_into_view(admin_instance, request):
                     invoice_number = analysis_result["invoice_number"]
                     invoice_date = analysis_result["invoice_date"]
 
-                    # Обновляем накладную и статус для записей со статусом NEW
-                    updated_count = filtered_queryset.filter(
-                        status=Reclamation.Status.NEW
-                    ).update(
-                        product_received_date=received_date,
-                        product_sender=product_sender,
-                        receipt_invoice_number=invoice_number,
-                        receipt_invoice_date=invoice_date,
-                        status=Reclamation.Status.IN_PROGRESS,
-                    )
+                    with transaction.atomic():
+                        # Накладная - всем найденным записям одним запросом
+                        # (update() не обновляет auto_now - updated_at задаем явно)
+                        total_updated = filtered_queryset.update(
+                            product_received_date=received_date,
+                            product_sender=product_sender,
+                            receipt_invoice_number=invoice_number,
+                            receipt_invoice_date=invoice_date,
+                            updated_at=timezone.now(),
+                        )
 
-                    # Обновляем только накладную для остальных записей
-                    other_updated = filtered_queryset.exclude(
-                        status=Reclamation.Status.NEW
-                    ).update(
-                        product_received_date=received_date,
-                        product_sender=product_sender,
-                        receipt_invoice_number=invoice_number,
-                        receipt_invoice_date=invoice_date,
-                    )
+                        # Статус по накладной (NEW → IN_PROGRESS) - групповым сервисом
+                        updated_count = update_status_on_receipt(filtered_queryset)
+
+                    # update() не отправляет сигналы - готовые отчеты устарели
+                    bump_data_generation()
 
-                    total_updated = updated_count + other_updated
                     status_message = (
                         f"Изменен статус для записей: {updated_count}"
                         if updated_count
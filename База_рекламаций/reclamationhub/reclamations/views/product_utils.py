@@ -5,26 +5,101 @@
 # т.е. при выборе типа изделия динамически загружаются соответствующие обозначения изделий.
 # Например: водяной насос -> 240-1307010, 245-1307010, 260-1307116-02  и др.
 
+# Справочник изделий меняется редко, поэтому карта "тип изделия → изделия" строится одним запросом
+# и хранится в памяти процесса до изменения Product / ProductType (сброс через сигналы в
+# reclamations/models.py) или до истечения PRODUCTS_CACHE_TIMEOUT - сигналы не срабатывают
+# в других процессах (import_otk_journal, load_snapshot и т.п.). Ответы get_products содержат ETag / Last-Modified - браузер
+# переспрашивает сервер условным запросом и получает 304 без тела ответа.
+# При RECLAMATION_FORM_EMBED_PRODUCTS = True карта целиком встраивается в страницу формы рекламации
+# (атрибут data-products-map поля "Наименование изделия") и запросы при смене типа не нужны.
+
+import hashlib
+import json
+import threading
+import time
+
 from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
 
 from sourcebook.models import Product
 
+PRODUCTS_CACHE_TIMEOUT = 300  # сек, после чего карта перестраивается из БД
+
+_products_cache = {}
+_products_cache_lock = threading.Lock()
+
+
+def _build_products_cache():
+    """Карта {id типа: [{"id", "nomenclature"}, ...]} одним запросом к БД"""
+    products_map = {}
+    rows = Product.objects.order_by("nomenclature").values_list(
+        "product_type_id", "id", "nomenclature"
+    )
+    for product_type_id, product_id, nomenclature in rows:
+        products_map.setdefault(str(product_type_id), []).append(
+            {"id": product_id, "nomenclature": nomenclature}
+        )
+
+    products_json = json.dumps(products_map, ensure_ascii=False, separators=(",", ":"))
+    return {
+        "map": products_map,
+        "json": products_json,
+        "etag": hashlib.md5(products_json.encode("utf-8")).hexdigest(),
+        "last_modified": timezone.now().replace(microsecond=0),
+    }
+
+
+def get_products_cache():
+    """Кэш справочника изделий (строится при первом обращении после сброса или истечения срока)"""
+    with _products_cache_lock:
+        if (
+            not _products_cache
+            or time.monotonic() - _products_cache["built_at"] > PRODUCTS_CACHE_TIMEOUT
+        ):
+            products_cache = _build_products_cache()
+            if _products_cache.get("etag") == products_cache["etag"]:
+                # Справочник не изменился - Last-Modified прежний (ответы 304 продолжают работать)
+                products_cache["last_modified"] = _products_cache["last_modified"]
+            _products_cache.update(products_cache, built_at=time.monotonic())
+        return _products_cache.copy()
+
+
+def clear_products_cache():
+    """Сброс кэша справочника изделий (вызывается сигналами при изменении Product / ProductType)"""
+    with _products_cache_lock:
+        _products_cache.clear()
 
+
+def get_products_map_json():
+    """Компактный JSON всей карты "тип изделия → изделия" для встраивания в страницу формы"""
+    return get_products_cache()["json"]
+
+
+def _get_products_etag(request):
+    """ETag ответа - хэш всей карты изделий (меняется при изменении справочника)"""
+    return get_products_cache()["etag"]
+
+
+def _get_products_last_modified(request):
+    """Last-Modified ответа - время построения кэша после последнего сброса"""
+    return get_products_cache()["last_modified"]
+
+
+@condition(etag_func=_get_products_etag, last_modified_func=_get_products_last_modified)
 def get_products(request):
     """Возвращает список продуктов для выбранного типа"""
     product_type_id = request.GET.get("product_type_id")
 
+    product_list = []
     if product_type_id:
-        products = (
-            Product.objects.filter(product_type_id=product_type_id)
-            .values("id", "nomenclature")
-            .order_by("nomenclature")
-        )
-
-        product_list = list(products)
-        return JsonResponse(product_list, safe=False)
+        product_list = get_products_cache()["map"].get(product_type_id, [])
 
-    return JsonResponse([])
+    response = JsonResponse(product_list, safe=False)
+    # Браузер хранит ответ, но перед использованием проверяет актуальность по ETag (304)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 """
@@ -45,6 +120,7 @@ def get_products(request):
         ]
 
         Если product_type_id не передан или продукты не найдены - возвращает пустой список [].
+        Если список не изменился с прошлого запроса (If-None-Match / If-Modified-Since) - 304.
 
     **Пример использования в JavaScript:**
         ```javascript
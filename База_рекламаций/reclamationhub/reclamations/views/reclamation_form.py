@@ -1,119 +1,155 @@
 # reclamations\views\reclamation_form.py
 """
 AJAX endpoint для проверки дубликатов рекламаций.
-Проверяет каждое поле отдельно и возвращает предупреждение если найден дубликат.
+Проверяет сразу все поля формы одним запросом к БД и возвращает предупреждения
+для полей, по которым найден дубликат.
+
+Результат проверки кэшируется на короткое время по нормализованным значениям полей,
+поэтому повторные проверки при переходе между полями формы не обращаются к БД.
 """
 
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Q
 from django.http import JsonResponse
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_http_methods
 
 from reclamations.models import Reclamation
 
+# Поля для проверки дубликатов и их человекочитаемые названия для предупреждений
+DUPLICATE_CHECK_FIELDS = {
+    "sender_outgoing_number": "номером ПСА",  # Номер ПСА отправителя
+    "product_number": "номером изделия",  # Номер изделия
+    "consumer_act_number": "номером акта приобретателя",  # Номер акта приобретателя
+    "end_consumer_act_number": "номером акта конечного потребителя",  # Номер акта конечного потребителя
+    "engine_number": "номером двигателя",  # Номер двигателя
+}
+
+DUPLICATE_CACHE_TIMEOUT = 30  # время хранения результата проверки в кэше (секунды)
+DUPLICATE_CACHE_PREFIX = "reclamation_duplicates"
+
 
 @staff_member_required
 @require_http_methods(["POST"])
 def check_duplicate_reclamations_ajax(request):
     """
-    AJAX проверка дубликатов рекламаций по одному полю.
+    AJAX проверка дубликатов рекламаций сразу по всем полям формы.
 
     Принимает:
-        field_name: название поля для проверки
-        field_value: значение поля
+        sender_outgoing_number, product_number, consumer_act_number,
+        end_consumer_act_number, engine_number: значения полей (пустые поля не проверяются)
         current_reclamation_id: ID текущей рекламации (для исключения при редактировании)
 
     Возвращает:
-        JSON с результатом проверки и предупреждением если найден дубликат
+        JSON {"duplicates": {field_name: warning}} - предупреждения только для полей с дубликатами
     """
 
     # Получаем данные из POST запроса
-    field_name = request.POST.get("field_name", "").strip()
-    field_value = request.POST.get("field_value", "").strip()
-    current_id = request.POST.get("current_reclamation_id")
+    values = normalize_duplicate_values(
+        {
+            field_name: request.POST.get(field_name)
+            for field_name in DUPLICATE_CHECK_FIELDS
+        }
+    )
+    current_id = request.POST.get("current_reclamation_id", "").strip()
+    if not current_id.isdigit():
+        current_id = None
 
-    # Если поле или значение пустые - дубликатов нет
-    if not field_name or not field_value:
-        return JsonResponse({"duplicate_found": False})
+    # Если все поля пустые - дубликатов нет
+    if not values:
+        return JsonResponse({"duplicates": {}})
 
     try:
-        # Проверяем дубликат по конкретному полю
-        duplicate_info = _check_single_field_duplicate(
-            field_name, field_value, current_id
-        )
-
-        if duplicate_info:
-            return JsonResponse(
-                {"duplicate_found": True, "warning": duplicate_info["warning"]}
-            )
+        cache_key = _get_cache_key(values, current_id)
+        duplicates = cache.get(cache_key)
+
+        if duplicates is None:
+            duplicates = find_duplicates(values, current_id)
+            cache.set(cache_key, duplicates, DUPLICATE_CACHE_TIMEOUT)
 
-        return JsonResponse({"duplicate_found": False})
+        return JsonResponse({"duplicates": duplicates})
 
-    except Exception as e:
+    except Exception:
         # В случае ошибки возвращаем безопасный ответ
-        return JsonResponse(
-            {"duplicate_found": False, "error": "Ошибка проверки дубликатов"}
-        )
+        return JsonResponse({"duplicates": {}, "error": "Ошибка проверки дубликатов"})
 
 
-def _check_single_field_duplicate(field_name, field_value, exclude_id=None):
+def normalize_duplicate_values(raw_values):
     """
-    Проверка дубликата по одному конкретному полю.
+    Нормализация значений полей так же, как при сохранении рекламации
+    (пробелы по краям, кириллица в номере двигателя). Пустые поля отбрасываются.
+    """
+    values = {}
+    for field_name, value in raw_values.items():
+        value = (value or "").strip()
+        if not value:
+            continue
+        if field_name == "engine_number":
+            value = Reclamation.normalize_engine_number(value)
+        values[field_name] = value
+    return values
+
+
+def find_duplicates(values, exclude_id=None):
+    """
+    Поиск дубликатов по всем полям одним запросом (условия по полям объединены через OR).
 
     Args:
-        field_name (str): Название поля для проверки
-        field_value (str): Значение поля
+        values (dict): {field_name: value} - нормализованные непустые значения полей
         exclude_id (str|None): ID рекламации для исключения из поиска
 
     Returns:
-        dict|None: Информация о найденном дубликате или None
+        dict: {field_name: warning} для полей, по которым найдена рекламация
     """
+    # Проверяем только разрешенные поля (защита от инъекций)
+    values = {
+        field_name: value
+        for field_name, value in values.items()
+        if field_name in DUPLICATE_CHECK_FIELDS
+    }
+    if not values:
+        return {}
 
-    # Список разрешенных полей для проверки (защита от инъекций)
-    allowed_fields = [
-        "sender_outgoing_number",  # Номер ПСА отправителя
-        "product_number",  # Номер изделия
-        "consumer_act_number",  # Номер акта приобретателя
-        "end_consumer_act_number",  # Номер акта конечного потребителя
-        "engine_number",  # Номер двигателя
-    ]
-
-    # Проверяем что поле разрешено для поиска
-    if field_name not in allowed_fields:
-        return None
-
-    # Создаем динамический фильтр для конкретного поля
-    # Например: {'product_number': '123'} превратится в filter(product_number='123')
-    filter_kwargs = {field_name: field_value}
-
-    # Выполняем оптимизированный запрос к БД
-    queryset = Reclamation.objects.filter(**filter_kwargs).only(
-        "id",
-        "year",
-        "yearly_number",  # Загружаем только нужные поля для производительности
-    )
+    condition = Q()
+    for field_name, value in values.items():
+        condition |= Q(**{field_name: value})
+
+    queryset = Reclamation.objects.filter(condition)
 
     # Исключаем текущую рекламацию при редактировании
     if exclude_id:
         queryset = queryset.exclude(id=exclude_id)
 
-    # Получаем первый найденный дубликат
-    duplicate = queryset.first()
-
-    if duplicate:
-        # Словарь для человекочитаемых названий полей
-        field_labels = {
-            "sender_outgoing_number": "номером ПСА",
-            "product_number": "номером изделия",
-            "consumer_act_number": "номером акта приобретателя",
-            "end_consumer_act_number": "номером акта конечного потребителя",
-            "engine_number": "номером двигателя",
-        }
+    # Загружаем только нужные поля; сортировка модели (-id) - сначала самая новая рекламация
+    rows = queryset.values_list("year", "yearly_number", *values)
+
+    duplicates = {}
+    for year, yearly_number, *field_values in rows:
+        for field_name, field_value in zip(values, field_values):
+            if field_name in duplicates or field_value is None:
+                continue
+            # Сравнение без учета регистра, как в БД (collation MySQL)
+            if field_value.strip().casefold() != values[field_name].casefold():
+                continue
+
+            # Формируем номер рекламации в формате YYYY-NNNN
+            reclamation_number = f"{year}-{yearly_number:04d}"
+            duplicates[field_name] = (
+                f"⚠️ С {DUPLICATE_CHECK_FIELDS[field_name]} '{values[field_name]}' "
+                f"уже есть рекламация: {reclamation_number}"
+            )
 
-        # Формируем номер рекламации в формате YYYY-NNNN
-        reclamation_number = f"{duplicate.year}-{duplicate.yearly_number:04d}"
+        if len(duplicates) == len(values):
+            break
+
+    return duplicates
 
-        return {
-            "warning": f"⚠️ С {field_labels[field_name]} '{field_value}' уже есть рекламация: {reclamation_number}"
-        }
 
-    return None
+def _get_cache_key(values, exclude_id):
+    """Ключ кэша по нормализованным значениям полей и ID текущей рекламации"""
+    payload = json.dumps([sorted(values.items()), exclude_id], ensure_ascii=False)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return f"{DUPLICATE_CACHE_PREFIX}:{digest}"
@@ -11,8 +11,7 @@ from datetime import date
 import os
 from django.db.models import Q
 
-from investigations.models import Investigation
-from reclamations.models import Reclamation
+from core.modules.data_access import get_investigations_df, get_reclamations_df
 from reports.config.paths import (
     get_accept_defect_txt_path,
     ACCEPT_DEFECT_DIR,  # BASE_REPORTS_DIR,
@@ -70,41 +69,28 @@ class AcceptDefectProcessor:
             reclamations_filter &= Q(message_received_date__month__in=self.months)
 
         # Получаем ВСЕ рекламации за указанный год и месяцы
-        all_reclamations = (
-            Reclamation.objects.filter(reclamations_filter)
-            .select_related("defect_period", "product_name")
-            .values("defect_period__name", "product_name__name", "products_count")
+        df_all = get_reclamations_df(
+            reclamations_filter,
+            ["defect_period__name", "product_name__name", "products_count"],
+            columns={
+                "defect_period__name": "Потребитель",
+                "product_name__name": "Изделие",
+                "products_count": "Количество",
+            },
         )
 
-        if not all_reclamations.exists():
-            period_text = f"{self.year} год"
-            if self.months:
-                month_names = self._get_month_names()
-                period_text = f"{month_names} {self.year} года"
-            return False, f"Нет данных за {period_text}"
-
-        # Создаем DataFrame всех рекламаций
-        df_all = pd.DataFrame(list(all_reclamations))
-
         if df_all.empty:
             period_text = f"{self.year} год"
             if self.months:
                 month_names = self._get_month_names()
                 period_text = f"{month_names} {self.year} года"
-            return False, f"DataFrame пустой за {period_text}"
-
-        df_all.rename(
-            columns={
-                "defect_period__name": "Потребитель",
-                "product_name__name": "Изделие",
-                "products_count": "Количество",
-            },
-            inplace=True,
-        )
+            return False, f"Нет данных за {period_text}"
 
         # Группируем по Потребителю и Изделию (общее количество рекламаций)
         total_df = (
-            df_all.groupby(["Потребитель", "Изделие"])["Количество"].sum().reset_index()
+            df_all.groupby(["Потребитель", "Изделие"], observed=True)["Количество"]
+            .sum()
+            .reset_index()
         )
 
         # 2. Формируем фильтр для исследований
@@ -117,35 +103,29 @@ class AcceptDefectProcessor:
             )
 
         # Получаем данные по виновникам из Investigation
-        investigations = (
-            Investigation.objects.filter(investigations_filter)
-            .select_related("reclamation__defect_period", "reclamation__product_name")
-            .values(
+        df_investigations = get_investigations_df(
+            investigations_filter,
+            [
                 "reclamation__defect_period__name",
                 "reclamation__product_name__name",
                 "fault_type",
                 "reclamation__products_count",
-            )
+            ],
+            columns={
+                "reclamation__defect_period__name": "Потребитель",
+                "reclamation__product_name__name": "Изделие",
+                "fault_type": "Виновник",
+                "reclamation__products_count": "Количество_вин",
+            },
         )
 
         # Создаем сводную таблицу по виновникам (если есть исследования)
-        if investigations.exists():
-            df_investigations = pd.DataFrame(list(investigations))
-            df_investigations.rename(
-                columns={
-                    "reclamation__defect_period__name": "Потребитель",
-                    "reclamation__product_name__name": "Изделие",
-                    "fault_type": "Виновник",
-                    "reclamation__products_count": "Количество_вин",
-                },
-                inplace=True,
-            )
-
+        if not df_investigations.empty:
             # Группируем по виновникам
             grouped_investigations = (
-                df_investigations.groupby(["Потребитель", "Изделие", "Виновник"])[
-                    "Количество_вин"
-                ]
+                df_investigations.groupby(
+                    ["Потребитель", "Изделие", "Виновник"], observed=True
+                )["Количество_вин"]
                 .sum()
                 .reset_index()
             )
@@ -157,6 +137,7 @@ class AcceptDefectProcessor:
                 values="Количество_вин",
                 aggfunc="sum",
                 fill_value=0,
+                observed=True,
             ).reset_index()
 
             # Убираем имя колонок
@@ -15,7 +15,8 @@ import errno
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
 
-from investigations.models import Investigation
+from core.modules.data_access import get_investigations_df
+from core.modules.stage_metrics import files_size, stage, timed_stage
 from reports.config.paths import (
     BASE_REPORTS_DIR,
     culprits_defect_json_db,
@@ -42,13 +43,16 @@ class CulpritsDefectProcessor:
         12: "декабрь",
     }
 
-    def __init__(self, user_number=None):
+    def __init__(self, user_number=None, save_act_numbers=True):
         """
         Инициализация процессора.
 
         user_number: Номер акта, введённый пользователем.
         Если None - используется автоматическое значение из JSON.
+        save_act_numbers: False - не записывать номера актов справки в JSON
+        (ночная подготовка не должна сдвигать номер по умолчанию в форме).
         """
+        self.save_act_numbers = save_act_numbers
         self.today = date.today()
         self.bza_df = pd.DataFrame()
         self.not_bza_df = pd.DataFrame()
@@ -101,6 +105,11 @@ class CulpritsDefectProcessor:
         except Exception as e:
             print(f"Ошибка сохранения JSON: {e}")
 
+    def record_act_numbers(self, start_act_number, max_act_number):
+        """Запись номеров актов справки за прошлый месяц в JSON"""
+        self.dct_act_numbers[self.prev_month.month] = [start_act_number, max_act_number]
+        self._save_act_numbers_to_json(self.dct_act_numbers)
+
     def get_default_act_number(self):
         """
         Получение месяца справки и номеров актов по умолчанию для отображения в форме.
@@ -118,6 +127,9 @@ class CulpritsDefectProcessor:
 
         return json_month_name, self.start_act_number, self.max_act_number
 
+    @timed_stage(
+        "pandas", rows=lambda self, result: len(self.bza_df) + len(self.not_bza_df)
+    )
     def process_data(self):
         """Основная логика обработки данных с pandas"""
 
@@ -137,31 +149,21 @@ class CulpritsDefectProcessor:
         try:
             # =========== Получение данных из модели Investigation ============
 
-            investigations_queryset = Investigation.objects.select_related(
-                "reclamation__defect_period", "reclamation__product_name"
-            ).values(
-                "act_number",
-                "act_date",
-                "reclamation__defect_period__name",
-                "reclamation__product_name__name",
-                "reclamation__product_number",
-                "reclamation__manufacture_date",
-                "reclamation__products_count",
-                "solution",
-                "fault_type",
-                "guilty_department",
-                "defect_causes",
-                "defect_causes_explanation",
-            )
-
-            if not investigations_queryset.exists():
-                return False, "Нет данных в таблице исследований"
-
-            # =========== Создание датафрейма ============
-
-            df = pd.DataFrame(list(investigations_queryset))
-
-            df.rename(
+            df = get_investigations_df(
+                fields=[
+                    "act_number",
+                    "act_date",
+                    "reclamation__defect_period__name",
+                    "reclamation__product_name__name",
+                    "reclamation__product_number",
+                    "reclamation__manufacture_date",
+                    "reclamation__products_count",
+                    "solution",
+                    "fault_type",
+                    "guilty_department",
+                    "defect_causes",
+                    "defect_causes_explanation",
+                ],
                 columns={
                     "act_number": "Номер акта исследования",
                     "act_date": "Дата акта исследования",
@@ -176,9 +178,11 @@ class CulpritsDefectProcessor:
                     "defect_causes": "Причины дефектов",
                     "defect_causes_explanation": "Пояснения к причинам дефектов",
                 },
-                inplace=True,
             )
 
+            if df.empty:
+                return False, "Нет данных в таблице исследований"
+
             # =========== Обработка отсутствующих значений ============
 
             # Удаляем строки с отсутствующим номером акта исследования
@@ -195,8 +199,7 @@ class CulpritsDefectProcessor:
 
             # =========== Фильтрация датафрейма ============
 
-            # 1. Фильтруем по отчетному месяцу
-            df["Дата акта исследования"] = pd.to_datetime(df["Дата акта исследования"])
+            # 1. Фильтруем по отчетному месяцу (дата акта уже в datetime64)
             prev_month_ts = pd.Timestamp(self.prev_month)
 
             # Преобразуем даты в формат год-месяц и оставляем только отчетный месяц
@@ -261,11 +264,8 @@ class CulpritsDefectProcessor:
             self.max_act_number = int(df_filtered["act_number_int"].max())
 
             # Сохраняем с числовым ключом в JSON
-            self.dct_act_numbers[self.prev_month.month] = [
-                self.start_act_number,
-                self.max_act_number,
-            ]
-            self._save_act_numbers_to_json(self.dct_act_numbers)
+            if self.save_act_numbers:
+                self.record_act_numbers(self.start_act_number, self.max_act_number)
 
             # 4. Фильтруем по признано/отклонено
             df_filtered = df_filtered[df_filtered["Решение"] == "ACCEPT"]
@@ -283,7 +283,8 @@ class CulpritsDefectProcessor:
                     "Виновное подразделение",
                     "Период выявления дефекта",
                     "Обозначение изделия",
-                ]
+                ],
+                observed=True,  # только реально встречающиеся категории
             ).agg(
                 {
                     "Заводской номер изделия": join_unique,
@@ -387,9 +388,12 @@ class CulpritsDefectProcessor:
             excel_path = get_culprits_defect_excel_path()
 
             # Создаем Excel файл из готовых данных
-            self._create_excel_from_data(
-                excel_path, bza_data, not_bza_data, start_act_number, max_act_number
-            )
+            with stage("file", processor=type(self).__name__) as timer:
+                self._create_excel_from_data(
+                    excel_path, bza_data, not_bza_data, start_act_number, max_act_number
+                )
+                timer.add_rows(len(bza_data) + len(not_bza_data))
+                timer.add_bytes(files_size(excel_path))
 
             return {
                 "success": True,
@@ -14,8 +14,9 @@ from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font, Border, Side
 import errno
 import os
+from django.db.models import Q
 
-from reclamations.models import Reclamation
+from core.modules.data_access import get_reclamations_df
 from reports.models import EnquiryPeriod
 from reports.config.paths import (
     BASE_REPORTS_DIR,
@@ -61,34 +62,21 @@ class DataProcessor(MetadataLoader):
         year_start = date(self.current_year, 1, 1)  # начало текущего года
         year_end = date(self.current_year, 12, 31)  # конец текущего года
 
-        queryset = (
-            Reclamation.objects.filter(
+        df = get_reclamations_df(
+            Q(
                 id__gt=self.last_processed_id,
                 # Добавляем фильтр по текущему году
                 message_received_date__range=[year_start, year_end],
-            )
-            .select_related("defect_period", "product_name", "product")
-            .values(
+            ),
+            [
                 "id",  # поле из Reclamation для отслеживания последнего ID
                 "defect_period__name",  # Период выявления дефекта - поле name из PeriodDefect
                 "product_name__name",  # Наименование изделия - поле name из ProductType
                 "product__nomenclature",  # Обозначение изделия - поле nomenclature из Product
                 "claimed_defect",  # поле из Reclamation
-                "products_count",  # поле из Reclamation
-            )
-        )
-
-        if not queryset.exists():
-            return None  # Нет новых данных
-
-        # Преобразуем в DataFrame
-        df = pd.DataFrame(list(queryset))
-
-        # Устанавливаем индекс как ID записи (аналог номера строки Excel)
-        df.set_index("id", inplace=True)
-
-        # Переименовываем столбцы как в оригинале
-        df.rename(
+                "products_count",  # поле из Reclamation (int16)
+            ],
+            # Переименовываем столбцы как в оригинале
             columns={
                 "defect_period__name": "Период выявления",
                 "product_name__name": "Наименование изделия",
@@ -96,25 +84,27 @@ class DataProcessor(MetadataLoader):
                 "claimed_defect": "Заявленный дефект",
                 "products_count": "Количество",
             },
-            inplace=True,
         )
 
+        if df.empty:
+            return None  # Нет новых данных
+
+        # Устанавливаем индекс как ID записи (аналог номера строки Excel)
+        df.set_index("id", inplace=True)
+
         # Ваша существующая логика обработки
-        df_c = df.dropna(subset=["Период выявления"])
+        df_c = df.dropna(subset=["Период выявления"]).copy()
 
         # Очистка обозначения изделий от переносов
-        df_c["Обозначение изделия"] = df_c["Обозначение изделия"].apply(
-            lambda x: x.split("\n")[0] if pd.notna(x) and "\n" in str(x) else x
+        df_c["Обозначение изделия"] = (
+            df_c["Обозначение изделия"].astype(object).str.split("\n").str[0]
         )
 
-        # Приведение типов
-        df_c["Количество"] = df_c["Количество"].astype("int16")
-
         # Заполнение пропусков
-        df_c["Заявленный дефект"].fillna("неизвестно", inplace=True)
+        df_c["Заявленный дефект"] = df_c["Заявленный дефект"].fillna("неизвестно")
 
         # Запоминаем последний обработанный ID
-        self.new_last_id = df_c.index.max()
+        self.new_last_id = int(df_c.index.max())
 
         # Группировка как в оригинале
         self.df_res = (
@@ -124,7 +114,8 @@ class DataProcessor(MetadataLoader):
                     "Наименование изделия",
                     "Обозначение изделия",
                     "Заявленный дефект",
-                ]
+                ],
+                observed=True,  # только встречающиеся сочетания категорий
             )["Количество"]
             .sum()
             .to_frame()
@@ -132,6 +123,16 @@ class DataProcessor(MetadataLoader):
 
         return self.df_res
 
+    def to_prebuilt(self):
+        """Результат get_result для кэша ночной подготовки (core.modules.report_jobs)"""
+        return {"df_res": self.df_res, "new_last_id": self.new_last_id}
+
+    def load_prebuilt(self, prebuilt):
+        """Результат get_result из ночной подготовки вместо запроса к БД"""
+        self.df_res = prebuilt["df_res"]
+        self.new_last_id = prebuilt["new_last_id"]
+        return self.df_res
+
     def update_metadata(self):
         """Аналог write_to_database - создаем новую запись метаданных"""
         EnquiryPeriod.objects.create(
@@ -244,10 +245,16 @@ class ExcelWriter(DataProcessor):
         # Задаем высоту строки
         sheet.row_dimensions[len_table + 3].height = 30
 
-    def generate_full_report(self):
-        """Полная генерация справки с обработкой ошибок"""
+    def generate_full_report(self, prebuilt=None):
+        """
+        Полная генерация справки с обработкой ошибок
+        prebuilt: выборка, подготовленная ночью (DataProcessor.to_prebuilt)
+        """
         try:
-            result = self.get_result()
+            if prebuilt is None:
+                result = self.get_result()
+            else:
+                result = self.load_prebuilt(prebuilt)
 
             if result is None:
                 return {
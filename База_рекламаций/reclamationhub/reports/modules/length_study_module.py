@@ -17,6 +17,7 @@ from io import BytesIO
 from datetime import date
 import os
 from django.db.models import Case, When, F, Q
+from core.modules.data_access import get_queryset_df
 from investigations.models import Investigation
 from reports.config.paths import (
     BASE_REPORTS_DIR,
@@ -67,43 +68,37 @@ class LengthStudyProcessor:
 
             investigations_filter &= consumer_q
 
-        queryset = (
-            Investigation.objects.filter(investigations_filter)
-            .select_related("reclamation__defect_period")
-            .annotate(
-                # Логика подстановки даты поступления
-                effective_received_date=Case(
-                    # Если есть product_received_date - используем его
-                    When(
-                        reclamation__product_received_date__isnull=False,
-                        then=F("reclamation__product_received_date"),
-                    ),
-                    # Иначе используем message_received_date
-                    default=F("reclamation__message_received_date"),
-                )
+        queryset = Investigation.objects.filter(investigations_filter).annotate(
+            # Логика подстановки даты поступления
+            effective_received_date=Case(
+                # Если есть product_received_date - используем его
+                When(
+                    reclamation__product_received_date__isnull=False,
+                    then=F("reclamation__product_received_date"),
+                ),
+                # Иначе используем message_received_date
+                default=F("reclamation__message_received_date"),
             )
-            .values(
+        )
+
+        # Даты приходят сразу в datetime64, потребитель - category
+        df = get_queryset_df(
+            queryset,
+            [
                 "act_date",
                 "effective_received_date",
                 "reclamation__defect_period__name",
-            )
-        )
-
-        if not queryset.exists():
-            return None
-
-        df = pd.DataFrame(list(queryset))
-
-        # Переименовываем столбцы
-        df.rename(
+            ],
             columns={
                 "act_date": "Дата исследования",
                 "effective_received_date": "Дата поступления",
                 "reclamation__defect_period__name": "Потребитель",
             },
-            inplace=True,
         )
 
+        if df.empty:
+            return None
+
         # Убираем записи где effective_received_date пустое (подстраховка)
         df = df.dropna(subset=["Дата поступления"])
 
@@ -116,10 +111,6 @@ class LengthStudyProcessor:
         if df is None or df.empty:
             return False, "Нет данных для анализа"
 
-        # Преобразуем в datetime если нужно
-        df["Дата исследования"] = pd.to_datetime(df["Дата исследования"])
-        df["Дата поступления"] = pd.to_datetime(df["Дата поступления"])
-
         # Рассчитываем разность в днях
         df["DIFF"] = (df["Дата исследования"] - df["Дата поступления"]).dt.days
 
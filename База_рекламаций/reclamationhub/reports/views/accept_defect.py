@@ -11,6 +11,8 @@ from django.shortcuts import redirect, render
 from django.contrib import messages
 import os
 
+from core.modules.report_jobs import accept_defect_params
+from core.modules.report_scheduler import get_prebuilt
 from reports.modules.accept_defect_module import AcceptDefectProcessor
 from reclamations.models import Reclamation
 
@@ -151,9 +153,14 @@ def generate_report(request):
             messages.error(request, "Некорректные месяцы")
             return redirect("reports:accept_defect")
 
-    # Если не выбрано ни одного месяца - обрабатываем весь год
-    processor = AcceptDefectProcessor(year=year, months=months)
-    result = processor.generate_report()
+    # Готовый результат ночной подготовки (файл TXT восстанавливается в папке отчетов)
+    result = get_prebuilt(
+        "accept_defect", accept_defect_params(year, months), restore=True
+    )
+    if result is None:
+        # Если не выбрано ни одного месяца - обрабатываем весь год
+        processor = AcceptDefectProcessor(year=year, months=months)
+        result = processor.generate_report()
 
     if result["success"]:
         messages.success(request, f"✅ {result['message']}")
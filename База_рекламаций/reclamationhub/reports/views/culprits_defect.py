@@ -5,6 +5,8 @@ from datetime import date
 from django.shortcuts import redirect, render
 from django.contrib import messages
 
+from core.modules.report_jobs import culprits_defect_params
+from core.modules.report_scheduler import get_prebuilt
 from reports.modules.culprits_defect_module import CulpritsDefectProcessor
 
 
@@ -119,9 +121,16 @@ def generate_analysis(request):
         messages.warning(request, "Некорректный номер акта исследования")
         return redirect("reports:culprits_defect")
 
-    # Запускаем анализ С ПОЛЬЗОВАТЕЛЬСКИМ НОМЕРОМ АКТА
-    processor = CulpritsDefectProcessor(user_number=user_number)  # Передаём номер
-    result = processor.generate_analysis()
+    # Готовый результат ночной подготовки или анализ С ПОЛЬЗОВАТЕЛЬСКИМ НОМЕРОМ АКТА
+    result = get_prebuilt("culprits_defect", culprits_defect_params(user_number))
+    if result is not None:
+        # Номера актов справки записываются, как при обычном анализе
+        CulpritsDefectProcessor().record_act_numbers(
+            result["start_act_number"], result["max_act_number"]
+        )
+    else:
+        processor = CulpritsDefectProcessor(user_number=user_number)  # Передаём номер
+        result = processor.generate_analysis()
 
     if result["success"]:
         messages.success(request, f"✅ {result['message']}")
@@ -10,6 +10,8 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.http import FileResponse, Http404
 
+from core.modules.report_jobs import enquiry_period_params
+from core.modules.report_scheduler import get_prebuilt
 from reports.modules.enquiry_period_module import ExcelWriter
 from reports.models import EnquiryPeriod
 from reclamations.models import Reclamation
@@ -57,7 +59,11 @@ def generate_report(request):
     """Обертка для представления результата генерации справки модулем enquiry_period_module"""
     # Вся логика в модуле enquiry_period_module
     writer = ExcelWriter()
-    result = writer.generate_full_report()
+    # Выборка, подготовленная ночью (если с тех пор не было новых записей и справок)
+    prebuilt = get_prebuilt(
+        "enquiry_period", enquiry_period_params(writer.last_processed_id)
+    )
+    result = writer.generate_full_report(prebuilt=prebuilt)
 
     # Обрабатываем результат
     if result["success"]:
@@ -8,6 +8,8 @@
 from datetime import datetime
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from core.modules.report_jobs import length_study_params
+from core.modules.report_scheduler import get_prebuilt
 from reports.modules.length_study_module import LengthStudyProcessor
 from reclamations.models import Reclamation  # ДОБАВИЛИ импорт
 
@@ -82,9 +84,14 @@ def generate_report(request):
         ]
         consumers = [c for c in selected_consumers if c in valid_consumers]
 
-    # Создаем экземпляр класса LengthStudyProcessor с выбранным годом и пользователями
-    processor = LengthStudyProcessor(year=year, consumers=consumers)
-    result = processor.generate_report()
+    # Готовый результат ночной подготовки (файлы TXT и PNG восстанавливаются в папке отчетов)
+    result = get_prebuilt(
+        "length_study", length_study_params(year, consumers), restore=True
+    )
+    if result is None:
+        # Создаем экземпляр класса LengthStudyProcessor с выбранным годом и пользователями
+        processor = LengthStudyProcessor(year=year, consumers=consumers)
+        result = processor.generate_report()
 
     if result["success"]:
         messages.success(request, f"✅ {result['message']}")
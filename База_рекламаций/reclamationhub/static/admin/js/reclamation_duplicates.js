@@ -3,10 +3,10 @@
 // static\admin\js\reclamation_duplicates.js
 
 /**
-Проверяет каждое поле отдельно при потере фокуса
-Отправляет AJAX запрос на сервер для поиска дубликатов
-Показывает предупреждение под соответствующим полем
-Убирает предупреждение при очистке поля
+При потере фокуса любым полем проверяет сразу все поля формы
+Отправляет один AJAX запрос на сервер для поиска дубликатов
+Показывает предупреждение под полями, по которым найден дубликат
+Убирает предупреждения у остальных полей (в том числе при очистке поля)
 */
 
 // =================== Проверка дубликатов рекламаций =====================
@@ -38,28 +38,46 @@ window.addEventListener('load', function() {
 
             // Добавляем обработчик события "потеря фокуса"
             field.addEventListener('blur', function() {
-                checkSingleFieldDuplicate(fieldName, field.value.trim());
+                checkAllFieldsDuplicates();
             });
         }
     });
 
+    // Значения полей при последней проверке (повторно одни и те же данные не отправляем)
+    let lastCheckedValues = null;
+
     /**
-     * Проверка дубликатов для одного конкретного поля
-     * @param {string} fieldName - Название поля для проверки
-     * @param {string} fieldValue - Значение поля
+     * Проверка дубликатов сразу для всех полей одним запросом
      */
-    function checkSingleFieldDuplicate(fieldName, fieldValue) {
+    function checkAllFieldsDuplicates() {
+
+        // Подготавливаем данные для отправки на сервер
+        const formData = new FormData();
+        const values = {};
+        let hasValues = false;
+
+        fieldsToCheck.forEach(function(fieldName) {
+            const field = document.getElementById('id_' + fieldName);
+            const fieldValue = field ? field.value.trim() : '';
+            values[fieldName] = fieldValue;
+            if (fieldValue) {
+                formData.append(fieldName, fieldValue);
+                hasValues = true;
+            }
+        });
 
-        // Если поле пустое - убираем предупреждение для этого поля
-        if (!fieldValue) {
-            clearWarning(fieldName);
+        // Если значения не изменились с прошлой проверки - запрос не нужен
+        const valuesKey = JSON.stringify(values);
+        if (valuesKey === lastCheckedValues) {
             return;
         }
+        lastCheckedValues = valuesKey;
 
-        // Подготавливаем данные для отправки на сервер
-        const formData = new FormData();
-        formData.append('field_name', fieldName);    // Какое поле проверяем
-        formData.append('field_value', fieldValue);  // Значение поля
+        // Если все поля пустые - убираем все предупреждения
+        if (!hasValues) {
+            showWarnings({});
+            return;
+        }
 
         // Добавляем ID текущей рекламации (нужно для исключения при редактировании)
         const currentIdMatch = window.location.pathname.match(/\/(\d+)\/change\//);
@@ -80,21 +98,30 @@ window.addEventListener('load', function() {
         })
         .then(response => response.json())
         .then(data => {
-            // Обрабатываем ответ от сервера
-            if (data.duplicate_found) {
-                // Найден дубликат - показываем предупреждение под полем
-                showWarning(fieldName, data.warning);
-            } else {
-                // Дубликат не найден - убираем предупреждение
-                clearWarning(fieldName);
-            }
+            // Обрабатываем ответ от сервера - предупреждения только для полей с дубликатами
+            showWarnings(data.duplicates || {});
         })
         .catch(error => {
-            // Обрабатываем ошибки сети
+            // Обрабатываем ошибки сети (при следующей потере фокуса проверка повторится)
+            lastCheckedValues = null;
             console.error('Ошибка проверки дубликатов:', error);
         });
     }
 
+    /**
+     * Обновление предупреждений под всеми полями
+     * @param {Object} duplicates - Предупреждения по полям {fieldName: message}
+     */
+    function showWarnings(duplicates) {
+        fieldsToCheck.forEach(function(fieldName) {
+            if (duplicates[fieldName]) {
+                showWarning(fieldName, duplicates[fieldName]);
+            } else {
+                clearWarning(fieldName);
+            }
+        });
+    }
+
     /**
      * Отображение предупреждения под конкретным полем
      * @param {string} fieldName - Название поля
@@ -10,25 +10,37 @@ window.addEventListener('load', function() {
     var productSelect = $('#id_product');
 
     if (productNameSelect.length && productSelect.length) {
+        // Карта "тип изделия → изделия", встроенная в страницу (если включена в настройках)
+        var productsMap = productNameSelect.data('products-map');
+
+        // Заполнение списка обозначений изделий
+        function fillProductSelect(data) {
+            // Очищаем и добавляем пустую опцию
+            productSelect.empty();
+            productSelect.append(new Option('---------', '', true, true));
+
+            // Добавляем полученные опции
+            data.forEach(function(item) {
+                productSelect.append(new Option(item.nomenclature, item.id));
+            });
+        }
+
         productNameSelect.on('select2:select', function(e) {
             var productTypeId = e.params.data.id;
 
+            // Список из встроенной карты - без запроса к серверу
+            if (productsMap) {
+                fillProductSelect(productsMap[productTypeId] || []);
+                return;
+            }
+
             $.ajax({
                 url: '/admin/get_products/',
                 method: 'GET',
                 data: {
                     'product_type_id': productTypeId
                 },
-                success: function(data) {
-                    // Очищаем и добавляем пустую опцию
-                    productSelect.empty();
-                    productSelect.append(new Option('---------', '', true, true));
-
-                    // Добавляем полученные опции
-                    data.forEach(function(item) {
-                        productSelect.append(new Option(item.nomenclature, item.id));
-                    });
-                }
+                success: fillProductSelect
             });
         });
     }
@@ -10,6 +10,7 @@ from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+from core.modules.stage_metrics import files_size, stage, timed_stage
 from reclamations.models import Reclamation
 from reports.config.paths import get_excel_exporter_path
 
@@ -238,8 +239,13 @@ class UniversalExcelExporter:
         if self.year and str(self.year) != "all":
             queryset = queryset.filter(year=self.year)
 
+        # Загружаем записи (prefetch_related все равно читает всю выборку сразу)
+        with stage("db") as timer:
+            reclamations = list(queryset)
+            timer.add_rows(len(reclamations))
+
         # Записываем данные
-        for row, reclamation in enumerate(queryset, 2):
+        for row, reclamation in enumerate(reclamations, 2):
             for col, field_key in enumerate(self.selected_fields, 1):
                 value = self._get_field_value(reclamation, field_key)
                 cell = self.ws.cell(row=row, column=col, value=value)
@@ -332,6 +338,7 @@ class UniversalExcelExporter:
             # Закрепляем первую строку (заголовки)
             self.ws.freeze_panes = "A2"
 
+    @timed_stage("excel")
     def export_to_excel(self):
         """Основной метод экспорта в файл Excel"""
 
@@ -344,5 +351,7 @@ class UniversalExcelExporter:
         self._apply_filter_and_freeze_row()  # Добавляем фильтры и закрепляем заголовок
 
         # Сохраняем файл на диск
-        self.wb.save(self.save_path)
+        with stage("file") as timer:
+            self.wb.save(self.save_path)
+            timer.add_bytes(files_size(self.save_path))
         return True
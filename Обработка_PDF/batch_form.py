@@ -0,0 +1,219 @@
+# импортируемый модуль batch_form.py (импортируется в main.py)
+
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from batch_processor import find_pdf_files, get_workers_count, run_batch
+from excel_handler import ExcelHandler
+
+
+class BatchForm:
+    """Окно пакетной обработки всех PDF файлов папки"""
+
+    POLL_INTERVAL = 100  # период проверки очереди результатов (мс)
+
+    def __init__(self, parent, config, folder, form):
+        self.parent = parent
+        self.config = config
+        self.folder = folder
+        self.form = form  # выбранная стандартная форма акта рекламации
+
+        self.fields = list(config['default_data'].keys())
+        self.pdf_files = find_pdf_files(folder)
+        self.results = {}  # {путь до файла: словарь данных или None при ошибке}
+
+        # Результаты из рабочего потока передаются в окно через очередь
+        self.queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.worker = None
+
+        self.create_form()
+
+        if not self.pdf_files:
+            messagebox.showinfo("Сообщение", f"В папке нет PDF файлов:\n{folder}", parent=self.window)
+            self.window.destroy()
+            return
+
+        self.start_processing()
+
+
+    def create_form(self):
+        """Создание окна пакетной обработки"""
+        self.window = tk.Toplevel(self.parent)
+        self.window.title(f"Пакетная обработка - {self.form}")
+        self.window.geometry("900x500")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.main_frame = ttk.Frame(self.window, padding="10")
+        self.main_frame.pack(fill='both', expand=True)
+
+        self.create_progress_frame()
+        self.create_table()
+        self.create_buttons()
+
+
+    def create_progress_frame(self):
+        """Создание строки с ходом обработки"""
+        progress_frame = ttk.Frame(self.main_frame)
+        progress_frame.pack(fill='x', pady=(0, 10))
+
+        self.progress_label = ttk.Label(progress_frame, text="", font=('TkDefaultFont', 10))
+        self.progress_label.pack(side='left', padx=(0, 10))
+
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=max(len(self.pdf_files), 1))
+        self.progress_bar.pack(side='left', fill='x', expand=True)
+
+
+    def create_table(self):
+        """Создание таблицы предпросмотра результатов (строка - файл, колонки - поля)"""
+        table_container = ttk.Frame(self.main_frame)
+        table_container.pack(fill='both', expand=True)
+
+        columns = ['Файл', 'Статус'] + self.fields
+        self.tree = ttk.Treeview(table_container, columns=columns, show='headings', style="Treeview")
+
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=150, stretch=False)
+
+        y_scrollbar = ttk.Scrollbar(table_container, orient='vertical', command=self.tree.yview)
+        x_scrollbar = ttk.Scrollbar(table_container, orient='horizontal', command=self.tree.xview)
+        self.tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+
+        y_scrollbar.pack(side='right', fill='y')
+        x_scrollbar.pack(side='bottom', fill='x')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        # Строки добавляются сразу для всех файлов и заполняются по мере готовности
+        self.tree_items = {}
+        for pdf_path in self.pdf_files:
+            self.tree_items[pdf_path] = self.tree.insert(
+                '', 'end', values=[os.path.basename(pdf_path), "в очереди"]
+            )
+
+
+    def create_buttons(self):
+        """Создание кнопок"""
+        button_frame = ttk.Frame(self.main_frame)
+        button_frame.pack(pady=(10, 0), fill='x')
+
+        self.save_button = ttk.Button(
+            button_frame,
+            text="Сохранить в Excel",
+            command=self.save_to_excel,
+            style='Custom.TButton',
+            state='disabled'
+        )
+        self.save_button.pack(side='right', padx=5)
+
+        self.close_button = ttk.Button(
+            button_frame,
+            text="Закрыть",
+            command=self.close,
+            style='Custom.TButton'
+        )
+        self.close_button.pack(side='left', padx=5)
+
+
+    def start_processing(self):
+        """Запуск обработки в рабочем потоке (окно остается отзывчивым)"""
+        workers = get_workers_count(len(self.pdf_files))
+        self.progress_label.config(text=f"Обработано: 0 из {len(self.pdf_files)} (процессов: {workers})")
+
+        self.worker = threading.Thread(target=self.process_files, daemon=True)
+        self.worker.start()
+        self.window.after(self.POLL_INTERVAL, self.poll_results)
+
+
+    def process_files(self):
+        """Рабочий поток: получает результаты из пула процессов по мере готовности"""
+        try:
+            for result in run_batch(self.pdf_files, self.form):
+                self.queue.put(('result', result))
+                if self.stop_event.is_set():
+                    break  # выход из генератора отменяет не начатые задачи
+        except Exception as e:
+            self.queue.put(('error', str(e)))
+        finally:
+            self.queue.put(('done', None))
+
+
+    def poll_results(self):
+        """Перенос готовых результатов из очереди в таблицу"""
+        if not self.window.winfo_exists():
+            return
+
+        done = False
+        while True:
+            try:
+                kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'result':
+                self.show_result(*payload)
+            elif kind == 'error':
+                messagebox.showerror("Ошибка", payload, parent=self.window)
+            else:
+                done = True
+
+        if done:
+            self.finish_processing()
+        else:
+            self.window.after(self.POLL_INTERVAL, self.poll_results)
+
+
+    def show_result(self, pdf_path, data, error):
+        """Вывод результата одного файла в таблицу"""
+        self.results[pdf_path] = data
+
+        if error:
+            values = [os.path.basename(pdf_path), f"ошибка: {error}"]
+        else:
+            values = [os.path.basename(pdf_path), "готово"] + [data.get(field, '') for field in self.fields]
+        self.tree.item(self.tree_items[pdf_path], values=values)
+
+        self.progress_bar['value'] = len(self.results)
+        self.progress_label.config(text=f"Обработано: {len(self.results)} из {len(self.pdf_files)}")
+
+
+    def finish_processing(self):
+        """Окончание обработки всех файлов"""
+        found = sum(1 for data in self.results.values() if data)
+        self.progress_label.config(
+            text=f"Обработано: {len(self.results)} из {len(self.pdf_files)}, распознано: {found}"
+        )
+        if found:
+            self.save_button.config(state='normal')
+
+
+    def save_to_excel(self):
+        """Запись всех распознанных актов в ЖУРНАЛ УЧЕТА одной операцией"""
+        # Записываем в порядке имен файлов, ошибочные файлы пропускаем
+        rows = [self.results[pdf_path] for pdf_path in self.pdf_files if self.results.get(pdf_path)]
+
+        try:
+            self.window.config(cursor='watch')
+            self.window.update()
+
+            ExcelHandler(self.config['excel_path']).write_rows(rows)
+
+            messagebox.showinfo(
+                "Сообщение", f"В ЖУРНАЛ УЧЕТА сохранено строк: {len(rows)}", parent=self.window
+            )
+            self.save_button.config(state='disabled')
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", str(e), parent=self.window)
+
+        finally:
+            self.window.config(cursor='')
+
+
+    def close(self):
+        """Закрытие окна (незавершенная обработка прерывается)"""
+        self.stop_event.set()
+        self.window.destroy()
@@ -0,0 +1,124 @@
+# импортируемый модуль batch_processor.py (импортируется в batch_form.py, можно запускать из командной строки)
+"""
+Пакетная обработка актов рекламаций: все PDF файлы папки распознаются параллельно
+в пуле процессов (по числу ядер процессора), результаты записываются в ЖУРНАЛ УЧЕТА
+одной операцией.
+
+Запуск из командной строки:
+    python batch_processor.py "D:/Акты" --form "Группа ГАЗ"
+    python batch_processor.py "D:/Акты" --form "Ростсельмаш" --workers 4 --save
+"""
+
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import freeze_support
+
+from pdf_processor_2image import PDFProcessorYMZ, PDFProcessorRSM
+from excel_handler import ExcelHandler
+
+
+# Формы актов, которые распознаются автоматически (формы МАЗ и Другая заполняются вручную)
+BATCH_PROCESSORS = {
+    "Группа ГАЗ": PDFProcessorYMZ,
+    "Ростсельмаш": PDFProcessorRSM,
+}
+
+
+def find_pdf_files(folder):
+    """Список PDF файлов папки (без вложенных папок), отсортированный по имени"""
+    return sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.lower().endswith('.pdf') and os.path.isfile(os.path.join(folder, name))
+    )
+
+
+def get_workers_count(files_count, workers=None):
+    """Число процессов пула: по числу ядер, но не больше числа файлов"""
+    workers = workers or os.cpu_count() or 1
+    return max(1, min(workers, files_count))
+
+
+def process_pdf(pdf_path, form):
+    """
+    Распознавание одного PDF файла (выполняется в отдельном процессе пула)
+    Returns (tuple): (путь до файла, словарь данных, текст ошибки или None)
+    """
+    try:
+        processor = BATCH_PROCESSORS[form](pdf_path)
+        data = processor.extract_data()
+
+        # extract_data при ошибке возвращает {"Ошибка": текст}
+        if "Ошибка" in data:
+            return pdf_path, None, data["Ошибка"]
+
+        return pdf_path, data, None
+
+    except Exception as e:
+        return pdf_path, None, str(e)
+
+
+def run_batch(pdf_files, form, workers=None):
+    """
+    Параллельная обработка списка PDF файлов.
+    Генератор: результаты process_pdf возвращаются по мере готовности (а не в порядке списка).
+    """
+    if form not in BATCH_PROCESSORS:
+        raise ValueError(f"Пакетная обработка недоступна для формы: {form}")
+
+    if not pdf_files:
+        return
+
+    executor = ProcessPoolExecutor(max_workers=get_workers_count(len(pdf_files), workers))
+    futures = [executor.submit(process_pdf, pdf_path, form) for pdf_path in pdf_files]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # При прерывании обработки отменяем еще не начатые задачи
+        # (shutdown(cancel_futures=True) недоступен в Python 3.8 для Windows 7)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def main():
+    """Пакетная обработка из командной строки"""
+    parser = argparse.ArgumentParser(description="Пакетная обработка PDF актов рекламаций")
+    parser.add_argument("folder", help="папка с PDF файлами актов")
+    parser.add_argument(
+        "--form", default="Группа ГАЗ", choices=list(BATCH_PROCESSORS),
+        help="стандартная форма акта рекламации"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию - по числу ядер)")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты в ЖУРНАЛ УЧЕТА")
+    args = parser.parse_args()
+
+    pdf_files = find_pdf_files(args.folder)
+    if not pdf_files:
+        print(f"В папке {args.folder} нет PDF файлов")
+        return
+
+    print(f"Файлов: {len(pdf_files)}, процессов: {get_workers_count(len(pdf_files), args.workers)}")
+
+    results = {}
+    for number, (pdf_path, data, error) in enumerate(run_batch(pdf_files, args.form, args.workers), start=1):
+        results[pdf_path] = data
+        status = f"ошибка: {error}" if error else json.dumps(data, ensure_ascii=False)
+        print(f"[{number}/{len(pdf_files)}] {os.path.basename(pdf_path)} - {status}")
+
+    # Записываем в порядке имен файлов, ошибочные файлы пропускаем
+    rows = [results[pdf_path] for pdf_path in pdf_files if results.get(pdf_path)]
+
+    if args.save and rows:
+        with open('config.json', 'r', encoding='utf-8') as file:
+            config = json.load(file)
+        ExcelHandler(config['excel_path']).write_rows(rows)
+        print(f"В ЖУРНАЛ УЧЕТА записано строк: {len(rows)}")
+
+
+if __name__ == "__main__":
+    freeze_support()
+    main()
@@ -0,0 +1,116 @@
+# импортируемый модуль excel_backend.py (импортируется в excel_handler.py и invoice_processor.py)
+"""
+Способы работы с ЖУРНАЛОМ УЧЕТА (выбираются в config.json, "excel_backend"):
+
+    "xlwings"  - открытая в Excel книга (активный лист активной книги), как раньше.
+                 Данные читаются и записываются блоками (одно обращение к Excel на диапазон),
+                 а не по одной ячейке.
+    "openpyxl" - файл журнала по пути excel_path без запуска Excel (можно запускать на сервере).
+                 Книга на время записи не должна быть открыта в Excel.
+
+Оба класса имеют одинаковый набор методов, поэтому ExcelHandler и InvoiceProcessor
+не зависят от выбранного способа.
+"""
+
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+from openpyxl.utils import column_index_from_string
+
+
+YELLOW = (255, 255, 0)  # RGB для желтого
+
+
+class XlwingsBackend:
+    """Работа с открытой в Excel книгой через xlwings"""
+
+    def __init__(self, excel_path):
+        import xlwings as xw  # xlwings нужен только для этого способа (Windows с установленным Excel)
+
+        self.excel_path = excel_path
+        self.wb = xw.books.active
+        self.sheet = self.wb.sheets.active
+
+    def read_columns(self, first_col, last_col):
+        """
+        Значения столбцов first_col..last_col всех строк листа одним обращением к Excel
+        Returns (list): список строк, строка - список значений (индекс 0 - строка 1 листа)
+        """
+        last_row = self.sheet.used_range.last_cell.row
+        return self.sheet.range((1, first_col), (last_row, last_col)).options(ndim=2).value
+
+    def write_block(self, row, col, block):
+        """Запись блока значений (список строк), левая верхняя ячейка - (row, col)"""
+        self.sheet.range((row, col)).value = block
+
+    def fill_rows(self, first_row, last_row, color=YELLOW):
+        """Заливка строк цветом (столбцы B:BP)"""
+        self.sheet.range(f"B{first_row}:BP{last_row}").color = color
+
+    def save(self):
+        self.wb.save()
+
+
+class OpenpyxlBackend:
+    """Работа с файлом журнала через openpyxl (без Excel)"""
+
+    def __init__(self, excel_path):
+        self.excel_path = excel_path
+        # Для .xlsm сохраняем макросы книги
+        self.wb = load_workbook(excel_path, keep_vba=excel_path.lower().endswith('.xlsm'))
+        self.sheet = self.wb.active
+
+    def read_columns(self, first_col, last_col):
+        """
+        Значения столбцов first_col..last_col всех строк листа (один проход по строкам)
+        Returns (list): список строк, строка - список значений (индекс 0 - строка 1 листа)
+        """
+        return [
+            list(values)
+            for values in self.sheet.iter_rows(min_col=first_col, max_col=last_col, values_only=True)
+        ]
+
+    def write_block(self, row, col, block):
+        """Запись блока значений (список строк), левая верхняя ячейка - (row, col)"""
+        for row_offset, values in enumerate(block):
+            for col_offset, value in enumerate(values):
+                self.sheet.cell(row=row + row_offset, column=col + col_offset, value=value)
+
+    def fill_rows(self, first_row, last_row, color=YELLOW):
+        """Заливка строк цветом (столбцы B:BP)"""
+        rgb = '{:02X}{:02X}{:02X}'.format(*color)
+        fill = PatternFill(start_color=rgb, end_color=rgb, fill_type='solid')
+        for row in self.sheet.iter_rows(
+            min_row=first_row, max_row=last_row,
+            min_col=column_index_from_string('B'), max_col=column_index_from_string('BP')
+        ):
+            for cell in row:
+                cell.fill = fill
+
+    def save(self):
+        self.wb.save(self.excel_path)
+
+
+EXCEL_BACKENDS = {
+    "xlwings": XlwingsBackend,
+    "openpyxl": OpenpyxlBackend,
+}
+
+
+def get_excel_backend(excel_path, backend="xlwings"):
+    """Объект для работы с журналом выбранным способом"""
+    if backend not in EXCEL_BACKENDS:
+        raise ValueError(f"Неизвестный способ работы с Excel: {backend} (допустимо: {', '.join(EXCEL_BACKENDS)})")
+    return EXCEL_BACKENDS[backend](excel_path)
+
+
+def find_last_filled_row(rows, columns, first_col):
+    """
+    Номер последней строки листа, в которой заполнены все указанные столбцы
+    rows: результат read_columns, first_col - номер первого прочитанного столбца
+    """
+    indexes = [col - first_col for col in columns]
+    last_row = 1
+    for row, values in enumerate(rows, start=1):
+        if all(values[index] for index in indexes):
+            last_row = row
+    return last_row
@@ -1,8 +1,9 @@
 # импортируемый модуль excel_handler.py
 
-import xlwings as xw
 import json
 
+from excel_backend import get_excel_backend, find_last_filled_row
+
 
 class ExcelHandler:
     def __init__(self, excel_path):
@@ -12,6 +13,7 @@ class ExcelHandler:
         with open('config.json', 'r', encoding='utf-8') as file:
             config = json.load(file)
             self.fields = list(config['default_data'].keys())
+            self.backend = config.get('excel_backend', 'xlwings')  # способ работы с журналом (excel_backend.py)
 
         # Номера столбцов в базе ОТК для соответствующих полей
         self.columns = [5, 13, 14, 15, 16, 19, 20, 21, 24, 25, 26]
@@ -19,29 +21,99 @@ class ExcelHandler:
         # Создаем словарь соответствия динамически
         self.column_mapping = dict(zip(self.fields, self.columns))
 
+        # Группы соседних столбцов (каждая группа записывается одним блоком)
+        self.column_groups = []
+        for field, column in sorted(self.column_mapping.items(), key=lambda item: item[1]):
+            if self.column_groups and self.column_groups[-1][-1][1] == column - 1:
+                self.column_groups[-1].append((field, column))
+            else:
+                self.column_groups.append([(field, column)])
+
     def write_data(self, data):
         """Запись данных в Excel"""
         try:
-            # Получаем активную книгу
-            wb = xw.books.active
-            sheet = wb.sheets.active
+            sheet = get_excel_backend(self.excel_path, self.backend)
 
-            # Ищем последнюю заполненную строку
-            last_row = 1
-            for row in range(1, sheet.used_range.last_cell.row + 1):
-                if all(sheet.cells(row, col).value for col in [7, 8, 9]):
-                    last_row = row
+            # Ищем последнюю заполненную строку (столбцы 7-9 читаются одним блоком)
+            last_row = find_last_filled_row(sheet.read_columns(7, 9), [7, 8, 9], first_col=7)
 
             # Записываем данные в нужные ячейки
-            for field, column in self.column_mapping.items():
-                sheet.cells(last_row, column).value = data[field]
+            self.write_groups(sheet, last_row, [data])
 
             # Заливаем строку желтым цветом
-            range_to_fill = sheet.range(f"B{last_row}:BP{last_row}")
-            range_to_fill.color = (255, 255, 0)  # RGB для желтого
+            sheet.fill_rows(last_row, last_row)
 
             # Сохраняем изменения
-            wb.save()
+            sheet.save()
 
         except Exception as e:
             raise Exception(f"Ошибка при сохранении в ЖУРНАЛ УЧЕТА: {str(e)}")
+
+    def write_rows(self, rows):
+        """
+        Пакетная запись нескольких строк данных в Excel (блоками столбцов, а не по ячейкам)
+        rows (list): Список словарей данных (по одному на акт рекламации)
+        Как и write_data, данные записываются в строки, заранее зарегистрированные в журнале
+        (заполнены столбцы 7-9): по порядку в свободные зарегистрированные строки после
+        последней строки с данными акта. Если таких строк меньше, чем актов - ничего не записывается.
+        Записанные строки заливаются желтым цветом
+        """
+        try:
+            if not rows:
+                return
+
+            sheet = get_excel_backend(self.excel_path, self.backend)
+
+            first_col = min(self.columns + [7])
+            last_col = max(self.columns + [9])
+
+            # Читаем заполненную часть журнала одним обращением (вместо чтения по ячейкам)
+            values = sheet.read_columns(first_col, last_col)
+
+            def is_filled(row_values, columns):
+                return [row_values[col - first_col] not in (None, '') for col in columns]
+
+            # Последняя строка, в которой уже есть данные акта
+            last_data_row = 0
+            for row in range(len(values), 0, -1):
+                if any(is_filled(values[row - 1], self.columns)):
+                    last_data_row = row
+                    break
+
+            # Свободные зарегистрированные строки после нее (по порядку)
+            free_rows = [
+                row
+                for row in range(last_data_row + 1, len(values) + 1)
+                if all(is_filled(values[row - 1], [7, 8, 9]))
+            ][:len(rows)]
+
+            if len(free_rows) < len(rows):
+                raise ValueError(
+                    f"в журнале зарегистрировано свободных строк: {len(free_rows)}, "
+                    f"а актов для записи: {len(rows)}"
+                )
+
+            # Записываем строки блоками: подряд идущие строки - одной операцией на группу столбцов
+            runs = []
+            for row, data in zip(free_rows, rows):
+                if runs and runs[-1][0] + len(runs[-1][1]) == row:
+                    runs[-1][1].append(data)
+                else:
+                    runs.append((row, [data]))
+
+            for start_row, run_rows in runs:
+                self.write_groups(sheet, start_row, run_rows)
+                # Заливаем строки желтым цветом
+                sheet.fill_rows(start_row, start_row + len(run_rows) - 1)
+
+            # Сохраняем изменения
+            sheet.save()
+
+        except Exception as e:
+            raise Exception(f"Ошибка при сохранении в ЖУРНАЛ УЧЕТА: {str(e)}")
+
+    def write_groups(self, sheet, start_row, rows):
+        """Запись строк данных начиная со start_row: одна операция записи на группу соседних столбцов"""
+        for group in self.column_groups:
+            block = [[data.get(field, '') for field, _ in group] for data in rows]
+            sheet.write_block(start_row, group[0][1], block)
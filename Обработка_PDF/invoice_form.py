@@ -217,7 +217,7 @@ class InvoiceForm:
                     raise ValueError("Необходимо указать дату накладной")
 
                 # Создаем процессор и проверяем данные
-                self.processor = InvoiceProcessor(self.config['excel_path'])
+                self.processor = InvoiceProcessor(self.config['excel_path'], self.config.get('excel_backend', 'xlwings'))
                 found_rows = self.processor.find_rows(claim_numbers)
 
                 # Закрываем окно индикации
@@ -1,14 +1,21 @@
 # импортируемый модуль invoice_processor.py (импортируется в invoice_form.py)
 
-import xlwings as xw
 from datetime import datetime
 
+from excel_backend import get_excel_backend, find_last_filled_row
+
 
 class InvoiceProcessor:
-    def __init__(self, excel_path):
+    # Столбцы журнала: 7-9 - признак заполненной строки, 13 и 17 - номера актов рекламации,
+    # 36 и 37 - номер и дата накладной
+    FILLED_COLUMNS = [7, 8, 9]
+    CLAIM_COLUMNS = [13, 17]
+    INVOICE_COLUMN = 36
+
+    def __init__(self, excel_path, backend='xlwings'):
         self.excel_path = excel_path
+        self.backend = backend  # способ работы с журналом (excel_backend.py)
         self.found_rows = []  # Список для хранения найденных строк
-        self.wb = None
         self.sheet = None
         self.initialize_workbook()
 
@@ -16,8 +23,7 @@ class InvoiceProcessor:
     def initialize_workbook(self):
         """Инициализация рабочей книги"""
         try:
-            self.wb = xw.books.active
-            self.sheet = self.wb.sheets.active
+            self.sheet = get_excel_backend(self.excel_path, self.backend)
         except Exception as e:
             raise Exception(f"Ошибка при инициализации Excel: {str(e)}")
 
@@ -31,22 +37,23 @@ class InvoiceProcessor:
         try:
             self.found_rows = []
 
+            # Читаем столбцы 7-17 всех строк одним обращением (вместо чтения по ячейкам)
+            first_col = self.FILLED_COLUMNS[0]
+            values = self.sheet.read_columns(first_col, max(self.CLAIM_COLUMNS))
+
             # Ищем последнюю заполненную строку
-            last_row = 1
-            for row in range(1, self.sheet.used_range.last_cell.row + 1):
-                if all(self.sheet.cells(row, col).value for col in [7, 8, 9]):
-                    last_row = row
+            last_row = find_last_filled_row(values, self.FILLED_COLUMNS, first_col)
 
             # Преобразуем номера актов в строки без десятичной части
             claim_numbers = {str(num).split('.')[0] for num in claim_numbers}
 
-            # Ищем строки в столбцах 13 и 17 по номерам актов
-            for row in range(1, last_row + 1):
+            # Ищем строки в столбцах 13 и 17 по номерам актов (проверка по множеству номеров)
+            indexes = [col - first_col for col in self.CLAIM_COLUMNS]
+            for row, row_values in enumerate(values[:last_row], start=1):
                 # Получаем значения и преобразуем их в строки без десятичной части
-                cell_value_13 = str(self.sheet.cells(row, 13).value or '').split('.')[0].strip()
-                cell_value_14 = str(self.sheet.cells(row, 17).value or '').split('.')[0].strip()
+                cell_values = {str(row_values[index] or '').split('.')[0].strip() for index in indexes}
 
-                if cell_value_13 in claim_numbers or cell_value_14 in claim_numbers:
+                if not cell_values.isdisjoint(claim_numbers):
                     self.found_rows.append(row)
 
             return len(self.found_rows)
@@ -68,20 +75,31 @@ class InvoiceProcessor:
             if not self.found_rows:
                 raise ValueError("Нет найденных строк для сохранения")
 
-            # Обновляем данные в найденных строках
-            for row in self.found_rows:
-                # Записываем номер накладной в столбец 36
-                self.sheet.cells(row, 36).value = invoice_number
-                # Записываем дату накладной в столбец 37
-                self.sheet.cells(row, 37).value = invoice_date
+            # Обновляем данные в найденных строках:
+            # номер и дата накладной (столбцы 36-37) записываются одним блоком на каждый диапазон соседних строк
+            for start_row, rows_count in self.group_rows(self.found_rows):
+                block = [[invoice_number, invoice_date]] * rows_count
+                self.sheet.write_block(start_row, self.INVOICE_COLUMN, block)
 
             # Сохраняем изменения
-            self.wb.save()
+            self.sheet.save()
 
         except Exception as e:
             raise Exception(f"Ошибка при сохранении данных: {str(e)}")
 
 
+    @staticmethod
+    def group_rows(rows):
+        """Разбиение номеров строк на диапазоны соседних строк: [(первая строка, количество строк), ...]"""
+        groups = []
+        for row in sorted(rows):
+            if groups and groups[-1][0] + groups[-1][1] == row:
+                groups[-1][1] += 1
+            else:
+                groups.append([row, 1])
+        return [tuple(group) for group in groups]
+
+
     @staticmethod
     def validate_date(date_str):
         """Проверка корректности даты"""
@@ -2,6 +2,7 @@
 
 import os
 import json
+from multiprocessing import freeze_support
 import tkinter as tk
 from tkinter import filedialog, ttk, scrolledtext, messagebox
 from tkinterdnd2 import *
@@ -12,6 +13,8 @@ from pdf_processor_2image import (
     )
 from excel_handler import ExcelHandler
 from invoice_form import InvoiceForm
+from batch_form import BatchForm
+from batch_processor import BATCH_PROCESSORS
 
 
 class MainApplication:
@@ -93,6 +96,14 @@ class MainApplication:
         )
         self.process_button.pack(side='left', padx=5)
 
+        self.batch_button = ttk.Button(
+            self.button_frame,
+            text="Пакетная обработка",
+            command=self.select_batch_folder,
+            style='Custom.TButton'
+        )
+        self.batch_button.pack(side='left', padx=5)
+
         # Создаем фрейм для чек-боксов (правая часть)
         self.checkbox_frame = ttk.LabelFrame(
             self.top_frame,
@@ -637,12 +648,28 @@ class MainApplication:
         )
 
 
+    def select_batch_folder(self):
+        """Выбор папки с PDF файлами для пакетной обработки"""
+        selected_form = self.selected_form.get()
+        if selected_form not in BATCH_PROCESSORS:
+            messagebox.showerror(
+                "Ошибка",
+                f"Пакетная обработка доступна только для форм: {', '.join(BATCH_PROCESSORS)}"
+            )
+            return
+
+        folder = filedialog.askdirectory(title="Выберите папку с PDF файлами актов")
+        if folder:
+            BatchForm(self.root, self.config, folder, selected_form)
+
+
     def open_invoice_form(self):
         """Открытие формы для ввода данных накладной"""
         InvoiceForm(self.root, self.config)
 
 
 if __name__ == "__main__":
+    freeze_support()  # для пула процессов пакетной обработки в exe (PyInstaller)
     root = TkinterDnD.Tk()  # Вместо tk.Tk()
     app = MainApplication(root)
     root.mainloop()
@@ -0,0 +1,109 @@
+# импортируемый модуль ocr_cache.py (импортируется в pdf_processor_2image.py)
+"""
+Дисковый кэш результатов распознавания PDF.
+
+Ключ записи - SHA-256 содержимого PDF файла + класс процессора + параметры предобработки
+(язык OCR, флаг улучшения качества, версия алгоритма). Поэтому повторная обработка
+того же акта (в том числе переименованного или скопированного в другую папку)
+возвращает распознанный текст и извлеченные данные без повторного OCR.
+
+Каждая запись хранится в отдельном JSON файле папки кэша. Время изменения файла
+обновляется при каждом чтении, и при превышении максимального размера папки
+удаляются записи, которые дольше всего не использовались (LRU).
+Запись идет через временный файл, поэтому кэшем могут одновременно пользоваться
+несколько процессов пакетной обработки.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 содержимого файла (файл читается частями)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """Кэш результатов распознавания в папке на диске с вытеснением по размеру (LRU)"""
+
+    def __init__(self, folder, max_size_mb=200):
+        self.folder = folder  # папка кэша
+        self.max_size = int(max_size_mb * 1024 * 1024)  # максимальный размер папки кэша (байт)
+
+    @staticmethod
+    def make_key(*parts):
+        """Ключ записи из частей (хэш документа, класс процессора, параметры обработки)"""
+        return hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.folder, f"{key}.json")
+
+    def get(self, key):
+        """Значение записи или None, если записи нет (ошибки чтения кэша не прерывают обработку)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                value = json.load(file)
+            os.utime(path)  # отмечаем использование записи для LRU
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        """Сохранение записи с последующим вытеснением старых записей при переполнении"""
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.folder)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(value, file, ensure_ascii=False)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self.evict()
+
+        except OSError:
+            pass  # кэш необязателен: при ошибке записи обработка продолжается без него
+
+    def evict(self):
+        """Удаление давно не использованных записей, пока размер кэша больше максимального"""
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # запись могла удалить другой процесс
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def clear(self):
+        """Полная очистка кэша"""
+        if not os.path.isdir(self.folder):
+            return
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith('.json'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
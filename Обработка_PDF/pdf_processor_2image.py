@@ -1,6 +1,8 @@
 # импортируемый модуль pdf_processor.py
 
 import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pdf2image import convert_from_path
 import pytesseract
 import re
@@ -8,6 +10,8 @@ from PIL import Image
 import cv2
 import numpy as np
 
+from ocr_cache import OCRCache, file_sha256
+
 
 class PDFProcessingError(Exception):
     """Пользовательское исключение для обработки ошибок PDF"""
@@ -21,6 +25,16 @@ class ExcelError(Exception):
 class PDFProcessor:
     """Базовый класс для обработки PDF документов"""
 
+    # Версия алгоритма распознавания (входит в ключ кэша OCR).
+    # Увеличивается при изменении предобработки изображения или разбора текста,
+    # чтобы не использовать результаты, сохраненные в кэше старым алгоритмом
+    CACHE_VERSION = 3
+
+    # Поля, которые извлекаются распознаванием (переопределяется в дочерних классах).
+    # Если по шаблону областей (ocr_layouts) найдены не все эти поля (или значение не прошло проверку
+    # validate_region_value) - выполняется распознавание всей страницы
+    OCR_FIELDS = ()
+
     def __init__(self, pdf_path, lang='rus'):
         self.pdf_path = pdf_path
         self.lang = lang  # язык для распознавания OCR
@@ -28,7 +42,21 @@ class PDFProcessor:
         # Словарь для хранения извлеченных данных загружаем из config.json
         with open('config.json', 'r', encoding='utf-8') as file:
             config = json.load(file)
-            self.data = config['default_data'].copy()
+            self.default_data = config['default_data']
+            self.data = self.default_data.copy()
+            self.engine_models = config.get('engine_models', [])  # известные модели двигателей
+
+        # Дисковый кэш результатов распознавания (отключается в config.json: "enabled": false)
+        cache_config = config.get('ocr_cache', {})
+        self.cache = None
+        if cache_config.get('enabled', True):
+            self.cache = OCRCache(cache_config.get('folder', 'ocr_cache'), cache_config.get('max_size_mb', 200))
+        self.file_hash = None  # SHA-256 содержимого PDF (вычисляется при первом обращении к кэшу)
+
+        # Шаблон областей полей на странице для формы акта (распознаются только эти области).
+        # По умолчанию шаблонов нет: ocr_layouts_draft в config.json - не выверенные по сканам образцы
+        self.layout = config.get('ocr_layouts', {}).get(type(self).__name__, [])
+        self.page_image = None  # изображение первой страницы (конвертируется из PDF один раз)
 
         # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -114,26 +142,139 @@ class PDFProcessor:
             raise PDFProcessingError(f"Ошибка при улучшении качества изображения: {str(e)}")
 
 
+    def cache_key(self, *params):
+        """
+        Ключ кэша OCR: хэш содержимого PDF + класс процессора + параметры обработки
+        Returns: ключ или None, если кэш отключен или файл недоступен
+        """
+        if self.cache is None:
+            return None
+
+        try:
+            if self.file_hash is None:
+                self.file_hash = file_sha256(self.pdf_path)
+        except OSError:
+            return None
+
+        return OCRCache.make_key(self.file_hash, type(self).__name__, self.lang, self.CACHE_VERSION, *params)
+
+
     def get_raw_text(self, enhance_quality=False):
         """
-        Общий метод получения необработанного текста из PDF
+        Общий метод получения необработанного текста из PDF (с использованием кэша OCR)
         enhance_quality: Флаг для применения расширенной обработки изображения
         """
-        try:
+        key = self.cache_key('text', enhance_quality)
+        if key:
+            text = self.cache.get(key)
+            if text is not None:
+                return text
+
+        text = self.recognize_text(enhance_quality)
+
+        if key:
+            self.cache.set(key, text)
+        return text
+
+
+    def get_page_image(self):
+        """Изображение первой страницы PDF (конвертируется один раз для всех проходов распознавания)"""
+        if self.page_image is None:
             # Конвертируем только первую страницу PDF
             images = convert_from_path(self.pdf_path, first_page=1, last_page=1)
 
             if not images:
                 raise PDFProcessingError("Не удалось получить изображения из PDF")
 
+            self.page_image = images[0]
+
+        return self.page_image
+
+
+    def recognize_region(self, image, region):
+        """
+        Распознавание одной области страницы по шаблону
+        region: {"bbox": [x0, y0, x1, y1] в долях ширины/высоты страницы, "psm": режим сегментации,
+                 "whitelist": допустимые символы, "fields": {поле: регулярное выражение с группой}}
+        Returns (dict): {поле: значение} для полей, найденных в области
+        """
+        width, height = image.size
+        x0, y0, x1, y1 = region['bbox']
+        crop = image.crop((int(x0 * width), int(y0 * height), int(x1 * width), int(y1 * height)))
+
+        config = f"--psm {region.get('psm', 6)}"
+        if region.get('whitelist'):
+            config += f" -c tessedit_char_whitelist={region['whitelist']}"
+
+        text = pytesseract.image_to_string(crop, lang=self.lang, config=config)
+
+        found = {}
+        for field, pattern in region['fields'].items():
+            match = re.search(pattern, text, re.DOTALL)
+            if match and match.group(1).strip():
+                value = self.format_region_value(field, match.group(1).strip())
+                # Значение из смещенной области не записываем - поле возьмется из всей страницы
+                if self.validate_region_value(field, value):
+                    found[field] = value
+        return found
+
+
+    def extract_regions(self):
+        """
+        Распознавание областей полей по шаблону формы (области распознаются параллельно в потоках,
+        каждый поток запускает отдельный процесс Tesseract)
+        Returns (dict): {поле: значение} для найденных полей
+        """
+        if not self.layout:
+            return {}
+
+        processed_image = self.preprocess_image(self.get_page_image())
+
+        found = {}
+        with ThreadPoolExecutor(max_workers=len(self.layout)) as executor:
+            for region_found in executor.map(lambda region: self.recognize_region(processed_image, region), self.layout):
+                for field, value in region_found.items():
+                    found.setdefault(field, value)
+        return found
+
+
+    def format_region_value(self, field, value):
+        """Приведение значения, найденного в области, к виду как при разборе всего текста"""
+        return value
+
+
+    def validate_region_value(self, field, value):
+        """Проверка значения из области теми же правилами, что и при разборе всего текста"""
+        return True
+
+
+    def layout_signature(self):
+        """Хэш шаблона областей (входит в ключ кэша: изменение шаблона в config.json сбрасывает кэш)"""
+        layout_json = json.dumps(self.layout, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(layout_json.encode('utf-8')).hexdigest()
+
+
+    def parse_full_page(self, enhance_quality, region_data):
+        """Распознавание всей страницы; значения, найденные по областям и прошедшие проверку, не перезаписываются"""
+        text = self.get_raw_text(enhance_quality=enhance_quality)
+        self.parse_text(text)
+        self.data.update(region_data)
+
+
+    def recognize_text(self, enhance_quality=False):
+        """
+        Распознавание текста первой страницы PDF (без кэша)
+        enhance_quality: Флаг для применения расширенной обработки изображения
+        """
+        try:
             if enhance_quality:
                 # Улучшаем качество изображения
-                enhanced_image = self.enhance_image_quality(images[0])
+                enhanced_image = self.enhance_image_quality(self.get_page_image())
                 # Применяем предобработку с улучшением качества
                 processed_image = self.preprocess_image(enhanced_image, enhance_quality=True)
             else:
                 # Обычная предобработка
-                processed_image = self.preprocess_image(images[0])
+                processed_image = self.preprocess_image(self.get_page_image())
 
             # Распознаем текст
             text = pytesseract.image_to_string(processed_image, lang=self.lang)
@@ -192,15 +333,31 @@ class PDFProcessor:
     def extract_data(self):
         """Общий метод извлечения структурированных данных из распознанного текста"""
         try:
-            # Получаем текст с обычной обработкой
-            text = self.get_raw_text(enhance_quality=False)
-            self.parse_text(text)
-
-            # Если много "Не найдено", пробуем расширенную обработку
-            if self.count_not_found() > 4:
-                text = self.get_raw_text(enhance_quality=True)
-                self.parse_text(text)
-
+            # Данные уже извлекались из этого файла - берем из кэша без распознавания
+            key = self.cache_key('data', self.layout_signature())
+            if key:
+                cached_data = self.cache.get(key)
+                if cached_data is not None:
+                    self.data.update(cached_data)
+                    return self.data
+
+            # Сначала распознаем только области полей по шаблону формы
+            region_data = self.extract_regions()
+            self.data.update(region_data)
+
+            # Всю страницу распознаем, только если по областям найдены не все поля
+            if not self.layout or any(field not in region_data for field in self.OCR_FIELDS):
+                # Получаем текст с обычной обработкой
+                self.parse_full_page(False, region_data)
+
+                # Если много "Не найдено", пробуем расширенную обработку
+                if self.count_not_found() > 4:
+                    self.parse_full_page(True, region_data)
+
+            if key:
+                # В кэш сохраняем только извлеченные значения (значения по умолчанию берутся из config.json)
+                extracted = {field: value for field, value in self.data.items() if value != self.default_data.get(field)}
+                self.cache.set(key, extracted)
             return self.data
 
         except Exception as e:
@@ -218,6 +375,11 @@ class PDFProcessorYMZ(PDFProcessor):
     MILEAGE_PATTERN = r'Дата начала гарант.*?(\d{2}.\d{2}.\d{4})\s*[^0-9]*(\d{4,7})[^0-9]'
     # MILEAGE_PATTERN = r'Дата начала гарантии.*?(\d{2}.\d{2}.\d{4}).*?[\n\s](\d{4,7})[\s|]'
 
+    OCR_FIELDS = (
+        "Номер акта рекламации", "Дата акта", "Сервисное предприятие",
+        "Модель двигателя", "Номер двигателя", "Пробег/наработка"
+    )
+
 
     def __init__(self, pdf_path):
         super().__init__(pdf_path, lang='rus')
@@ -269,6 +431,33 @@ class PDFProcessorYMZ(PDFProcessor):
                 self.data["Пробег/наработка"] = f'{mileage} км'
 
 
+    def format_region_value(self, field, value):
+        """Пробег из области записываем так же, как при разборе всего текста"""
+        if field == "Пробег/наработка":
+            return f'{value} км'
+        return value
+
+
+    def validate_region_value(self, field, value):
+        """Значение из области принимается, только если оно проходит правила parse_text"""
+        if field == "Номер акта рекламации":
+            return value.isdigit()
+        if field == "Дата акта":
+            return re.fullmatch(r'\d{2}.\d{2}.\d{4}', value) is not None
+        if field == "Сервисное предприятие":
+            return len(value) <= 30
+        if field in ("Модель двигателя", "Номер двигателя"):
+            # Группа должна пройти фильтр групп ENGINE_PATTERN без изменений
+            if self.filter_groups([value]) != [value] or not any(c.isdigit() for c in value):
+                return False
+            if field == "Модель двигателя" and self.engine_models:
+                return value in self.engine_models
+            return True
+        if field == "Пробег/наработка":
+            return re.fullmatch(r'\d{1,7} км', value) is not None
+        return True
+
+
 class PDFProcessorRSM(PDFProcessor):
     """Класс для обработки формы РСМ"""
 
@@ -286,6 +475,8 @@ class PDFProcessorRSM(PDFProcessor):
     # Паттерн для транспортного средства
     VEHICLE_PATTERN = r'((?:NOVA|KSU|ACROS).*?)(?=\sR[0O])'
 
+    OCR_FIELDS = ("Номер акта рекламации", "Дата акта", "Сервисное предприятие", "Транспортное средство")
+
     def __init__(self, pdf_path):
         super().__init__(pdf_path, lang='rus+eng')
 
@@ -314,6 +505,28 @@ class PDFProcessorRSM(PDFProcessor):
             self.data["Транспортное средство"] = vehicle_match.group(1).strip()
 
 
+    def format_region_value(self, field, value):
+        """Дата акта из области ("01" февраля 2025) приводится к виду 01.02.2025"""
+        if field == "Дата акта":
+            date_match = re.search(r'(\d+)[""“»]?\s+([а-яА-Я]+)\s+(\d{4})', value)
+            if date_match:
+                day, month, year = date_match.groups()
+                return f"{day}.{self.MONTHS.get(month.lower(), '00')}.{year}"
+        return value
+
+
+    def validate_region_value(self, field, value):
+        """Значение из области принимается, только если оно проходит правила parse_text"""
+        if field == "Номер акта рекламации":
+            return value.isdigit()
+        if field == "Дата акта":
+            # Месяц прописью распознан и приведен к номеру (как ACT_PATTERN в parse_text)
+            return re.fullmatch(r'\d{1,2}\.(0[1-9]|1[0-2])\.\d{4}', value) is not None
+        if field == "Сервисное предприятие":
+            return bool(self.filter_groups(value.split()))
+        return True
+
+
     def extract_service_name(self, text):
         """Извлечение названия сервисного предприятия"""
         # Ищем текст между двумя вхождениями "Наименование организации"
@@ -0,0 +1,234 @@
+# Модуль снимка базы рекламаций ОТК для приложения ПОИСК_по_базе_ОТК
+"""
+Локальный снимок (SQLite) журнала учета рекламаций ОТК для быстрого поиска.
+
+Файл журнала Excel (.xlsm, несколько МБ на сервере) читается один раз и сохраняется в локальный
+файл SQLite с индексами по году + номеру двигателя и году + номеру акта рекламации.
+Снимок пересоздается автоматически, если у файла журнала изменились дата изменения или размер,
+поэтому поиск по нескольким номерам не требует повторного открытия книги Excel.
+
+Каждая строка листа хранится целиком (все колонки журнала), номер строки - как в Excel,
+поэтому отчет по результатам поиска строится без обращения к файлу журнала.
+
+Сборка снимка вручную (например, по расписанию):
+    python BZA_snapshot.py <файл журнала .xlsm> <файл снимка .sqlite3>
+"""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+from contextlib import closing
+
+from openpyxl import load_workbook
+
+
+FIRST_ROW = 3  # первая строка с данными на листе года (1-2 строки - заголовки)
+ENGINE_COLUMN = 20  # колонка 20 - номера двигателей
+ACT_COLUMN = 13  # колонка 13 - номера актов рекламаций ПРИОБРЕТАТЕЛЯ изделия
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE journal (
+    year TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    engine TEXT,
+    act TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (year, row)
+);
+CREATE INDEX journal_engine_idx ON journal (year, engine, row);
+CREATE INDEX journal_act_idx ON journal (year, act, row);
+"""
+
+
+class JournalSnapshot:
+    """Снимок журнала ОТК в SQLite с проверкой актуальности по файлу журнала"""
+
+    def __init__(self, file_database, snapshot_file):
+        self.file_database = file_database  # путь до файла базы рекламаций ОТК (.xlsm)
+        self.snapshot_file = snapshot_file  # путь до локального файла снимка (.sqlite3)
+
+    def _connect(self, file=None):
+        """Соединение с файлом снимка (закрывается при выходе из блока with)"""
+        return closing(sqlite3.connect(file or self.snapshot_file))
+
+    # ------------------------------ Актуальность и сборка снимка ------------------------------
+
+    def _source_signature(self):
+        """Дата изменения и размер файла журнала (признак изменения журнала)"""
+        stat = os.stat(self.file_database)
+        return str(stat.st_mtime_ns), str(stat.st_size)
+
+    def is_actual(self):
+        """True - снимок есть и построен по текущей версии файла журнала"""
+        if not os.path.exists(self.snapshot_file):
+            return False
+
+        try:
+            with self._connect() as conn:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:  # поврежденный или старый файл снимка
+            return False
+
+        mtime, size = self._source_signature()
+        return (
+            meta.get("source") == os.path.abspath(self.file_database)
+            and meta.get("mtime") == mtime
+            and meta.get("size") == size
+        )
+
+    def build(self):
+        """Сборка снимка: все листы годов журнала в один файл SQLite"""
+        mtime, size = self._source_signature()
+
+        folder = os.path.dirname(os.path.abspath(self.snapshot_file))
+        os.makedirs(folder, exist_ok=True)
+
+        # Пишем во временный файл и подменяем снимок целиком - при ошибке старый снимок не портится
+        fd, tmp_file = tempfile.mkstemp(suffix=".sqlite3", dir=folder)
+        os.close(fd)
+
+        try:
+            wb = load_workbook(self.file_database, read_only=True)
+            try:
+                with self._connect(tmp_file) as conn:
+                    conn.executescript(SCHEMA)
+
+                    for sheet_name in wb.sheetnames:
+                        if not sheet_name.isdigit():  # только листы годов ("2019", "2020", ...)
+                            continue
+                        conn.executemany(
+                            "INSERT INTO journal (year, row, engine, act, data) VALUES (?, ?, ?, ?, ?)",
+                            self._iter_sheet_rows(sheet_name, wb[sheet_name]),
+                        )
+
+                    conn.executemany(
+                        "INSERT INTO meta (key, value) VALUES (?, ?)",
+                        [
+                            ("source", os.path.abspath(self.file_database)),
+                            ("mtime", mtime),
+                            ("size", size),
+                        ],
+                    )
+                    conn.commit()
+            finally:
+                wb.close()
+
+            os.replace(tmp_file, self.snapshot_file)
+
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+    @staticmethod
+    def _iter_sheet_rows(sheet_name, sheet):
+        """Строки листа года для записи в снимок"""
+        for row, values in enumerate(
+            sheet.iter_rows(min_row=FIRST_ROW, values_only=True), start=FIRST_ROW
+        ):
+            if not any(value is not None for value in values):
+                continue  # пустые строки листа не сохраняем
+
+            engine = get_cell(values, ENGINE_COLUMN)
+            act = get_cell(values, ACT_COLUMN)
+            yield (
+                sheet_name,
+                row,
+                str(engine) if engine is not None else None,
+                str(act) if act is not None else None,
+                pickle.dumps(tuple(values), protocol=pickle.HIGHEST_PROTOCOL),
+            )
+
+    def ensure_actual(self):
+        """Пересобирает снимок, если журнал изменился. Возвращает True, если снимок пересобран"""
+        if self.is_actual():
+            return False
+        self.build()
+        return True
+
+    # ------------------------------------ Поиск по снимку ------------------------------------
+
+    def has_year(self, year):
+        """Есть ли в журнале лист года"""
+        with self._connect() as conn:
+            return (
+                conn.execute("SELECT 1 FROM journal WHERE year = ? LIMIT 1", (year,)).fetchone()
+                is not None
+            )
+
+    def find_engines(self, year, numbers):
+        """Поиск двигателей (по вхождению номера): {номер: [(строка, номер двигателя), ...]}"""
+        return self._find(year, "engine", numbers)
+
+    def find_acts(self, year, numbers):
+        """Поиск актов рекламаций (по вхождению номера): {номер: [(строка, номер акта), ...]}"""
+        return self._find(year, "act", numbers)
+
+    def exists_engines(self, year, numbers):
+        """Номера, совпадающие с номером двигателя полностью"""
+        return self._exists(year, "engine", numbers)
+
+    def exists_acts(self, year, numbers):
+        """Номера, совпадающие с номером акта рекламации полностью"""
+        return self._exists(year, "act", numbers)
+
+    def _find(self, year, column, numbers):
+        """Все строки года, в которых значение колонки содержит номер (как в поиске по книге Excel)"""
+        result = {}
+        with self._connect() as conn:
+            for number in numbers:
+                # Поиск идет по индексу (year, column) - читается только индекс нужного года
+                result[number] = conn.execute(
+                    f"SELECT row, {column} FROM journal "
+                    f"WHERE year = ? AND {column} IS NOT NULL AND instr({column}, ?) > 0 "
+                    f"ORDER BY row",
+                    (year, number),
+                ).fetchall()
+        return result
+
+    def _exists(self, year, column, numbers):
+        """Множество номеров, для которых есть точное совпадение (поиск по индексу)"""
+        found = set()
+        with self._connect() as conn:
+            for number in numbers:
+                if conn.execute(
+                    f"SELECT 1 FROM journal WHERE year = ? AND {column} = ? LIMIT 1",
+                    (year, number),
+                ).fetchone():
+                    found.add(number)
+        return found
+
+    def get_rows(self, year, rows):
+        """Значения всех колонок строк журнала: {номер строки: кортеж значений}"""
+        rows = sorted(set(rows))
+        result = {}
+        with self._connect() as conn:
+            for start in range(0, len(rows), 500):  # ограничение SQLite на число параметров
+                chunk = rows[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for row, data in conn.execute(
+                    f"SELECT row, data FROM journal WHERE year = ? AND row IN ({placeholders})",
+                    (year, *chunk),
+                ):
+                    result[row] = pickle.loads(data)
+        return result
+
+
+def get_cell(values, column):
+    """Значение ячейки строки журнала по номеру колонки (аналог sheet.cell(row, column).value)"""
+    return values[column - 1] if len(values) >= column else None
+
+
+if __name__ == "__main__":
+    import sys
+
+    snapshot = JournalSnapshot(sys.argv[1], sys.argv[2])
+    if snapshot.ensure_actual():
+        print(f"Снимок базы ОТК пересобран: {sys.argv[2]}")
+    else:
+        print(f"Снимок базы ОТК актуален: {sys.argv[2]}")
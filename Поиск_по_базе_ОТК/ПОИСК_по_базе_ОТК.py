@@ -1,8 +1,21 @@
+import os
+import tempfile
 import tkinter as tk
 from tkinter import messagebox
-from openpyxl import load_workbook
 from datetime import datetime
 import BZA_ind_coll as t
+from BZA_snapshot import JournalSnapshot, get_cell
+
+
+# файл базы рекламаций ОТК с учетом текущего года
+file_database = f'//Server/otk/1 ГАРАНТИЯ на сервере/{str(datetime.now().year)}-2019_ЖУРНАЛ УЧЁТА.xlsm'
+
+# локальный снимок базы рекламаций ОТК (SQLite) - поиск без открытия файла Excel,
+# пересобирается автоматически при изменении файла базы
+snapshot = JournalSnapshot(
+    file_database,
+    os.path.join(os.environ.get('LOCALAPPDATA', tempfile.gettempdir()), 'ПОИСК_по_базе_ОТК', 'Снимок_базы_ОТК.sqlite3')
+)
 
 
 def get_value():
@@ -25,53 +38,60 @@ def get_value():
 
 def get_itog():
     """функция подготовки выборки из базы и вывода на экран"""
-    global wb
-    global sheet
-    global cells_dvigs
-    global cells_acts
+    global rows
+    global found_dvigs
+    global found_acts
     global dvigs
     global acts
 
     god, num1, num2 = get_value()
 
-    # открываем файл
-    wb = load_workbook(
-        f'//Server/otk/1 ГАРАНТИЯ на сервере/{str(datetime.now().year)}-2019_ЖУРНАЛ УЧЁТА.xlsm')
-    # открываем лист по номеру года
-    sheet = wb[god]
+    if not god:
+        return
+
+    # проверяем снимок базы - если файл базы изменился, снимок пересобирается
+    snapshot.ensure_actual()
+
+    if not snapshot.has_year(god):
+        messagebox.showinfo('ОШИБКА', f'В базе нет листа {god} года')
+        return
 
-    # список двигателей и актов рекламаций из всей базы
-    # колонка 20 - номера двигателей
-    cells_dvigs = tuple(sheet.cell(row=i, column=20) for i in range(3, sheet.max_row+1))
-    # колонка 13 - номера актов рекламаций ПРИОБРЕТАТЕЛЯ изделия
-    cells_acts = tuple(sheet.cell(row=i, column=13) for i in range(3, sheet.max_row+1))
+    # найденные строки с двигателями и актами рекламаций: {номер: [(строка, значение ячейки), ...]}
+    # колонка 20 - номера двигателей, колонка 13 - номера актов рекламаций ПРИОБРЕТАТЕЛЯ изделия
+    found_dvigs = snapshot.find_engines(god, num1)
+    found_acts = snapshot.find_acts(god, num2)
 
-    # вспомогательные списки двигателей и актов рекламаций
-    dvigs = tuple(str(cell.value) for cell in cells_dvigs if cell.value)
-    acts = tuple(cell.value for cell in cells_acts)
+    # номера двигателей и актов рекламаций, которые есть в базе полностью
+    dvigs = snapshot.exists_engines(god, num1)
+    acts = snapshot.exists_acts(god, num2)
+
+    # значения всех колонок найденных строк (для отчета)
+    rows = snapshot.get_rows(
+        god, [row for found in (*found_dvigs.values(), *found_acts.values()) for row, value in found]
+    )
 
     for n in num1:           # перебираем входящий список двигателей и ищем двигатель в списке dvigs
         if n not in dvigs:   # если в списке нет - печатаем результат
             # вывод текста
             text_1.insert(1.0, f'Двигателя {n} в базе нет\n')
 
-        for i, cell in enumerate(cells_dvigs):
-            # если в списке cells_dvigs двигатель есть - печатаем номер строки таблицы Excel
-            if n in str(cell.value):
-                row = i + 3
-                text_1.insert(1.0, f'Двигатель {str(cell.value)}: строка - {row}\n')
+        for row, value in found_dvigs[n]:
+            # если двигатель есть - печатаем номер строки таблицы Excel
+            text_1.insert(1.0, f'Двигатель {value}: строка - {row}\n')
 
     for n in num2:           # перебираем входящий список актов и ищем акт во вспомогательном списке acts
         if n not in acts:    # если во вспомогательном списке нет - печатаем результат
             # вывод текста
             text_1.insert(1.0, f'Акта {n} в базе нет\n')
 
-        for i, cell in enumerate(cells_acts):
-            # если в списке cells_acts акт есть - печатаем номер строки таблицы Excel
-            if n in str(cell.value):
-                row = i + 3
-                # вывод текста
-                text_1.insert(1.0, f'Акт {cell.value}: строка - {row}\n')
+        for row, value in found_acts[n]:
+            # если акт есть - печатаем номер строки таблицы Excel
+            text_1.insert(1.0, f'Акт {value}: строка - {row}\n')
+
+
+def cell_value(row, name):
+    """значение ячейки найденной строки базы по названию колонки"""
+    return get_cell(rows[row], t.ind(name))
 
 
 def clear_strok():  # функция очистки строк ввода номеров двигателей и актов
@@ -106,74 +126,71 @@ def otchet_output():  # функция подготовки выборки из
                 print('Двигателя', n, 'в базе нет', file=res_file)
                 print(file=res_file)
 
-            for i, cell in enumerate(cells_dvigs):
-                # если в списке cells_dvigs двигатель есть - печатаем информацию из ячеек Excel
-                if n in str(cell.value):
-                    row = i + 3
-
-                    print('Двигатель', str(cell.value), '| строка -', row, '|', file=res_file)
-                    print('-' * 80, file=res_file)
-
+            for row, value in found_dvigs.get(n, []):
+                # если двигатель есть - печатаем информацию из ячеек Excel
+                print('Двигатель', value, '| строка -', row, '|', file=res_file)
+                print('-' * 80, file=res_file)
+
+                print(
+                    cell_value(row, 'Наименование изделия'), '|',
+                    cell_value(row, 'Обозначение изделия'), '|',
+                    'зав.№:', cell_value(row, 'Заводской номер изделия'),
+                    cell_value(row, 'Дата изготовления изделия'), '|',
+                    file=res_file
+                )
+
+                print(
+                    'Где выявлен дефект:',
+                    cell_value(row, 'Период выявления дефекта'), '|', end=' ',
+                    file=res_file
+                )
+
+                if cell_value(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'):
                     print(
-                        sheet.cell(row, t.ind('Наименование изделия')).value, '|',
-                        sheet.cell(row, t.ind('Обозначение изделия')).value, '|',
-                        'зав.№:', sheet.cell(row, t.ind('Заводской номер изделия')).value,
-                        sheet.cell(row, t.ind('Дата изготовления изделия')).value, '|',
-                        file=res_file
+                        'Р/А №:',
+                        cell_value(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'),
+                        '|', end=' ', file=res_file
                     )
+                else:
+                    print('Р/А №: акта нет', '|', end=' ', file=res_file)
+
+                print(
+                    'Дефект:', 
+                    cell_value(row, 'Заявленный дефект изделия'),
+                    file=res_file
+                )
 
+                if cell_value(row, 'Номер акта исследования'):
                     print(
-                        'Где выявлен дефект:',
-                        sheet.cell(row, t.ind('Период выявления дефекта')).value, '|', end=' ',
+                        'Акт БЗА:',
+                        cell_value(row, 'Номер акта исследования'), 'от',
+                        cell_value(row, 'Дата акта исследования').strftime('%d.%m.%Y'),
                         file=res_file
                     )
+                else:
+                    print('Акт БЗА: акта нет', file=res_file)
 
-                    if sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value:
-                        print(
-                            'Р/А №:',
-                            sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value,
-                            '|', end=' ', file=res_file
-                        )
-                    else:
-                        print('Р/А №: акта нет', '|', end=' ', file=res_file)
+                print(
+                    'Решение БЗА:',
+                    cell_value(row, 'Причины возникновения дефектов'), end=' ',
+                    file=res_file
+                )
 
+                if cell_value(row, 'Месяц отражения в статистике БЗА'):
                     print(
-                        'Дефект:', 
-                        sheet.cell(row, t.ind('Заявленный дефект изделия')).value,
+                        '| отчетность БЗА -',
+                        cell_value(row, 'Месяц отражения в статистике БЗА'),
                         file=res_file
                     )
-
-                    if sheet.cell(row, t.ind('Номер акта исследования')).value:
-                        print(
-                            'Акт БЗА:',
-                            sheet.cell(row, t.ind('Номер акта исследования')).value, 'от',
-                            sheet.cell(row, t.ind('Дата акта исследования')).value.strftime('%d.%m.%Y'),
-                            file=res_file
-                        )
-                    else:
-                        print('Акт БЗА: акта нет', file=res_file)
-
+                else:
                     print(
-                        'Решение БЗА:',
-                        sheet.cell(row, t.ind('Причины возникновения дефектов')).value, end=' ',
+                        '|', 
+                        cell_value(row, 'Пояснения к причинам возникновения дефектов'),
                         file=res_file
                     )
 
-                    if sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value:
-                        print(
-                            '| отчетность БЗА -',
-                            sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value,
-                            file=res_file
-                        )
-                    else:
-                        print(
-                            '|', 
-                            sheet.cell(row, t.ind('Пояснения к причинам возникновения дефектов')).value,
-                            file=res_file
-                        )
-
-                    print('-' * 80, file=res_file)
-                    print(file=res_file)
+                print('-' * 80, file=res_file)
+                print(file=res_file)
 
         if num2:   # если есть список актов из строки ввода
             print('Номер акта:', ', '.join(n for n in num2),
@@ -185,74 +202,71 @@ def otchet_output():  # функция подготовки выборки из
                 print('Акта', n, 'в базе нет', file=res_file)
                 print(file=res_file)
 
-            for i, cell in enumerate(cells_acts):
-                # если в списке cells_acts есть акт - печатаем информацию из ячеек Excel
-                if n in str(cell.value):
-                    row = i + 3
-
-                    print('Акт', cell.value, '| строка -', row, '|', file=res_file)
-                    print('-' * 80, file=res_file)
-
+            for row, value in found_acts.get(n, []):
+                # если акт есть - печатаем информацию из ячеек Excel
+                print('Акт', value, '| строка -', row, '|', file=res_file)
+                print('-' * 80, file=res_file)
+
+                print(
+                    cell_value(row, 'Наименование изделия'), '|',
+                    cell_value(row, 'Обозначение изделия'), '|',
+                    'зав.№:', cell_value(row, 'Заводской номер изделия'),
+                    cell_value(row, 'Дата изготовления изделия'), '|',
+                    file=res_file
+                )
+
+                print(
+                    'Где выявлен дефект:',
+                    cell_value(row, 'Период выявления дефекта'), '|', end=' ',
+                    file=res_file
+                )
+
+                if cell_value(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'):
                     print(
-                        sheet.cell(row, t.ind('Наименование изделия')).value, '|',
-                        sheet.cell(row, t.ind('Обозначение изделия')).value, '|',
-                        'зав.№:', sheet.cell(row, t.ind('Заводской номер изделия')).value,
-                        sheet.cell(row, t.ind('Дата изготовления изделия')).value, '|',
+                        'Р/А №:',
+                        cell_value(row, 'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'),
+                        '|', end=' ',
                         file=res_file
                     )
+                else:
+                    print('Р/А №: акта нет', '|', end=' ', file=res_file)
+
+                print(
+                    'Дефект:', 
+                    cell_value(row, 'Заявленный дефект изделия'),
+                    file=res_file
+                )
 
+                if cell_value(row, 'Номер акта исследования'):
                     print(
-                        'Где выявлен дефект:',
-                        sheet.cell(row, t.ind('Период выявления дефекта')).value, '|', end=' ',
+                        'Акт БЗА:', 
+                        cell_value(row, 'Номер акта исследования'),
+                        'от', cell_value(row, 'Дата акта исследования').strftime('%d.%m.%Y'),
                         file=res_file
                     )
+                else:
+                    print('Акт БЗА: акта нет', file=res_file)
 
-                    if sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value:
-                        print(
-                            'Р/А №:',
-                            sheet.cell(row, t.ind('Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия')).value,
-                            '|', end=' ',
-                            file=res_file
-                        )
-                    else:
-                        print('Р/А №: акта нет', '|', end=' ', file=res_file)
+                print(
+                    'Решение БЗА:', cell_value(row, 'Причины возникновения дефектов'), end=' ',
+                    file=res_file
+                )
 
+                if cell_value(row, 'Месяц отражения в статистике БЗА'):
                     print(
-                        'Дефект:', 
-                        sheet.cell(row, t.ind('Заявленный дефект изделия')).value,
+                        '| отчетность БЗА -', 
+                        cell_value(row, 'Месяц отражения в статистике БЗА'),
                         file=res_file
                     )
-
-                    if sheet.cell(row, t.ind('Номер акта исследования')).value:
-                        print(
-                            'Акт БЗА:', 
-                            sheet.cell(row, t.ind('Номер акта исследования')).value,
-                            'от', sheet.cell(row, t.ind('Дата акта исследования')).value.strftime('%d.%m.%Y'),
-                            file=res_file
-                        )
-                    else:
-                        print('Акт БЗА: акта нет', file=res_file)
-
+                else:
                     print(
-                        'Решение БЗА:', sheet.cell(row, t.ind('Причины возникновения дефектов')).value, end=' ',
+                        '|', 
+                        cell_value(row, 'Пояснения к причинам возникновения дефектов'),
                         file=res_file
                     )
 
-                    if sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value:
-                        print(
-                            '| отчетность БЗА -', 
-                            sheet.cell(row, t.ind('Месяц отражения в статистике БЗА')).value,
-                            file=res_file
-                        )
-                    else:
-                        print(
-                            '|', 
-                            sheet.cell(row, t.ind('Пояснения к причинам возникновения дефектов')).value,
-                            file=res_file
-                        )
-
-                    print('-' * 80, file=res_file)
-                    print(file=res_file)
+                print('-' * 80, file=res_file)
+                print(file=res_file)
 
     # вывод информационного окна о сохранении отчета
     messagebox.showinfo(
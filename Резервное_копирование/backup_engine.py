@@ -0,0 +1,334 @@
+# Модуль резервного копирования: потоковые инкрементальные архивы с дедупликацией и восстановлением
+"""
+Файлы записываются в zip-архив напрямую из исходных каталогов (без временной копии).
+Рядом с архивами хранится манифест - перечень файлов с размером, датой изменения и SHA-256:
+    - первый запуск (или каждый full_every-й) создает полный архив;
+    - остальные запуски создают инкрементальный архив только с измененными файлами;
+    - файл с уже сохраненным содержимым (тот же хэш, в том числе под другим именем) не записывается повторно.
+
+В каждый архив вкладывается снимок состояния на момент копирования (__manifest__.json):
+по нему восстанавливаются все файлы этой точки, в том числе из предыдущих архивов цепочки.
+
+Запуск из командной строки:
+    python backup_engine.py backup "E:/АРХИВ" "D:/Документы" "D:/Отчет.xlsx"
+    python backup_engine.py list "E:/АРХИВ"
+    python backup_engine.py restore "E:/АРХИВ" "D:/Восстановление" [--point "Архив файлов_2025-01-31_120000_000000_incr.zip"]
+
+Имя архива содержит дату и время с микросекундами; существующий архив никогда не перезаписывается
+(на него могут ссылаться инкрементальные архивы цепочки).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+MANIFEST_FILE = "manifest.json"  # манифест каталога архивов (состояние после последнего копирования)
+ARCHIVE_MANIFEST = "__manifest__.json"  # снимок состояния внутри каждого архива
+ARCHIVE_PREFIX = "Архив файлов"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """функция вычисляет SHA-256 содержимого файла (файл читается частями)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_sources(sources):
+    """функция перебирает файлы для копирования: (путь до файла, имя в архиве)
+    файл сохраняется в корень архива, каталог - в папку архива со своим именем (как раньше)
+    """
+    for item in sources:
+        item = item.strip()
+        if os.path.isfile(item):
+            yield item, os.path.basename(item)
+        elif os.path.isdir(item):
+            root_dir = os.path.dirname(os.path.normpath(item))
+            for dir_path, _, file_names in os.walk(item):
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    yield path, os.path.relpath(path, root_dir).replace(os.sep, "/")
+
+
+class BackupEngine:
+    """
+    класс инкрементального резервного копирования в каталог архивов archive_dir
+    full_every: через сколько архивов создается новый полный архив (0 - только первый архив полный)
+    keep_chains: сколько последних цепочек (полный архив + инкрементальные) хранить
+    workers: число потоков для чтения и хэширования файлов
+    """
+
+    def __init__(self, archive_dir, full_every=30, keep_chains=2, workers=4):
+        self.archive_dir = archive_dir
+        self.full_every = full_every
+        self.keep_chains = keep_chains
+        self.workers = workers
+
+    # ------------------------------------ манифест каталога архивов ------------------------------------
+
+    def load_manifest(self):
+        """функция считывает манифест каталога архивов (пустой, если архивов еще нет)"""
+        path = os.path.join(self.archive_dir, MANIFEST_FILE)
+        try:
+            with open(path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {"archives": [], "files": {}}
+
+        # архивы, удаленные вручную, в цепочке не учитываем - следующий архив будет полным
+        archives = manifest.get("archives", [])
+        if any(
+            not os.path.exists(os.path.join(self.archive_dir, a["name"]))
+            for a in archives
+        ):
+            return {"archives": [], "files": {}}
+        return manifest
+
+    def save_manifest(self, manifest):
+        """функция записывает манифест через временный файл (при сбое старый манифест не портится)"""
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.archive_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, os.path.join(self.archive_dir, MANIFEST_FILE))
+
+    # ------------------------------------ создание архива ------------------------------------
+
+    def backup(self, sources, full=False):
+        """
+        функция создает архив (полный или инкрементальный) и возвращает словарь с итогами:
+        {"archive": имя архива, "type": "full"/"incr", "files": всего файлов, "stored": записано в архив,
+         "unchanged": без изменений, "deduplicated": найдено по хэшу в других архивах}
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        manifest = self.load_manifest()
+
+        archives = manifest["archives"]
+        chain_length = len(archives) - max(
+            (i for i, a in enumerate(archives) if a["type"] == "full"),
+            default=len(archives),
+        )
+        full = (
+            full
+            or not archives
+            or (self.full_every and chain_length >= self.full_every)
+        )
+        archive_type = "full" if full else "incr"
+        archive_name = self._new_archive_name(archive_type)
+
+        previous = {} if full else manifest["files"]
+        # содержимое, которое уже есть в архивах цепочки: {sha256: (архив, имя в архиве)}
+        known = {
+            entry["sha256"]: (entry["archive"], entry["member"])
+            for entry in previous.values()
+        }
+
+        files = list(iter_sources(sources))
+        entries = self._describe(files, previous)
+
+        stats = {
+            "archive": archive_name,
+            "type": archive_type,
+            "files": len(entries),
+            "stored": 0,
+            "unchanged": 0,
+            "deduplicated": 0,
+        }
+
+        archive_path = os.path.join(self.archive_dir, archive_name)
+        tmp_path = archive_path + ".tmp"
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for arcname, entry in entries.items():
+                    old = previous.get(arcname)
+                    if old and old["sha256"] == entry["sha256"] and "archive" in old:
+                        entry.update(archive=old["archive"], member=old["member"])
+                        stats["unchanged"] += 1
+                    elif entry["sha256"] in known:
+                        entry["archive"], entry["member"] = known[entry["sha256"]]
+                        stats["deduplicated"] += 1
+                    else:
+                        # файл пишется в архив потоком напрямую с диска
+                        zf.write(entry["source"], arcname)
+                        entry.update(archive=archive_name, member=arcname)
+                        known[entry["sha256"]] = (archive_name, arcname)
+                        stats["stored"] += 1
+
+                snapshot = {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "files": entries,
+                }
+                zf.writestr(
+                    ARCHIVE_MANIFEST, json.dumps(snapshot, ensure_ascii=False, indent=4)
+                )
+            if os.path.exists(archive_path):
+                raise FileExistsError(f"Архив {archive_name} уже существует")
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if full:
+            archives = []
+        archives.append(
+            {"name": archive_name, "type": archive_type, "created": snapshot["created"]}
+        )
+        self.save_manifest({"archives": archives, "files": entries})
+        self.prune()
+        return stats
+
+    def _new_archive_name(self, archive_type):
+        """
+        функция возвращает имя нового архива, которого еще нет в каталоге архивов
+        (дата и время с микросекундами; при совпадении ждем следующего значения часов,
+        чтобы порядок имен совпадал с порядком создания архивов)
+        """
+        while True:
+            archive_name = f"{ARCHIVE_PREFIX}_{datetime.now():%Y-%m-%d_%H%M%S_%f}_{archive_type}.zip"
+            if not any(
+                os.path.exists(os.path.join(self.archive_dir, name))
+                for name in (archive_name, archive_name + ".tmp")
+            ):
+                return archive_name
+            time.sleep(0.001)
+
+    def _describe(self, files, previous):
+        """
+        функция собирает сведения о файлах: размер, дата изменения и SHA-256.
+        хэш не пересчитывается, если размер и дата изменения совпадают с манифестом,
+        остальные файлы читаются и хэшируются параллельно в пуле потоков
+        """
+        entries = {}
+        to_hash = []
+        for source, arcname in files:
+            stat = os.stat(source)
+            entry = {"source": source, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            old = previous.get(arcname)
+            if old and old["size"] == entry["size"] and old["mtime"] == entry["mtime"]:
+                entry["sha256"] = old["sha256"]
+            else:
+                to_hash.append(arcname)
+            entries[arcname] = entry
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            hashes = executor.map(
+                lambda name: file_sha256(entries[name]["source"]), to_hash
+            )
+            for arcname, sha256 in zip(to_hash, hashes):
+                entries[arcname]["sha256"] = sha256
+
+        return entries
+
+    def prune(self):
+        """функция удаляет архивы старых цепочек (хранятся keep_chains последних полных архивов с инкрементами)"""
+        if not self.keep_chains:
+            return
+
+        chains = []
+        for name in sorted(os.listdir(self.archive_dir)):
+            if name.startswith(ARCHIVE_PREFIX) and name.endswith(".zip"):
+                if name.endswith("_full.zip") or not chains:
+                    chains.append([])
+                chains[-1].append(name)
+
+        for chain in chains[: -self.keep_chains]:
+            for name in chain:
+                os.remove(os.path.join(self.archive_dir, name))
+
+    # ------------------------------------ просмотр и восстановление ------------------------------------
+
+    def list_points(self):
+        """функция возвращает список точек восстановления: имена архивов по возрастанию даты"""
+        return sorted(
+            name
+            for name in os.listdir(self.archive_dir)
+            if name.startswith(ARCHIVE_PREFIX) and name.endswith(".zip")
+        )
+
+    def restore(self, target_dir, point=None):
+        """
+        функция восстанавливает в каталог target_dir все файлы на момент создания архива point
+        (по умолчанию - последнего). Возвращает количество восстановленных файлов
+        """
+        points = self.list_points()
+        if not points:
+            raise FileNotFoundError(f"В каталоге {self.archive_dir} нет архивов")
+        point = point or points[-1]
+
+        with zipfile.ZipFile(os.path.join(self.archive_dir, point)) as zf:
+            snapshot = json.loads(zf.read(ARCHIVE_MANIFEST).decode("utf-8"))
+
+        # группируем файлы по архивам, чтобы каждый архив открывать один раз
+        by_archive = {}
+        for arcname, entry in snapshot["files"].items():
+            by_archive.setdefault(entry["archive"], []).append(
+                (arcname, entry["member"])
+            )
+
+        target_root = os.path.abspath(target_dir)
+        for archive_name, members in by_archive.items():
+            with zipfile.ZipFile(os.path.join(self.archive_dir, archive_name)) as zf:
+                for arcname, member in members:
+                    target = os.path.abspath(os.path.join(target_root, arcname))
+                    if not target.startswith(target_root + os.sep):
+                        continue  # защита от путей вида ../ в архиве
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with zf.open(member) as src, open(target, "wb") as dst:
+                        while True:
+                            chunk = src.read(1024 * 1024)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+
+        return len(snapshot["files"])
+
+
+def main():
+    """запуск резервного копирования и восстановления из командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Инкрементальное резервное копирование файлов"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd_backup = commands.add_parser("backup", help="создать архив")
+    cmd_backup.add_argument("archive_dir", help="каталог архивов")
+    cmd_backup.add_argument(
+        "sources", nargs="+", help="файлы и каталоги для копирования"
+    )
+    cmd_backup.add_argument("--full", action="store_true", help="создать полный архив")
+
+    cmd_list = commands.add_parser("list", help="список точек восстановления")
+    cmd_list.add_argument("archive_dir", help="каталог архивов")
+
+    cmd_restore = commands.add_parser("restore", help="восстановить файлы")
+    cmd_restore.add_argument("archive_dir", help="каталог архивов")
+    cmd_restore.add_argument("target_dir", help="каталог для восстановленных файлов")
+    cmd_restore.add_argument("--point", help="имя архива (по умолчанию - последний)")
+
+    args = parser.parse_args()
+    engine = BackupEngine(args.archive_dir)
+
+    if args.command == "backup":
+        stats = engine.backup(args.sources, full=args.full)
+        print(
+            f"{stats['archive']}: файлов {stats['files']}, записано {stats['stored']}, "
+            f"без изменений {stats['unchanged']}, дубликатов {stats['deduplicated']}"
+        )
+    elif args.command == "list":
+        for point in engine.list_points():
+            print(point)
+    else:
+        count = engine.restore(args.target_dir, args.point)
+        print(f"Восстановлено файлов: {count} в каталог {args.target_dir}")
+
+
+if __name__ == "__main__":
+    main()
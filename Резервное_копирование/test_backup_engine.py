@@ -0,0 +1,90 @@
+# тесты модуля backup_engine.py (запуск: python -m unittest test_backup_engine)
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import backup_engine
+from backup_engine import BackupEngine
+
+
+class FrozenClock:
+    """часы, которые возвращают одно и то же время первые repeat обращений, затем +1 мкс"""
+
+    def __init__(self, moment, repeat):
+        self.moment = moment
+        self.repeat = repeat
+
+    def now(self):
+        if self.repeat:
+            self.repeat -= 1
+        else:
+            self.moment += timedelta(microseconds=1)
+        return self.moment
+
+
+class BackupEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, "src")
+        self.archive_dir = os.path.join(self.tmp.name, "archive")
+        os.makedirs(self.src)
+        self.engine = BackupEngine(self.archive_dir)
+
+    def write(self, name, text):
+        with open(os.path.join(self.src, name), "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def restore(self, point=None):
+        target = tempfile.mkdtemp(dir=self.tmp.name)
+        self.engine.restore(target, point)
+        return target
+
+    def read(self, folder, name):
+        with open(os.path.join(folder, "src", name), encoding="utf-8") as file:
+            return file.read()
+
+    def test_backups_within_one_clock_tick_do_not_overwrite_archives(self):
+        self.write("a.txt", "первая версия")
+        self.write("b.txt", "без изменений")
+
+        # все обращения к часам в пределах двух копирований возвращают одно время
+        clock = FrozenClock(datetime(2025, 1, 31, 12, 0, 0), repeat=6)
+        with mock.patch.object(backup_engine, "datetime", clock):
+            first = self.engine.backup([self.src])
+            self.write("a.txt", "вторая версия")
+            second = self.engine.backup([self.src])
+
+        self.assertNotEqual(first["archive"], second["archive"])
+        self.assertEqual(
+            self.engine.list_points(), [first["archive"], second["archive"]]
+        )
+
+        # последняя точка: измененный файл из второго архива, неизменный - из первого
+        latest = self.restore()
+        self.assertEqual(self.read(latest, "a.txt"), "вторая версия")
+        self.assertEqual(self.read(latest, "b.txt"), "без изменений")
+
+        earlier = self.restore(first["archive"])
+        self.assertEqual(self.read(earlier, "a.txt"), "первая версия")
+
+    def test_existing_archive_is_never_replaced(self):
+        self.write("a.txt", "данные")
+        first = self.engine.backup([self.src])
+
+        # имя нового архива совпало с уже существующим (сбой часов и т.п.)
+        with mock.patch.object(
+            BackupEngine, "_new_archive_name", return_value=first["archive"]
+        ):
+            with self.assertRaises(FileExistsError):
+                self.engine.backup([self.src], full=True)
+
+        self.assertEqual(self.engine.list_points(), [first["archive"]])
+        self.assertEqual(self.read(self.restore(), "a.txt"), "данные")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,8 +6,8 @@
 from tkinter import Tk, Label
 import json
 import os
-import shutil
 from datetime import date, datetime
+from backup_engine import BackupEngine
 
 year_now = str(date.today().year)  # текущий год
 data_now = date.today()  # сегодняшняя дата
@@ -54,29 +54,9 @@ class Copy_file:
             # вызываем функцию для переименовывания (создания) каталога с сегодняшней датой
             self.make_dir()
 
-            # Создаем временный каталог для копирования файлов
-            temp_dir = f"{self.path_full_name}/temp_archive_dir/"
-            os.makedirs(temp_dir, exist_ok=True)
-
-            # циклом по списку копируем файлы и каталоги во временный каталог
-            for item in self.files:
-                if os.path.isfile(item):  # если объект - это файл
-                    # отсекаем название файла с расширением
-                    file_name = os.path.basename(item)  # file.split("/")[-1]
-                    # копируем файл во временный каталог копий файлов
-                    shutil.copy(item, os.path.join(temp_dir, file_name))
-                    # копируем файл в каталог резевных копий (если требуется, то РАСКОМЕНТИРОВАТЬ)
-                    # shutil.copy(item, os.path.join(self.path_full_name, file_name))
-                elif os.path.isdir(item):  # если объект - это каталог и каталогов
-                    base_name = os.path.basename(item)  # отсекаем название каталога
-                    # копируем каталог во временный каталог копий файлов и каталогов
-                    shutil.copytree(item, os.path.join(temp_dir, base_name))
-
-            # Создаем архив
-            archive_name = f"{self.path_full_name}Архив файлов"
-            shutil.make_archive(archive_name, "zip", temp_dir)
-            # Удаляем временный каталог копий файлов
-            shutil.rmtree(temp_dir)
+            # записываем файлы и каталоги в архив напрямую, без временного каталога;
+            # после первого (полного) архива записываются только новые и измененные файлы
+            stats = BackupEngine(self.path_full_name).backup(self.files)
 
             # записываем информацию в лог-файл
             with open(file_logs, "a", encoding="utf-8") as file:
@@ -84,7 +64,11 @@ class Copy_file:
                     f"{datetime.now()}\n    ОК! Скопировано {len(self.files)} файл(а/ов) в каталог {self.path_full_name} ",
                     file=file,
                 )
-                print(f"    ОК! Архив файлов_{data_now}.zip успешно создан.", file=file)
+                print(
+                    f"    ОК! {stats['archive']} успешно создан: записано {stats['stored']}, "
+                    f"без изменений {stats['unchanged']}, дубликатов {stats['deduplicated']}.",
+                    file=file,
+                )
             return True
         except:
             # записываем информацию об ошибке в лог-файл
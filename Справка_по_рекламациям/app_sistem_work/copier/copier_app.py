@@ -131,34 +131,12 @@ class CopierData(tk.Toplevel):
         """функция копирования отгрузки из файла ОСиМ в файл ОТК на Лист конкретного месяца,
         а затем на лист "Гарантийный парк" и лист "Данные2" файла отчета"""
 
-        pr = cm.ExcelSheetCopier()
+        def on_stage(stage):
+            # 4 этапа копирования: ОСиМ, Лист месяца, Гарантийный парк, Данные2
+            self.progress_bar["value"] += 25
+            self.update()
 
-        pr.copy_in_otk(3, 21, 1)  # ТКР
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(23, 40, 2)  # ПК
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(42, 59, 3)  # ВН
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(61, 75, 4)  # МН
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(77, 83, 5)  # ГП
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(85, 96, 6)  # ЦМФ
-        self.progress_bar["value"] += 10
-        self.update()
-        pr.copy_in_otk(110, 114, 11)  # штанга и коромысло
-        self.progress_bar["value"] += 10
-        self.update()
-
-        grp = cm.DataCopierGarant()
-        grp.copy_garant()
-        self.progress_bar["value"] += 10
-        self.update()
+        cm.ShipmentCopier().copy(progress=on_stage)
 
         self.progress_bar["value"] = 100
         self.update()
@@ -1,9 +1,12 @@
 # Вспомогательный модуль приложения <Копирование отгрузки>
 
+import json
+import os
+
 import openpyxl
-import xlwings
 from openpyxl.styles import PatternFill
 
+from copier.copier_formulas import FormulaError, FormulaEvaluator
 import paths_work  # импортируем файл с путями до базы данных, отчетов и др.
 
 
@@ -16,328 +19,172 @@ file_otk = paths_work.copier_otk
 # импортируем путь до файла отчета ОТК по дефектности
 file_otchet = paths_work.copier_otchet
 
-# открываем файл ОСиМ и нужный Лист
-wb1 = openpyxl.load_workbook(file_osim, data_only=True)  # флаг True - считываем только значение ячейки
-name_list = wb1.sheetnames  # список имен всех Листов таблицы ОСиМ
-name_osim = name_list[0]  # имя первого Листа
-ws1 = wb1[name_osim]  # открываем первый Лист таблицы ОСиМ по имени
-
-# открываем файл ОТК и нужный Лист
-wb2 = openpyxl.load_workbook(file_otk)
-# используем title, чтобы имя Листа таблицы ОСиМ начиналось с большой буквы и по этому имени открываем Лист в файле ОТК
-name_otk = name_osim.title()
-ws2 = wb2[name_otk]  # открываем Лист в файле ОТК
+# карта копирования: какие блоки строк и ячейки куда копируются (файл рядом с модулем)
+file_mapping = os.path.join(os.path.dirname(os.path.abspath(__file__)), "copier_mapping.json")
 
 
-class ExcelSheetCopier:
+class ShipmentCopier:
     """
-    класс для копирования значений отгрузки из файла ОСиМ в файл ОТК на Лист конкретного месяца
-    row_start: строка начала диапазона по изделию (ТКР, ПК, ВН и т.д.) в файле ОСиМ
-    row_end: строка окончания диапазона по изделию в файле ОСиМ
-    k: поправочный коэффициент - разница номеров строк начала диапазона в таблице ОТК и ОСиМ
-       ТКР = 1, ПК = 2, ВН = 3, МН = 4, ГП = 5, ЦМФ = 6, коромысло и штанга = 11
-    col_start: столбец начала диапазона по изделию в АСП = 3, т.к совпадает в таблицах ОСиМ и ОТК
-    col_end: столбец окончания диапазона по изделию в АСП = 21, т.к совпадает
+    класс для копирования отгрузки по карте copier_mapping.json:
+    1. значения отгрузки из файла ОСиМ в файл ОТК на Лист конкретного месяца (блоками строк по изделиям)
+    2. суммарная отгрузка по изделиям и потребителям с Листа месяца на Лист "Гарантийный парк" файла ОТК
+    3. отгрузка по потребителям на лист "Данные2" файла отчета
+    каждый файл открывается и сохраняется один раз, суммы по формулам Листа месяца рассчитываются без Excel
     """
 
-    def copy_in_otk(self, row_start, row_end, k, col_start=3, col_end=21):
-        for i in range(row_start, row_end + 1):
-            for j in range(col_start, col_end + 1):
-                # -------------------- копируем значения по АСП ------------------------
-                # временная переменная - значение ячеек в таблице ОСиМ
-                t_1 = ws1.cell(row=i, column=j).value
-                # если значение в ячейке есть, то переводим в int, иначе пустая строка
-                cell = int(t_1) if t_1 else ""
-                # копируем значения по АСП из таблицы ОСиМ в ОТК
-                ws2.cell(row=i + k, column=j).value = cell
-
-            # ---------------------- копируем значения по Запчасти ---------------------
-            # временная переменная (22 - номер столбца в ОСиМ)
-            t_2 = ws1.cell(row=i, column=22).value
-            # проверка значения и перевод в int
-            cell = int(t_2) if t_2 else ""
-            # копируем значения по Запчасти в ОТК (24 - столбец в ОТК)
-            ws2.cell(row=i + k, column=24).value = cell
-
-        wb2.save(file_otk)  # сохраняем файл ОТК
-        wb1.close()  # закрываем файл ОСиМ
-        wb2.close()  # закрываем файл ОТК
-
-
-class DataCopierGarant:
-    """
-    класс для копирования значений отгрузки из Листа конкретного месяца на Лист "Гарантийный парк" файла ОТК
-    гарантийный парк по потребителям на Листе "Гарантийный парк" расчитывается формулами в Excel
-    """
-
-    def copy_garant(self):
-        # ----------------- сохраняем значения суммарной отгрузки по изделиям в списки и временные переменные -----------------
-        # модулем xlwings в таблице ОТК фиксируем значения в ячейках, где используются формулы
-        excel_app = xlwings.App(visible=False)
-        excel_book = excel_app.books.open(file_otk)
-        excel_book.save()
-        excel_book.close()
-        excel_app.quit()
-
-        wb1 = openpyxl.open(file_otk, read_only=True, data_only=True)
-        ws1 = wb1[name_otk]
-
-        # номера строк с суммарной месячной отгрузкой:
-        # ТКР = 23, ПК = 43, ВН = 63, МН = 80, ГП = 89, ЦМФ = 103, коромысло = 122, штанга = 123
-        num_strok = (23, 43, 63, 80, 89, 103, 122, 123)
-
-        # список значений суммарной отгрузки по изделиям на АСП
-        asp = list(ws1.cell(i, 22).value for i in num_strok)
-        # список значений отгрузки по изделиям в ЗАПЧАСТЬ
-        zap = list(ws1.cell(i, 24).value for i in num_strok)
-
-        # список значений отгрузки по изделиям на ММЗ
-        mmz = list(ws1.cell(i, 3).value for i in num_strok)
-
-        maz = ws1.cell(row=43, column=4).value  # отгрузка на МАЗ
-        gomsel = ws1.cell(row=43, column=5).value  # ГОМСЕЛЬМАШ
-        mzkt = ws1.cell(row=43, column=6).value  # МЗКТ
-        belaz = ws1.cell(row=43, column=7).value  # БелАЗ
-        saleo = ws1.cell(row=103, column=8).value  # САЛЕО-Гомель
-        xxx_rb = ws1.cell(row=105, column=9).value  # ХХХ-РБ
-
-        ural = ws1.cell(row=43, column=10).value  # УРАЛ
-        rostsel_1 = ws1.cell(row=43, column=11).value  # РОСТСЕЛЬМАШ (ПК)
-        rostsel_2 = ws1.cell(row=23, column=11).value  # РОСТСЕЛЬМАШ (ТКР)
-        rostsel_3 = ws1.cell(row=63, column=11).value  # РОСТСЕЛЬМАШ (ВН)
-        rostsel_4 = ws1.cell(row=80, column=11).value  # РОСТСЕЛЬМАШ (МН)
-        kamaz_1 = ws1.cell(row=43, column=12).value  # КАМАЗ (ПК)
-        kamaz_2 = ws1.cell(row=63, column=12).value  # КАМАЗ (ВН)
-        kamaz_3 = ws1.cell(row=80, column=12).value  # КАМАЗ (МН)
-        ymz_1 = ws1.cell(row=43, column=13).value  # ЯМЗ (ПК)
-        ymz_2 = ws1.cell(row=63, column=13).value  # ЯМЗ (ВН)
-        ymz_3 = ws1.cell(row=80, column=13).value  # ЯМЗ (МН)
-        ptz = ws1.cell(row=43, column=14).value  # ПТЗ С-Петербург
-        paz_1 = ws1.cell(row=43, column=15).value  # ПАЗ (ПК)
-        paz_2 = ws1.cell(row=63, column=15).value  # ПАЗ (ВН)
-        csdm = ws1.cell(row=43, column=16).value  # ЧСДМ
-        tula = ws1.cell(row=43, column=17).value  # Тула
-        baz = ws1.cell(row=43, column=18).value  # БАЗ
-        xx_rf_1 = ws1.cell(row=105, column=19).value  # ХХ-РФ-1
-        xx_rf_2 = ws1.cell(row=105, column=20).value  # ХХ-РФ-2
-        xx_rf_3 = ws1.cell(row=105, column=21).value  # ХХ-РФ-3
-
-        wb1.close()  # закрываем файл ОТК
-
-        # ----------------- копируем цифры отгрузки по потребителям и изделиям на лист "Гарантийный парк" -----------------
-        wb2 = openpyxl.open(file_otk)  # повторно открываем файл ОТК
-        ws2 = wb2["Гарантийный парк"]  # делаем активным лист "Гарантийный парк"
-
-        # словарь номеров столбцов АСП на листе "Гарантийный парк" по наименованию месяца
-        num_col = {
-            "январь": 2,
-            "февраль": 3,
-            "март": 4,
-            "апрель": 5,
-            "май": 6,
-            "июнь": 7,
-            "июль": 8,
-            "август": 9,
-            "сентябрь": 10,
-            "октябрь": 11,
-            "ноябрь": 12,
-            "декабрь": 13,
-        }
+    def __init__(self, mapping_file=file_mapping):
+        with open(mapping_file, "r", encoding="utf-8") as file:
+            self.mapping = json.load(file)
+
+    def copy(self, progress=None):
+        """
+        копирование по всем этапам, progress - функция, которая вызывается после каждого этапа
+        возвращает имя Листа месяца в файле ОТК
+        """
+        progress = progress or (lambda stage: None)
+
+        # ----------------- считываем блоки отгрузки из файла ОСиМ (только значения, одним проходом) -----------------
+        wb_osim = openpyxl.load_workbook(file_osim, read_only=True, data_only=True)
+        try:
+            ws_osim = wb_osim[wb_osim.sheetnames[0]]  # первый Лист таблицы ОСиМ
+            # используем title, чтобы имя Листа таблицы ОСиМ начиналось с большой буквы
+            # и по этому имени открываем Лист в файле ОТК
+            name_otk = ws_osim.title.title()
+            osim_rows = self.read_osim(ws_osim)
+        finally:
+            wb_osim.close()
+        progress("ОСиМ")
 
         # наименование месяца в который производится копирование данных
         month = name_otk.split()[0].lower()
 
-        # номер колонки в которую производится копирование данных
-        col_asp = num_col[month]  # АСП
-        col_zap = num_col[month] + 12  # ЗАПЧАСТЬ
-        # номера столбцов ЗАПЧАСТИ отличаются от номеров столбцов АСП на +12
-
-        # создаем итераторы для перебора списков значений отгрузки по АСП, ЗАПЧАСТИ и ММЗ
-        it_asp = iter(asp)
-        it_zap = iter(zap)
-        it_mmz_1 = iter(mmz)
-
-        for i in range(6, 14):
-            # копируем значения по АСП
-            ws2.cell(row=i, column=col_asp).value = next(it_asp)
-            # копируем значения по ЗАПЧАСТИ
-            ws2.cell(row=i, column=col_zap).value = next(it_zap)
-
-        for i in range(41, 49):
-            # копируем значения по ММЗ
-            ws2.cell(row=i, column=col_asp).value = next(it_mmz_1)
-
-        # копируем значения по МАЗ
-        ws2.cell(row=71, column=col_asp).value = maz
-        # копируем значения по ГОМСЕЛЬМАШ
-        ws2.cell(row=80, column=col_asp).value = gomsel
-        # копируем значения по МЗКТ
-        ws2.cell(row=89, column=col_asp).value = mzkt
-        # копируем значения по БелАЗ
-        ws2.cell(row=98, column=col_asp).value = belaz
-        # копируем значения по САЛЕО-Гомель
-        ws2.cell(row=107, column=col_asp).value = saleo
-        # копируем значения по ХХХ-РБ
-        ws2.cell(row=116, column=col_asp).value = xxx_rb
-
-        # копируем значения по УРАЛ
-        ws2.cell(row=125, column=col_asp).value = ural
-        # копируем значения по РОСТСЕЛЬМАШ (ПК)
-        ws2.cell(row=134, column=col_asp).value = rostsel_1
-        # копируем значения по РОСТСЕЛЬМАШ (ТКР)
-        ws2.cell(row=135, column=col_asp).value = rostsel_2
-        # копируем значения по РОСТСЕЛЬМАШ (ВН)
-        ws2.cell(row=136, column=col_asp).value = rostsel_3
-        # копируем значения по РОСТСЕЛЬМАШ (МН)
-        ws2.cell(row=137, column=col_asp).value = rostsel_4
-        # копируем значения по КАМАЗ (ПК)
-        ws2.cell(row=152, column=col_asp).value = kamaz_1
-        # копируем значения по КАМАЗ (ВН)
-        ws2.cell(row=153, column=col_asp).value = kamaz_2
-        # копируем значения по КАМАЗ (МН)
-        ws2.cell(row=154, column=col_asp).value = kamaz_3
-        # копируем значения по ЯМЗ (ПК)
-        ws2.cell(row=167, column=col_asp).value = ymz_1
-        # копируем значения по ЯМЗ (ВН)
-        ws2.cell(row=168, column=col_asp).value = ymz_2
-        # копируем значения по ЯМЗ (МН)
-        ws2.cell(row=169, column=col_asp).value = ymz_3
-        # копируем значения по ПТЗ С-Петербург
-        ws2.cell(row=182, column=col_asp).value = ptz
-        # копируем значения по ПАЗ (ПК)
-        ws2.cell(row=191, column=col_asp).value = paz_1
-        # копируем значения по ПАЗ (ВН)
-        ws2.cell(row=192, column=col_asp).value = paz_2
-        # копируем значения по ЧСДМ
-        ws2.cell(row=203, column=col_asp).value = csdm
-        # копируем значения по Туле
-        ws2.cell(row=212, column=col_asp).value = tula
-        # копируем значения по БАЗ
-        ws2.cell(row=221, column=col_asp).value = baz
-        # копируем значения по ХХ-РФ-1
-        ws2.cell(row=230, column=col_asp).value = xx_rf_1
-        # копируем значения по ХХ-РФ-2
-        ws2.cell(row=239, column=col_asp).value = xx_rf_2
-        # копируем значения по ХХ-РФ-3
-        ws2.cell(row=248, column=col_asp).value = xx_rf_3
-
-        # после копирования данных и расчета гарантийного парка заливаем столбцы белым цветом
-        # номера столбцов отличаются от номеров столбцов АСП на +26
-        col_color = num_col[month] + 26
-
-        for row in range(2, 155):
-            # заливка белым цветом: : RGB (255, 255, 255), в шестнадцатиричном значении FFFFFF
-            ws2.cell(row, col_color).fill = PatternFill(
-                fill_type="solid", fgColor="FFFFFF"
+        # ----------------- файл ОТК: Лист месяца и лист "Гарантийный парк" -----------------
+        wb_otk = openpyxl.load_workbook(file_otk)
+        ws_month = wb_otk[name_otk]
+        self.write_month_sheet(ws_month, osim_rows)
+        progress("Лист месяца")
+
+        values = self.calc_sources(wb_otk, ws_month)
+
+        self.write_garant_park(wb_otk[self.mapping["garant_park"]["sheet"]], month, values)
+        wb_otk.save(file_otk)
+        wb_otk.close()
+        progress("Гарантийный парк")
+
+        # ----------------- файл отчета: лист "Данные2" -----------------
+        wb_otchet = openpyxl.load_workbook(file_otchet)
+        self.write_report(wb_otchet[self.mapping["report"]["sheet"]], month, values)
+        wb_otchet.save(file_otchet)
+        wb_otchet.close()
+        progress("Данные2")
+
+        return name_otk
+
+    def read_osim(self, ws_osim):
+        """значения всех блоков отгрузки ОСиМ: {номер строки: кортеж значений столбцов}"""
+        blocks = self.mapping["month_sheet"]["blocks"]
+        columns = self.mapping["month_sheet"]["columns"]
+
+        min_row = min(block["rows"][0] for block in blocks)
+        max_row = max(block["rows"][1] for block in blocks)
+        min_col = min(col[0] for col in columns)
+        max_col = max(col[1] for col in columns)
+
+        return {
+            row: values
+            for row, values in enumerate(
+                ws_osim.iter_rows(
+                    min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True
+                ),
+                start=min_row,
             )
-
-        wb2.save(file_otk)  # сохраняем изменения
-        wb2.close()  # закрываем файл ОТК
-
-        # ----------------- копируем цифры отгрузки по потребителям и изделиям на лист "Данные2" файла отчета -----------------
-        # открываем файл отчета и лист "Данные2"
-        wb3 = openpyxl.load_workbook(file_otchet)
-        ws3 = wb3["Данные2"]  # открываем лист "Данные2" в файле ОТК
-
-        # словарь номеров столбцов на листе "Данные2" по наименованию месяца
-        num_col_onchet = {
-            "январь": 2,
-            "февраль": 5,
-            "март": 8,
-            "апрель": 11,
-            "май": 14,
-            "июнь": 17,
-            "июль": 20,
-            "август": 23,
-            "сентябрь": 26,
-            "октябрь": 29,
-            "ноябрь": 32,
-            "декабрь": 35,
         }
 
-        # номер колонки в которую производится копирование данных
-        col_otchet = num_col_onchet[month]
-
-        # создаем итераторы для перебора списка отгрузки по ММЗ
-        it_mmz_2 = iter(mmz)
-
-        # копируем значения по ММЗ
-        for i in range(6, 14):
-            ws3.cell(row=i, column=col_otchet).value = next(it_mmz_2)
-
-        # копируем значения по МАЗ
-        ws3.cell(row=16, column=col_otchet).value = maz
-        # копируем значения по ГОМСЕЛЬМАШ
-        ws3.cell(row=20, column=col_otchet).value = gomsel
-        # копируем значения по МЗКТ
-        ws3.cell(row=24, column=col_otchet).value = mzkt
-        # копируем значения по БелАЗ
-        ws3.cell(row=28, column=col_otchet).value = belaz
-        # копируем значения по САЛЕО-Гомель
-        ws3.cell(row=32, column=col_otchet).value = saleo
-        # копируем значения по ХХХ-РБ
-        ws3.cell(row=36, column=col_otchet).value = xxx_rb
-
-        # копируем значения по УРАЛ
-        ws3.cell(row=40, column=col_otchet).value = ural
-        # копируем значения по РОСТСЕЛЬМАШ (ПК)
-        ws3.cell(row=44, column=col_otchet).value = rostsel_1
-        # # копируем значения по РОСТСЕЛЬМАШ (ТКР)
-        # ws3.cell(row=135, column=col_otchet).value = rostsel_2
-        # # копируем значения по РОСТСЕЛЬМАШ (ВН)
-        # ws3.cell(row=136, column=col_otchet).value = rostsel_3
-        # # копируем значения по РОСТСЕЛЬМАШ (МН)
-        # ws3.cell(row=137, column=col_otchet).value = rostsel_4
-        # копируем значения по КАМАЗ (ПК)
-        ws3.cell(row=48, column=col_otchet).value = kamaz_1
-        # # копируем значения по КАМАЗ (ВН)
-        # ws3.cell(row=153, column=col_otchet).value = kamaz_2
-        # # копируем значения по КАМАЗ (МН)
-        # ws3.cell(row=154, column=col_otchet).value = kamaz_3
-        # копируем значения по ЯМЗ (ПК)
-        ws3.cell(row=52, column=col_otchet).value = ymz_1
-        # копируем значения по ЯМЗ (ВН)
-        ws3.cell(row=53, column=col_otchet).value = ymz_2
-        # копируем значения по ЯМЗ (МН)
-        ws3.cell(row=54, column=col_otchet).value = ymz_3
-        # копируем значения по ПТЗ С-Петербург
-        ws3.cell(row=57, column=col_otchet).value = ptz
-        # копируем значения по ПАЗ (ПК)
-        ws3.cell(row=61, column=col_otchet).value = paz_1
-        # # копируем значения по ПАЗ (ВН)
-        # ws3.cell(row=192, column=col_otchet).value = paz_2
-        # копируем значения по ЧСДМ
-        ws3.cell(row=65, column=col_otchet).value = csdm
-        # копируем значения по Туле
-        ws3.cell(row=69, column=col_otchet).value = tula
-        # копируем значения по БАЗ
-        ws3.cell(row=73, column=col_otchet).value = baz
-        # копируем значения по ХХ-РФ-1
-        ws3.cell(row=77, column=col_otchet).value = xx_rf_1
-        # копируем значения по ХХ-РФ-2
-        ws3.cell(row=81, column=col_otchet).value = xx_rf_2
-        # копируем значения по ХХ-РФ-3
-        ws3.cell(row=85, column=col_otchet).value = xx_rf_3
-
-        wb3.save(file_otchet)  # сохраняем изменения
-        wb3.close()  # закрываем файл отчета
+    def write_month_sheet(self, ws_month, osim_rows):
+        """копирование блоков строк ОСиМ на Лист месяца ОТК со смещением строк по изделиям"""
+        columns = self.mapping["month_sheet"]["columns"]
+        min_col = min(col[0] for col in columns)  # первый столбец, считанный из ОСиМ
+
+        for block in self.mapping["month_sheet"]["blocks"]:
+            row_start, row_end = block["rows"]
+            k = block["offset"]  # разница номеров строк начала диапазона в таблице ОТК и ОСиМ
+            for i in range(row_start, row_end + 1):
+                values = osim_rows.get(i, ())
+                for col_start, col_end, col_otk in columns:
+                    for j in range(col_start, col_end + 1):
+                        index = j - min_col
+                        value = values[index] if index < len(values) else None
+                        # если значение в ячейке есть, то переводим в int, иначе пустая строка
+                        ws_month.cell(row=i + k, column=col_otk + j - col_start).value = int(value) if value else ""
+
+    def source_cells(self):
+        """ячейки Листа месяца, значения которых копируются на листы Гарантийный парк и Данные2"""
+        cells = self.mapping["garant_park"]["cells"] + self.mapping["report"]["cells"]
+        return {tuple(cell["source"]) for cell in cells}
+
+    def calc_sources(self, wb_otk, ws_month):
+        """
+        значения ячеек-источников Листа месяца: формулы сумм рассчитываются в памяти;
+        если встретилась формула, которую нельзя рассчитать, - пересчет в Excel, как раньше
+        """
+        evaluator = FormulaEvaluator(ws_month)
+        try:
+            values = {cell: evaluator.value(*cell) for cell in self.source_cells()}
+        except FormulaError:
+            values = self.calc_sources_in_excel(wb_otk, ws_month.title)
+
+        # пустые строки в ячейках отгрузки не переносим
+        return {cell: (None if value == "" else value) for cell, value in values.items()}
+
+    def calc_sources_in_excel(self, wb_otk, name_otk):
+        """пересчет формул файла ОТК запуском Excel (нужен установленный Excel)"""
+        import xlwings
+
+        wb_otk.save(file_otk)
 
+        # модулем xlwings в таблице ОТК фиксируем значения в ячейках, где используются формулы
+        excel_app = xlwings.App(visible=False)
+        try:
+            excel_book = excel_app.books.open(file_otk)
+            excel_book.save()
+            excel_book.close()
+        finally:
+            excel_app.quit()
+
+        wb_values = openpyxl.load_workbook(file_otk, read_only=True, data_only=True)
+        try:
+            ws_values = wb_values[name_otk]
+            return {cell: ws_values.cell(*cell).value for cell in self.source_cells()}
+        finally:
+            wb_values.close()
+
+    def write_garant_park(self, ws_garant, month, values):
+        """копирование отгрузки на лист "Гарантийный парк" в столбцы месяца"""
+        garant = self.mapping["garant_park"]
+        col_asp = garant["month_columns"][month]  # номер колонки месяца (АСП)
+
+        for cell in garant["cells"]:
+            ws_garant.cell(row=cell["row"], column=col_asp + cell["shift"]).value = values[tuple(cell["source"])]
+
+        # после копирования данных и расчета гарантийного парка заливаем столбец месяца белым цветом
+        col_color = col_asp + garant["fill_shift"]
+        white = PatternFill(fill_type="solid", fgColor="FFFFFF")
+        row_start, row_end = garant["fill_rows"]
+        for row in range(row_start, row_end + 1):
+            ws_garant.cell(row, col_color).fill = white
+
+    def write_report(self, ws_report, month, values):
+        """копирование отгрузки по потребителям на лист "Данные2" файла отчета"""
+        report = self.mapping["report"]
+        col_otchet = report["month_columns"][month]
+
+        for cell in report["cells"]:
+            ws_report.cell(row=cell["row"], column=col_otchet).value = values[tuple(cell["source"])]
 
-if __name__ == "__main__":
-    pr = ExcelSheetCopier()
-    pr.copy_in_otk(3, 21, 1)  # ТКР
-    pr.copy_in_otk(23, 40, 2)  # ПК
-    pr.copy_in_otk(42, 59, 3)  # ВН
-    pr.copy_in_otk(61, 75, 4)  # МН
-    pr.copy_in_otk(77, 83, 5)  # ГП
-    pr.copy_in_otk(85, 96, 6)  # ЦМФ
-    pr.copy_in_otk(110, 114, 11)  # штанга и коромысло
-
-    print("Данные по отгрузке скопированы на лист месяца файла ОТК")
 
-    grp = DataCopierGarant()
-    grp.copy_garant()
+if __name__ == "__main__":
+    name = ShipmentCopier().copy(progress=print)
 
     print(
-        'Данные скопированы на лист "Гарантийный парк" файла ОТК и "Данные2" файла отчета'
+        f'Данные по отгрузке скопированы на лист "{name}" и "Гарантийный парк" файла ОТК и "Данные2" файла отчета'
     )
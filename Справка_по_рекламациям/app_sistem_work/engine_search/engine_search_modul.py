@@ -1,6 +1,8 @@
 # Вспомогательный модуль приложения <Поиск двигателя по изделию>
 # для определения номера двигателя и акта рекламации по номеру изделия
 
+import os
+
 import pandas as pd
 
 from paths_work import file_database # путь до файла базы рекламаций ОТК с учетом текущего года
@@ -8,41 +10,87 @@ from paths_work import file_database # путь до файла базы рек
 
 # класс для определения номера двигателя и акта рекламации по номеру изделия
 class Search:
+    # кэш прочитанных листов базы ОТК по годам: {год: (подпись файла, датафрейм, индекс номеров)}
+    # повторный поиск (в том числе после поиска по другому году) не читает файл Excel заново
+    _cache = {}
+
     def __init__(self, year: int) -> None:
         # год поиска (в каком году базы будем исать информацию)
         self.year = str(year)
-        self.num_prod = tuple()
-        sheet = self.year        # делаем активным Лист базы ОТК по году поиска
-        # читаем файл Excel и создаем датафрейм
-        self.df = pd.read_excel(file_database, sheet_name=sheet, header=1)
+        # датафрейм листа базы ОТК по году поиска и индекс {номер изделия: [номера строк датафрейма]}
+        self.df, self.index = self._load(self.year)
+        self.num_prod = tuple(self.index)
+
+    @classmethod
+    def _load(cls, year):
+        """Лист базы ОТК и индекс номеров изделий (из кэша, если файл базы не менялся)"""
+        stat = os.stat(file_database)
+        signature = (stat.st_mtime_ns, stat.st_size)  # дата изменения и размер файла базы
+
+        cached = cls._cache.get(year)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        # читаем файл Excel и создаем датафрейм (лист базы ОТК по году поиска)
+        df = pd.read_excel(file_database, sheet_name=year, header=1)
+
+        # индекс номеров изделий строится один раз для листа года
+        index = {}
+        for position, value in enumerate(df['Заводской номер изделия']):
+            if pd.notna(value):
+                index.setdefault(value, []).append(position)
+
+        cls._cache[year] = (signature, df, index)
+        return df, index
+
+    @classmethod
+    def clear_cache(cls):
+        """Сброс кэша прочитанных листов базы ОТК"""
+        cls._cache.clear()
 
     def all_num_prod(self):
-        k = 3  # поправочный коэффициент нумерации строк
         # кортеж номеров изделий из базы
-        self.num_prod = tuple(self.df['Заводской номер изделия'][3-k:1000-k])
         return self.num_prod   # возвращаем кортеж номеров изделий
 
     def get_answer(self, value):
-        # есть ли номер изделия в базе: True - есть, False - нет
-        if value not in self.all_num_prod():
+        # есть ли номер изделия в базе: нет - возвращаем 0
+        positions = self.index.get(value)
+        if not positions:
             return 0
 
-        # номер строки по номеру изделия
-        res = self.df[self.df['Заводской номер изделия'] == value].index[0]
+        res = positions[0]  # номер строки по номеру изделия (первое вхождение)
+        row = self.df.iloc[res]
 
-        vid = self.df.iloc[res]['Наименование изделия']  # наименование изделия
-        dvg = self.df.iloc[res]['Номер двигателя']       # номер двигателя
-        act = self.df.iloc[res]['Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'] # номер рекламационного акта
+        vid = row['Наименование изделия']  # наименование изделия
+        dvg = row['Номер двигателя']       # номер двигателя
+        act = row['Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия'] # номер рекламационного акта
 
         return res, vid, dvg, act
 
+    def get_answers(self, values):
+        """
+        Пакетный поиск: {номер изделия: (строка, наименование, двигатель, акт) или 0}
+        Все номера ищутся по индексу за один вызов, данные строк берутся одним обращением к датафрейму.
+        """
+        found = {value: self.index[value][0] for value in values if value in self.index}
+
+        rows = self.df.iloc[list(found.values())][[
+            'Наименование изделия',
+            'Номер двигателя',
+            'Номер рекламационного акта ПРИОБРЕТАТЕЛЯ изделия',
+        ]].itertuples(index=False, name=None)
+        answers = {value: (res, *row) for (value, res), row in zip(found.items(), rows)}
+
+        return {value: answers.get(value, 0) for value in values}
+
     def show(self, value):
         print('-'*50)
-        for v in value.split():
-            # переводим в int и обратно в str для удаления незначащих нулей в вводимых номерах
-            v = str(int(v))
-            if self.get_answer(v):
-                res, vid, dvg, act = self.get_answer(v)
+        # переводим в int и обратно в str для удаления незначащих нулей в вводимых номерах
+        numbers = [str(int(v)) for v in value.split()]
+        answers = self.get_answers(numbers)
+        for v in numbers:
+            if answers[v]:
+                res, vid, dvg, act = answers[v]
                 print(f'Изделие № {v} - {vid} - cтрока {res+3}')
                 print(f'Двигатель № {dvg}, акт рекламации № {act}\n')
             else: